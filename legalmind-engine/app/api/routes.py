@@ -1,21 +1,41 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, Body
+from fastapi import APIRouter, Depends, Query, HTTPException, Body, Request
+from fastapi.responses import FileResponse, StreamingResponse
+import asyncio
+import json
+import os
+from datetime import datetime
 from typing import Optional, Dict, Any, List
-from app.core.stores import CaseContext
-from app.modules.dominion import Dominion
+from app.core.stores import AuditLog, CaseContext, TERMINAL_STATUSES
+from app.core.config import load_config
+from app.core.case_cache import CaseCache
+from app.core.executors import io_lane, llm_lane
+from app.core.scheduling import work_scope
+from app.modules.dominion import Dominion, WARMUP_COMPONENTS, warmup
+from app.modules.chronicle import REPORT_FORMATS
 from app.models import RunState, RunStatus, EvidenceSegment, Chunk, Claim, EvidenceBundle, VerificationFinding, CitationFinding, GateResult, RetrievalMode
 
 router = APIRouter()
 
-from functools import lru_cache
-
-@lru_cache()
-def get_cached_dominion(case_id: str):
-    case_context = CaseContext(case_id)
+def new_dominion(case_id: str) -> Dominion:
+    # Workers resolve cases through this too, so it must agree with their storage root
+    case_context = CaseContext(case_id, base_storage_path=load_config().STORAGE_PATH)
     return Dominion(case_context)
 
+# Bounded by LEGALMIND_CASE_CACHE_*; evicted cases release their clients and indexes
+case_cache = CaseCache.from_config(new_dominion)
+case_cache.report_metrics()
+
+def get_cached_dominion(case_id: str) -> Dominion:
+    return case_cache.get(case_id)
+
 async def get_dominion(case_id: str = Query("default_case")):
     return get_cached_dominion(case_id)
 
+def check_formats(formats: Optional[List[str]]):
+    unknown = [f for f in formats or [] if f.lower() not in REPORT_FORMATS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported report format(s): {', '.join(unknown)}")
+
 # --- Case & Evidence ---
 
 @router.post("/case/init")
@@ -44,9 +64,8 @@ async def evidence_register(
 @router.post("/document/register")
 async def document_register(
     file_path: str = Body(..., embed=True),
-    case_id: str = Query("default_case")
+    dominion: Dominion = Depends(get_dominion)
 ):
-    case_context = CaseContext(case_id)
     # Stub
     return {"status": "registered", "document_id": "dummy_doc_id"}
 
@@ -56,6 +75,8 @@ async def document_register(
 async def evidence_ingest(
     file_path: Optional[str] = Body(None, embed=True),
     run_id: Optional[str] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
@@ -67,7 +88,7 @@ async def evidence_ingest(
 
     if not file_path:
         raise HTTPException(status_code=400, detail="file_path required")
-    return await dominion.workflow_ingest_case(file_path)
+    return await dominion.workflow_ingest_case(file_path, deadline_seconds, profile)
 
 @router.post("/index/chunk", response_model=RunState)
 async def index_chunk(
@@ -89,8 +110,7 @@ async def index_build(
     return RunState(run_id="index_job_1", status=RunStatus.RUNNING)
 
 @router.get("/index/health")
-async def index_health(case_id: str = Query("default_case")):
-    case_context = CaseContext(case_id)
+async def index_health(dominion: Dominion = Depends(get_dominion)):
     return {"status": "healthy", "degraded": False}
 
 # --- Brief Audit ---
@@ -106,6 +126,9 @@ async def brief_extract_claims(
 async def audit_run(
     brief_path: Optional[str] = Body(None, embed=True),
     run_id: Optional[str] = Body(None, embed=True),
+    formats: Optional[List[str]] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
@@ -117,7 +140,8 @@ async def audit_run(
 
     if not brief_path:
         raise HTTPException(status_code=400, detail="brief_path required")
-    return await dominion.workflow_audit_brief(brief_path)
+    check_formats(formats)
+    return await dominion.workflow_audit_brief(brief_path, formats, deadline_seconds, profile)
 
 @router.post("/retrieve/hybrid", response_model=EvidenceBundle)
 async def retrieve_hybrid(
@@ -135,7 +159,8 @@ async def retrieve_hybrid(
         priority=1,
         routing=RoutingDecision.VERIFY
     )
-    return dominion.inquiry.retrieve_evidence(claim)
+    with work_scope(dominion.case_context.case_id, "verify_claim"):
+        return await io_lane.run(dominion.inquiry.retrieve_evidence, claim)
 
 @router.post("/verify/claim", response_model=RunState)
 async def verify_claim(
@@ -160,8 +185,10 @@ async def verify_claim(
         priority=1,
         routing=RoutingDecision.VERIFY
     )
-    bundle = dominion.inquiry.retrieve_evidence(claim)
-    finding = dominion.adjudication.verify_claim_skeptical(claim, bundle)
+    # Interactive: served ahead of bulk work on the shared lanes
+    with work_scope(dominion.case_context.case_id, "verify_claim"):
+        bundle = await io_lane.run(dominion.inquiry.retrieve_evidence, claim)
+        finding = await llm_lane.run(dominion.adjudication.verify_claim_skeptical, claim, bundle)
 
     return RunState(
         run_id="sync_complete",
@@ -174,41 +201,227 @@ async def verify_claim(
 async def citations_verify_batch(
     text: Optional[str] = Body(None, embed=True),
     run_id: Optional[str] = Body(None, embed=True),
+    formats: Optional[List[str]] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
         return RunState(run_id=run_id, status=RunStatus.COMPLETE)
     if not text:
         raise HTTPException(status_code=400, detail="text required")
-    return await dominion.workflow_cite_check(text)
+    check_formats(formats)
+    return await dominion.workflow_cite_check(text, formats, deadline_seconds, profile)
 
 @router.post("/prefile/run", response_model=RunState)
 async def prefile_run(
     brief_path: Optional[str] = Body(None, embed=True),
     run_id: Optional[str] = Body(None, embed=True),
+    formats: Optional[List[str]] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
         return RunState(run_id=run_id, status=RunStatus.RUNNING)
     if not brief_path:
         raise HTTPException(status_code=400, detail="brief_path required")
-    return await dominion.workflow_prefile_gate(brief_path)
+    check_formats(formats)
+    return await dominion.workflow_prefile_gate(brief_path, formats, deadline_seconds, profile)
 
 @router.post("/report/render", response_model=RunState)
 async def report_render(
+    source_run_id: Optional[str] = Body(None, embed=True),
     findings_ids: Optional[List[str]] = Body(None, embed=True),
     run_id: Optional[str] = Body(None, embed=True),
+    formats: Optional[List[str]] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
-        return RunState(run_id=run_id, status=RunStatus.COMPLETE, result_payload={"path": "/tmp/report.html"})
-    return RunState(run_id="report_job_1", status=RunStatus.RUNNING)
+        job = dominion.get_job_status(run_id)
+        if job:
+            return job
+        else:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    if not source_run_id:
+        raise HTTPException(status_code=400, detail="source_run_id required")
+    check_formats(formats)
+    return await dominion.workflow_render_report(source_run_id, findings_ids, formats, deadline_seconds, profile)
+
+@router.get("/report/download")
+async def report_download(
+    run_id: str = Query(...),
+    format: str = Query("html"),
+    dominion: Dominion = Depends(get_dominion)
+):
+    job = dominion.get_job_status(run_id)
+    if not job or "report_path" not in job.result_payload:
+        raise HTTPException(status_code=404, detail="Report not found")
+    check_formats([format])
+
+    html_path = job.result_payload["report_path"]
+    fmt = format.lower()
+    if fmt == "pdf":
+        # Rendered on first download, then served from disk
+        try:
+            path = await asyncio.to_thread(dominion.chronicle.ensure_pdf, html_path)
+        except Exception as e:
+            # weasyprint missing its system libraries, or failing on this report
+            raise HTTPException(status_code=503, detail=f"PDF rendering unavailable: {e}")
+    else:
+        path = os.path.join(os.path.dirname(html_path), f"report.{fmt}")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Report was not rendered as {fmt}")
+    return FileResponse(path, filename=os.path.basename(path))
+
+# --- Job Events ---
+
+SSE_KEEPALIVE_SECONDS = 15.0
+
+def _latest_state(events: List[Dict[str, Any]]) -> Optional[RunState]:
+    for event in reversed(events):
+        if event["type"] == "status":
+            return RunState(**event["data"])
+    return None
+
+@router.delete("/jobs/{run_id}", response_model=RunState)
+async def job_cancel(
+    run_id: str,
+    dominion: Dominion = Depends(get_dominion)
+):
+    """
+    Cancels a job. A job still waiting is CANCELLED immediately; a running
+    one stays RUNNING until its worker has stopped it (watch /wait or
+    /events for the CANCELLED status). Finished jobs are returned unchanged.
+    """
+    job = await asyncio.to_thread(dominion.cancel_job, run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{run_id}/trace")
+async def job_trace(
+    run_id: str,
+    dominion: Dominion = Depends(get_dominion)
+):
+    """
+    The run's spans in OTLP/JSON, one resourceSpans entry per finished
+    attempt. A running attempt appears once it ends.
+    """
+    trace = await asyncio.to_thread(dominion.case_context.jobs.get_trace, run_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+@router.get("/jobs/{run_id}/profile")
+async def job_profile(
+    run_id: str,
+    format: str = Query("json", pattern="^(json|collapsed)$", description="json summary, or collapsed stacks for a flamegraph"),
+    dominion: Dominion = Depends(get_dominion)
+):
+    """Profile of the run's last attempt, for jobs started with ?profile=true."""
+    summary_path, collapsed_path = dominion.case_context.jobs.profile_paths(run_id)
+    path = summary_path if format == "json" else collapsed_path
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "application/json" if format == "json" else "text/plain"
+    return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+
+@router.get("/jobs/{run_id}/wait")
+async def job_wait(
+    run_id: str,
+    since: Optional[int] = Query(None, description="Last event seq seen; defaults to now"),
+    timeout: float = Query(30.0, ge=0, le=300),
+    dominion: Dominion = Depends(get_dominion)
+):
+    """Blocks until the job publishes an event after `since` or the timeout passes."""
+    events = dominion.case_context.jobs.events
+    if since is None:
+        since = events.last_seq(run_id)
+    job = dominion.get_job_status(run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.status in TERMINAL_STATUSES:
+        new_events = events.since(run_id, since)
+    else:
+        new_events = await events.wait(run_id, since, timeout)
+
+    return {
+        "run_state": _latest_state(new_events) or job,
+        "events": new_events,
+        "last_seq": new_events[-1]["seq"] if new_events else since
+    }
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+@router.get("/jobs/{run_id}/events")
+async def job_events(
+    run_id: str,
+    request: Request,
+    since: int = Query(0, description="Replay events after this seq (Last-Event-ID takes precedence)"),
+    dominion: Dominion = Depends(get_dominion)
+):
+    """Server-Sent Events stream of status, progress, warning and partial events, ending when the job does."""
+    job = dominion.get_job_status(run_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    events = dominion.case_context.jobs.events
+    last_event_id = request.headers.get("last-event-id")
+    seq = int(last_event_id) if last_event_id and last_event_id.isdigit() else since
+
+    async def stream():
+        nonlocal seq
+        if job.status in TERMINAL_STATUSES and not events.since(run_id, seq):
+            # Finished before this process saw it (or before a restart); report where it ended
+            yield _sse({"seq": events.last_seq(run_id), "type": "status", "run_id": run_id, "data": job.model_dump(mode="json")})
+            return
+        while not await request.is_disconnected():
+            batch = await events.wait(run_id, seq, SSE_KEEPALIVE_SECONDS)
+            if not batch:
+                yield ": keepalive\n\n"
+                continue
+            for event in batch:
+                seq = event["seq"]
+                yield _sse(event)
+                if event["type"] == "status" and event["data"]["status"] in TERMINAL_STATUSES:
+                    return
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+# --- Audit Log ---
+
+@router.get("/audit-log/stats")
+async def audit_log_stats():
+    """Writer queue depth, batch and fsync counters for the audit trail."""
+    return AuditLog.stats()
+
+@router.get("/audit-log/events")
+async def audit_log_events(
+    run_id: Optional[str] = Query(None),
+    module: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="ISO timestamp; naive values are server local time, like the log's"),
+    until: Optional[datetime] = Query(None),
+    limit: int = Query(1000, ge=1, le=10000),
+    dominion: Dominion = Depends(get_dominion)
+):
+    """A case's audit events, oldest first, looked up through the audit index."""
+    # Include events this process has queued but not yet written
+    await asyncio.to_thread(AuditLog.flush)
+    events = await asyncio.to_thread(dominion.case_context.audit_log.query, run_id, module, since, until, limit)
+    return {"case_id": dominion.case_context.case_id, "count": len(events), "events": events}
 
 # --- Maintenance ---
 
 @router.post("/maintenance/upgrade-transcripts", response_model=RunState)
 async def maintenance_upgrade_transcripts(
     run_id: Optional[str] = Body(None, embed=True),
+    deadline_seconds: Optional[float] = Body(None, embed=True, gt=0, description="Cancel the job if it has not finished after this many seconds"),
+    profile: bool = Query(False, description="Profile the job; see GET /jobs/{run_id}/profile"),
     dominion: Dominion = Depends(get_dominion)
 ):
     if run_id:
@@ -218,4 +431,18 @@ async def maintenance_upgrade_transcripts(
         else:
             raise HTTPException(status_code=404, detail="Job not found")
 
-    return await dominion.workflow_background_maintenance()
+    return await dominion.workflow_background_maintenance(deadline_seconds, profile)
+
+@router.post("/warmup")
+async def warmup_engine(
+    components: Optional[List[str]] = Body(None, embed=True, description=f"Any of {', '.join(WARMUP_COMPONENTS)}; defaults to everything but whisper"),
+    case_id: Optional[str] = Query(None, description="Also build this case's modules and open its index"),
+):
+    """Preloads dependencies and models that the engine otherwise loads on first use."""
+    unknown = [c for c in components or [] if c not in WARMUP_COMPONENTS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown warmup component(s): {', '.join(unknown)}")
+    result = {"components": await asyncio.to_thread(warmup, components)}
+    if case_id:
+        result["case"] = {"case_id": case_id, **await asyncio.to_thread(get_cached_dominion(case_id).warm)}
+    return result
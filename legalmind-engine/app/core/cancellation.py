@@ -0,0 +1,92 @@
+"""
+Cooperative cancellation for job work.
+
+The job runner cancels a job's asyncio task, which aborts awaits (HTTP
+calls, sleeps) immediately. Work running in threads cannot be interrupted,
+so it calls check_cancelled() between units of work (pages, segments,
+claim windows). asyncio.to_thread carries the job's token into the thread
+through a context variable; other executors need contextvars.copy_context().
+"""
+import time
+import threading
+import contextlib
+import contextvars
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterator, Optional
+
+class JobCancelled(BaseException):
+    # BaseException, like asyncio.CancelledError, so the modules' broad
+    # `except Exception` fallbacks never swallow a cancellation
+    def __init__(self, reason: str = "Cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+class CancelToken:
+    def __init__(self, deadline: Optional[float] = None, run_id: Optional[str] = None):
+        self.deadline = deadline
+        # The run this token belongs to; the audit log attributes events to it
+        self.run_id = run_id
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def cancel(self, reason: str = "Cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline is not None and time.time() >= self.deadline:
+            self.cancel("Deadline exceeded")
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def check(self):
+        if self.cancelled:
+            raise JobCancelled(self.reason)
+
+_current_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar("legalmind_cancel_token", default=None)
+
+@contextlib.contextmanager
+def cancel_scope(token: CancelToken) -> Iterator[CancelToken]:
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+def check_cancelled():
+    """Raises JobCancelled if the job this code runs for was cancelled or ran out of time."""
+    token = _current_token.get()
+    if token is not None:
+        token.check()
+
+def remaining_time() -> Optional[float]:
+    token = _current_token.get()
+    return token.remaining() if token is not None else None
+
+def deadline_kwargs() -> Dict[str, float]:
+    """{"timeout": seconds left} for client calls made under a job deadline, else {}."""
+    remaining = remaining_time()
+    return {} if remaining is None else {"timeout": remaining}
+
+def result_or_cancel(future: Future, poll_interval: float = 0.2) -> Any:
+    """Waits for an executor future, dropping it if the job is cancelled first."""
+    while True:
+        try:
+            return future.result(timeout=poll_interval)
+        except FutureTimeoutError:
+            try:
+                check_cancelled()
+            except JobCancelled:
+                # Only helps if it has not started; a running process finishes on its own
+                future.cancel()
+                raise
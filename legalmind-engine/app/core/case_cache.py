@@ -0,0 +1,198 @@
+"""
+Bounded cache of per-case objects: the Dominions the API and workers resolve
+case ids to.
+
+Cases are kept in least-recently-used order. Every lookup drops cases that
+have been idle longer than idle_seconds. A miss also drops the least
+recently used cases while more than max_cases are resident or, with a
+memory budget, while the process's resident set is over it. A case whose
+busy() is true (one of its jobs is running) is never dropped, so the cache
+can briefly hold more than max_cases. Dropped values have close() called
+to release their clients and indexes. A caller still holding one can keep
+using it, because Dominion reopens what it needs on first use.
+
+Building a case, closing dropped ones and measuring memory all happen
+outside the cache lock, so a slow miss never holds up other cases'
+lookups. The memory budget is checked at most every memory_check_seconds.
+"""
+import os
+import gc
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import Config, load_config
+from app.core.metrics import case_cache_state, registry
+
+def resident_memory_mb() -> Optional[float]:
+    """This process's resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+class CaseCache:
+    def __init__(self, factory: Callable[[str], Any], max_cases: int = 32, idle_seconds: float = 1800.0,
+                 memory_budget_mb: float = 0.0, clock: Callable[[], float] = time.monotonic,
+                 memory: Callable[[], Optional[float]] = resident_memory_mb, memory_check_seconds: float = 5.0):
+        self.factory = factory
+        self.max_cases = max(1, max_cases)
+        self.idle_seconds = idle_seconds
+        self.memory_budget_mb = memory_budget_mb
+        self.memory_check_seconds = memory_check_seconds
+        self._clock = clock
+        self._memory = memory
+        # case_id -> (value, last used); oldest first
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per case being built, so concurrent misses for it build it once
+        self._building: Dict[str, threading.Lock] = {}
+        self._memory_lock = threading.Lock()
+        self._memory_checked_at: Optional[float] = None
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "evictions_size": 0, "evictions_idle": 0, "evictions_memory": 0}
+
+    @classmethod
+    def from_config(cls, factory: Callable[[str], Any], config: Optional[Config] = None) -> "CaseCache":
+        config = config or load_config()
+        return cls(factory, config.CASE_CACHE_MAX_CASES, config.CASE_CACHE_IDLE_SECONDS, config.CASE_CACHE_MEMORY_MB)
+
+    def get(self, case_id: str) -> Any:
+        with self._lock:
+            now = self._clock()
+            evicted = self._expire(now)
+            entry = self._entries.get(case_id)
+            if entry is not None:
+                self._stats["hits"] += 1
+                self._touch(case_id, entry[0], now)
+            else:
+                building = self._building.setdefault(case_id, threading.Lock())
+        self._release(evicted)
+        if entry is not None:
+            return entry[0]
+
+        with building:
+            with self._lock:
+                entry = self._entries.get(case_id)
+                if entry is not None:
+                    # Built by a concurrent miss while this one waited
+                    self._stats["hits"] += 1
+                    self._touch(case_id, entry[0], self._clock())
+                    return entry[0]
+            try:
+                value = self.factory(case_id)
+            except BaseException:
+                with self._lock:
+                    self._building.pop(case_id, None)
+                raise
+            with self._lock:
+                self._stats["misses"] += 1
+                self._touch(case_id, value, self._clock())
+                self._building.pop(case_id, None)
+                evicted = self._shrink(keep=case_id)
+        self._release(evicted)
+        self._enforce_memory_budget(keep=case_id)
+        return value
+
+    def evict(self, case_id: str, force: bool = False) -> bool:
+        """Drops one case now; a busy case only with force."""
+        with self._lock:
+            entry = self._entries.get(case_id)
+            if entry is None or (not force and self._busy(entry[0])):
+                return False
+            del self._entries[case_id]
+            self._stats["evictions"] += 1
+        self._release([entry[0]])
+        return True
+
+    def clear(self):
+        """Drops every case, busy or not (tests, shutdown)."""
+        with self._lock:
+            values = [value for value, _ in self._entries.values()]
+            self._entries.clear()
+        self._release(values)
+
+    def resident(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            busy = sum(1 for value, _ in self._entries.values() if self._busy(value))
+            return {**self._stats, "resident": len(self._entries), "busy": busy, "max_cases": self.max_cases}
+
+    def report_metrics(self):
+        """Exports this cache's stats on every metrics scrape."""
+        registry.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self):
+        for field, value in self.stats().items():
+            case_cache_state.set(value, field=field)
+
+    def _busy(self, value: Any) -> bool:
+        busy = getattr(value, "busy", None)
+        return bool(busy()) if callable(busy) else False
+
+    def _drop(self, case_id: str, reason: Optional[str] = None) -> Any:
+        value, _ = self._entries.pop(case_id)
+        self._stats["evictions"] += 1
+        if reason:
+            self._stats[f"evictions_{reason}"] += 1
+        return value
+
+    def _expire(self, now: float) -> List[Any]:
+        if self.idle_seconds <= 0:
+            return []
+        idle = [case_id for case_id, (value, used) in self._entries.items()
+                if now - used > self.idle_seconds and not self._busy(value)]
+        return [self._drop(case_id, "idle") for case_id in idle]
+
+    def _touch(self, case_id: str, value: Any, now: float):
+        self._entries[case_id] = (value, now)
+        self._entries.move_to_end(case_id)
+
+    def _shrink(self, keep: str) -> List[Any]:
+        evicted = []
+        candidates = [case_id for case_id in self._entries if case_id != keep]
+        for case_id in candidates:
+            if len(self._entries) <= self.max_cases:
+                break
+            if not self._busy(self._entries[case_id][0]):
+                evicted.append(self._drop(case_id, "size"))
+        return evicted
+
+    def _enforce_memory_budget(self, keep: str):
+        # One caller at a time, and not more often than memory_check_seconds
+        if self.memory_budget_mb <= 0 or not self._memory_lock.acquire(blocking=False):
+            return
+        try:
+            now = self._clock()
+            if self._memory_checked_at is not None and now - self._memory_checked_at < self.memory_check_seconds:
+                return
+            self._memory_checked_at = now
+            while self._over_budget():
+                with self._lock:
+                    idle = next((case_id for case_id, (value, _) in self._entries.items()
+                                 if case_id != keep and not self._busy(value)), None)
+                    if idle is None:
+                        return
+                    value = self._drop(idle, "memory")
+                # Memory only comes back once the evicted case has let go of its indexes
+                self._release([value])
+                gc.collect()
+        finally:
+            self._memory_lock.release()
+
+    def _over_budget(self) -> bool:
+        rss = self._memory()
+        return rss is not None and rss > self.memory_budget_mb
+
+    def _release(self, values: List[Any]):
+        for value in values:
+            close = getattr(value, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Failed to release an evicted case: {e}")
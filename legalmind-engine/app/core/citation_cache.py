@@ -0,0 +1,162 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import contextlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from app.core.config import Config, load_config
+
+def normalize_citation(citation_text: str) -> str:
+    return citation_text.lower().replace(".", "").replace(" ", "")
+
+class CachedCitation:
+    def __init__(self, result: Dict[str, Any], fetched_at: float, expires_at: float):
+        self.result = result
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def found(self) -> bool:
+        return self.result.get("status") == "found"
+
+class CitationCache:
+    """
+    Authority lookups shared by every case and process on the host, keyed by
+    the normalized citation. Found results are kept for the positive TTL and
+    not-found results for the (much shorter) negative TTL. Expired entries are
+    retained so a stale positive can still be served while the API is down.
+    """
+    def __init__(self, db_path: str, positive_ttl: float, negative_ttl: float):
+        self.db_path = db_path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS citations ("
+                "key TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_config(cls, config: Config) -> "CitationCache":
+        db_path = config.CITATION_CACHE_PATH or os.path.join(config.STORAGE_PATH, "citation_cache.db")
+        return cls(db_path, config.CITATION_CACHE_POSITIVE_TTL, config.CITATION_CACHE_NEGATIVE_TTL)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CachedCitation]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload, fetched_at, expires_at FROM citations WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return CachedCitation(json.loads(row[0]), row[1], row[2])
+
+    def put(self, key: str, result: Dict[str, Any], ttl: Optional[float] = None):
+        self.bulk_put([(key, result)], ttl=ttl)
+
+    def bulk_put(self, entries: Iterable[Tuple[str, Dict[str, Any]]], ttl: Optional[float] = None) -> int:
+        now = time.time()
+        rows = []
+        for key, result in entries:
+            status = result.get("status", "not_found")
+            entry_ttl = ttl if ttl is not None else (self.positive_ttl if status == "found" else self.negative_ttl)
+            rows.append((key, status, json.dumps(result), now, now + entry_ttl))
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO citations (key, status, payload, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def purge_expired(self, include_positive: bool = False) -> int:
+        # Stale positives are kept by default as the outage fallback
+        query = "DELETE FROM citations WHERE expires_at < ?"
+        if not include_positive:
+            query += " AND status != 'found'"
+        with self._connect() as conn:
+            return conn.execute(query, (time.time(),)).rowcount
+
+    def export_entries(self) -> Iterator[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, payload, fetched_at, expires_at FROM citations ORDER BY key").fetchall()
+        for key, payload, fetched_at, expires_at in rows:
+            yield {"key": key, "fetched_at": fetched_at, "expires_at": expires_at, **json.loads(payload)}
+
+    def stats(self) -> Dict[str, int]:
+        now = time.time()
+        with self._connect() as conn:
+            total, found, fresh = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(status = 'found'), 0), COALESCE(SUM(expires_at >= ?), 0) FROM citations",
+                (now,)
+            ).fetchone()
+        return {"entries": total, "found": found, "not_found": total - found, "fresh": fresh}
+
+def _read_import_file(path: str) -> Iterator[Dict[str, Any]]:
+    # Accepts a JSON list or JSONL; each record needs "citation" (or a precomputed "key")
+    with open(path, "r") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        yield from json.loads(content)
+        return
+    for line in content.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+def import_file(cache: CitationCache, path: str, ttl: Optional[float] = None) -> int:
+    entries = []
+    for record in _read_import_file(path):
+        record = dict(record)
+        key = record.pop("key", None) or normalize_citation(record.pop("citation"))
+        record.pop("fetched_at", None)
+        record.pop("expires_at", None)
+        record.setdefault("status", "found")
+        entries.append((key, record))
+    return cache.bulk_put(entries, ttl=ttl)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.core.citation_cache", description="Manage the shared citation authority cache.")
+    parser.add_argument("--db", help="Cache database path (defaults to the configured CITATION_CACHE_PATH)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = sub.add_parser("import", help="Preload authorities from a JSON or JSONL file")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--ttl", type=float, help="Override TTL in seconds for every imported entry")
+    export_cmd = sub.add_parser("export", help="Write all entries as JSONL to stdout")
+    purge_cmd = sub.add_parser("purge", help="Delete expired entries")
+    purge_cmd.add_argument("--include-positive", action="store_true", help="Also delete stale found entries")
+    sub.add_parser("stats", help="Print entry counts")
+
+    args = parser.parse_args(argv)
+    config = load_config()
+    if args.db:
+        cache = CitationCache(args.db, config.CITATION_CACHE_POSITIVE_TTL, config.CITATION_CACHE_NEGATIVE_TTL)
+    else:
+        cache = CitationCache.from_config(config)
+
+    if args.command == "import":
+        print(f"Imported {import_file(cache, args.path, ttl=args.ttl)} citations into {cache.db_path}")
+    elif args.command == "export":
+        for entry in cache.export_entries():
+            sys.stdout.write(json.dumps(entry) + "\n")
+    elif args.command == "purge":
+        print(f"Purged {cache.purge_expired(include_positive=args.include_positive)} entries")
+    elif args.command == "stats":
+        print(json.dumps(cache.stats()))
+
+if __name__ == "__main__":
+    main()
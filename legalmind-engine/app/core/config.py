@@ -11,6 +11,7 @@ class Config(BaseModel):
     # Models
     LLM_PROVIDER: str = Field(default="openai", description="litellm provider name (openai, anthropic, ollama)")
     LLM_MODEL_NAME: str = Field(default="gpt-4o", description="Model name for verification")
+    LLM_API_BASE: str = Field(default="", description="OpenAI-compatible endpoint to send LLM calls to instead of the provider's (e.g. a local fake for load tests)")
     EMBEDDING_PROVIDER: str = Field(default="sentence-transformers", description="embedding provider")
 
     # Audio Models
@@ -18,9 +19,82 @@ class Config(BaseModel):
     WHISPER_MODEL_ACCURATE: str = Field(default="large", description="Accurate Whisper model for refinement")
 
     # Concurrency
-    MAX_LLM_CONCURRENCY: int = 10
-    MAX_IO_CONCURRENCY: int = 5
-    MAX_CPU_CONCURRENCY: int = 4
+    MAX_LLM_CONCURRENCY: int = Field(default=10, description="LLM calls in flight at once across the whole process")
+    MAX_IO_CONCURRENCY: int = Field(default=5, description="Threads for blocking index, ledger and file work, shared by every case")
+    MAX_CPU_CONCURRENCY: int = Field(default=4, description="Worker processes for PDF/DOCX parsing, OCR and report rendering; 0 runs them in-process")
+
+    # Scheduling
+    SCHED_MAX_RUNNING_JOBS: int = Field(default=8, description="Jobs running at once in one process across every case; further jobs wait their fair turn")
+    SCHED_INTERACTIVE_WEIGHT: float = Field(default=8.0, description="Share of capacity for interactive work (cite checks, report rendering, single-claim verification)")
+    SCHED_STANDARD_WEIGHT: float = Field(default=2.0, description="Share of capacity for audits and pre-file gates")
+    SCHED_BULK_WEIGHT: float = Field(default=1.0, description="Share of capacity for ingest and maintenance")
+    SCHED_CASE_WEIGHTS: List[str] = Field(default=[], description="case_id=weight pairs for cases that get more (or less) than an equal share")
+    CASE_MAX_CPU_JOBS: int = Field(default=2, description="CPU-heavy jobs (ingest, maintenance, report rendering) one case runs at once per process; 0: no cap")
+    CASE_LLM_TOKENS_PER_MINUTE: int = Field(default=0, description="LLM tokens one case may use per minute per process before its calls are held back; 0: no cap")
+
+    # Claim Extraction
+    CLAIM_WINDOW_CHARS: int = Field(default=8000, description="Target size of each brief window sent to the claim extractor")
+    CLAIM_WINDOW_OVERLAP_CHARS: int = Field(default=800, description="Trailing context repeated at the start of the next window")
+    CLAIM_DEDUP_ENABLED: bool = Field(default=True, description="Verify near-duplicate claims once and share the finding")
+    CLAIM_DEDUP_THRESHOLD: float = Field(default=0.8, description="Shingle Jaccard similarity at which two claims are treated as duplicates")
+
+    # Retrieval
+    RETRIEVAL_MODE: str = Field(default="hybrid", description="hybrid (dense and BM25 fused with RRF), dense or bm25")
+    RETRIEVAL_CANDIDATES: int = Field(default=10, description="Hits taken from each retriever before fusion")
+    RETRIEVAL_TOP_K: int = Field(default=5, description="Chunks returned in an evidence bundle")
+    RRF_K: int = Field(default=60, description="Reciprocal rank fusion constant; lower values favour the top ranks")
+    RERANKER_ENABLED: bool = Field(default=False, description="Reorder fused candidates with a cross-encoder before taking the top k")
+    RERANKER_MODEL: str = Field(default="cross-encoder/ms-marco-MiniLM-L-6-v2", description="sentence-transformers cross-encoder used by the reranker")
+
+    # Citation Verification
+    COURTLISTENER_BASE_URL: str = Field(default="https://www.courtlistener.com", description="CourtListener API host (point at a stub server for tests)")
+    COURTLISTENER_API_TOKEN: str = Field(default="", description="Optional CourtListener API token")
+    CITATION_MAX_CONCURRENCY: int = Field(default=8, description="Citation lookups in flight at once")
+    CITATION_RATE_LIMIT: float = Field(default=4.0, description="Sustained citation requests per second per host")
+    CITATION_RATE_BURST: int = Field(default=8, description="Requests allowed back-to-back before the rate limit applies")
+    CITATION_REQUEST_TIMEOUT: float = Field(default=10.0, description="Deadline in seconds for a single citation lookup")
+    CITATION_LOOKUP_MODE: str = Field(default="auto", description="bulk (citation-lookup endpoint over brief text), search (one query per citation), or auto (bulk when an API token is set)")
+    CITATION_BULK_MAX_CHARS: int = Field(default=64000, description="Largest text block sent to the citation-lookup endpoint in one request")
+    CITATION_BULK_MAX_CITATIONS: int = Field(default=250, description="Citations the citation-lookup endpoint resolves per request")
+    CITATION_BULK_TIMEOUT: float = Field(default=30.0, description="Deadline in seconds for a single citation-lookup request")
+    CITATION_CACHE_PATH: str = Field(default="", description="SQLite citation cache shared by all cases (defaults to STORAGE_PATH/citation_cache.db)")
+    CITATION_CACHE_POSITIVE_TTL: float = Field(default=30 * 86400, description="Seconds a found citation is trusted without re-querying")
+    CITATION_CACHE_NEGATIVE_TTL: float = Field(default=86400, description="Seconds a not-found citation is remembered")
+
+    # Job Queue
+    JOB_LEASE_SECONDS: float = Field(default=60.0, description="How long a worker owns a job without heartbeating")
+    JOB_HEARTBEAT_SECONDS: float = Field(default=15.0, description="Interval at which a running job renews its lease")
+    JOB_MAX_ATTEMPTS: int = Field(default=3, description="Attempts before a failing job is marked FAILED")
+    JOB_RETRY_BACKOFF: float = Field(default=5.0, description="Seconds before the first retry; doubles per attempt")
+    JOB_POLL_INTERVAL: float = Field(default=1.0, description="Seconds between queue polls when idle")
+    JOB_WORKER_CONCURRENCY: int = Field(default=2, description="Jobs a single queue runner executes at once")
+    JOB_EXECUTION_MODE: str = Field(default="inline", description="inline: the API process runs jobs; worker: the API only enqueues and python -m app.worker runs them")
+    JOB_EVENT_POLL_INTERVAL: float = Field(default=0.25, description="Seconds between checks for job events published by worker processes")
+    JOB_CANCEL_POLL_INTERVAL: float = Field(default=0.5, description="Seconds between a running job's checks for a cancellation request")
+
+    # Audit log
+    AUDIT_BATCH_SIZE: int = Field(default=512, description="Most audit events appended in one write")
+    AUDIT_MAX_OPEN_FILES: int = Field(default=64, description="Case audit logs kept open by the writer (least recently used are closed)")
+    AUDIT_FSYNC_POLICY: str = Field(default="interval", description="batch: fsync every batch; interval: at most every AUDIT_FSYNC_INTERVAL seconds; never: leave it to the OS")
+    AUDIT_FSYNC_INTERVAL: float = Field(default=1.0, description="Seconds between fsyncs under the interval policy")
+    AUDIT_ECHO: bool = Field(default=False, description="Also print every audit event to stdout")
+    AUDIT_BUCKET_SECONDS: float = Field(default=3600.0, description="Time span of one audit index bucket")
+    AUDIT_ROTATE_BYTES: int = Field(default=64 * 1024 * 1024, description="Size at which audit.jsonl is packed into a compressed segment")
+
+    # Case cache
+    CASE_CACHE_MAX_CASES: int = Field(default=32, description="Cases whose modules, Chroma clients and indexes a process keeps loaded")
+    CASE_CACHE_IDLE_SECONDS: float = Field(default=1800.0, description="Unload a case unused for this long (0 keeps cases until evicted by size)")
+    CASE_CACHE_MEMORY_MB: float = Field(default=0.0, description="Unload least recently used cases while the process's resident memory exceeds this (0: no budget)")
+
+    # Tracing
+    TRACING_ENABLED: bool = Field(default=True, description="Write each job's spans to jobs/<run_id>.trace.json")
+
+    # Profiling (jobs started with ?profile=true)
+    PROFILE_SAMPLE_INTERVAL: float = Field(default=0.01, description="Seconds between stack samples of a profiled job")
+    PROFILE_TRACE_MEMORY: bool = Field(default=True, description="Track peak memory and top allocation sites with tracemalloc while profiling")
+
+    # Reports
+    REPORT_FORMATS: List[str] = Field(default=["html", "docx"], description="Formats rendered when a job finishes; PDF is otherwise generated on first download")
 
     # System
     STORAGE_PATH: str = Field(default="./storage", description="Base storage path for cases")
@@ -38,9 +112,66 @@ def load_config() -> Config:
         EXPORT_RAW_EVIDENCE=os.getenv("LEGALMIND_EXPORT_RAW_EVIDENCE", "true").lower() == "true",
         LLM_PROVIDER=os.getenv("LEGALMIND_LLM_PROVIDER", "openai"),
         LLM_MODEL_NAME=os.getenv("LEGALMIND_LLM_MODEL_NAME", "gpt-4o"),
+        LLM_API_BASE=os.getenv("LEGALMIND_LLM_API_BASE", ""),
         EMBEDDING_PROVIDER=os.getenv("LEGALMIND_EMBEDDING_PROVIDER", "sentence-transformers"),
         WHISPER_MODEL_FAST=os.getenv("LEGALMIND_WHISPER_MODEL_FAST", "tiny"),
         WHISPER_MODEL_ACCURATE=os.getenv("LEGALMIND_WHISPER_MODEL_ACCURATE", "large"),
+        MAX_LLM_CONCURRENCY=int(os.getenv("LEGALMIND_MAX_LLM_CONCURRENCY", "10")),
+        MAX_IO_CONCURRENCY=int(os.getenv("LEGALMIND_MAX_IO_CONCURRENCY", "5")),
+        MAX_CPU_CONCURRENCY=int(os.getenv("LEGALMIND_MAX_CPU_CONCURRENCY", "4")),
+        SCHED_MAX_RUNNING_JOBS=int(os.getenv("LEGALMIND_SCHED_MAX_RUNNING_JOBS", "8")),
+        SCHED_INTERACTIVE_WEIGHT=float(os.getenv("LEGALMIND_SCHED_INTERACTIVE_WEIGHT", "8.0")),
+        SCHED_STANDARD_WEIGHT=float(os.getenv("LEGALMIND_SCHED_STANDARD_WEIGHT", "2.0")),
+        SCHED_BULK_WEIGHT=float(os.getenv("LEGALMIND_SCHED_BULK_WEIGHT", "1.0")),
+        SCHED_CASE_WEIGHTS=[pair for pair in os.getenv("LEGALMIND_SCHED_CASE_WEIGHTS", "").split(",") if pair.strip()],
+        CASE_MAX_CPU_JOBS=int(os.getenv("LEGALMIND_CASE_MAX_CPU_JOBS", "2")),
+        CASE_LLM_TOKENS_PER_MINUTE=int(os.getenv("LEGALMIND_CASE_LLM_TOKENS_PER_MINUTE", "0")),
+        CLAIM_WINDOW_CHARS=int(os.getenv("LEGALMIND_CLAIM_WINDOW_CHARS", "8000")),
+        CLAIM_WINDOW_OVERLAP_CHARS=int(os.getenv("LEGALMIND_CLAIM_WINDOW_OVERLAP_CHARS", "800")),
+        CLAIM_DEDUP_ENABLED=os.getenv("LEGALMIND_CLAIM_DEDUP_ENABLED", "true").lower() == "true",
+        CLAIM_DEDUP_THRESHOLD=float(os.getenv("LEGALMIND_CLAIM_DEDUP_THRESHOLD", "0.8")),
+        RETRIEVAL_MODE=os.getenv("LEGALMIND_RETRIEVAL_MODE", "hybrid"),
+        RETRIEVAL_CANDIDATES=int(os.getenv("LEGALMIND_RETRIEVAL_CANDIDATES", "10")),
+        RETRIEVAL_TOP_K=int(os.getenv("LEGALMIND_RETRIEVAL_TOP_K", "5")),
+        RRF_K=int(os.getenv("LEGALMIND_RRF_K", "60")),
+        RERANKER_ENABLED=os.getenv("LEGALMIND_RERANKER_ENABLED", "false").lower() == "true",
+        RERANKER_MODEL=os.getenv("LEGALMIND_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+        COURTLISTENER_BASE_URL=os.getenv("LEGALMIND_COURTLISTENER_BASE_URL", "https://www.courtlistener.com"),
+        COURTLISTENER_API_TOKEN=os.getenv("LEGALMIND_COURTLISTENER_API_TOKEN", ""),
+        CITATION_MAX_CONCURRENCY=int(os.getenv("LEGALMIND_CITATION_MAX_CONCURRENCY", "8")),
+        CITATION_RATE_LIMIT=float(os.getenv("LEGALMIND_CITATION_RATE_LIMIT", "4.0")),
+        CITATION_RATE_BURST=int(os.getenv("LEGALMIND_CITATION_RATE_BURST", "8")),
+        CITATION_REQUEST_TIMEOUT=float(os.getenv("LEGALMIND_CITATION_REQUEST_TIMEOUT", "10.0")),
+        CITATION_LOOKUP_MODE=os.getenv("LEGALMIND_CITATION_LOOKUP_MODE", "auto"),
+        CITATION_BULK_MAX_CHARS=int(os.getenv("LEGALMIND_CITATION_BULK_MAX_CHARS", "64000")),
+        CITATION_BULK_MAX_CITATIONS=int(os.getenv("LEGALMIND_CITATION_BULK_MAX_CITATIONS", "250")),
+        CITATION_BULK_TIMEOUT=float(os.getenv("LEGALMIND_CITATION_BULK_TIMEOUT", "30.0")),
+        CITATION_CACHE_PATH=os.getenv("LEGALMIND_CITATION_CACHE_PATH", ""),
+        CITATION_CACHE_POSITIVE_TTL=float(os.getenv("LEGALMIND_CITATION_CACHE_POSITIVE_TTL", str(30 * 86400))),
+        CITATION_CACHE_NEGATIVE_TTL=float(os.getenv("LEGALMIND_CITATION_CACHE_NEGATIVE_TTL", "86400")),
+        JOB_LEASE_SECONDS=float(os.getenv("LEGALMIND_JOB_LEASE_SECONDS", "60.0")),
+        JOB_HEARTBEAT_SECONDS=float(os.getenv("LEGALMIND_JOB_HEARTBEAT_SECONDS", "15.0")),
+        JOB_MAX_ATTEMPTS=int(os.getenv("LEGALMIND_JOB_MAX_ATTEMPTS", "3")),
+        JOB_RETRY_BACKOFF=float(os.getenv("LEGALMIND_JOB_RETRY_BACKOFF", "5.0")),
+        JOB_POLL_INTERVAL=float(os.getenv("LEGALMIND_JOB_POLL_INTERVAL", "1.0")),
+        JOB_WORKER_CONCURRENCY=int(os.getenv("LEGALMIND_JOB_WORKER_CONCURRENCY", "2")),
+        JOB_EXECUTION_MODE=os.getenv("LEGALMIND_JOB_EXECUTION_MODE", "inline"),
+        JOB_EVENT_POLL_INTERVAL=float(os.getenv("LEGALMIND_JOB_EVENT_POLL_INTERVAL", "0.25")),
+        JOB_CANCEL_POLL_INTERVAL=float(os.getenv("LEGALMIND_JOB_CANCEL_POLL_INTERVAL", "0.5")),
+        AUDIT_BATCH_SIZE=int(os.getenv("LEGALMIND_AUDIT_BATCH_SIZE", "512")),
+        AUDIT_MAX_OPEN_FILES=int(os.getenv("LEGALMIND_AUDIT_MAX_OPEN_FILES", "64")),
+        AUDIT_FSYNC_POLICY=os.getenv("LEGALMIND_AUDIT_FSYNC_POLICY", "interval"),
+        AUDIT_FSYNC_INTERVAL=float(os.getenv("LEGALMIND_AUDIT_FSYNC_INTERVAL", "1.0")),
+        AUDIT_ECHO=os.getenv("LEGALMIND_AUDIT_ECHO", "false").lower() == "true",
+        AUDIT_BUCKET_SECONDS=float(os.getenv("LEGALMIND_AUDIT_BUCKET_SECONDS", "3600")),
+        AUDIT_ROTATE_BYTES=int(os.getenv("LEGALMIND_AUDIT_ROTATE_BYTES", str(64 * 1024 * 1024))),
+        CASE_CACHE_MAX_CASES=int(os.getenv("LEGALMIND_CASE_CACHE_MAX_CASES", "32")),
+        CASE_CACHE_IDLE_SECONDS=float(os.getenv("LEGALMIND_CASE_CACHE_IDLE_SECONDS", "1800")),
+        CASE_CACHE_MEMORY_MB=float(os.getenv("LEGALMIND_CASE_CACHE_MEMORY_MB", "0")),
+        TRACING_ENABLED=os.getenv("LEGALMIND_TRACING_ENABLED", "true").lower() == "true",
+        PROFILE_SAMPLE_INTERVAL=float(os.getenv("LEGALMIND_PROFILE_SAMPLE_INTERVAL", "0.01")),
+        PROFILE_TRACE_MEMORY=os.getenv("LEGALMIND_PROFILE_TRACE_MEMORY", "true").lower() == "true",
+        REPORT_FORMATS=os.getenv("LEGALMIND_REPORT_FORMATS", "html,docx").split(","),
         STORAGE_PATH=os.getenv("LEGALMIND_STORAGE_PATH", "./storage"),
         ALLOWED_INPUT_PATHS=os.getenv("LEGALMIND_ALLOWED_INPUT_PATHS", "/tmp,.").split(","),
         BACKGROUND_TASK_ENABLED=os.getenv("LEGALMIND_BACKGROUND_TASK_ENABLED", "true").lower() == "true",
@@ -0,0 +1,294 @@
+"""
+Process-wide executors shared by every Dominion.
+
+Blocking work goes to one of three lanes, each sized from config:
+
+- cpu: spawned worker processes (MAX_CPU_CONCURRENCY) for stages that would
+  otherwise hold the GIL, such as PDF and DOCX parsing, OCR and report
+  rendering.
+  Functions sent there must be module-level and take picklable arguments.
+  With MAX_CPU_CONCURRENCY set to 0 they run in the calling thread, and a
+  call that finds the pool broken runs in-process while a fresh pool starts.
+- io: threads (MAX_IO_CONCURRENCY) for blocking index, ledger and file work:
+  retrieval, and the ingest and report stages that write to a case.
+- llm: threads (MAX_LLM_CONCURRENCY) for model calls. The lane is shared, so
+  the limit holds across every job and case in the process, and it holds
+  back cases that are over CASE_LLM_TOKENS_PER_MINUTE.
+
+Work waiting for a lane is queued fairly by case and workload class (see
+app.core.scheduling), not first come, first served. Thread lanes run each
+call in a copy of the caller's context, as asyncio.to_thread does, so the
+job's cancellation token and trace span carry over. Work still queued is
+dropped, never started, when the task awaiting it is cancelled.
+"""
+import asyncio
+import threading
+import contextvars
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import load_config
+from app.core.metrics import registry, executor_state
+from app.core.scheduling import FairQueue, TokenBudget, Weights, current_work, llm_budget
+
+class Lane:
+    """
+    A bounded set of threads that async and blocking callers share. Calls
+    wait in a FairQueue by the case and workload class they were submitted
+    under; with a TokenBudget, a case that has spent its budget waits until
+    it refills while other cases' calls go ahead.
+    """
+
+    def __init__(self, name: str, size: int, budget: Optional[TokenBudget] = None, weights: Optional[Weights] = None):
+        self.name = name
+        self.size = max(1, size)
+        self.budget = budget
+        self._queue = FairQueue(weights)
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        case_id, klass = current_work()
+        future = Future()
+        call = (future, contextvars.copy_context(), func, args, kwargs, case_id)
+        with self._cond:
+            self._closed = False
+            self._queue.push(call, case_id, klass)
+            self._queued += 1
+            if not self._idle and len(self._threads) < self.size:
+                thread = threading.Thread(target=self._work, name=f"legalmind-{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        future.add_done_callback(self._settled)
+        return future
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def _work(self):
+        while True:
+            with self._cond:
+                call = self._next()
+                if call is None:
+                    self._threads.remove(threading.current_thread())
+                    return
+            future, context, func, args, kwargs, case_id = call
+            # Cancelled while queued; _settled has already uncounted it
+            if not future.set_running_or_notify_cancel():
+                continue
+            with self._cond:
+                self._queued -= 1
+                self._running += 1
+            error = None
+            try:
+                result = context.run(func, *args, **kwargs)
+            except BaseException as e:
+                error = e
+            # Counted before the caller is woken, so its view of stats() includes this call
+            with self._cond:
+                self._running -= 1
+                self._completed += 1
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _next(self):
+        # Caller holds the condition; None once the lane is shut down
+        self._idle += 1
+        try:
+            while not self._closed:
+                call = self._queue.pop(self._eligible)
+                if call is not None:
+                    return call
+                self._cond.wait(self.budget.retry_in() if self.budget and len(self._queue) else None)
+            return None
+        finally:
+            self._idle -= 1
+
+    def _eligible(self, call) -> bool:
+        future, case_id = call[0], call[5]
+        # Cancelled calls are let through so they leave the queue
+        return self.budget is None or future.cancelled() or self.budget.allows(case_id)
+
+    def _settled(self, future: Future):
+        # A future cancelled while queued is never run
+        if future.cancelled():
+            with self._cond:
+                self._queued -= 1
+
+    def wake(self):
+        """Rechecks held-back calls, e.g. after a budget change."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def shutdown(self):
+        """Drops queued calls and lets the threads exit once their current call returns."""
+        with self._cond:
+            self._closed = True
+            calls = []
+            while len(self._queue):
+                calls.append(self._queue.pop())
+            self._cond.notify_all()
+        for call in calls:
+            call[0].cancel()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "queued": self._queued, "running": self._running, "completed": self._completed}
+
+_config = load_config()
+io_lane = Lane("io", _config.MAX_IO_CONCURRENCY)
+llm_lane = Lane("llm", _config.MAX_LLM_CONCURRENCY, budget=llm_budget)
+
+class CpuDispatcher:
+    """
+    Feeds CPU work to the worker process pool, keeping no more in flight than
+    there are workers, so waiting work queues fairly here rather than in the
+    pool's own first-come queue.
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._size = 0
+        self._queue = FairQueue()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._stats = {"completed": 0, "in_process": 0}
+
+    def pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._cond:
+            if self._pool is None:
+                workers = cpu_workers()
+                if workers == 0:
+                    return None
+                # spawn, not fork: the API process runs threads that may hold locks at fork time
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                self._size = workers
+            return self._pool
+
+    def reset(self):
+        with self._cond:
+            pool, self._pool, self._size = self._pool, None, 0
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, func: Callable[..., Any], *args) -> Future:
+        if self.pool() is None:
+            return self._run_here(func, args)
+        case_id, klass = current_work()
+        future = Future()
+        with self._cond:
+            self._queue.push((future, func, args), case_id, klass)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name="legalmind-cpu-dispatch", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not len(self._queue) or self._in_flight >= max(1, self._size or cpu_workers()):
+                    self._cond.wait()
+                future, func, args = self._queue.pop()
+            if not future.set_running_or_notify_cancel():
+                continue
+            pool = self.pool()
+            try:
+                if pool is None:
+                    raise RuntimeError("CPU workers are disabled")
+                inner = pool.submit(func, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                # A worker died or the pool was shut down; run this in-process and start a fresh pool
+                # next time. On its own thread, so the rest of the queue keeps being dispatched.
+                print(f"CPU worker pool unavailable, running in-process: {e}")
+                self.reset()
+                with self._cond:
+                    self._in_flight += 1
+                threading.Thread(target=self._fallback, args=(future, func, args), name="legalmind-cpu-fallback", daemon=True).start()
+                continue
+            with self._cond:
+                self._in_flight += 1
+            inner.add_done_callback(lambda inner, future=future: self._done(inner, future))
+
+    def _done(self, inner: Future, future: Future):
+        _copy_outcome(inner, future)
+        with self._cond:
+            self._in_flight -= 1
+            self._stats["completed"] += 1
+            self._cond.notify()
+
+    def _fallback(self, future: Future, func: Callable[..., Any], args):
+        _copy_outcome(self._run_here(func, args), future)
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def _run_here(self, func: Callable[..., Any], args) -> Future:
+        future = Future()
+        with self._cond:
+            self._stats["in_process"] += 1
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self._size, "queued": len(self._queue), "running": self._in_flight, **self._stats}
+
+def _copy_outcome(source: Future, target: Future):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+_cpu = CpuDispatcher()
+
+def cpu_workers() -> int:
+    """Worker processes for CPU-bound stages; 0 runs them in the calling thread."""
+    return max(0, load_config().MAX_CPU_CONCURRENCY)
+
+def cpu_pool() -> Optional[ProcessPoolExecutor]:
+    return _cpu.pool()
+
+def reset_cpu_pool():
+    """Forgets the pool (after it broke, or in tests); the next submit starts a fresh one."""
+    _cpu.reset()
+
+def submit_cpu(func: Callable[..., Any], *args) -> Future:
+    """Runs func(*args) in a worker process, or here when there is no usable pool."""
+    return _cpu.submit(func, *args)
+
+async def run_cpu(func: Callable[..., Any], *args) -> Any:
+    return await asyncio.wrap_future(submit_cpu(func, *args))
+
+def executor_stats() -> Dict[str, Dict[str, int]]:
+    return {"cpu": _cpu.stats(), "io": io_lane.stats(), "llm": llm_lane.stats()}
+
+def shutdown_executors():
+    """Stops every lane without waiting; queued work is dropped (shutdown, tests)."""
+    io_lane.shutdown()
+    llm_lane.shutdown()
+    reset_cpu_pool()
+
+def _collect_metrics():
+    for lane, stats in executor_stats().items():
+        for field, value in stats.items():
+            executor_state.set(value, lane=lane, field=field)
+
+registry.add_collector(_collect_metrics)
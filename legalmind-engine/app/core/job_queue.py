@@ -0,0 +1,512 @@
+import os
+import json
+import time
+import socket
+import asyncio
+import sqlite3
+import contextlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from app.core.config import Config, load_config
+from app.core.cancellation import CancelToken, JobCancelled, cancel_scope
+from app.core.metrics import job_queue_jobs, job_seconds, jobs_running, jobs_total, registry, retries_total
+from app.core.scheduling import JobScheduler, job_scheduler, work_scope
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class QueuedJob:
+    def __init__(self, run_id: str, case_id: str, workflow: str, payload: Dict[str, Any], attempts: int, max_attempts: int, deadline: Optional[float] = None, cancel_requested: bool = False, profile: bool = False):
+        self.run_id = run_id
+        self.case_id = case_id
+        self.workflow = workflow
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.cancel_requested = cancel_requested
+        self.profile = profile
+
+    @property
+    def exhausted(self) -> bool:
+        # Leased again after its final attempt's worker died without reporting
+        return self.attempts > self.max_attempts
+
+class JobQueue:
+    """
+    Durable workflow queue shared by every case under one storage root.
+    Workers lease a job for a fixed period and keep it alive with
+    heartbeats; a lease that expires (worker crashed or was redeployed)
+    makes the job available again. Stage checkpoints live alongside so a
+    re-leased job can skip work an earlier attempt already finished, and
+    so does the job event log that carries progress from worker processes
+    back to the API.
+    """
+    def __init__(self, db_path: str, max_attempts: int = 3, retry_backoff: float = 5.0):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "run_id TEXT PRIMARY KEY, case_id TEXT NOT NULL, workflow TEXT NOT NULL, payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL, "
+                "owner TEXT, lease_expires REAL, available_at REAL NOT NULL, last_error TEXT, "
+                "deadline REAL, cancel_requested INTEGER NOT NULL DEFAULT 0, profile INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            # Queues created before cancellation or profiling existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "deadline" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN deadline REAL")
+            if "cancel_requested" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+            if "profile" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN profile INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, available_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "run_id TEXT NOT NULL, stage TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (run_id, stage))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "event_id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, seq INTEGER NOT NULL, "
+                "type TEXT NOT NULL, data TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_events_run ON events (run_id, seq)")
+
+    @classmethod
+    def for_storage(cls, storage_path: str, config: Optional[Config] = None) -> "JobQueue":
+        config = config or load_config()
+        return cls(os.path.join(storage_path, "job_queue.db"), config.JOB_MAX_ATTEMPTS, config.JOB_RETRY_BACKOFF)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit; multi-statement operations open their own transaction
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, run_id: str, case_id: str, workflow: str, payload: Dict[str, Any], max_attempts: Optional[int] = None, deadline: Optional[float] = None, profile: bool = False):
+        """
+        deadline is an absolute epoch time after which the job is cancelled,
+        wherever it is. profile asks whichever worker runs it to profile it.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (run_id, case_id, workflow, payload, status, max_attempts, available_at, deadline, profile, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, case_id, workflow, json.dumps(payload), QUEUED, max_attempts or self.max_attempts, now, deadline, int(profile), now, now)
+            )
+
+    def lease(self, owner: str, lease_seconds: float, run_id: Optional[str] = None) -> Optional[QueuedJob]:
+        """Claims the oldest available job (or the given one) for lease_seconds."""
+        now = time.time()
+        query = (
+            "SELECT run_id, case_id, workflow, payload, attempts, max_attempts, deadline, cancel_requested, profile FROM jobs "
+            "WHERE ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?))"
+        )
+        params = [QUEUED, now, LEASED, now]
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        query += " ORDER BY available_at LIMIT 1"
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(query, params).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                job = QueuedJob(row[0], row[1], row[2], json.loads(row[3]), row[4] + 1, row[5], row[6], bool(row[7]), bool(row[8]))
+                if job.exhausted:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, owner = NULL, last_error = ?, updated_at = ? WHERE run_id = ?",
+                        (FAILED, "Lease expired on the final attempt", now, job.run_id)
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, attempts = ?, updated_at = ? WHERE run_id = ?",
+                        (LEASED, owner, now + lease_seconds, job.attempts, now, job.run_id)
+                    )
+                conn.execute("COMMIT")
+                return job
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def available(self) -> List[Tuple[str, str, str]]:
+        """(run_id, case_id, workflow) of the oldest available job of each workflow in each case."""
+        now = time.time()
+        with self._connect() as conn:
+            # SQLite returns the other columns from the row holding the MIN()
+            rows = conn.execute(
+                "SELECT run_id, case_id, workflow, MIN(available_at) FROM jobs "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_expires < ?) "
+                "GROUP BY case_id, workflow ORDER BY MIN(available_at)",
+                (QUEUED, now, LEASED, now)
+            ).fetchall()
+        return [(run_id, case_id, workflow) for run_id, case_id, workflow, _ in rows]
+
+    def describe(self, run_id: str) -> Optional[Tuple[str, str]]:
+        """(case_id, workflow) of a job, or None if it is not in the queue."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT case_id, workflow FROM jobs WHERE run_id = ?", (run_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def heartbeat(self, run_id: str, owner: str, lease_seconds: float) -> bool:
+        """Extends the lease; False means the lease was lost to another worker."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE run_id = ? AND owner = ? AND status = ?",
+                (now + lease_seconds, now, run_id, owner, LEASED)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, run_id: str, owner: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, updated_at = ? WHERE run_id = ? AND owner = ?",
+                (DONE, time.time(), run_id, owner)
+            )
+
+    def cancel(self, run_id: str) -> Optional[str]:
+        """
+        Cancels a job. One that is waiting is cancelled outright; a running one
+        is flagged for its worker to stop. Returns the status the job had, or
+        None if it is unknown or already finished.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT status FROM jobs WHERE run_id = ?", (run_id,)).fetchone()
+                status = row[0] if row else None
+                if status == QUEUED:
+                    conn.execute("UPDATE jobs SET status = ?, cancel_requested = 1, updated_at = ? WHERE run_id = ?", (CANCELLED, now, run_id))
+                elif status == LEASED:
+                    conn.execute("UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE run_id = ?", (now, run_id))
+                else:
+                    status = None
+                conn.execute("COMMIT")
+                return status
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def cancel_requested(self, run_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE run_id = ?", (run_id,)).fetchone()
+        return bool(row and row[0])
+
+    def finish_cancelled(self, run_id: str, owner: str, reason: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, last_error = ?, updated_at = ? WHERE run_id = ? AND owner = ?",
+                (CANCELLED, reason, time.time(), run_id, owner)
+            )
+
+    def release(self, run_id: str, owner: str):
+        """Hands a job back (worker shutting down) without spending an attempt."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, attempts = MAX(attempts - 1, 0), available_at = ?, updated_at = ? "
+                "WHERE run_id = ? AND owner = ? AND status = ?",
+                (QUEUED, now, now, run_id, owner, LEASED)
+            )
+
+    def fail(self, run_id: str, owner: str, error: str, retryable: bool = True) -> Optional[float]:
+        """
+        Records a failed attempt. Returns the delay before the job becomes
+        available again, or None if it will not be retried.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE run_id = ? AND owner = ?", (run_id, owner)).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                attempts, max_attempts = row
+                if retryable and attempts < max_attempts:
+                    delay = self.retry_backoff * (2 ** (attempts - 1))
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, owner = NULL, available_at = ?, last_error = ?, updated_at = ? WHERE run_id = ?",
+                        (QUEUED, now + delay, error, now, run_id)
+                    )
+                else:
+                    delay = None
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, owner = NULL, last_error = ?, updated_at = ? WHERE run_id = ?",
+                        (FAILED, error, now, run_id)
+                    )
+                conn.execute("COMMIT")
+                return delay
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def save_checkpoint(self, run_id: str, stage: str, data: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, stage, data, updated_at) VALUES (?, ?, ?, ?)",
+                (run_id, stage, json.dumps(data), time.time())
+            )
+
+    def checkpoints(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT stage, data FROM checkpoints WHERE run_id = ?", (run_id,)).fetchall()
+        return {stage: json.loads(data) for stage, data in rows}
+
+    def append_event(self, run_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Sequence numbers stay per run however many processes publish
+                seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM events WHERE run_id = ?", (run_id,)).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO events (run_id, seq, type, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (run_id, seq, event_type, json.dumps(data, default=str), now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._event(run_id, seq, event_type, data, now)
+
+    def events_after(self, event_id: int, limit: int = 500) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT event_id, run_id, seq, type, data, created_at FROM events WHERE event_id > ? ORDER BY event_id LIMIT ?",
+                (event_id, limit)
+            ).fetchall()
+        return [(row[0], self._event(row[1], row[2], row[3], json.loads(row[4]), row[5])) for row in rows]
+
+    def last_event_id(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(event_id), 0) FROM events").fetchone()[0]
+
+    def prune_events(self, before: float):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM events WHERE created_at < ?", (before,))
+
+    @staticmethod
+    def _event(run_id: str, seq: int, event_type: str, data: Dict[str, Any], created_at: float) -> Dict[str, Any]:
+        return {"seq": seq, "type": event_type, "run_id": run_id, "timestamp": datetime.fromtimestamp(created_at).isoformat(), "data": data}
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0, CANCELLED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def report_metrics(self):
+        """Exports this queue's depth by status on every metrics scrape."""
+        registry.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self):
+        for status, count in self.stats().items():
+            job_queue_jobs.set(count, status=status)
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+class JobRunner:
+    """
+    Leases jobs from a JobQueue and executes them on the Dominion that owns
+    the case. resolve(case_id) must return an object with execute_job(job),
+    record_job_failure(job, error, retrying) and
+    record_job_cancelled(job, reason). Every runner in a process shares one
+    JobScheduler, which decides when each job gets to run and, when polling,
+    which available job to lease next.
+    """
+    def __init__(self, queue: JobQueue, resolve: Callable[[str], Any], owner: Optional[str] = None, config: Optional[Config] = None,
+                 scheduler: Optional[JobScheduler] = None):
+        config = config or load_config()
+        self.queue = queue
+        self.scheduler = scheduler or job_scheduler
+        self.resolve = resolve
+        self.owner = owner or default_owner()
+        self.lease_seconds = config.JOB_LEASE_SECONDS
+        self.heartbeat_seconds = config.JOB_HEARTBEAT_SECONDS
+        self.poll_interval = config.JOB_POLL_INTERVAL
+        self.cancel_poll_interval = config.JOB_CANCEL_POLL_INTERVAL
+        self.concurrency = max(1, config.JOB_WORKER_CONCURRENCY)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run_now(self, run_id: str):
+        """
+        Runs one job to completion in this process, waiting out retry backoff
+        between attempts. Each attempt first waits for a run slot.
+        """
+        described = await asyncio.to_thread(self.queue.describe, run_id)
+        if described is None:
+            return
+        case_id, workflow = described
+        while True:
+            async with self.scheduler.slot(case_id, workflow, run_id):
+                job = await asyncio.to_thread(self.queue.lease, self.owner, self.lease_seconds, run_id)
+                if job is None:
+                    # Taken by another worker, or already finished
+                    return
+                retry_in = await self.run_job(job)
+            if retry_in is None:
+                return
+            await asyncio.sleep(retry_in)
+
+    async def run_job(self, job: QueuedJob) -> Optional[float]:
+        start = time.perf_counter()
+        jobs_running.inc(workflow=job.workflow)
+        try:
+            return await self._attempt(job)
+        finally:
+            jobs_running.dec(workflow=job.workflow)
+            job_seconds.observe(time.perf_counter() - start, workflow=job.workflow, case=job.case_id)
+
+    def _count(self, job: QueuedJob, outcome: str):
+        jobs_total.inc(workflow=job.workflow, case=job.case_id, outcome=outcome)
+
+    async def _attempt(self, job: QueuedJob) -> Optional[float]:
+        target = self.resolve(job.case_id)
+        if job.exhausted:
+            self._count(job, "failed")
+            target.record_job_failure(job, RuntimeError(f"Job was abandoned by its worker after {job.max_attempts} attempts"), False)
+            return None
+
+        token = CancelToken(job.deadline, job.run_id)
+        if job.cancel_requested:
+            token.cancel("Cancelled by request")
+        if token.cancelled:
+            return await self._cancel(target, job, token, None)
+
+        work = asyncio.create_task(self._execute(target, job, token))
+        next_heartbeat = time.monotonic() + self.heartbeat_seconds
+        try:
+            while not work.done():
+                timeout = min(self.cancel_poll_interval, max(0.0, next_heartbeat - time.monotonic()))
+                remaining = token.remaining()
+                if remaining is not None:
+                    timeout = min(timeout, remaining)
+                done, _ = await asyncio.wait({work}, timeout=timeout)
+                if done:
+                    break
+                if not token.cancelled and await asyncio.to_thread(self.queue.cancel_requested, job.run_id):
+                    token.cancel("Cancelled by request")
+                if token.cancelled:
+                    return await self._cancel(target, job, token, work)
+                if time.monotonic() >= next_heartbeat:
+                    alive = await asyncio.to_thread(self.queue.heartbeat, job.run_id, self.owner, self.lease_seconds)
+                    if not alive:
+                        # Lease expired and another worker owns the job now; stop duplicating its work
+                        self._count(job, "lease_lost")
+                        work.cancel()
+                        with contextlib.suppress(asyncio.CancelledError, JobCancelled):
+                            await work
+                        return None
+                    next_heartbeat = time.monotonic() + self.heartbeat_seconds
+            work.result()
+        except asyncio.CancelledError:
+            # Shutting down rather than failing; let the next worker start it promptly
+            work.cancel()
+            # Off the event loop, and shielded so a second cancellation cannot cut the release short
+            await asyncio.shield(asyncio.to_thread(self.queue.release, job.run_id, self.owner))
+            self._count(job, "released")
+            raise
+        except JobCancelled:
+            # Work in a thread hit the deadline before the next poll did
+            return await self._cancel(target, job, token, None)
+        except Exception as e:
+            # Bad input will fail the same way again; everything else is retried
+            retry_in = await asyncio.to_thread(self.queue.fail, job.run_id, self.owner, str(e), not isinstance(e, ValueError))
+            self._count(job, "failed" if retry_in is None else "retry")
+            if retry_in is not None:
+                retries_total.inc(kind="job", case=job.case_id)
+            target.record_job_failure(job, e, retry_in is not None)
+            return retry_in
+
+        await asyncio.to_thread(self.queue.complete, job.run_id, self.owner)
+        self._count(job, "complete")
+        return None
+
+    async def _execute(self, target: Any, job: QueuedJob, token: CancelToken):
+        # Threads started with asyncio.to_thread, and calls on the shared lanes, inherit the token
+        # and the job's case and workflow from here
+        with cancel_scope(token), work_scope(job.case_id, job.workflow):
+            await target.execute_job(job)
+
+    async def _cancel(self, target: Any, job: QueuedJob, token: CancelToken, work: Optional[asyncio.Task]) -> None:
+        if work is not None and not work.done():
+            work.cancel()
+            # Let the job clean up, and its threads reach their next check, before reporting
+            with contextlib.suppress(Exception, asyncio.CancelledError, JobCancelled):
+                await work
+        reason = token.reason or "Cancelled"
+        await asyncio.to_thread(self.queue.finish_cancelled, job.run_id, self.owner, reason)
+        self._count(job, "cancelled")
+        target.record_job_cancelled(job, reason)
+        return None
+
+    async def run_forever(self, stop: Optional[asyncio.Event] = None):
+        """Polls for available jobs (new, retrying, or orphaned by a dead worker) until stop is set."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            job = None
+            if len(self._tasks) < self.concurrency:
+                try:
+                    job = await asyncio.to_thread(self._lease_next)
+                except sqlite3.Error as e:
+                    print(f"Job queue lease failed: {e}")
+            if job is None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                continue
+            task = asyncio.create_task(self._run_leased(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            # Returns the slot _lease_next reserved, even if the task is cancelled before it starts
+            task.add_done_callback(lambda _, job=job: self.scheduler.finish(job.case_id, job.workflow))
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _lease_next(self) -> Optional[QueuedJob]:
+        # The scheduler picks among the oldest job of each case and workflow and holds a slot for it
+        for _ in range(3):
+            chosen = self.scheduler.reserve(self.queue.available())
+            if chosen is None:
+                return None
+            run_id, case_id, workflow = chosen
+            try:
+                job = self.queue.lease(self.owner, self.lease_seconds, run_id)
+            except BaseException:
+                self.scheduler.finish(case_id, workflow)
+                raise
+            if job is not None:
+                return job
+            # Another worker got there first
+            self.scheduler.finish(case_id, workflow)
+        return None
+
+    async def _run_leased(self, job: QueuedJob):
+        try:
+            await self.run_job(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Job {job.run_id} could not be run: {e}")
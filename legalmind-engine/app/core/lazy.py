@@ -0,0 +1,64 @@
+"""
+Deferred imports for the engine's heavy dependencies.
+
+Modules bind names like ``litellm = lazy_import("litellm")`` at top level;
+the real module is imported on first attribute access, so importing the app
+or constructing a Dominion does not pay for chromadb, litellm or eyecite
+until a workflow needs them. Attributes set on the proxy (as
+unittest.mock.patch does for "app.modules.discernment.litellm.completion")
+shadow the module's own, and patches applied to the real module are seen
+through it. POST /api/warmup imports everything up front instead.
+"""
+import sys
+import types
+import importlib
+import importlib.util
+from typing import Dict, Iterable, Optional
+
+# Imported by the pipeline on first use; warmup() in app.modules.dominion preloads them
+HEAVY_MODULES = ("chromadb", "litellm", "eyecite", "pdfplumber", "docx", "rank_bm25")
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module until one of its attributes is read."""
+
+    def _load(self) -> types.ModuleType:
+        # import_module takes the per-module import lock, so concurrent first uses import once
+        return importlib.import_module(self.__name__)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__name__ in sys.modules else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module itself if it is already imported, otherwise a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+def optional_import(name: str) -> Optional[types.ModuleType]:
+    """Like lazy_import, but None when the module is not installed (checked without importing it)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    return LazyModule(name) if found else None
+
+def preload(names: Iterable[str] = HEAVY_MODULES) -> Dict[str, bool]:
+    """Imports each module now; maps name to whether it could be imported."""
+    loaded = {}
+    for name in names:
+        try:
+            importlib.import_module(name)
+            loaded[name] = True
+        except ImportError:
+            loaded[name] = False
+    return loaded
+
+def loaded_modules(names: Iterable[str] = HEAVY_MODULES) -> Dict[str, bool]:
+    return {name: name in sys.modules for name in names}
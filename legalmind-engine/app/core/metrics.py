@@ -0,0 +1,254 @@
+"""
+Process-wide metrics in the Prometheus text exposition format.
+
+Modules record into the shared instruments below; GET /metrics renders them,
+and python -m app.worker --metrics-port serves the same text for a worker.
+Values that already live elsewhere (queue depths, audit writer counters)
+are read at scrape time by collectors registered with add_collector().
+"""
+import time
+import math
+import threading
+import contextlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; wide enough for a cached lookup and a large-model transcription alike
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        unknown = set(labels) - set(self.labelnames)
+        if unknown:
+            raise ValueError(f"Unknown label(s) for {self.name}: {', '.join(sorted(unknown))}")
+        return tuple("" if labels.get(name) is None else str(labels[name]) for name in self.labelnames)
+
+    def _sample(self, suffix: str, key: Tuple[str, ...], value: float, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        labels = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return f"{self.name}{suffix}{{{labels}}} {_format_value(value)}" if labels else f"{self.name}{suffix} {_format_value(value)}"
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [self._sample("", key, value) for key, value in sorted(self._values.items())]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(self._sample("_bucket", key, cumulative, (("le", _format_value(bound)),)))
+                lines.append(self._sample("_bucket", key, count, (("le", "+Inf"),)))
+                lines.append(self._sample("_sum", key, total))
+                lines.append(self._sample("_count", key, count))
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]):
+        """collector() runs before every render, typically to set gauges."""
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], None]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                # A failing source must not take the whole scrape down with it
+                print(f"Metrics collector {getattr(collector, '__qualname__', collector)} failed: {e}")
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Zeroes every instrument (tests)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+registry = MetricsRegistry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+stage_seconds = registry.histogram(
+    "legalmind_stage_duration_seconds",
+    "Time spent in each pipeline stage (pdf_parse, ocr, whisper, embed_index, bm25_index, dense_search, bm25_search, rerank, llm, courtlistener, render)",
+    ("stage", "case", "modality")
+)
+stage_errors = registry.counter("legalmind_stage_errors_total", "Pipeline stage invocations that raised", ("stage", "case", "modality"))
+jobs_total = registry.counter("legalmind_jobs_total", "Job attempts by outcome (complete, failed, retry, cancelled, released)", ("workflow", "case", "outcome"))
+job_seconds = registry.histogram("legalmind_job_duration_seconds", "Wall time of one job attempt", ("workflow", "case"))
+jobs_running = registry.gauge("legalmind_jobs_running", "Jobs executing in this process", ("workflow",))
+job_queue_jobs = registry.gauge("legalmind_job_queue_jobs", "Jobs in the durable queue by status", ("status",))
+retries_total = registry.counter("legalmind_retries_total", "Retried work by kind (job, claim)", ("kind", "case"))
+llm_requests = registry.counter("legalmind_llm_requests_total", "LLM completions by purpose and outcome (ok, error)", ("purpose", "case", "outcome"))
+llm_tokens = registry.counter("legalmind_llm_tokens_total", "LLM tokens reported by the provider, by kind (prompt, completion)", ("purpose", "case", "kind"))
+cache_requests = registry.counter("legalmind_cache_requests_total", "Cache lookups by cache and result (hit, miss, stale)", ("cache", "result"))
+courtlistener_requests = registry.counter("legalmind_courtlistener_requests_total", "CourtListener calls by endpoint (search, lookup) and outcome", ("endpoint", "outcome"))
+audit_log_state = registry.gauge("legalmind_audit_log", "Audit writer state (queue_depth, open_files, events_written, write_errors, fsyncs, rotations)", ("field",))
+case_cache_state = registry.gauge("legalmind_case_cache", "Resident case contexts (resident, busy, max_cases) and cache counters (hits, misses, evictions)", ("field",))
+executor_state = registry.gauge("legalmind_executor", "Shared executor lanes (cpu, io, llm): size and queued, running, pending, completed work", ("lane", "field"))
+scheduler_state = registry.gauge("legalmind_scheduler", "Job admission (running, max_running, waiting_<class>, admitted, waited) and LLM token quota state", ("field",))
+
+@contextlib.contextmanager
+def track_stage(stage: str, case: Optional[str] = None, modality: Any = None) -> Iterator[None]:
+    """Times the block into legalmind_stage_duration_seconds, counting it in stage_errors if it raises."""
+    labels = {"stage": stage, "case": case, "modality": getattr(modality, "value", modality)}
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(**labels)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, **labels)
+
+def observe_llm_call(purpose: str, case: Optional[str], completion: Callable[..., Any], *args, modality: Any = None, **kwargs) -> Any:
+    """Calls completion(*args, **kwargs) as the "llm" stage, counting the request and the tokens it used."""
+    try:
+        with track_stage("llm", case, modality):
+            response = completion(*args, **kwargs)
+    except Exception:
+        llm_requests.inc(purpose=purpose, case=case, outcome="error")
+        raise
+    record_llm_response(purpose, case, response)
+    return response
+
+def record_llm_response(purpose: str, case: Optional[str], response: Any):
+    llm_requests.inc(purpose=purpose, case=case, outcome="ok")
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if isinstance(tokens, (int, float)) and tokens > 0:
+            llm_tokens.inc(tokens, purpose=purpose, case=case, kind=kind)
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,220 @@
+"""
+On-demand profiling of a single job (?profile=true on a workflow endpoint).
+
+A wall-clock sampler thread records the Python stack of every thread in the
+process at a fixed interval, so work a job hands to asyncio.to_thread shows
+up alongside its event-loop code (cProfile only sees the thread that enabled
+it). Threads parked in the loop's selector, a pool's idle wait or a
+background writer are dropped unless the stack passes through a pipeline
+module. tracemalloc tracks the peak traced memory and snapshots the largest
+allocation sites as usage climbs.
+
+The result is a JSON summary plus a collapsed-stack file
+("thread;outer;...;inner count" per line) that flamegraph.pl, speedscope and
+inferno read directly. Nothing here runs unless a job asked for it.
+"""
+import os
+import sys
+import time
+import threading
+import tracemalloc
+import contextlib
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+MAX_STACK_DEPTH = 128
+TOP_ENTRIES = 25
+# Snapshot again only once traced memory has grown this much past the last snapshot
+SNAPSHOT_GROWTH = 1.1
+SNAPSHOT_MIN_INTERVAL = 1.0
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MODULES_DIR = os.path.join(_APP_ROOT, "modules") + os.sep
+
+# Innermost frames of a thread that is waiting for work rather than doing it
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("socketserver.py", "serve_forever"),
+}
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+def _short_path(path: str) -> str:
+    marker = f"site-packages{os.sep}"
+    if marker in path:
+        return path.split(marker, 1)[1]
+    parent = os.path.dirname(_APP_ROOT)
+    if path.startswith(parent + os.sep):
+        return os.path.relpath(path, parent)
+    return os.path.basename(path)
+
+def _acquire_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+        if _tracemalloc_users == 0:
+            tracemalloc.reset_peak()
+        _tracemalloc_users += 1
+
+def _release_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+class JobProfiler:
+    def __init__(self, interval: float = 0.01, trace_memory: bool = True):
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.stacks: Counter = Counter()
+        self.thread_samples: Counter = Counter()
+        self.idle_samples = 0
+        self.ticks = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self.peak_memory = 0
+        self.snapshot_memory = 0
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._snapshot_time = 0.0
+        self._labels: Dict[Any, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.trace_memory:
+            _acquire_tracemalloc()
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="legalmind-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+        if self.trace_memory:
+            try:
+                self._check_memory(final=True)
+            finally:
+                _release_tracemalloc()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+            if self.trace_memory:
+                self._check_memory()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def sample(self):
+        self.ticks += 1
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            codes = []
+            while frame is not None and len(codes) < MAX_STACK_DEPTH:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if not codes:
+                continue
+            innermost = codes[0]
+            if (os.path.basename(innermost.co_filename), innermost.co_name) in _IDLE_FRAMES and \
+                    not any(code.co_filename.startswith(_MODULES_DIR) for code in codes):
+                self.idle_samples += 1
+                continue
+            thread_name = names.get(ident, f"thread-{ident}")
+            self.thread_samples[thread_name] += 1
+            self.stacks[(thread_name,) + tuple(self._label(code) for code in reversed(codes))] += 1
+
+    def _check_memory(self, final: bool = False):
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_memory = max(self.peak_memory, peak)
+        now = time.perf_counter()
+        if final:
+            # The job's last moment is often its high point; don't let the growth and interval
+            # thresholds leave the report with an early, nearly empty snapshot
+            take = current >= self.snapshot_memory
+        else:
+            take = current > self.snapshot_memory * SNAPSHOT_GROWTH and now - self._snapshot_time >= SNAPSHOT_MIN_INTERVAL
+        if take:
+            # Kept only when usage is at a new high, so it shows what the peak was made of
+            self._snapshot = tracemalloc.take_snapshot()
+            self.snapshot_memory = current
+            self._snapshot_time = now
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format, outermost frame first."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def _top_functions(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack[1:]):
+                total[label] += count
+        samples = sum(self.stacks.values()) or 1
+
+        def rows(counter: Counter) -> List[Dict[str, Any]]:
+            return [{"function": label, "samples": count, "fraction": round(count / samples, 4)} for label, count in counter.most_common(TOP_ENTRIES)]
+        return rows(own), rows(total)
+
+    def _top_allocations(self) -> List[Dict[str, Any]]:
+        if self._snapshot is None:
+            return []
+        stats = self._snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("lineno")
+        return [
+            {"location": f"{_short_path(s.traceback[0].filename)}:{s.traceback[0].lineno}", "bytes": s.size, "blocks": s.count}
+            for s in stats[:TOP_ENTRIES]
+        ]
+
+    def summary(self, **attributes) -> Dict[str, Any]:
+        self_time, cumulative = self._top_functions()
+        report = {
+            **attributes,
+            "started_at": self.started_at,
+            "duration_seconds": round(self.duration, 6),
+            "sampler": {"interval_seconds": self.interval, "ticks": self.ticks, "samples": sum(self.stacks.values()), "idle_samples": self.idle_samples},
+            "threads": dict(self.thread_samples.most_common()),
+            "self_time": self_time,
+            "cumulative": cumulative,
+        }
+        if self.trace_memory:
+            report["memory"] = {
+                "peak_traced_bytes": self.peak_memory,
+                "snapshot_traced_bytes": self.snapshot_memory,
+                "top_allocations": self._top_allocations(),
+            }
+        return report
+
+@contextlib.contextmanager
+def profile_job(exporter: Callable[[Dict[str, Any], str], None], interval: float = 0.01, trace_memory: bool = True, **attributes) -> Iterator[JobProfiler]:
+    """
+    Profiles the block and hands exporter(summary, collapsed_stacks) the
+    result, even if the block raised. Other jobs running in the same process
+    at the same time appear in the samples too.
+    """
+    profiler = JobProfiler(interval, trace_memory)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            exporter(profiler.summary(**attributes), profiler.collapsed())
+        except Exception as e:
+            # Losing a profile must never fail the job it describes
+            print(f"Profile export failed: {e}")
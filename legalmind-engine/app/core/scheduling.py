@@ -0,0 +1,396 @@
+"""
+Fair sharing of a process's capacity between cases and kinds of work.
+
+Every job, and every call it makes on a shared executor, belongs to a case
+and a workload class: interactive (cite checks, report rendering,
+single-claim verification), standard (audits, pre-file gates) or bulk
+(ingest, maintenance). Wherever work waits for capacity (a run slot for a
+job, a thread on the IO or LLM lane, a CPU worker process) it waits in a
+FairQueue. The queue serves classes by deficit round-robin in proportion to
+their weights and, within a class, cases in proportion to theirs. A case's
+3,000-file ingest is then one bulk flow among many: it keeps moving, but a
+cite check from another case is served within a pick or two.
+
+Per-case quotas sit on top. CASE_MAX_CPU_JOBS caps the CPU-heavy jobs one
+case runs at once in a process. CASE_LLM_TOKENS_PER_MINUTE holds a case's
+LLM calls back once it has spent its tokens for the minute.
+"""
+import time
+import asyncio
+import threading
+import contextlib
+import contextvars
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import Config, load_config
+from app.core.metrics import registry, scheduler_state
+
+INTERACTIVE = "interactive"
+STANDARD = "standard"
+BULK = "bulk"
+
+WORKFLOW_CLASSES = {
+    "cite_check": INTERACTIVE,
+    "render_report": INTERACTIVE,
+    "verify_claim": INTERACTIVE,
+    "audit": STANDARD,
+    "prefile": STANDARD,
+    "ingest": BULK,
+    "maintenance": BULK,
+}
+
+# Jobs that keep CPU workers busy: conversion, OCR, transcription, rendering
+CPU_WORKFLOWS = frozenset({"ingest", "maintenance", "render_report"})
+
+def workload_class(workflow: Optional[str]) -> str:
+    return WORKFLOW_CLASSES.get(workflow, STANDARD)
+
+_current_work: contextvars.ContextVar[Tuple[Optional[str], Optional[str]]] = contextvars.ContextVar("legalmind_work", default=(None, None))
+
+@contextlib.contextmanager
+def work_scope(case_id: Optional[str], workflow: Optional[str]) -> Iterator[None]:
+    """Attributes work started in this block (and the threads it starts) to a case and workflow."""
+    reset = _current_work.set((case_id, workflow))
+    try:
+        yield
+    finally:
+        _current_work.reset(reset)
+
+def current_work() -> Tuple[Optional[str], str]:
+    """(case_id, workload class) of the work running here."""
+    case_id, workflow = _current_work.get()
+    return case_id, workload_class(workflow)
+
+def parse_case_weights(pairs: Iterable[str]) -> Dict[str, float]:
+    """["case_a=2", "case_b=0.5"] -> {"case_a": 2.0, "case_b": 0.5}"""
+    weights = {}
+    for pair in pairs:
+        if not pair.strip():
+            continue
+        case_id, _, weight = pair.rpartition("=")
+        if not case_id or float(weight) <= 0:
+            raise ValueError(f"Invalid case weight: {pair!r} (expected case_id=weight, weight > 0)")
+        weights[case_id.strip()] = float(weight)
+    return weights
+
+class Weights:
+    def __init__(self, classes: Optional[Dict[str, float]] = None, cases: Optional[Dict[str, float]] = None):
+        self.classes = classes or {INTERACTIVE: 8.0, STANDARD: 2.0, BULK: 1.0}
+        self.cases = cases or {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Config] = None) -> "Weights":
+        config = config or load_config()
+        classes = {INTERACTIVE: config.SCHED_INTERACTIVE_WEIGHT, STANDARD: config.SCHED_STANDARD_WEIGHT, BULK: config.SCHED_BULK_WEIGHT}
+        return cls({k: max(w, 0.01) for k, w in classes.items()}, parse_case_weights(config.SCHED_CASE_WEIGHTS))
+
+    def of_class(self, klass: str) -> float:
+        return self.classes.get(klass, 1.0)
+
+    def of_case(self, case_id: Optional[str]) -> float:
+        return self.cases.get(case_id, 1.0)
+
+class DeficitRoundRobin:
+    """
+    Chooses among backlogged flows, one unit of work per pick, in proportion
+    to their weights. Each visit credits the flow its weight; it is picked
+    while its deficit covers a unit, then the round moves on. A flow that is
+    no longer backlogged leaves the round and forfeits its deficit.
+    """
+    def __init__(self, weight: Callable[[Hashable], float]):
+        self._weight = weight
+        self._order: Deque[Hashable] = deque()
+        self._deficit: Dict[Hashable, float] = {}
+        self._credited = False
+
+    def pick(self, backlogged: Iterable[Hashable]) -> Optional[Hashable]:
+        backlogged = list(dict.fromkeys(backlogged))
+        if not backlogged:
+            return None
+        present = set(backlogged)
+        for key in [k for k in self._order if k not in present]:
+            if key == self._order[0]:
+                self._credited = False
+            self._order.remove(key)
+            del self._deficit[key]
+        for key in backlogged:
+            if key not in self._deficit:
+                self._order.append(key)
+                self._deficit[key] = 0.0
+        while True:
+            key = self._order[0]
+            if not self._credited:
+                self._deficit[key] += self._weight(key)
+                self._credited = True
+            if self._deficit[key] >= 1.0:
+                self._deficit[key] -= 1.0
+                return key
+            self._order.rotate(-1)
+            self._credited = False
+
+class FairQueue:
+    """
+    Items queued per (class, case) flow, FIFO within a flow. pop() picks a
+    class by deficit round-robin over class weights, then a case within it
+    over case weights. Not thread-safe; owners hold their own lock.
+    """
+    def __init__(self, weights: Optional[Weights] = None):
+        self.weights = weights or Weights()
+        self._flows: Dict[str, Dict[Optional[str], Deque[Any]]] = {}
+        self._classes = DeficitRoundRobin(self.weights.of_class)
+        self._cases: Dict[str, DeficitRoundRobin] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, item: Any, case_id: Optional[str], klass: str):
+        self._flows.setdefault(klass, {}).setdefault(case_id, deque()).append(item)
+        self._size += 1
+
+    def pop(self, eligible: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """The next item whose flow's turn it is; flows whose head is not eligible sit the pick out."""
+        heads = [(klass, case_id) for klass, cases in self._flows.items() for case_id, flow in cases.items()
+                 if eligible is None or eligible(flow[0])]
+        chosen = self.pick(heads)
+        if chosen is None:
+            return None
+        klass, case_id = chosen
+        flow = self._flows[klass][case_id]
+        item = flow.popleft()
+        self._size -= 1
+        if not flow:
+            self._discard_flow(klass, case_id)
+        return item
+
+    def discard(self, item: Any, case_id: Optional[str], klass: str) -> bool:
+        flow = self._flows.get(klass, {}).get(case_id)
+        if flow is None or item not in flow:
+            return False
+        flow.remove(item)
+        self._size -= 1
+        if not flow:
+            self._discard_flow(klass, case_id)
+        return True
+
+    def pick(self, flows: Iterable[Tuple[str, Optional[str]]]) -> Optional[Tuple[str, Optional[str]]]:
+        """The (class, case) flow to serve next among the given backlogged ones."""
+        by_class: Dict[str, List[Optional[str]]] = {}
+        for klass, case_id in flows:
+            by_class.setdefault(klass, []).append(case_id)
+        klass = self._classes.pick(by_class)
+        if klass is None:
+            return None
+        cases = self._cases.setdefault(klass, DeficitRoundRobin(self.weights.of_case))
+        return klass, cases.pick(by_class[klass])
+
+    def depth(self) -> Dict[str, int]:
+        return {klass: sum(len(flow) for flow in cases.values()) for klass, cases in self._flows.items()}
+
+    def _discard_flow(self, klass: str, case_id: Optional[str]):
+        del self._flows[klass][case_id]
+        if not self._flows[klass]:
+            del self._flows[klass]
+
+class TokenBudget:
+    """
+    A token bucket per case holding tokens_per_minute and refilling at that
+    rate. Calls are charged after the fact with the tokens they used, so a
+    balance can go negative; the case is held back until it refills.
+    """
+    def __init__(self, tokens_per_minute: int = 0, clock: Callable[[], float] = time.monotonic):
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        # case_id -> (tokens, as of); cases with a full bucket are not kept
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def allows(self, case_id: Optional[str]) -> bool:
+        if self.tokens_per_minute <= 0 or case_id is None:
+            return True
+        with self._lock:
+            return self._balance(case_id) > 0
+
+    def retry_in(self) -> Optional[float]:
+        """Seconds until the first held-back case may call again, or None if none is held back."""
+        if self.tokens_per_minute <= 0:
+            return None
+        with self._lock:
+            owed = [-self._balance(case_id) for case_id in list(self._buckets)]
+        owed = [tokens for tokens in owed if tokens >= 0]
+        if not owed:
+            return None
+        return (min(owed) + 1) * 60.0 / self.tokens_per_minute
+
+    def charge(self, case_id: Optional[str], tokens: float):
+        if self.tokens_per_minute <= 0 or case_id is None or tokens <= 0:
+            return
+        with self._lock:
+            self._buckets[case_id] = (self._balance(case_id) - tokens, self._clock())
+
+    def charge_response(self, case_id: Optional[str], response: Any):
+        """Charges an LLM response's total_tokens (or prompt plus completion tokens)."""
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if not isinstance(total, (int, float)):
+            total = sum(t for t in (getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0)) if isinstance(t, (int, float)))
+        self.charge(case_id, total)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            held = sum(1 for case_id in list(self._buckets) if self._balance(case_id) <= 0)
+            return {"llm_cases_throttled": held}
+
+    def _balance(self, case_id: str) -> float:
+        now = self._clock()
+        tokens, as_of = self._buckets.get(case_id, (self.tokens_per_minute, now))
+        tokens = min(self.tokens_per_minute, tokens + (now - as_of) * self.tokens_per_minute / 60.0)
+        if tokens >= self.tokens_per_minute:
+            self._buckets.pop(case_id, None)
+        else:
+            self._buckets[case_id] = (tokens, now)
+        return tokens
+
+class _Waiter:
+    def __init__(self, loop: asyncio.AbstractEventLoop, case_id: str, workflow: str, run_id: Optional[str]):
+        self.loop = loop
+        self.future = loop.create_future()
+        self.case_id = case_id
+        self.workflow = workflow
+        self.run_id = run_id
+        self.granted = False
+
+class JobScheduler:
+    """
+    Admits jobs to a process's run slots (max_running across every case).
+    Inline jobs wait for a slot in a FairQueue; queue runners choose which
+    available job to lease with the same policy. A case runs at most
+    case_cpu_jobs CPU-heavy jobs at once (0: no cap).
+    """
+    def __init__(self, max_running: int = 8, case_cpu_jobs: int = 2, weights: Optional[Weights] = None):
+        self.max_running = max(1, max_running)
+        self.case_cpu_jobs = case_cpu_jobs
+        self._queue = FairQueue(weights)
+        self._lock = threading.Lock()
+        self._running = 0
+        self._cpu_jobs: Dict[str, int] = {}
+        self._waiting_runs: Dict[str, int] = {}
+        self._stats = {"admitted": 0, "waited": 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Config] = None) -> "JobScheduler":
+        config = config or load_config()
+        return cls(config.SCHED_MAX_RUNNING_JOBS, config.CASE_MAX_CPU_JOBS, Weights.from_config(config))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, case_id: str, workflow: str, run_id: Optional[str] = None) -> AsyncIterator[None]:
+        """Holds one run slot for the block, waiting for this job's fair turn if the process is busy."""
+        waiter = _Waiter(asyncio.get_running_loop(), case_id, workflow, run_id)
+        with self._lock:
+            self._queue.push(waiter, case_id, workload_class(workflow))
+            if run_id:
+                self._waiting_runs[run_id] = self._waiting_runs.get(run_id, 0) + 1
+            self._dispatch()
+            if not waiter.granted:
+                self._stats["waited"] += 1
+        try:
+            await waiter.future
+        except BaseException:
+            with self._lock:
+                if not waiter.granted:
+                    self._queue.discard(waiter, case_id, workload_class(workflow))
+                    self._forget_waiter(waiter)
+                    raise
+            self.finish(case_id, workflow)
+            raise
+        try:
+            yield
+        finally:
+            self.finish(case_id, workflow)
+
+    def reserve(self, candidates: List[Tuple[str, str, str]]) -> Optional[Tuple[str, str, str]]:
+        """
+        Takes a slot for whichever of the available (run_id, case_id, workflow)
+        jobs is next in line, or returns None when there is no free slot or
+        every candidate's case is at its quota. Candidates come oldest first
+        per flow; jobs an inline caller in this process is already waiting to
+        run are left to it. Call finish() when the job is done.
+        """
+        with self._lock:
+            if self._running >= self.max_running:
+                return None
+            heads: Dict[Tuple[str, Optional[str]], Tuple[str, str, str]] = {}
+            for candidate in candidates:
+                run_id, case_id, workflow = candidate
+                if run_id in self._waiting_runs or not self._allowed(case_id, workflow):
+                    continue
+                heads.setdefault((workload_class(workflow), case_id), candidate)
+            chosen = self._queue.pick(heads)
+            if chosen is None:
+                return None
+            candidate = heads[chosen]
+            self._start(candidate[1], candidate[2])
+            return candidate
+
+    def finish(self, case_id: str, workflow: str):
+        with self._lock:
+            self._release(case_id, workflow)
+            self._dispatch()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            depth = self._queue.depth()
+            return {**self._stats, "running": self._running, "max_running": self.max_running,
+                    **{f"waiting_{klass}": depth.get(klass, 0) for klass in (INTERACTIVE, STANDARD, BULK)}}
+
+    def _allowed(self, case_id: str, workflow: str) -> bool:
+        if workflow not in CPU_WORKFLOWS or self.case_cpu_jobs <= 0:
+            return True
+        return self._cpu_jobs.get(case_id, 0) < self.case_cpu_jobs
+
+    def _start(self, case_id: str, workflow: str):
+        self._running += 1
+        self._stats["admitted"] += 1
+        if workflow in CPU_WORKFLOWS:
+            self._cpu_jobs[case_id] = self._cpu_jobs.get(case_id, 0) + 1
+
+    def _release(self, case_id: str, workflow: str):
+        self._running -= 1
+        if workflow in CPU_WORKFLOWS:
+            self._cpu_jobs[case_id] -= 1
+            if not self._cpu_jobs[case_id]:
+                del self._cpu_jobs[case_id]
+
+    def _dispatch(self):
+        # Caller holds the lock
+        while self._running < self.max_running:
+            waiter = self._queue.pop(lambda w: self._allowed(w.case_id, w.workflow))
+            if waiter is None:
+                return
+            self._start(waiter.case_id, waiter.workflow)
+            waiter.granted = True
+            self._forget_waiter(waiter)
+            try:
+                waiter.loop.call_soon_threadsafe(_grant, waiter.future)
+            except RuntimeError:
+                # The waiter's event loop is gone; nobody will run the job or return its slot
+                self._release(waiter.case_id, waiter.workflow)
+
+    def _forget_waiter(self, waiter: _Waiter):
+        if waiter.run_id and waiter.run_id in self._waiting_runs:
+            self._waiting_runs[waiter.run_id] -= 1
+            if not self._waiting_runs[waiter.run_id]:
+                del self._waiting_runs[waiter.run_id]
+
+def _grant(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+job_scheduler = JobScheduler.from_config()
+llm_budget = TokenBudget(load_config().CASE_LLM_TOKENS_PER_MINUTE)
+
+def _collect_metrics():
+    for field, value in {**job_scheduler.stats(), **llm_budget.stats()}.items():
+        scheduler_state.set(value, field=field)
+
+registry.add_collector(_collect_metrics)
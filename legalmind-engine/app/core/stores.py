@@ -1,12 +1,135 @@
 import os
+import sys
 import json
+import time
+import atexit
+import fcntl
+import gzip
 import shutil
 import hashlib
 import threading
+import zlib
 import queue
-from typing import List, Dict, Any, Optional
+import sqlite3
+import asyncio
+import contextlib
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
-from app.models import EvidenceSegment, Chunk, RunState, RunStatus
+from app.core.cancellation import check_cancelled, current_token
+from app.core.config import load_config
+from app.core.metrics import audit_log_state, registry
+from app.models import EvidenceSegment, Chunk, RunState, RunStatus, VerificationFinding, CitationFinding, GateResult
+
+TERMINAL_STATUSES = {RunStatus.COMPLETE, RunStatus.FAILED, RunStatus.CANCELLED}
+
+@contextlib.contextmanager
+def file_lock(lock_path: str):
+    """Exclusive lock shared by threads and by every process on the host."""
+    with open(lock_path, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+class JobEvents:
+    """
+    In-process fan-out of job events (status, progress, warning, partial).
+    Each run keeps a bounded, sequence-numbered history so late subscribers
+    can replay what they missed; waiters on any event loop are woken as soon
+    as something is published, from any thread.
+
+    When jobs run in separate worker processes, attach_log() routes every
+    publish through a shared event log instead, and the API process runs
+    relay() to deliver the logged events to its own subscribers.
+    """
+    def __init__(self, max_runs: int = 1024, max_events: int = 512):
+        self.max_runs = max_runs
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[str, deque]" = OrderedDict()
+        self._last_seq: Dict[str, int] = {}
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._log = None
+
+    def attach_log(self, log):
+        """log needs append_event(run_id, type, data) and events_after(event_id), as JobQueue has."""
+        self._log = log
+
+    def publish(self, run_id: str, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if self._log is not None:
+            # Subscribers may be in another process; relay() delivers it to this one
+            return self._log.append_event(run_id, event_type, data)
+        with self._lock:
+            seq = self._last_seq.get(run_id, 0) + 1
+            event = {"seq": seq, "type": event_type, "run_id": run_id, "timestamp": datetime.now().isoformat(), "data": data}
+        return self._record(event)
+
+    def _record(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        run_id = event["run_id"]
+        with self._lock:
+            self._last_seq[run_id] = max(self._last_seq.get(run_id, 0), event["seq"])
+            history = self._history.setdefault(run_id, deque(maxlen=self.max_events))
+            history.append(event)
+            self._history.move_to_end(run_id)
+            while len(self._history) > self.max_runs:
+                evicted, _ = self._history.popitem(last=False)
+                self._last_seq.pop(evicted, None)
+            waiters = self._waiters.pop(run_id, [])
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(waiter.set)
+        return event
+
+    def last_seq(self, run_id: str) -> int:
+        with self._lock:
+            return self._last_seq.get(run_id, 0)
+
+    def since(self, run_id: str, seq: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [e for e in self._history.get(run_id, ()) if e["seq"] > seq]
+
+    async def wait(self, run_id: str, seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """Returns events after seq, waiting up to timeout seconds for the first one."""
+        waiter = asyncio.Event()
+        entry = (asyncio.get_running_loop(), waiter)
+        with self._lock:
+            if self._last_seq.get(run_id, 0) <= seq:
+                self._waiters.setdefault(run_id, []).append(entry)
+            else:
+                waiter.set()
+        try:
+            await asyncio.wait_for(waiter.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if entry in self._waiters.get(run_id, []):
+                    self._waiters[run_id].remove(entry)
+        return self.since(run_id, seq)
+
+    async def relay(self, log, stop: asyncio.Event, interval: float, retention: float = 86400.0):
+        """Delivers events other processes appended to log until stop is set."""
+        last_id = await asyncio.to_thread(log.last_event_id)
+        next_prune = 0.0
+        while not stop.is_set():
+            try:
+                events = await asyncio.to_thread(log.events_after, last_id)
+                if time.monotonic() >= next_prune:
+                    await asyncio.to_thread(log.prune_events, time.time() - retention)
+                    next_prune = time.monotonic() + 3600
+            except sqlite3.Error as e:
+                print(f"Job event relay failed: {e}")
+                events = []
+            for event_id, event in events:
+                self._record(event)
+                last_id = event_id
+            if not events:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), timeout=interval)
+
+# Shared by every CaseContext in the process; run ids are unique across cases
+job_events = JobEvents()
 
 class JobStore:
     def __init__(self, case_id: str, base_path: str):
@@ -14,11 +137,19 @@ class JobStore:
         self.base_path = base_path
         self.jobs_path = os.path.join(base_path, "jobs")
         os.makedirs(self.jobs_path, exist_ok=True)
+        self.events = job_events
 
     def save_job(self, run_state: RunState):
         file_path = os.path.join(self.jobs_path, f"{run_state.run_id}.json")
-        with open(file_path, "w") as f:
+        # Readers in other processes must never see a half-written state
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
             f.write(run_state.model_dump_json())
+        os.replace(tmp_path, file_path)
+        self.events.publish(run_state.run_id, "status", run_state.model_dump(mode="json"))
+
+    def publish(self, run_id: str, event_type: str, data: Dict[str, Any]):
+        self.events.publish(run_id, event_type, data)
 
     def get_job(self, run_id: str) -> Optional[RunState]:
         file_path = os.path.join(self.jobs_path, f"{run_id}.json")
@@ -30,6 +161,41 @@ class JobStore:
             except json.JSONDecodeError:
                 return None
 
+    def trace_path(self, run_id: str) -> str:
+        return os.path.join(self.jobs_path, f"{run_id}.trace.json")
+
+    def append_trace(self, run_id: str, resource_spans: Dict[str, Any]):
+        """Adds one attempt's spans to jobs/<run_id>.trace.json (OTLP/JSON)."""
+        file_path = self.trace_path(run_id)
+        # A run has one attempt in flight at a time, so read-modify-write is safe
+        document = self.get_trace(run_id) or {"resourceSpans": []}
+        document["resourceSpans"].append(resource_spans)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(document, f)
+        os.replace(tmp_path, file_path)
+
+    def profile_paths(self, run_id: str) -> Tuple[str, str]:
+        """(summary JSON, collapsed stacks) of the run's last profiled attempt."""
+        return os.path.join(self.jobs_path, f"{run_id}.profile.json"), os.path.join(self.jobs_path, f"{run_id}.collapsed.txt")
+
+    def save_profile(self, run_id: str, summary: Dict[str, Any], collapsed: str):
+        for file_path, content in zip(self.profile_paths(run_id), (json.dumps(summary, indent=2), collapsed)):
+            tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, file_path)
+
+    def get_trace(self, run_id: str) -> Optional[Dict[str, Any]]:
+        file_path = self.trace_path(run_id)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return None
+
 class EvidenceVault:
     def __init__(self, case_id: str, base_path: str):
         self.case_id = case_id
@@ -50,7 +216,10 @@ class EvidenceVault:
     def store_file_from_path(self, source_path: str) -> str:
         sha256_hash = hashlib.sha256()
         with open(source_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
+            for i, byte_block in enumerate(iter(lambda: f.read(4096), b"")):
+                if i % 256 == 0:
+                    # Hashing a large media file takes a while; stop every MiB if the job was cancelled
+                    check_cancelled()
                 sha256_hash.update(byte_block)
         file_hash = sha256_hash.hexdigest()
 
@@ -74,9 +243,10 @@ class EvidenceLedger:
         self.ledger_path = os.path.join(base_path, "ledger")
         os.makedirs(self.ledger_path, exist_ok=True)
         self.segments_file = os.path.join(self.ledger_path, "segments.jsonl")
+        self.lock_path = os.path.join(self.ledger_path, ".lock")
 
     def append_segment(self, segment: EvidenceSegment):
-        with open(self.segments_file, "a") as f:
+        with file_lock(self.lock_path), open(self.segments_file, "a") as f:
             f.write(segment.model_dump_json() + "\n")
 
     def get_segments(self, source_asset_id: str) -> List[EvidenceSegment]:
@@ -97,9 +267,26 @@ class EvidenceLedger:
     def update_segment(self, updated_segment: EvidenceSegment):
         """
         Updates an existing segment by rewriting the JSONL file.
-        Note: This is not concurrency-safe for high-volume parallel writes.
-        Intended for maintenance tasks.
+        Holds the ledger lock throughout so appends from other workers are
+        not lost. Intended for maintenance tasks.
         """
+        with file_lock(self.lock_path):
+            self._rewrite_segment(updated_segment)
+
+    def remove_segments(self, segment_ids: List[str]):
+        """Drops segments (e.g. from a cancelled conversion) under the ledger lock."""
+        if not segment_ids:
+            return
+        unwanted = set(segment_ids)
+        with file_lock(self.lock_path):
+            kept = [seg for seg in self.get_all_segments() if seg.segment_id not in unwanted]
+            temp_file = self.segments_file + ".tmp"
+            with open(temp_file, "w") as f:
+                for seg in kept:
+                    f.write(seg.model_dump_json() + "\n")
+            os.replace(temp_file, self.segments_file)
+
+    def _rewrite_segment(self, updated_segment: EvidenceSegment):
         all_segments = self.get_all_segments()
         found = False
         new_segments = []
@@ -139,6 +326,8 @@ class RetrievalIndex:
         self.index_path = os.path.join(base_path, "index")
         os.makedirs(self.index_path, exist_ok=True)
         self.chunks_file = os.path.join(self.index_path, "chunks.jsonl")
+        # Held by a worker from chunk numbering until both indexes include its chunks
+        self.lock_path = os.path.join(self.index_path, ".lock")
 
     def add_chunks(self, chunks: List[Chunk]):
         with open(self.chunks_file, "a") as f:
@@ -176,17 +365,178 @@ class RetrievalIndex:
         # RetrievalIndex acts as the store, but query might be delegated
         return []
 
+class FindingsStore:
+    """
+    Findings of every completed run, kept so reports can be re-rendered
+    without re-running verification. Rows are indexed by run and by finding
+    id (claim_id, normalized citation form or gate document_id).
+    """
+    KINDS = {"verification": VerificationFinding, "citation": CitationFinding, "gate": GateResult}
+
+    def __init__(self, case_id: str, base_path: str):
+        self.case_id = case_id
+        self.base_path = base_path
+        self.findings_path = os.path.join(base_path, "findings")
+        os.makedirs(self.findings_path, exist_ok=True)
+        self.db_path = os.path.join(self.findings_path, "findings.db")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS findings ("
+                "run_id TEXT NOT NULL, kind TEXT NOT NULL, position INTEGER NOT NULL, "
+                "finding_id TEXT NOT NULL, payload TEXT NOT NULL, "
+                "PRIMARY KEY (run_id, kind, position))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_findings_run_finding ON findings (run_id, finding_id)")
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_run(self, run_id: str, findings: Optional[List[VerificationFinding]] = None, citation_findings: Optional[List[CitationFinding]] = None, gate_result: Optional[GateResult] = None):
+        rows = [(run_id, "verification", i, f.claim_id, f.model_dump_json()) for i, f in enumerate(findings or [])]
+        rows += [(run_id, "citation", i, c.normalized_form, c.model_dump_json()) for i, c in enumerate(citation_findings or [])]
+        if gate_result:
+            rows.append((run_id, "gate", 0, gate_result.document_id, gate_result.model_dump_json()))
+        # Saving a run again replaces it rather than appending duplicates
+        with self._connect() as conn:
+            conn.execute("DELETE FROM findings WHERE run_id = ?", (run_id,))
+            conn.executemany("INSERT INTO findings (run_id, kind, position, finding_id, payload) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def load_run(self, run_id: str, finding_ids: Optional[List[str]] = None) -> Optional[Tuple[List[VerificationFinding], List[CitationFinding], Optional[GateResult]]]:
+        """
+        Returns (findings, citation_findings, gate_result) in their original
+        order, or None if the run stored nothing. finding_ids narrows claim and
+        citation findings; the gate result is always included.
+        """
+        query = "SELECT kind, payload FROM findings WHERE run_id = ?"
+        params: List[Any] = [run_id]
+        if finding_ids:
+            query += f" AND (kind = 'gate' OR finding_id IN ({', '.join('?' for _ in finding_ids)}))"
+            params += finding_ids
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM findings WHERE run_id = ? LIMIT 1", (run_id,)).fetchone() is None:
+                return None
+            rows = conn.execute(query + " ORDER BY kind, position", params).fetchall()
+
+        loaded: Dict[str, List[Any]] = {kind: [] for kind in self.KINDS}
+        for kind, payload in rows:
+            loaded[kind].append(self.KINDS[kind].model_validate_json(payload))
+        gate = loaded["gate"][0] if loaded["gate"] else None
+        return loaded["verification"], loaded["citation"], gate
+
+class _LogIndex:
+    """
+    A case log's index.db connection and .lock file, opened once (schema
+    included) and shared by the writer thread and queries. `lock` keeps
+    threads off the connection one at a time; the flock on the .lock file
+    does the same for processes.
+    """
+    def __init__(self, log_dir: str):
+        self.lock = threading.Lock()
+        self.users = 0
+        self.retired = False
+        self.db_path = os.path.join(log_dir, "index.db")
+        self.lock_path = os.path.join(log_dir, ".lock")
+        self.lock_file = open(self.lock_path, "w")
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # The index can always be rebuilt from the log, so it does not need its own fsyncs
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "bucket_id INTEGER PRIMARY KEY AUTOINCREMENT, segment TEXT NOT NULL, "
+                "start_offset INTEGER NOT NULL, end_offset INTEGER NOT NULL, min_ts REAL NOT NULL, max_ts REAL NOT NULL, "
+                "events INTEGER NOT NULL, packed_offset INTEGER, packed_length INTEGER);"
+                "CREATE INDEX IF NOT EXISTS idx_buckets_segment ON buckets (segment, bucket_id);"
+                "CREATE INDEX IF NOT EXISTS idx_buckets_time ON buckets (max_ts, min_ts);"
+                "CREATE TABLE IF NOT EXISTS bucket_modules (module TEXT NOT NULL, bucket_id INTEGER NOT NULL, PRIMARY KEY (module, bucket_id));"
+                "CREATE TABLE IF NOT EXISTS run_events (run_id TEXT NOT NULL, bucket_id INTEGER NOT NULL, line_offset INTEGER NOT NULL, line_length INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_run_events_run ON run_events (run_id, bucket_id, line_offset);"
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            )
+            self.files = self._files()
+        except BaseException:
+            self.close()
+            raise
+
+    def _files(self) -> Tuple[Tuple[int, int], ...]:
+        return tuple((stat.st_dev, stat.st_ino) for stat in (os.stat(self.lock_path), os.stat(self.db_path)))
+
+    def stale(self) -> bool:
+        """True once the case directory was removed or replaced underneath us."""
+        try:
+            return self._files() != self.files
+        except OSError:
+            return True
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[sqlite3.Connection]:
+        with self.lock:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+            try:
+                yield self.conn
+            finally:
+                fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+
+    def close(self):
+        self.conn.close()
+        self.lock_file.close()
+
 class AuditLog:
+    """
+    Per-case audit trail in audit_log/audit.jsonl. log_event only queues the
+    entry; one writer thread shared by every case drains the queue in
+    batches, appending each file's entries in a single write and keeping
+    recently used files and their index connections open (LRU,
+    AUDIT_MAX_OPEN_FILES). Durability follows
+    AUDIT_FSYNC_POLICY: "batch" fsyncs after every batch, "interval" at most
+    every AUDIT_FSYNC_INTERVAL seconds, "never" leaves it to the OS.
+    close() drains and fsyncs everything; it runs on API shutdown and at exit.
+
+    The writer also maintains audit_log/index.db. Appended lines are grouped
+    into time buckets (AUDIT_BUCKET_SECONDS, at most bucket_bytes each) that
+    record their byte range and modules; events carrying a run_id record
+    their offset within the bucket. Once audit.jsonl passes
+    AUDIT_ROTATE_BYTES it is packed into segments/ with one gzip member per
+    bucket, so query() only ever reads the buckets it needs.
+    """
     _queue = queue.Queue()
     _worker_thread = None
     _lock = threading.Lock()
+    _handles: "OrderedDict[str, Any]" = OrderedDict()
+    # Shared with query() callers' threads, unlike the file handles
+    _indexes: "OrderedDict[str, _LogIndex]" = OrderedDict()
+    _indexes_lock = threading.Lock()
+    _dirty: set = set()
+    _last_fsync = 0.0
+    _stats = {"events_written": 0, "batches": 0, "fsyncs": 0, "write_errors": 0, "last_batch_size": 0, "max_queue_depth": 0, "rotations": 0}
+    _FLUSH = "__flush__"
+    _CLOSE = "__close__"
+    ACTIVE_SEGMENT = "audit.jsonl"
+
+    batch_size = 512
+    max_open_files = 64
+    fsync_policy = "interval"
+    fsync_interval = 1.0
+    echo = False
+    bucket_seconds = 3600.0
+    bucket_bytes = 1 << 20
+    rotate_bytes = 64 << 20
 
     def __init__(self, case_id: str, base_path: str):
         self.case_id = case_id
         self.base_path = base_path
         self.log_path = os.path.join(base_path, "audit_log")
         os.makedirs(self.log_path, exist_ok=True)
-        self.log_file = os.path.join(self.log_path, "audit.jsonl")
+        self.log_file = os.path.join(self.log_path, self.ACTIVE_SEGMENT)
+        self.lock_path = os.path.join(self.log_path, ".lock")
 
         # Ensure worker is running
         self._start_worker()
@@ -196,37 +546,479 @@ class AuditLog:
         if cls._worker_thread is None or not cls._worker_thread.is_alive():
             with cls._lock:
                 if cls._worker_thread is None or not cls._worker_thread.is_alive():
-                    cls._worker_thread = threading.Thread(target=cls._process_queue, daemon=True)
+                    if cls._worker_thread is None:
+                        cls._configure()
+                        # Daemon threads are stopped without warning at exit; drain first
+                        atexit.register(cls.close)
+                    cls._worker_thread = threading.Thread(target=cls._process_queue, name="audit-writer", daemon=True)
                     cls._worker_thread.start()
 
+    @classmethod
+    def _configure(cls):
+        config = load_config()
+        cls.batch_size = max(1, config.AUDIT_BATCH_SIZE)
+        cls.max_open_files = max(1, config.AUDIT_MAX_OPEN_FILES)
+        cls.fsync_policy = config.AUDIT_FSYNC_POLICY
+        cls.fsync_interval = config.AUDIT_FSYNC_INTERVAL
+        cls.echo = config.AUDIT_ECHO
+        cls.bucket_seconds = config.AUDIT_BUCKET_SECONDS
+        cls.rotate_bytes = config.AUDIT_ROTATE_BYTES
+
     @classmethod
     def _process_queue(cls):
         while True:
-            file_path, entry_json = cls._queue.get()
             try:
-                with open(file_path, "a") as f:
-                    f.write(entry_json + "\n")
-            except Exception as e:
-                # In production we might log this to stderr or a fallback
-                print(f"Error writing audit log: {e}")
+                # Wake for a pending interval fsync even when no events arrive
+                wait = cls.fsync_interval if cls._dirty and cls.fsync_policy == "interval" else None
+                items = [cls._queue.get(timeout=wait)]
+            except queue.Empty:
+                cls._fsync_dirty()
+                continue
+            cls._stats["max_queue_depth"] = max(cls._stats["max_queue_depth"], len(items) + cls._queue.qsize())
+            while len(items) < cls.batch_size:
+                try:
+                    items.append(cls._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                cls._write_batch(items)
             finally:
-                cls._queue.task_done()
+                for _ in items:
+                    cls._queue.task_done()
+
+    @classmethod
+    def _write_batch(cls, items: List[Tuple[str, Any, Any]]):
+        batches: Dict[str, List[Tuple[str, Tuple]]] = {}
+        markers = []
+        for path, payload, meta in items:
+            if path in (cls._FLUSH, cls._CLOSE):
+                markers.append((path, payload))
+            else:
+                batches.setdefault(path, []).append((payload, meta))
+
+        for path, entries in batches.items():
+            try:
+                cls._append(path, entries)
+                cls._stats["events_written"] += len(entries)
+            except Exception as e:
+                cls._stats["write_errors"] += len(entries)
+                cls._drop_handle(path)
+                cls._drop_index(os.path.dirname(path))
+                print(f"Error writing audit log {path}: {e}", file=sys.stderr)
+        if batches:
+            cls._stats["batches"] += 1
+            cls._stats["last_batch_size"] = sum(len(entries) for entries in batches.values())
+
+        if markers or cls.fsync_policy == "batch" or (cls.fsync_policy == "interval" and time.monotonic() - cls._last_fsync >= cls.fsync_interval):
+            cls._fsync_dirty()
+        for marker, done in markers:
+            if marker == cls._CLOSE:
+                for path in list(cls._handles):
+                    cls._drop_handle(path)
+                for log_dir in list(cls._indexes):
+                    cls._drop_index(log_dir)
+            done.set()
+
+    @classmethod
+    def _append(cls, path: str, entries: List[Tuple[str, Tuple]]):
+        # API and worker processes append to the same case log; holding the
+        # case lock makes the offsets recorded in the index exact
+        with cls._locked_index(os.path.dirname(path)) as conn:
+            cls._sync_index(conn, path)
+            f = cls._handle(path)
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            lines = [(payload + "\n").encode("utf-8") for payload, _ in entries]
+            f.write(b"".join(lines))
+            f.flush()
+            cls._dirty.add(path)
+
+            rows = []
+            for line, (_, meta) in zip(lines, entries):
+                rows.append((offset, len(line)) + meta)
+                offset += len(line)
+            with conn:
+                cls._index_entries(conn, rows)
+                cls._set_meta(conn, "active_ino", os.fstat(f.fileno()).st_ino)
+            if offset >= cls.rotate_bytes:
+                cls._drop_handle(path)
+                cls._rotate(conn, path)
+
+    @classmethod
+    def _handle(cls, path: str):
+        f = cls._handles.get(path)
+        if f is not None:
+            try:
+                # Reopen if the file was removed or rotated underneath us
+                stat = os.stat(path)
+                current = os.fstat(f.fileno())
+                if (stat.st_dev, stat.st_ino) == (current.st_dev, current.st_ino):
+                    cls._handles.move_to_end(path)
+                    return f
+            except OSError:
+                pass
+            cls._drop_handle(path)
+        f = open(path, "ab")
+        cls._handles[path] = f
+        while len(cls._handles) > cls.max_open_files:
+            cls._drop_handle(next(iter(cls._handles)))
+        return f
+
+    @classmethod
+    def _drop_handle(cls, path: str):
+        f = cls._handles.pop(path, None)
+        if f is None:
+            return
+        try:
+            if path in cls._dirty and cls.fsync_policy != "never":
+                os.fsync(f.fileno())
+                cls._stats["fsyncs"] += 1
+            f.close()
+        except (OSError, ValueError):
+            pass
+        cls._dirty.discard(path)
+
+    @classmethod
+    def _fsync_dirty(cls):
+        if cls.fsync_policy != "never":
+            for path in list(cls._dirty):
+                f = cls._handles.get(path)
+                if f is None:
+                    continue
+                try:
+                    os.fsync(f.fileno())
+                    cls._stats["fsyncs"] += 1
+                except OSError as e:
+                    print(f"Error syncing audit log {path}: {e}", file=sys.stderr)
+        cls._dirty.clear()
+        cls._last_fsync = time.monotonic()
+
+    # --- Index ---
+
+    @classmethod
+    @contextlib.contextmanager
+    def _locked_index(cls, log_dir: str) -> Iterator[sqlite3.Connection]:
+        """The log's index connection, held against other threads and processes."""
+        index = cls._acquire_index(log_dir)
+        try:
+            with index.locked() as conn:
+                yield conn
+        except sqlite3.Error:
+            # Start from a fresh connection next time
+            cls._drop_index(log_dir, index)
+            raise
+        finally:
+            cls._release_index(index)
+
+    @classmethod
+    def _acquire_index(cls, log_dir: str) -> _LogIndex:
+        with cls._indexes_lock:
+            index = cls._indexes.get(log_dir)
+            if index is not None:
+                cls._indexes.move_to_end(log_dir)
+                index.users += 1
+        if index is not None:
+            if not index.stale():
+                return index
+            cls._drop_index(log_dir, index)
+            cls._release_index(index)
+
+        # Opened outside the lock; a connection opened meanwhile by another thread is simply replaced
+        index = _LogIndex(log_dir)
+        with cls._indexes_lock:
+            retired = [cls._indexes.pop(log_dir, None)]
+            cls._indexes[log_dir] = index
+            index.users += 1
+            while len(cls._indexes) > cls.max_open_files:
+                retired.append(cls._indexes.popitem(last=False)[1])
+        for old in retired:
+            if old is not None:
+                cls._retire_index(old)
+        return index
+
+    @classmethod
+    def _release_index(cls, index: _LogIndex):
+        with cls._indexes_lock:
+            index.users -= 1
+            idle = index.retired and index.users == 0
+        if idle:
+            index.close()
+
+    @classmethod
+    def _drop_index(cls, log_dir: str, index: Optional[_LogIndex] = None):
+        with cls._indexes_lock:
+            current = cls._indexes.get(log_dir)
+            if index is None or index is current:
+                index = cls._indexes.pop(log_dir, None)
+        if index is not None:
+            cls._retire_index(index)
+
+    @classmethod
+    def _retire_index(cls, index: _LogIndex):
+        # Closed now if idle, otherwise by its last user
+        with cls._indexes_lock:
+            index.retired = True
+            idle = index.users == 0
+        if idle:
+            index.close()
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: Any):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @staticmethod
+    def _get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _entry_meta(entry: Dict[str, Any]) -> Tuple[float, Optional[str], Optional[str]]:
+        run_id = entry.get("run_id") or (entry.get("details") or {}).get("run_id")
+        return datetime.fromisoformat(entry["timestamp"]).timestamp(), entry.get("module"), run_id
+
+    @classmethod
+    def _sync_index(cls, conn: sqlite3.Connection, path: str):
+        """
+        Brings the index up to date with audit.jsonl before it is read or
+        appended to: indexes a log written before the index existed or lines
+        a crash left unindexed, drops entries for a file replaced from
+        outside, and finishes a rotation interrupted before its file was removed.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None and str(stat.st_ino) == cls._get_meta(conn, "rotated_ino"):
+            os.remove(path)
+            stat = None
+
+        indexed = conn.execute("SELECT MAX(end_offset) FROM buckets WHERE segment = ?", (cls.ACTIVE_SEGMENT,)).fetchone()[0] or 0
+        # Inode numbers are reused, so a file shorter than what was indexed is also a new file
+        known = stat is not None and str(stat.st_ino) == cls._get_meta(conn, "active_ino") and stat.st_size >= indexed
+        with conn:
+            if not known:
+                indexed = 0
+                active = "SELECT bucket_id FROM buckets WHERE segment = ?"
+                conn.execute(f"DELETE FROM run_events WHERE bucket_id IN ({active})", (cls.ACTIVE_SEGMENT,))
+                conn.execute(f"DELETE FROM bucket_modules WHERE bucket_id IN ({active})", (cls.ACTIVE_SEGMENT,))
+                conn.execute("DELETE FROM buckets WHERE segment = ?", (cls.ACTIVE_SEGMENT,))
+                conn.execute("DELETE FROM meta WHERE key = 'active_ino'")
+            if stat is None:
+                return
+            if stat.st_size > indexed:
+                cls._index_entries(conn, cls._scan(path, indexed))
+            if not known:
+                cls._set_meta(conn, "active_ino", stat.st_ino)
+
+    @classmethod
+    def _scan(cls, path: str, start: int) -> Iterator[Tuple[int, int, float, Optional[str], Optional[str]]]:
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Torn final write; it is skipped like any other unreadable line
+                    break
+                try:
+                    yield (offset, len(line)) + cls._entry_meta(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    pass
+                offset += len(line)
+
+    @classmethod
+    def _index_entries(cls, conn: sqlite3.Connection, rows):
+        row = conn.execute(
+            "SELECT bucket_id, start_offset, end_offset, min_ts, max_ts, events FROM buckets WHERE segment = ? ORDER BY bucket_id DESC LIMIT 1",
+            (cls.ACTIVE_SEGMENT,)
+        ).fetchone()
+        bucket = list(row) if row else None
+        modules = set()
+        run_events = []
+
+        def save(bucket):
+            conn.execute(
+                "UPDATE buckets SET end_offset = ?, min_ts = ?, max_ts = ?, events = ? WHERE bucket_id = ?",
+                (bucket[2], bucket[3], bucket[4], bucket[5], bucket[0])
+            )
+
+        for offset, length, ts, module, run_id in rows:
+            if bucket is None or ts - bucket[3] >= cls.bucket_seconds or offset + length - bucket[1] > cls.bucket_bytes:
+                if bucket is not None:
+                    save(bucket)
+                cursor = conn.execute(
+                    "INSERT INTO buckets (segment, start_offset, end_offset, min_ts, max_ts, events) VALUES (?, ?, ?, ?, ?, 0)",
+                    (cls.ACTIVE_SEGMENT, offset, offset, ts, ts)
+                )
+                bucket = [cursor.lastrowid, offset, offset, ts, ts, 0]
+            bucket[2] = offset + length
+            bucket[3] = min(bucket[3], ts)
+            bucket[4] = max(bucket[4], ts)
+            bucket[5] += 1
+            if module:
+                modules.add((module, bucket[0]))
+            if run_id:
+                run_events.append((run_id, bucket[0], offset - bucket[1], length))
+        if bucket is not None:
+            save(bucket)
+        conn.executemany("INSERT OR IGNORE INTO bucket_modules (module, bucket_id) VALUES (?, ?)", modules)
+        conn.executemany("INSERT INTO run_events (run_id, bucket_id, line_offset, line_length) VALUES (?, ?, ?, ?)", run_events)
+
+    @classmethod
+    def _rotate(cls, conn: sqlite3.Connection, path: str):
+        """Packs audit.jsonl into segments/, one gzip member per bucket, then removes it."""
+        buckets = conn.execute(
+            "SELECT bucket_id, start_offset, end_offset FROM buckets WHERE segment = ? ORDER BY bucket_id", (cls.ACTIVE_SEGMENT,)
+        ).fetchall()
+        if not buckets:
+            return
+        segment = f"segments/audit-{buckets[0][0]:08d}.jsonl.gz"
+        target = os.path.join(os.path.dirname(path), segment)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        packed = []
+        with open(path, "rb") as src, open(target + ".tmp", "wb") as dst:
+            ino = os.fstat(src.fileno()).st_ino
+            for bucket_id, start, end in buckets:
+                src.seek(start)
+                member = gzip.compress(src.read(end - start), compresslevel=6)
+                packed.append((segment, dst.tell(), len(member), bucket_id))
+                dst.write(member)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(target + ".tmp", target)
+
+        with conn:
+            conn.executemany("UPDATE buckets SET segment = ?, packed_offset = ?, packed_length = ? WHERE bucket_id = ?", packed)
+            conn.execute("DELETE FROM meta WHERE key = 'active_ino'")
+            # If we stop before the remove below, _sync_index finishes the job
+            cls._set_meta(conn, "rotated_ino", ino)
+        os.remove(path)
+        with conn:
+            conn.execute("DELETE FROM meta WHERE key = 'rotated_ino'")
+        cls._stats["rotations"] += 1
+
+    def _read_bucket(self, segment: str, start: int, end: int, packed_offset: Optional[int], packed_length: Optional[int], needed: Optional[int] = None) -> bytes:
+        """The bucket's lines, or only its first `needed` bytes."""
+        needed = end - start if needed is None else needed
+        with open(os.path.join(self.log_path, segment), "rb") as f:
+            if packed_offset is None:
+                f.seek(start)
+                return f.read(needed)
+            f.seek(packed_offset)
+            return zlib.decompressobj(wbits=31).decompress(f.read(packed_length), needed)
+
+    def rotate(self):
+        """Packs the current log into a compressed segment now, whatever its size."""
+        with self._locked_index(self.log_path) as conn:
+            self._sync_index(conn, self.log_file)
+            if os.path.exists(self.log_file):
+                self._rotate(conn, self.log_file)
+
+    def query(self, run_id: Optional[str] = None, module: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Audit events matching every given filter, in log order. A run's events
+        are read straight from their recorded offsets; module and time filters
+        read only the buckets that can contain a match. Events still queued are
+        not included; call AuditLog.flush() first to see them.
+        """
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        with self._locked_index(self.log_path) as conn:
+            self._sync_index(conn, self.log_file)
+            columns = "b.bucket_id, b.segment, b.start_offset, b.end_offset, b.packed_offset, b.packed_length"
+            if run_id:
+                rows = conn.execute(
+                    f"SELECT {columns}, r.line_offset, r.line_length FROM run_events r JOIN buckets b ON b.bucket_id = r.bucket_id "
+                    "WHERE r.run_id = ? ORDER BY r.bucket_id, r.line_offset", (run_id,)
+                ).fetchall()
+            else:
+                clauses, params = [], []
+                if module:
+                    clauses.append("b.bucket_id IN (SELECT bucket_id FROM bucket_modules WHERE module = ?)")
+                    params.append(module)
+                if since_ts is not None:
+                    clauses.append("b.max_ts >= ?")
+                    params.append(since_ts)
+                if until_ts is not None:
+                    clauses.append("b.min_ts <= ?")
+                    params.append(until_ts)
+                where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+                rows = conn.execute(f"SELECT {columns}, NULL, NULL FROM buckets b{where} ORDER BY b.bucket_id", params).fetchall()
+
+            buckets: "OrderedDict[int, Tuple[Tuple, List[Tuple[int, int]]]]" = OrderedDict()
+            for row in rows:
+                bucket, spans = buckets.setdefault(row[0], (row[1:6], []))
+                if row[6] is not None:
+                    spans.append((row[6], row[7]))
+
+            events = []
+            for bucket, spans in buckets.values():
+                data = self._read_bucket(*bucket, needed=max(offset + length for offset, length in spans) if spans else None)
+                lines = [data[offset:offset + length] for offset, length in spans] if spans else data.splitlines()
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                        ts = datetime.fromisoformat(entry["timestamp"]).timestamp()
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if module and entry.get("module") != module:
+                        continue
+                    if (since_ts is not None and ts < since_ts) or (until_ts is not None and ts > until_ts):
+                        continue
+                    events.append(entry)
+                    if limit and len(events) >= limit:
+                        return events
+            return events
+
+    @classmethod
+    def flush(cls, timeout: float = 10.0) -> bool:
+        """Blocks until everything queued so far is written and synced."""
+        return cls._send(cls._FLUSH, timeout)
+
+    @classmethod
+    def close(cls, timeout: float = 10.0) -> bool:
+        """Like flush(), then closes every open file. Logging again reopens them."""
+        return cls._send(cls._CLOSE, timeout)
+
+    @classmethod
+    def _send(cls, marker: str, timeout: float) -> bool:
+        if cls._worker_thread is None or not cls._worker_thread.is_alive():
+            return True
+        done = threading.Event()
+        cls._queue.put((marker, done, None))
+        return done.wait(timeout)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {**cls._stats, "queue_depth": cls._queue.qsize(), "open_files": len(cls._handles), "open_indexes": len(cls._indexes), "fsync_policy": cls.fsync_policy}
+
+    @classmethod
+    def _collect_metrics(cls):
+        for field, value in cls.stats().items():
+            if isinstance(value, (int, float)):
+                audit_log_state.set(value, field=field)
 
     def log_event(self, module: str, action: str, details: Dict[str, Any]):
+        # Events logged while a job runs belong to its run even when details omit it
+        token = current_token()
         entry = {
             "timestamp": datetime.now().isoformat(),
             "case_id": self.case_id,
+            "run_id": details.get("run_id") or (token.run_id if token else None),
             "module": module,
             "action": action,
             "details": details
         }
         entry_json = json.dumps(entry)
 
-        # Print for debug
-        print(f"AUDIT: {entry_json}")
+        if AuditLog.echo:
+            print(f"AUDIT: {entry_json}")
 
         # Persist asynchronously
-        AuditLog._queue.put((self.log_file, entry_json))
+        AuditLog._queue.put((self.log_file, entry_json, self._entry_meta(entry)))
+
+registry.add_collector(AuditLog._collect_metrics)
 
 class CaseContext:
     def __init__(self, case_id: str, base_storage_path: str = "./storage"):
@@ -237,3 +1029,4 @@ class CaseContext:
         self.index = RetrievalIndex(case_id, self.base_path)
         self.audit_log = AuditLog(case_id, self.base_path)
         self.jobs = JobStore(case_id, self.base_path)
+        self.findings = FindingsStore(case_id, self.base_path)
@@ -0,0 +1,182 @@
+"""
+Per-run tracing in the OpenTelemetry JSON (OTLP/JSON) format.
+
+Dominion opens a trace for every job attempt with start_trace(); code that
+runs for the job, on the event loop or in threads started with
+asyncio.to_thread, nests spans under it with span(). Outside a trace span()
+does nothing, so modules can be instrumented unconditionally. Each finished
+attempt is handed to an exporter (JobStore.append_trace writes
+jobs/<run_id>.trace.json), which OTLP/JSON tools such as Jaeger or the
+collector's file receiver can load as is.
+"""
+import os
+import time
+import uuid
+import hashlib
+import threading
+import contextlib
+import contextvars
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+SCOPE_NAME = "legalmind"
+
+# OTLP SpanKind and StatusCode values
+KIND_INTERNAL = 1
+KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Copied from parent to child so any span can be filtered by run or claim
+INHERITED_ATTRIBUTES = ("run_id", "claim_id")
+
+def trace_id_for(run_id: str) -> str:
+    """32 hex chars; every attempt of a run shares its run's trace id."""
+    try:
+        return uuid.UUID(run_id).hex
+    except ValueError:
+        return hashlib.sha256(run_id.encode("utf-8")).hexdigest()[:32]
+
+def _any_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 is a string in the proto3 JSON mapping
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(v) for v in value]}}
+    return {"stringValue": str(getattr(value, "value", value))}
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _any_value(value)} for key, value in attributes.items() if value is not None]
+
+class Span:
+    def __init__(self, trace: "Trace", name: str, parent: Optional["Span"], kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else ""
+        inherited = {key: parent.attributes[key] for key in INHERITED_ATTRIBUTES if parent and key in parent.attributes}
+        self.attributes = {**inherited, **attributes}
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes):
+        self.events.append({"timeUnixNano": str(time.time_ns()), "name": name, "attributes": _attributes(attributes)})
+
+    def record_exception(self, error: BaseException):
+        self.add_event("exception", **{"exception.type": type(error).__name__, "exception.message": str(error)})
+        self.status_code = STATUS_ERROR
+        self.status_message = str(error) or type(error).__name__
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.add(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        status = {"code": self.status_code}
+        if self.status_message:
+            status["message"] = self.status_message
+        return {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": _attributes(self.attributes),
+            "events": self.events,
+            "status": status,
+        }
+
+class _NoopSpan:
+    """Stands in for a span when no trace is active."""
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def add_event(self, name: str, **attributes):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class Trace:
+    def __init__(self, run_id: str, resource: Optional[Dict[str, Any]] = None):
+        self.run_id = run_id
+        self.trace_id = trace_id_for(run_id)
+        self.resource = {"service.name": "legalmind-engine", **(resource or {})}
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        # Spans end on the loop and on worker threads alike
+        with self._lock:
+            self._spans.append(span)
+
+    def export(self) -> Dict[str, Any]:
+        """One OTLP/JSON ResourceSpans entry with the spans ended so far."""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s.start_ns)
+        return {
+            "resource": {"attributes": _attributes(self.resource)},
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [s.to_otlp() for s in spans]}],
+        }
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("legalmind_span", default=None)
+
+def current_span():
+    """The innermost open span, or a no-op span outside a trace."""
+    return _current_span.get() or NOOP_SPAN
+
+@contextlib.contextmanager
+def _open_span(trace: Trace, parent: Optional[Span], name: str, kind: int, attributes: Dict[str, Any]) -> Iterator[Span]:
+    opened = Span(trace, name, parent, kind, attributes)
+    reset = _current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(reset)
+        opened.end()
+
+@contextlib.contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Any]:
+    """Times the block as a child of the current span; a no-op outside a trace."""
+    parent = _current_span.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    with _open_span(parent.trace, parent, name, kind, attributes) as opened:
+        yield opened
+
+@contextlib.contextmanager
+def start_trace(run_id: str, name: str, exporter: Callable[[Dict[str, Any]], None], resource: Optional[Dict[str, Any]] = None, **attributes) -> Iterator[Span]:
+    """
+    Opens the root span of one attempt of a run. When the block exits the
+    attempt's spans are passed to exporter(resource_spans), even if it raised.
+    """
+    trace = Trace(run_id, resource)
+    try:
+        with _open_span(trace, None, name, KIND_INTERNAL, {"run_id": run_id, **attributes}) as root:
+            yield root
+    finally:
+        try:
+            exporter(trace.export())
+        except Exception as e:
+            # Losing a trace must never fail the job it describes
+            print(f"Trace export for run {run_id} failed: {e}")
@@ -1,10 +1,46 @@
+import asyncio
 from fastapi import FastAPI
-from app.api.routes import router as api_router
+from fastapi.responses import Response
+from app.api.routes import router as api_router, case_cache, get_cached_dominion
+from app.core.config import load_config
+from app.core.executors import shutdown_executors
+from app.core.job_queue import JobQueue, JobRunner
+from app.core.stores import AuditLog, job_events
+from app.core import metrics
 
 app = FastAPI(title="LegalMind Engine", version="3.0")
 
 app.include_router(api_router, prefix="/api")
 
+@app.on_event("startup")
+async def start_job_runner():
+    config = load_config()
+    queue = JobQueue.for_storage(config.STORAGE_PATH, config)
+    queue.report_metrics()
+    app.state.job_runner_stop = asyncio.Event()
+    if config.JOB_EXECUTION_MODE == "worker":
+        # Jobs run in app.worker processes; only their events are delivered here
+        job_events.attach_log(queue)
+        task = job_events.relay(queue, app.state.job_runner_stop, config.JOB_EVENT_POLL_INTERVAL)
+    else:
+        # Picks up jobs queued before a restart and ones whose worker died mid-run
+        task = JobRunner(queue, get_cached_dominion, config=config).run_forever(app.state.job_runner_stop)
+    app.state.job_runner_task = asyncio.create_task(task)
+
+@app.on_event("shutdown")
+async def stop_job_runner():
+    app.state.job_runner_stop.set()
+    await app.state.job_runner_task
+    await asyncio.to_thread(case_cache.clear)
+    shutdown_executors()
+    # Jobs are stopped, so nothing else will be logged; make the audit trail durable
+    await asyncio.to_thread(AuditLog.close)
+
 @app.get("/")
 def read_root():
     return {"message": "LegalMind Engine v3.0 is running"}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Collectors read SQLite (queue depth), so keep them off the event loop
+    return Response(await asyncio.to_thread(metrics.render), media_type=metrics.CONTENT_TYPE)
@@ -60,6 +60,7 @@ class RunStatus(str, Enum):
     RUNNING = "running"
     COMPLETE = "complete"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 # --- Models ---
 
@@ -119,6 +120,12 @@ class VerificationFinding(BaseModel):
     confidence: ConfidenceLevel
     warnings: List[str] = []
 
+class CitationOccurrence(BaseModel):
+    citation_text: str
+    form: str  # full, short, supra, id
+    start: int  # Character offsets into the submitted text
+    end: int
+
 class CitationFinding(BaseModel):
     citation_text: str
     normalized_form: str
@@ -127,6 +134,7 @@ class CitationFinding(BaseModel):
     case_details: Dict[str, str]  # name, date, court, url
     reconciliation_notes: str
     source_pass: str  # local, api, both
+    occurrences: List[CitationOccurrence] = []
 
 class GateResult(BaseModel):
     document_id: str
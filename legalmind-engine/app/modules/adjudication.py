@@ -3,9 +3,14 @@ import json
 import re
 from app.core.stores import CaseContext
 from app.core.config import load_config
+from app.core.cancellation import check_cancelled, deadline_kwargs
+from app.core.metrics import observe_llm_call
+from app.core.scheduling import llm_budget
 from app.models import Claim, EvidenceBundle, VerificationFinding, VerificationStatus, ConfidenceLevel, Justification
 from typing import List, Optional
-import litellm
+from app.core.lazy import lazy_import
+
+litellm = lazy_import("litellm")
 
 class Adjudication:
     def __init__(self, case_context: CaseContext):
@@ -40,12 +45,18 @@ class Adjudication:
             if not os.getenv("OPENAI_API_KEY") and self.config.LLM_PROVIDER == "openai":
                  return self._heuristic_verify(claim, bundle)
 
-            response = litellm.completion(
+            check_cancelled()
+            response = observe_llm_call(
+                "verify", self.case_context.case_id, litellm.completion,
+                modality=claim.expected_modality,
                 model=self.config.LLM_MODEL_NAME,
                 messages=[{"role": "user", "content": prompt}],
-                api_base="http://localhost:1234/v1" if self.config.LLM_PROVIDER == "lmstudio" else None,
-                max_tokens=500
+                api_base=self.config.LLM_API_BASE or ("http://localhost:1234/v1" if self.config.LLM_PROVIDER == "lmstudio" else None),
+                max_tokens=500,
+                # A job deadline also bounds the call already in flight
+                **deadline_kwargs()
             )
+            llm_budget.charge_response(self.case_context.case_id, response)
             content = response.choices[0].message.content
 
             # Simple parsing of the JSON or text response
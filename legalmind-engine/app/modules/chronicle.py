@@ -1,148 +1,181 @@
 import os
 import shutil
-import docx
+import tempfile
+import contextlib
+import threading
+from concurrent.futures import Future
 from typing import Dict, Any, List, Optional
-from jinja2 import Template
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from app.core.stores import CaseContext
 from app.core.config import Config, load_config
+from app.core.cancellation import check_cancelled, result_or_cancel
+from app.core.executors import submit_cpu
+from app.core.metrics import cache_requests, track_stage
+from app.core.tracing import span
 from app.models import GateResult, VerificationFinding, CitationFinding, FilingRecommendation
+from app.core.lazy import lazy_import
+
+docx = lazy_import("docx")
+
+REPORT_FORMATS = ("html", "docx", "pdf")
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+
+# Compiled once per process; auto_reload off so renders never stat the template file
+_template_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False
+)
+
+# pdf path -> [lock, callers holding or waiting on it]; entries go once the last caller is done
+_pdf_locks: Dict[str, list] = {}
+_pdf_locks_lock = threading.Lock()
+
+def render_html(path: str, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]], gate_result: Optional[GateResult], config: Config) -> str:
+    html = _template_env.get_template("report.html").render(
+        findings=findings,
+        citation_findings=citation_findings,
+        gate_result=gate_result,
+        config=config,
+        export_raw=config.EXPORT_RAW_EVIDENCE
+    )
+    with open(path, "w") as f:
+        f.write(html)
+    return path
+
+def render_docx(path: str, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]], gate_result: Optional[GateResult], config: Config) -> str:
+    doc = docx.Document()
+    doc.add_heading("LegalMind Audit Report", 0)
+
+    if gate_result:
+        doc.add_heading("Pre-Filing Gate", 1)
+        doc.add_paragraph(f"Recommendation: {gate_result.filing_recommendation.value}")
+        doc.add_paragraph(f"Risk Score: {gate_result.risk_score}")
+        doc.add_paragraph(f"Timestamp: {gate_result.timestamp}")
+
+    if findings:
+        doc.add_heading("Fact Verification", 1)
+        for finding in findings:
+            doc.add_heading(f"Claim: {finding.claim_id}", 2)
+            doc.add_paragraph(f"Status: {finding.status.value}")
+            doc.add_paragraph(f"Confidence: {finding.confidence.value}")
+            if config.EXPORT_RAW_EVIDENCE and finding.quotes_with_provenance:
+                doc.add_paragraph(finding.quotes_with_provenance[0], style="Quote")
+
+    if citation_findings:
+        doc.add_heading("Citation Verification", 1)
+        for citation in citation_findings:
+            doc.add_paragraph(f"{citation.citation_text} - {citation.status.value}")
+
+    # Transparency
+    doc.add_heading("System Transparency", 1)
+    doc.add_paragraph(f"Model Provider: {config.LLM_PROVIDER}")
+    doc.add_paragraph(f"Raw Evidence Export: {config.EXPORT_RAW_EVIDENCE}")
+
+    doc.save(path)
+    return path
+
+def render_pdf(html_path: str, path: str) -> str:
+    from weasyprint import HTML
+    # Write beside the target and rename so a concurrent download never sees a partial file;
+    # the temp name is unique, since API and worker processes may render the same report
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".pdf.tmp")
+    os.close(fd)
+    try:
+        HTML(filename=html_path).write_pdf(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return path
 
 class Chronicle:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
         self.config = load_config()
 
-    def render_report(self, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]] = None, gate_result: Optional[GateResult] = None) -> str:
-        # Default to HTML
-        html_path = self.html_renderer(findings, citation_findings, gate_result)
-
-        # Render others
-        self.docx_renderer(findings, citation_findings, gate_result)
-        self.pdf_renderer(html_path)
-
-        return html_path
+    def render_report(self, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]] = None, gate_result: Optional[GateResult] = None, formats: Optional[List[str]] = None, run_id: Optional[str] = None) -> str:
+        """
+        Renders the requested formats concurrently and returns the HTML path.
+        HTML is always produced (it is the PDF source); DOCX and PDF render in
+        worker processes. PDF is left to ensure_pdf unless asked for here.
+        With a run_id the files go to reports/<run_id>/ so runs never collide.
+        """
+        with track_stage("render", self.case_context.case_id), span("Chronicle.render_report", formats=formats) as render_span:
+            formats = self._requested_formats(formats)
+            render_span.set_attribute("formats", formats)
+            check_cancelled()
+            os.makedirs(self.report_dir(run_id), exist_ok=True)
+            pending = []
+            if "docx" in formats:
+                pending.append(self._submit(render_docx, self.report_path("docx", run_id), findings, citation_findings, gate_result, self.config))
+
+            html_path = render_html(self.report_path("html", run_id), findings, citation_findings, gate_result, self.config)
+            if "pdf" in formats:
+                pending.append(self._submit(render_pdf, html_path, self.report_path("pdf", run_id)))
+
+            try:
+                for future in pending:
+                    result_or_cancel(future)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+            return html_path
+
+    def _requested_formats(self, formats: Optional[List[str]]) -> List[str]:
+        requested = [f.lower() for f in (formats or self.config.REPORT_FORMATS)]
+        unknown = [f for f in requested if f not in REPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unsupported report format(s): {', '.join(unknown)}")
+        return requested
+
+    def _submit(self, func, *args) -> Future:
+        # The shared CPU pool; falls back to rendering here when it is unavailable
+        return submit_cpu(func, *args)
+
+    def report_dir(self, run_id: Optional[str] = None) -> str:
+        if run_id is None:
+            return self.case_context.base_path
+        return os.path.join(self.case_context.base_path, "reports", run_id)
+
+    def report_path(self, fmt: str, run_id: Optional[str] = None) -> str:
+        return os.path.join(self.report_dir(run_id), f"report.{fmt}")
 
     def html_renderer(self, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]], gate_result: Optional[GateResult]) -> str:
-        template_str = """
-        <html>
-        <head>
-            <title>LegalMind Audit Report</title>
-            <style>
-                body { font-family: sans-serif; }
-                .finding { border-bottom: 1px solid #ccc; padding: 10px; }
-                .citation { border-bottom: 1px solid #eee; padding: 10px; }
-                .gate { background-color: #f0f0f0; padding: 20px; border: 1px solid #999; margin-bottom: 20px; }
-                .recommendation-CLEAR { color: green; font-weight: bold; }
-                .recommendation-REVIEW_REQUIRED { color: orange; font-weight: bold; }
-                .recommendation-DO_NOT_FILE { color: red; font-weight: bold; }
-                .transparency { font-size: 0.8em; color: #666; margin-top: 50px; border-top: 1px solid #ccc; padding-top: 10px; }
-            </style>
-        </head>
-        <body>
-            <h1>LegalMind Audit Report</h1>
-
-            {% if gate_result %}
-            <div class="gate">
-                <h2>Pre-Filing Gate</h2>
-                <p>Recommendation: <span class="recommendation-{{ gate_result.filing_recommendation.name }}">{{ gate_result.filing_recommendation.value }}</span></p>
-                <p>Risk Score: {{ gate_result.risk_score }}</p>
-                <p>Timestamp: {{ gate_result.timestamp }}</p>
-            </div>
-            {% endif %}
-
-            {% if findings %}
-            <h2>Fact Verification</h2>
-            {% for finding in findings %}
-                <div class="finding">
-                    <h3>Claim: {{ finding.claim_id }}</h3>
-                    <p>Status: {{ finding.status.value }}</p>
-                    <p>Confidence: {{ finding.confidence.value }}</p>
-                    {% if export_raw and finding.quotes_with_provenance %}
-                        <blockquote>{{ finding.quotes_with_provenance[0] }}</blockquote>
-                    {% endif %}
-                </div>
-            {% endfor %}
-            {% endif %}
-
-            {% if citation_findings %}
-            <h2>Citation Verification</h2>
-            {% for citation in citation_findings %}
-                <div class="citation">
-                    <h3>{{ citation.citation_text }}</h3>
-                    <p>Status: {{ citation.status.value }}</p>
-                    <p>Case: {{ citation.case_details.name }} ({{ citation.case_details.date }})</p>
-                </div>
-            {% endfor %}
-            {% endif %}
-
-            <div class="transparency">
-                <h3>System Transparency</h3>
-                {% if gate_result %}
-                <p>Engine Version: {{ gate_result.config_snapshot.engine_version }}</p>
-                <p>Model: {{ gate_result.config_snapshot.model }}</p>
-                <p>Retrieval Mode: {{ gate_result.config_snapshot.retrieval_mode }}</p>
-                {% else %}
-                <p>Engine Version: 3.0</p>
-                <p>Model Provider: {{ config.LLM_PROVIDER }}</p>
-                {% endif %}
-                <p>Raw Evidence Export: {{ config.EXPORT_RAW_EVIDENCE }}</p>
-                <p>This report was generated by LegalMind. Verify all findings independently.</p>
-            </div>
-        </body>
-        </html>
-        """
-        template = Template(template_str)
-        html = template.render(
-            findings=findings,
-            citation_findings=citation_findings,
-            gate_result=gate_result,
-            config=self.config,
-            export_raw=self.config.EXPORT_RAW_EVIDENCE
-        )
-
-        report_path = os.path.join(self.case_context.base_path, "report.html")
-        with open(report_path, "w") as f:
-            f.write(html)
-        return report_path
+        return render_html(self.report_path("html"), findings, citation_findings, gate_result, self.config)
 
     def docx_renderer(self, findings: List[VerificationFinding], citation_findings: Optional[List[CitationFinding]], gate_result: Optional[GateResult]):
-        doc = docx.Document()
-        doc.add_heading("LegalMind Audit Report", 0)
-
-        if gate_result:
-            doc.add_heading("Pre-Filing Gate", 1)
-            doc.add_paragraph(f"Recommendation: {gate_result.filing_recommendation.value}")
-            doc.add_paragraph(f"Risk Score: {gate_result.risk_score}")
-            doc.add_paragraph(f"Timestamp: {gate_result.timestamp}")
-
-        if findings:
-            doc.add_heading("Fact Verification", 1)
-            for finding in findings:
-                doc.add_heading(f"Claim: {finding.claim_id}", 2)
-                doc.add_paragraph(f"Status: {finding.status.value}")
-                doc.add_paragraph(f"Confidence: {finding.confidence.value}")
-                if self.config.EXPORT_RAW_EVIDENCE and finding.quotes_with_provenance:
-                    doc.add_paragraph(finding.quotes_with_provenance[0], style="Quote")
-
-        if citation_findings:
-            doc.add_heading("Citation Verification", 1)
-            for citation in citation_findings:
-                doc.add_paragraph(f"{citation.citation_text} - {citation.status.value}")
-
-        # Transparency
-        doc.add_heading("System Transparency", 1)
-        doc.add_paragraph(f"Model Provider: {self.config.LLM_PROVIDER}")
-        doc.add_paragraph(f"Raw Evidence Export: {self.config.EXPORT_RAW_EVIDENCE}")
-
-        path = os.path.join(self.case_context.base_path, "report.docx")
-        doc.save(path)
-        return path
+        return render_docx(self.report_path("docx"), findings, citation_findings, gate_result, self.config)
 
     def pdf_renderer(self, html_path: str):
-        from weasyprint import HTML
-        path = os.path.join(self.case_context.base_path, "report.pdf")
-        HTML(filename=html_path).write_pdf(path)
-        return path
+        return render_pdf(html_path, os.path.join(os.path.dirname(html_path), "report.pdf"))
+
+    def ensure_pdf(self, html_path: str) -> str:
+        """
+        Returns the PDF for a rendered HTML report, generating it on first
+        request. Concurrent callers for the same report wait for one render.
+        """
+        pdf_path = os.path.join(os.path.dirname(html_path), "report.pdf")
+        with _pdf_locks_lock:
+            entry = _pdf_locks.setdefault(pdf_path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # A PDF older than its HTML belongs to an earlier render
+                if not os.path.exists(pdf_path) or os.path.getmtime(pdf_path) < os.path.getmtime(html_path):
+                    cache_requests.inc(cache="report_pdf", result="miss")
+                    with track_stage("render", self.case_context.case_id, "pdf"):
+                        self._submit(render_pdf, html_path, pdf_path).result()
+                else:
+                    cache_requests.inc(cache="report_pdf", result="hit")
+        finally:
+            with _pdf_locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del _pdf_locks[pdf_path]
+        return pdf_path
 
     def executive_summarizer(self, findings: Any): pass
     def quality_dashboard(self): pass
@@ -1,34 +1,64 @@
 import uuid
-import pdfplumber
-import docx
+import time
 import shutil
 import os
-from typing import List, Optional
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
 from PIL import Image
 from app.core.stores import CaseContext
 from app.core.config import load_config
+from app.core.cancellation import check_cancelled, result_or_cancel
+from app.core.executors import cpu_workers, submit_cpu
+from app.core.metrics import stage_seconds, track_stage
 from app.models import EvidenceSegment, Modality
-
-# Optional imports for multi-modal support
-try:
-    import whisper
-except ImportError:
-    whisper = None
-
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
-
-try:
-    import ffmpeg
-except ImportError:
-    ffmpeg = None
-
-try:
-    from pdf2image import convert_from_path
-except ImportError:
-    convert_from_path = None
+from app.core.lazy import lazy_import, optional_import
+
+pdfplumber = lazy_import("pdfplumber")
+docx = lazy_import("docx")
+
+# Optional imports for multi-modal support (whisper, which pulls in torch, is imported by WhisperModelManager)
+pytesseract = optional_import("pytesseract")
+ffmpeg = optional_import("ffmpeg")
+pdf2image = optional_import("pdf2image")
+
+# Pages parsed per worker-process task
+PDF_PAGE_BATCH = 4
+
+def pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+def parse_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[str, List[Any], float, float]]:
+    """
+    Text and tables of pages [start, stop) with the seconds each took.
+    Runs in a CPU worker process, so it only returns plain data.
+    """
+    pages = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            started = time.perf_counter()
+            text = page.extract_text()
+            text_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            tables = page.extract_tables()
+            pages.append((text, tables, text_seconds, time.perf_counter() - started))
+    return pages
+
+def docx_paragraphs(file_path: str) -> List[str]:
+    """Text of every paragraph, empty ones included so positions match the document."""
+    return [para.text for para in docx.Document(file_path).paragraphs]
+
+def ocr_image_file(file_path: str) -> str:
+    return pytesseract.image_to_string(Image.open(file_path))
+
+def ocr_pdf_pages(file_path: str, first_page: Optional[int] = None, last_page: Optional[int] = None) -> List[str]:
+    """
+    Rasterizes pages (1-based, inclusive; all by default) and OCRs each.
+    Runs in a CPU worker process, so it only returns the text.
+    """
+    images = pdf2image.convert_from_path(file_path, first_page=first_page, last_page=last_page)
+    return [pytesseract.image_to_string(image) for image in images]
 
 class WhisperModelManager:
     _instance = None
@@ -42,7 +72,9 @@ class WhisperModelManager:
         return cls._instance
 
     def get_model(self, model_name: str = None):
-        if not whisper:
+        try:
+            import whisper
+        except ImportError:
             return None
 
         config = load_config()
@@ -70,12 +102,39 @@ class Conversion:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
 
-    def ingest_pdf_layout(self, file_path: str, source_asset_id: str) -> List[EvidenceSegment]:
+    def ingest_pdf_layout(self, file_path: str, source_asset_id: str, start_page: int = 0, on_page: Optional[Callable[[int], None]] = None) -> List[EvidenceSegment]:
+        """
+        Extracts text and tables page by page. start_page (0-based) skips pages
+        a previous attempt already wrote to the ledger; on_page is called with
+        the number of pages completed so callers can checkpoint.
+
+        Pages are parsed in batches on the shared CPU pool, a few batches ahead
+        of the one being written, while ledger writes, OCR fallback and
+        checkpoints stay in this thread and in page order.
+        """
         segments = []
+        case_id = self.case_context.case_id
+        pending: Deque[Tuple[int, Future]] = deque()
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    text = page.extract_text()
+            page_count = pdf_page_count(file_path)
+            batches = iter(range(start_page, page_count, PDF_PAGE_BATCH))
+            ahead = max(1, cpu_workers())
+
+            def fill():
+                while len(pending) < ahead:
+                    first = next(batches, None)
+                    if first is None:
+                        return
+                    pending.append((first, submit_cpu(parse_pdf_pages, file_path, first, min(first + PDF_PAGE_BATCH, page_count))))
+
+            fill()
+            while pending:
+                first, future = pending.popleft()
+                pages = result_or_cancel(future)
+                fill()
+                for i, (text, tables, text_seconds, table_seconds) in enumerate(pages, first):
+                    check_cancelled()
+                    stage_seconds.observe(text_seconds, stage="pdf_parse", case=case_id, modality=Modality.PDF_TEXT.value)
                     if text and len(text.strip()) > 50:
                         segment = EvidenceSegment(
                             segment_id=str(uuid.uuid4()),
@@ -91,16 +150,12 @@ class Conversion:
                         segments.append(segment)
                         self.case_context.ledger.append_segment(segment)
                     else:
-                        # Fallback to OCR for this page if possible
-                        # Extract single page as image?
-                        # pdf2image converts whole PDF or ranges.
-                        # For simplicity/efficiency, we might just mark for OCR or do it here.
-                        # Calling internal helper
+                        # No usable text layer: OCR this page if possible
                         ocr_segments = self._ocr_page_fallback(file_path, i+1, source_asset_id)
                         segments.extend(ocr_segments)
 
                     # Basic table extraction (can be improved)
-                    tables = page.extract_tables()
+                    stage_seconds.observe(table_seconds, stage="pdf_parse", case=case_id, modality=Modality.PDF_TABLE.value)
                     for table in tables:
                         table_text = self._table_to_markdown(table)
                         if table_text:
@@ -118,17 +173,25 @@ class Conversion:
                             segments.append(segment)
                             self.case_context.ledger.append_segment(segment)
 
+                    if on_page:
+                        on_page(i + 1)
+
         except Exception as e:
             print(f"Error processing PDF {file_path}: {e}")
             # Should log to audit log
+        finally:
+            for _, future in pending:
+                future.cancel()
         return segments
 
     def ingest_docx(self, file_path: str, source_asset_id: str) -> List[EvidenceSegment]:
         segments = []
         try:
-            doc = docx.Document(file_path)
-            for i, para in enumerate(doc.paragraphs):
-                text = para.text.strip()
+            with track_stage("docx_parse", self.case_context.case_id, Modality.PDF_TEXT):
+                paragraphs = result_or_cancel(submit_cpu(docx_paragraphs, file_path))
+            for i, para_text in enumerate(paragraphs):
+                check_cancelled()
+                text = para_text.strip()
                 if text:
                     segment = EvidenceSegment(
                         segment_id=str(uuid.uuid4()),
@@ -159,10 +222,14 @@ class Conversion:
 
         if model and has_ffmpeg:
             try:
-                result = model.transcribe(file_path)
+                # A single transcription cannot be interrupted; check before starting it
+                check_cancelled()
+                with track_stage("whisper", self.case_context.case_id, modality):
+                    result = model.transcribe(file_path)
 
                 # Ideally map result['segments'] to EvidenceSegments
                 for s in result.get('segments', []):
+                    check_cancelled()
                     segment = EvidenceSegment(
                         segment_id=str(uuid.uuid4()),
                         source_asset_id=source_asset_id,
@@ -290,9 +357,10 @@ class Conversion:
 
         if pytesseract and has_tesseract:
             try:
-                image = Image.open(file_path)
-                segment = self._process_ocr_image(
-                    image,
+                with track_stage("ocr", self.case_context.case_id, Modality.OCR_PRINTED):
+                    text = result_or_cancel(submit_cpu(ocr_image_file, file_path))
+                segment = self._ocr_segment(
+                    text,
                     source_asset_id,
                     location="image_full",
                     extraction_method="tesseract",
@@ -312,15 +380,18 @@ class Conversion:
         # Explicit OCR ingestion for a file (PDF or Image)
         # Convert PDF to images -> OCR
         segments = []
-        if not convert_from_path or not pytesseract or shutil.which("tesseract") is None:
+        if not pdf2image or not pytesseract or shutil.which("tesseract") is None:
             print("OCR tools missing")
             return segments
 
         try:
-            images = convert_from_path(file_path)
-            for i, image in enumerate(images):
-                segment = self._process_ocr_image(
-                    image,
+            # Rasterizing and OCR run together in a worker process
+            with track_stage("ocr", self.case_context.case_id, Modality.OCR_PRINTED):
+                pages = result_or_cancel(submit_cpu(ocr_pdf_pages, file_path))
+            for i, text in enumerate(pages):
+                check_cancelled()
+                segment = self._ocr_segment(
+                    text,
                     source_asset_id,
                     location=f"page_{i+1}",
                     extraction_method="tesseract",
@@ -338,15 +409,16 @@ class Conversion:
         # Helper to OCR a specific page.
         # pdf2image is efficient enough to get one page
         segments = []
-        if not convert_from_path or not pytesseract or shutil.which("tesseract") is None:
+        if not pdf2image or not pytesseract or shutil.which("tesseract") is None:
             return segments
 
         try:
             # pdf2image uses 1-based indexing for first_page/last_page
-            images = convert_from_path(file_path, first_page=page_num, last_page=page_num)
-            if images:
-                segment = self._process_ocr_image(
-                    images[0],
+            with track_stage("ocr", self.case_context.case_id, Modality.OCR_PRINTED):
+                pages = result_or_cancel(submit_cpu(ocr_pdf_pages, file_path, page_num, page_num))
+            if pages:
+                segment = self._ocr_segment(
+                    pages[0],
                     source_asset_id,
                     location=f"page_{page_num}",
                     extraction_method="pdf_fallback_ocr",
@@ -359,9 +431,8 @@ class Conversion:
             print(f"Fallback OCR failed for page {page_num}: {e}")
         return segments
 
-    def _process_ocr_image(self, image: Image.Image, source_asset_id: str, location: str, extraction_method: str, warnings: List[str], confidence: float = 0.8) -> Optional[EvidenceSegment]:
+    def _ocr_segment(self, text: str, source_asset_id: str, location: str, extraction_method: str, warnings: List[str], confidence: float = 0.8) -> Optional[EvidenceSegment]:
         try:
-            text = pytesseract.image_to_string(image)
             if text.strip():
                 segment = EvidenceSegment(
                     segment_id=str(uuid.uuid4()),
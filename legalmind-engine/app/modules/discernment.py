@@ -1,48 +1,238 @@
 import uuid
-import docx
 import os
 import json
 import re
-import litellm
-from typing import List
+import hashlib
+from concurrent.futures import as_completed
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from app.core.stores import CaseContext
 from app.core.config import load_config
+from app.core.cancellation import check_cancelled, deadline_kwargs
+from app.core.executors import llm_lane
+from app.core.metrics import observe_llm_call
+from app.core.scheduling import llm_budget
 from app.models import Claim, ClaimType, RoutingDecision
+from app.core.lazy import lazy_import
+
+docx = lazy_import("docx")
+litellm = lazy_import("litellm")
+
+# (paragraph index, paragraph text); index is 1-based to match Conversion's para_N locations
+Paragraph = Tuple[int, str]
+
+# Numbered headings ("I.", "A.", "3.") and the standard brief section titles
+_HEADING_PATTERN = re.compile(
+    r"^(?:[IVXLC]+\.|[A-Z]\.|\d+\.)\s+\S"
+    r"|^(?:STATEMENT OF|SUMMARY OF|ARGUMENT|CONCLUSION|INTRODUCTION|BACKGROUND|PRELIMINARY STATEMENT)",
+)
+
+# MinHash over the Mersenne prime 2**61 - 1 with fixed coefficients so signatures are stable across runs
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PERMUTATIONS = 64
+_MINHASH_BANDS = 16
+_MINHASH_COEFFS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), "big") % _MINHASH_PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), "big") % _MINHASH_PRIME)
+    for i in range(_MINHASH_PERMUTATIONS)
+]
+
+class ClaimClusterer:
+    """
+    Incremental MinHash/LSH index over claim text. Each claim is either mapped
+    onto an earlier near-identical claim (its representative) or becomes the
+    representative of a new cluster.
+    """
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.rows = _MINHASH_PERMUTATIONS // _MINHASH_BANDS
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self.representatives: Dict[str, Tuple[Claim, Set[str]]] = {}
+
+    def assign(self, claim: Claim) -> Optional[Claim]:
+        """Returns the representative claim if one matches, otherwise registers claim and returns None."""
+        shingles = self._shingles(claim.text)
+        if not shingles:
+            return None
+        bands = self._bands(self._signature(shingles))
+
+        candidates = []
+        for key in bands:
+            for claim_id in self.buckets.get(key, []):
+                if claim_id not in candidates:
+                    candidates.append(claim_id)
+
+        for claim_id in candidates:
+            representative, rep_shingles = self.representatives[claim_id]
+            # Retrieval filters on modality, so only merge claims that would retrieve alike
+            if representative.expected_modality != claim.expected_modality:
+                continue
+            if len(shingles & rep_shingles) / len(shingles | rep_shingles) >= self.threshold:
+                return representative
+
+        self.representatives[claim.claim_id] = (claim, shingles)
+        for key in bands:
+            self.buckets.setdefault(key, []).append(claim.claim_id)
+        return None
+
+    def _shingles(self, text: str) -> Set[str]:
+        tokens = re.findall(r"\w+", text.lower())
+        if len(tokens) < 3:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+        return [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in _MINHASH_COEFFS]
+
+    def _bands(self, signature: List[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(_MINHASH_BANDS)]
 
 class Discernment:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
+        self.config = load_config()
 
     def extract_claims(self, file_path: str) -> List[Claim]:
-        # Read text first
+        paragraphs = self._read_paragraphs(file_path)
+        if paragraphs is None:
+            return []
+
+        # Try LLM first
+        if self._llm_enabled():
+            full_text = "\n".join([text for _, text in paragraphs])
+            return self.llm_decomposer(full_text, paragraphs)
+
+        # Fallback to heuristic
+        return self._heuristic_paragraphs(paragraphs)
+
+    def stream_claims(self, file_path: str) -> Iterator[Claim]:
+        """
+        Yields claims as soon as each brief window is decomposed, so callers can
+        start verifying before extraction finishes. Order follows window
+        completion rather than document order.
+        """
+        paragraphs = self._read_paragraphs(file_path)
+        if paragraphs is None:
+            return
+
+        if not self._llm_enabled():
+            yield from self._heuristic_paragraphs(paragraphs)
+            return
+
+        seen: Set[str] = set()
+        for _, claims in self._decompose_windows(self.section_splitter(paragraphs)):
+            yield from self._unseen_claims(claims, seen)
+
+    def _read_paragraphs(self, file_path: str) -> Optional[List[Paragraph]]:
         try:
             doc = docx.Document(file_path)
-            full_text = "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
+            return [(i + 1, p.text) for i, p in enumerate(doc.paragraphs) if p.text.strip()]
         except Exception as e:
             print(f"Error reading doc for claims: {e}")
-            return []
+            return None
 
-        # Try LLM first
+    def _llm_enabled(self) -> bool:
         config = load_config()
-        if config.CLOUD_MODEL_ALLOWED and os.getenv("OPENAI_API_KEY"):
-            return self.llm_decomposer(full_text)
+        return bool(config.CLOUD_MODEL_ALLOWED and os.getenv("OPENAI_API_KEY"))
 
-        # Fallback to heuristic
-        return self._heuristic_extract(full_text)
+    def llm_decomposer(self, text: str, paragraphs: Optional[List[Paragraph]] = None) -> List[Claim]:
+        """
+        Extracts claims from the whole brief by splitting it into section-aware
+        windows and decomposing the windows concurrently.
+        """
+        if paragraphs is None:
+            paragraphs = [(i + 1, p) for i, p in enumerate(text.split("\n")) if p.strip()]
+
+        windows = self.section_splitter(paragraphs)
+        results = dict(self._decompose_windows(windows))
+        return self.claim_merger([results[i] for i in range(len(windows))])
 
-    def llm_decomposer(self, text: str) -> List[Claim]:
+    def _decompose_windows(self, windows: List[List[Paragraph]]) -> Iterator[Tuple[int, List[Claim]]]:
+        # Yields (window index, claims) in completion order
+        if not windows:
+            return
+        # Windows share the process-wide LLM lane with every other job; each runs
+        # in a copy of this context so it sees the job's cancellation token
+        futures = {llm_lane.submit(self._decompose_window, window): i for i, window in enumerate(windows)}
         try:
-            response = litellm.completion(
-                model=load_config().LLM_MODEL_NAME,
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def section_splitter(self, paragraphs: List[Paragraph], max_chars: Optional[int] = None, overlap_chars: Optional[int] = None) -> List[List[Paragraph]]:
+        """
+        Groups paragraphs into windows of roughly max_chars. Windows break at
+        section headings once they are at least half full, otherwise at the
+        paragraph boundary that would overflow them. Paragraph-boundary breaks
+        carry up to overlap_chars of trailing paragraphs into the next window
+        so claims spanning the break are still seen whole.
+        """
+        max_chars = max_chars or self.config.CLAIM_WINDOW_CHARS
+        overlap_chars = self.config.CLAIM_WINDOW_OVERLAP_CHARS if overlap_chars is None else overlap_chars
+
+        windows = []
+        current: List[Paragraph] = []
+        size = 0
+
+        for index, para_text in paragraphs:
+            is_heading = self._is_heading(para_text)
+            overflow = size + len(para_text) > max_chars
+            if current and (overflow or (is_heading and size >= max_chars // 2)):
+                windows.append(current)
+
+                carry: List[Paragraph] = []
+                if not is_heading:
+                    carried = 0
+                    # Never carry the whole window, or the next one starts as a duplicate
+                    for para in reversed(current[1:]):
+                        if carried + len(para[1]) > overlap_chars:
+                            break
+                        carry.insert(0, para)
+                        carried += len(para[1])
+
+                current = carry
+                size = sum(len(p[1]) for p in carry)
+
+            current.append((index, para_text))
+            size += len(para_text)
+
+        if current:
+            windows.append(current)
+        return windows
+
+    def _is_heading(self, text: str) -> bool:
+        text = text.strip()
+        if not text or len(text) > 120:
+            return False
+        if _HEADING_PATTERN.match(text):
+            return True
+        letters = [c for c in text if c.isalpha()]
+        return bool(letters) and all(c.isupper() for c in letters)
+
+    def _decompose_window(self, window: List[Paragraph]) -> List[Claim]:
+        window_text = "\n".join([f"[{index}] {para_text}" for index, para_text in window])
+        config = load_config()
+        check_cancelled()
+        try:
+            response = observe_llm_call(
+                # Briefs are also parsed for callers without a case workspace
+                "extract_claims", getattr(self.case_context, "case_id", None), litellm.completion,
+                model=config.LLM_MODEL_NAME,
                 messages=[{
                     "role": "system",
-                    "content": "Extract factual claims from the legal text. Return a JSON list of objects with 'text', 'type', 'priority' (1-5)."
+                    "content": "Extract factual claims from the legal text. Each paragraph is prefixed with its index in brackets. "
+                               "Return a JSON list of objects with 'text', 'type', 'priority' (1-5) and 'paragraph' (the index of the paragraph the claim comes from)."
                 }, {
                     "role": "user",
-                    "content": text[:10000] # Truncate for safety in this stub
+                    "content": window_text
                 }],
-                max_tokens=2000
+                max_tokens=2000,
+                **({"api_base": config.LLM_API_BASE} if config.LLM_API_BASE else {}),
+                **deadline_kwargs()
             )
+            llm_budget.charge_response(getattr(self.case_context, "case_id", None), response)
             content = response.choices[0].message.content
             # Parse JSON
             match = re.search(r'\[.*\]', content, re.DOTALL)
@@ -50,11 +240,12 @@ class Discernment:
                 data = json.loads(match.group(0))
                 claims = []
                 for item in data:
+                    claim_text = item.get("text", "")
                     claim = Claim(
                         claim_id=str(uuid.uuid4()),
-                        text=item.get("text", ""),
+                        text=claim_text,
                         type=ClaimType.FACTUAL, # Default or map from item['type']
-                        source_location="llm_extracted",
+                        source_location=f"para_{self._locate_paragraph(item.get('paragraph'), claim_text, window)}",
                         priority=item.get("priority", 1),
                         routing=RoutingDecision.VERIFY
                     )
@@ -64,9 +255,52 @@ class Discernment:
         except Exception as e:
             print(f"LLM extraction failed: {e}")
 
-        return self._heuristic_extract(text)
+        return self._heuristic_paragraphs(window)
+
+    def _locate_paragraph(self, reported: object, claim_text: str, window: List[Paragraph]) -> int:
+        indices = [index for index, _ in window]
+        try:
+            if int(reported) in indices:
+                return int(reported)
+        except (TypeError, ValueError):
+            pass
+
+        # Model did not report a usable index; pick the paragraph sharing the most words
+        claim_words = set(re.findall(r"\w+", claim_text.lower()))
+        best_index, best_overlap = indices[0], -1
+        for index, para_text in window:
+            overlap = len(claim_words & set(re.findall(r"\w+", para_text.lower())))
+            if overlap > best_overlap:
+                best_index, best_overlap = index, overlap
+        return best_index
+
+    def claim_merger(self, window_claims: List[List[Claim]]) -> List[Claim]:
+        """
+        Flattens per-window results in document order, dropping claims already
+        emitted by an overlapping window.
+        """
+        seen: Set[str] = set()
+        merged = []
+        for claims in window_claims:
+            merged.extend(self._unseen_claims(claims, seen))
+        return merged
+
+    def _unseen_claims(self, claims: List[Claim], seen: Set[str]) -> Iterator[Claim]:
+        for claim in claims:
+            key = " ".join(re.findall(r"\w+", claim.text.lower()))
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            yield claim
+
+    def claim_clusterer(self) -> ClaimClusterer:
+        return ClaimClusterer(threshold=self.config.CLAIM_DEDUP_THRESHOLD)
+
+    def _heuristic_paragraphs(self, paragraphs: List[Paragraph]) -> List[Claim]:
+        # Per paragraph, so heuristic claims keep the paragraph they came from
+        return [claim for index, para_text in paragraphs for claim in self._heuristic_extract(para_text, f"para_{index}")]
 
-    def _heuristic_extract(self, text: str) -> List[Claim]:
+    def _heuristic_extract(self, text: str, source_location: str = "heuristic_body") -> List[Claim]:
         claims = []
         sentences = text.replace("?", ".").replace("!", ".").split(".")
         for sent in sentences:
@@ -76,7 +310,7 @@ class Discernment:
                     claim_id=str(uuid.uuid4()),
                     text=sent,
                     type=ClaimType.FACTUAL,
-                    source_location="heuristic_body",
+                    source_location=source_location,
                     priority=1,
                     routing=RoutingDecision.VERIFY
                 )
@@ -1,85 +1,199 @@
 import uuid
+import time
 import asyncio
 import os
+import re
 import tempfile
-from app.core.stores import CaseContext
-from app.models import RunState, RunStatus
-from typing import Dict, Any, Optional
+import functools
+import threading
+import contextlib
+from app.core.stores import CaseContext, TERMINAL_STATUSES, file_lock
+from app.models import RunState, RunStatus, EvidenceSegment, Chunk
+from typing import Dict, Any, List, Optional
 from app.modules.intake import Intake
-from app.modules.conversion import Conversion
+from app.modules.conversion import Conversion, WhisperModelManager, docx_paragraphs
 from app.modules.structuring import Structuring
-from app.modules.preservation import Preservation
+from app.modules.preservation import Preservation, embedding_function
 from app.modules.discernment import Discernment
-from app.modules.inquiry import Inquiry
+from app.modules.inquiry import Inquiry, _load_cross_encoder
 from app.modules.adjudication import Adjudication
 from app.modules.chronicle import Chronicle
-from app.modules.validation import Validation
+from app.modules.validation import Validation, eyecite
 from app.modules.sentinel import Sentinel
 from app.core.config import load_config
+from app.core.job_queue import QUEUED, JobQueue, JobRunner, QueuedJob
+from app.core.cancellation import JobCancelled
+from app.core.executors import Lane, io_lane, llm_lane, run_cpu
+from app.core.metrics import retries_total
+from app.core.tracing import span, start_trace
+from app.core.profiling import profile_job
+from app.core.lazy import HEAVY_MODULES, preload
+
+WARMUP_COMPONENTS = ("imports", "embeddings", "citations", "reranker", "whisper")
+
+def _warm_imports(config) -> Dict[str, Any]:
+    missing = [name for name, ok in preload(HEAVY_MODULES).items() if not ok]
+    if missing:
+        raise ImportError(f"Not installed: {', '.join(missing)}")
+    return {"modules": list(HEAVY_MODULES)}
+
+def _warm_model(load, name: str) -> Dict[str, Any]:
+    if load() is None:
+        raise RuntimeError(f"Model {name} could not be loaded")
+    return {"model": name}
+
+_WARMUP_STEPS = {
+    "imports": _warm_imports,
+    "embeddings": lambda config: {"provider": config.EMBEDDING_PROVIDER, "function": type(embedding_function(config)).__name__},
+    # eyecite builds its reporter tokenizer on the first extraction
+    "citations": lambda config: {"citations": len(eyecite.get_citations("See Marbury v. Madison, 5 U.S. 137 (1803)."))},
+    "reranker": lambda config: _warm_model(lambda: _load_cross_encoder(config.RERANKER_MODEL), config.RERANKER_MODEL),
+    "whisper": lambda config: _warm_model(lambda: WhisperModelManager.get_instance().get_model(), config.WHISPER_MODEL_FAST),
+}
+
+def warmup(components: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Loads process-wide dependencies and models now instead of in the first
+    job that needs them. By default that is the heavy imports, the embedding
+    model, eyecite's tokenizer and, when RERANKER_ENABLED, the cross-encoder;
+    whisper only when asked for. Each component reports "ready" or
+    "unavailable" (with the error) and the seconds it took.
+    """
+    config = load_config()
+    if components is None:
+        components = ["imports", "embeddings", "citations"] + (["reranker"] if config.RERANKER_ENABLED else [])
+    report = {}
+    for component in components:
+        started = time.perf_counter()
+        try:
+            report[component] = {"status": "ready", **_WARMUP_STEPS[component](config)}
+        except Exception as e:
+            report[component] = {"status": "unavailable", "error": str(e)}
+        report[component]["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+def _page_of(segment: EvidenceSegment) -> int:
+    match = re.match(r"page_(\d+)", segment.location)
+    return int(match.group(1)) if match else 0
 
 class Dominion:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
         self.config = load_config()
-        self.kpi_stats = {"jobs_run": 0, "errors": 0}
-
-        # Initialize modules
-        self.intake = Intake(case_context)
-        self.conversion = Conversion(case_context)
-        self.structuring = Structuring(case_context)
-        self.preservation = Preservation(case_context)
-        self.discernment = Discernment(case_context)
-        self.inquiry = Inquiry(case_context)
-        self.adjudication = Adjudication(case_context)
-        self.chronicle = Chronicle(case_context)
-        self.validation = Validation(case_context)
-        self.sentinel = Sentinel(case_context)
-
-    async def workflow_ingest_case(self, file_path: str) -> RunState:
-        run_id = str(uuid.uuid4())
 
-        # Initial state
-        run_state = RunState(
-            run_id=run_id,
-            status=RunStatus.RUNNING,
-            progress=0.0
-        )
-        self.case_context.jobs.save_job(run_state)
+        # Modules are built on first use (see __getattr__), so a case that only
+        # cite-checks never opens Chroma or loads the embedding model
+        self._module_factories = {
+            "intake": Intake,
+            "conversion": Conversion,
+            "structuring": Structuring,
+            "preservation": Preservation,
+            "discernment": Discernment,
+            "inquiry": Inquiry,
+            "adjudication": Adjudication,
+            "chronicle": Chronicle,
+            "validation": Validation,
+            "sentinel": Sentinel,
+        }
+        self._modules_lock = threading.Lock()
+
+        self._job_queue = None
+        self._job_runner = None
+        self._background_tasks = set()
+        self._running_jobs = 0
+
+    def __getattr__(self, name: str):
+        # Only reached while the attribute is unset; jobs touch modules from worker threads, hence the lock
+        factories = self.__dict__.get("_module_factories", {})
+        if name not in factories:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        with self._modules_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = factories[name](self.case_context)
+        return self.__dict__[name]
+
+    def loaded_modules(self) -> List[str]:
+        return [name for name in self._module_factories if name in self.__dict__]
+
+    def warm(self) -> Dict[str, Any]:
+        """Builds every module and opens the case's Chroma collection now rather than on first use."""
+        for name in self._module_factories:
+            getattr(self, name)
+        try:
+            index = {"status": "ready", "chunks": self.preservation.collection.count()}
+        except Exception as e:
+            index = {"status": "unavailable", "error": str(e)}
+        return {"modules": self.loaded_modules(), "index": index}
 
-        # Launch background task
-        asyncio.create_task(self._run_ingest_job(run_id, file_path))
+    def busy(self) -> bool:
+        """True while a job of this case is starting or running here; the case cache keeps busy cases."""
+        return self._running_jobs > 0 or bool(self._background_tasks)
 
-        return run_state
+    def close(self):
+        """
+        Releases the modules built so far (Chroma clients, the BM25 index, the
+        CourtListener client). The Dominion stays usable and rebuilds them on
+        demand.
+        """
+        with self._modules_lock:
+            modules = [self.__dict__.pop(name) for name in self.loaded_modules()]
+        for module in modules:
+            close = getattr(module, "close", None)
+            if callable(close):
+                close()
+
+    @property
+    def job_queue(self) -> JobQueue:
+        # Jobs are queued under the storage root so any worker can pick them up
+        if self._job_queue is None:
+            self._job_queue = JobQueue.for_storage(os.path.dirname(os.path.abspath(self.case_context.base_path)), self.config)
+        return self._job_queue
+
+    @property
+    def job_runner(self) -> JobRunner:
+        if self._job_runner is None:
+            self._job_runner = JobRunner(self.job_queue, lambda case_id: self, config=self.config)
+        return self._job_runner
+
+    async def workflow_ingest_case(self, file_path: str, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("ingest", {"file_path": file_path}, deadline_seconds, profile)
 
     async def _run_ingest_job(self, run_id: str, file_path: str):
         self.case_context.audit_log.log_event("Dominion", "ingest_job_start", {"run_id": run_id, "file": file_path})
-
+        # Stages an earlier attempt finished are reloaded instead of redone
+        checkpoints = await io_lane.run(self.job_queue.checkpoints, run_id)
+        if checkpoints:
+            self.case_context.audit_log.log_event("Dominion", "ingest_job_resume", {"run_id": run_id, "stages": sorted(checkpoints)})
+
+        file_hash = None
+        prior_segments = 0
+        indexing = False
         try:
             # 1. Intake (CPU/IO bound)
-            file_hash = await asyncio.to_thread(self.intake.vault_writer, file_path)
+            if "intake" in checkpoints:
+                file_hash = checkpoints["intake"]["file_hash"]
+                prior_segments = checkpoints["intake"].get("prior_segments", 0)
+            else:
+                with span("Intake.vault_writer"):
+                    file_hash = await self._settle(io_lane.run(self.intake.vault_writer, file_path))
+                # Ledger segments for this file beyond this count are written by this run
+                prior_segments = len(await io_lane.run(self.case_context.ledger.get_segments, file_hash))
+                self._checkpoint(run_id, "intake", {"file_hash": file_hash, "prior_segments": prior_segments})
+            self._stage_progress(run_id, "intake", 0.2)
 
             # 2. Conversion (CPU bound)
-            segments = []
-            mime_type = self.intake.file_classifier(file_path)
-            if "pdf" in mime_type:
-                segments = await asyncio.to_thread(self.conversion.ingest_pdf_layout, file_path, file_hash)
-            elif "word" in mime_type or "docx" in mime_type or "officedocument" in mime_type:
-                segments = await asyncio.to_thread(self.conversion.ingest_docx, file_path, file_hash)
-            elif "audio" in mime_type:
-                segments = await asyncio.to_thread(self.conversion.ingest_audio, file_path, file_hash)
-            elif "video" in mime_type:
-                segments = await asyncio.to_thread(self.conversion.ingest_video, file_path, file_hash)
-            elif "image" in mime_type:
-                segments = await asyncio.to_thread(self.conversion.ingest_image, file_path, file_hash)
+            if "conversion" in checkpoints:
+                segments = await io_lane.run(self._stored_segments, file_hash, checkpoints["conversion"]["segment_ids"])
             else:
-                self.case_context.audit_log.log_event("Dominion", "ingest_skip_unsupported", {"mime": mime_type})
+                with span("Conversion.ingest"):
+                    segments = await self._convert(run_id, file_path, file_hash, checkpoints.get("conversion_page", {}).get("pages_done", 0))
+                self._checkpoint(run_id, "conversion", {"segment_ids": [s.segment_id for s in segments]})
+            self._stage_progress(run_id, "conversion", 0.4, items_processed=len(segments))
 
-            # 3. Structuring (CPU bound)
-            chunks = await asyncio.to_thread(self.structuring.structural_chunker, segments)
-
-            # 4. Preservation (IO/CPU bound)
-            await asyncio.to_thread(self.preservation.dense_indexer, chunks)
-            await asyncio.to_thread(self.preservation.bm25_indexer, chunks)
+            # 3-4. Structuring and indexing always run to the end once started,
+            # so a cancellation never leaves chunks missing from Chroma or BM25
+            indexing = True
+            chunks = await self._settle(self._index_segments(run_id, segments, checkpoints))
 
             self.case_context.audit_log.log_event("Dominion", "ingest_job_complete", {"run_id": run_id})
 
@@ -93,42 +207,214 @@ class Dominion:
             )
             self.case_context.jobs.save_job(complete_state)
 
+        except (asyncio.CancelledError, JobCancelled):
+            if file_hash is not None and not indexing:
+                # Nothing was indexed; drop the partial conversion so the ledger only holds usable evidence
+                await io_lane.run(self._discard_conversion, file_hash, prior_segments)
+            raise
         except Exception as e:
             self.case_context.audit_log.log_event("Dominion", "ingest_job_error", {"run_id": run_id, "error": str(e)})
-            failed_state = RunState(
-                run_id=run_id,
-                status=RunStatus.FAILED,
-                warnings=[str(e)]
-            )
-            self.case_context.jobs.save_job(failed_state)
+            if file_hash is not None and not indexing and "conversion" not in checkpoints:
+                # The retry converts again, resuming after the last checkpointed page; drop what it would duplicate
+                pages_done = (await io_lane.run(self.job_queue.checkpoints, run_id)).get("conversion_page", {}).get("pages_done", 0)
+                await io_lane.run(self._discard_conversion, file_hash, prior_segments, pages_done)
+            raise
+
+    async def _index_segments(self, run_id: str, segments: List[EvidenceSegment], checkpoints: Dict[str, Dict[str, Any]]) -> List[Chunk]:
+        # Chunks are numbered from the current index size, so ingests into
+        # the same case (from any worker) index one at a time. These stages run
+        # on the io lane, not in CPU workers: chunks would cost as much to pickle
+        # as to build, and the embedding model and Chroma client live here
+        async with self._index_lock():
+            # 3. Structuring (CPU bound)
+            if "structuring" in checkpoints:
+                chunks = await io_lane.run(self._stored_chunks, checkpoints["structuring"]["chunk_ids"])
+            else:
+                with span("Structuring.structural_chunker", segments=len(segments)):
+                    chunks = await io_lane.run(self.structuring.structural_chunker, segments)
+                self._checkpoint(run_id, "structuring", {"chunk_ids": [c.chunk_id for c in chunks]})
+            self._stage_progress(run_id, "structuring", 0.6, items_total=len(chunks))
 
-    def get_job_status(self, run_id: str) -> Optional[RunState]:
-        return self.case_context.jobs.get_job(run_id)
+            # 4. Preservation (IO/CPU bound)
+            if "dense" not in checkpoints:
+                with span("Preservation.dense_indexer", chunks=len(chunks)):
+                    await io_lane.run(self.preservation.dense_indexer, chunks)
+                self._checkpoint(run_id, "dense", {"chunks": len(chunks)})
+            self._stage_progress(run_id, "dense_index", 0.8, items_total=len(chunks))
+            if "sparse" not in checkpoints:
+                with span("Preservation.bm25_indexer", chunks=len(chunks)):
+                    await io_lane.run(self.preservation.bm25_indexer, chunks)
+                self._checkpoint(run_id, "sparse", {"chunks": len(chunks)})
+        return chunks
+
+    def _discard_conversion(self, file_hash: str, prior_segments: int, keep_through_page: int = 0):
+        written = self.case_context.ledger.get_segments(file_hash)[prior_segments:]
+        self.case_context.ledger.remove_segments([s.segment_id for s in written if not keep_through_page or _page_of(s) > keep_through_page])
+
+    async def _settle(self, awaitable):
+        """
+        Awaits work that may be running in a thread. If the job is cancelled
+        meanwhile, waits for that thread to reach its next cancellation check
+        before propagating, so cleanup never races a thread still writing.
+        """
+        task = asyncio.ensure_future(awaitable)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            with contextlib.suppress(BaseException):
+                await task
+            raise
+
+    async def _convert(self, run_id: str, file_path: str, file_hash: str, pages_done: int = 0) -> List[EvidenceSegment]:
+        segments = []
+        mime_type = self.intake.file_classifier(file_path)
+        if "pdf" in mime_type:
+            def on_page(pages: int):
+                self._checkpoint(run_id, "conversion_page", {"pages_done": pages})
+
+            segments = await self._settle(io_lane.run(self.conversion.ingest_pdf_layout, file_path, file_hash, pages_done, on_page))
+            if pages_done:
+                # Pages before the resume point are already in the ledger
+                earlier = await io_lane.run(self._stored_segments, file_hash, None, pages_done)
+                segments = earlier + segments
+        elif "word" in mime_type or "docx" in mime_type or "officedocument" in mime_type:
+            segments = await self._settle(io_lane.run(self.conversion.ingest_docx, file_path, file_hash))
+        elif "audio" in mime_type:
+            # Whisper stays in this process: a model per CPU worker would multiply its memory
+            segments = await self._settle(io_lane.run(self.conversion.ingest_audio, file_path, file_hash))
+        elif "video" in mime_type:
+            segments = await self._settle(io_lane.run(self.conversion.ingest_video, file_path, file_hash))
+        elif "image" in mime_type:
+            segments = await self._settle(io_lane.run(self.conversion.ingest_image, file_path, file_hash))
+        else:
+            self.case_context.audit_log.log_event("Dominion", "ingest_skip_unsupported", {"mime": mime_type})
+        return segments
+
+    @contextlib.asynccontextmanager
+    async def _index_lock(self):
+        lock = file_lock(self.case_context.index.lock_path)
+        # Waits out another ingest's indexing; on the io lane that would hold a retrieval thread
+        await asyncio.to_thread(lock.__enter__)
+        try:
+            yield
+        finally:
+            lock.__exit__(None, None, None)
+
+    def _checkpoint(self, run_id: str, stage: str, data: Dict[str, Any]):
+        self.job_queue.save_checkpoint(run_id, stage, data)
+
+    def _stored_segments(self, file_hash: str, segment_ids: Optional[List[str]] = None, before_page: Optional[int] = None) -> List[EvidenceSegment]:
+        segments = self.case_context.ledger.get_segments(file_hash)
+        if segment_ids is not None:
+            wanted = set(segment_ids)
+            return [s for s in segments if s.segment_id in wanted]
+        return [s for s in segments if _page_of(s) <= before_page]
 
-    async def workflow_audit_brief(self, brief_path: str) -> RunState:
+    def _stored_chunks(self, chunk_ids: List[str]) -> List[Chunk]:
+        wanted = set(chunk_ids)
+        return [c for c in self.case_context.index.get_all_chunks() if c.chunk_id in wanted]
+
+    async def _enqueue(self, workflow: str, payload: Dict[str, Any], deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
         run_id = str(uuid.uuid4())
-        run_state = RunState(
-            run_id=run_id,
-            status=RunStatus.RUNNING,
-            progress=0.0
-        )
+        run_state = RunState(run_id=run_id, status=RunStatus.RUNNING, progress=0.0)
         self.case_context.jobs.save_job(run_state)
-        asyncio.create_task(self._run_audit_job(run_id, brief_path))
+        deadline = time.time() + deadline_seconds if deadline_seconds else None
+        self.job_queue.enqueue(run_id, self.case_context.case_id, workflow, payload, deadline=deadline, profile=profile)
+        if self.config.JOB_EXECUTION_MODE == "worker":
+            # A worker process (python -m app.worker) will lease it
+            return run_state
+
+        # Start here right away; the lease still stops any other worker running it twice
+        task = asyncio.create_task(self.job_runner.run_now(run_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
         return run_state
 
-    async def _run_audit_job(self, run_id: str, brief_path: str):
-        self.kpi_monitor("jobs_run")
+    async def execute_job(self, job: QueuedJob):
+        handlers = {
+            "ingest": self._run_ingest_job,
+            "audit": self._run_audit_job,
+            "cite_check": self._run_cite_check_job,
+            "prefile": self._run_prefile_gate_job,
+            "render_report": self._run_render_report_job,
+            "maintenance": self._run_maintenance_job,
+        }
+        if job.workflow not in handlers:
+            raise ValueError(f"Unknown workflow: {job.workflow}")
+        jobs = self.case_context.jobs
+        with contextlib.ExitStack() as observers:
+            if self.config.TRACING_ENABLED:
+                # One root span per attempt; retried attempts add to the same trace file
+                observers.enter_context(start_trace(
+                    job.run_id, f"Dominion.{job.workflow}", functools.partial(jobs.append_trace, job.run_id),
+                    resource={"case_id": self.case_context.case_id}, workflow=job.workflow, attempt=job.attempts
+                ))
+            if job.profile:
+                observers.enter_context(profile_job(
+                    functools.partial(jobs.save_profile, job.run_id), self.config.PROFILE_SAMPLE_INTERVAL, self.config.PROFILE_TRACE_MEMORY,
+                    run_id=job.run_id, case_id=self.case_context.case_id, workflow=job.workflow, attempt=job.attempts
+                ))
+            self._running_jobs += 1
+            try:
+                await handlers[job.workflow](job.run_id, **job.payload)
+            finally:
+                self._running_jobs -= 1
+
+    def record_job_failure(self, job: QueuedJob, error: Exception, retrying: bool):
+        if retrying:
+            self.case_context.audit_log.log_event("Dominion", "job_retry_scheduled", {"run_id": job.run_id, "attempt": job.attempts, "error": str(error)})
+            self.case_context.jobs.save_job(RunState(
+                run_id=job.run_id,
+                status=RunStatus.RUNNING,
+                warnings=[f"Attempt {job.attempts} of {job.max_attempts} failed: {error}; retrying"]
+            ))
+        else:
+            self.case_context.jobs.save_job(RunState(run_id=job.run_id, status=RunStatus.FAILED, warnings=[str(error)]))
+
+    def record_job_cancelled(self, job: QueuedJob, reason: str):
+        self._save_cancelled(job.run_id, reason)
+
+    def _save_cancelled(self, run_id: str, reason: str):
+        self.case_context.audit_log.log_event("Dominion", "job_cancelled", {"run_id": run_id, "reason": reason})
+        self.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.CANCELLED, warnings=[reason]))
+
+    def cancel_job(self, run_id: str) -> Optional[RunState]:
+        """
+        Cancels a job wherever it runs. A waiting job is CANCELLED at once; a
+        running one is stopped by its worker within JOB_CANCEL_POLL_INTERVAL
+        and reports CANCELLED when its work has been abandoned.
+        """
+        state = self.get_job_status(run_id)
+        if state is None or state.status in TERMINAL_STATUSES:
+            return state
+        previous = self.job_queue.cancel(run_id)
+        if previous == QUEUED:
+            self._save_cancelled(run_id, "Cancelled by request")
+        return self.get_job_status(run_id)
+
+    def get_job_status(self, run_id: str) -> Optional[RunState]:
+        return self.case_context.jobs.get_job(run_id)
+
+    async def workflow_audit_brief(self, brief_path: str, formats: Optional[List[str]] = None, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("audit", {"brief_path": brief_path, "formats": formats}, deadline_seconds, profile)
+
+    async def _run_audit_job(self, run_id: str, brief_path: str, formats: Optional[List[str]] = None):
         self.case_context.audit_log.log_event("Dominion", "audit_job_start", {"run_id": run_id, "brief": brief_path})
 
         try:
-            # 1. Discernment (CPU bound)
-            claims = await asyncio.to_thread(self.discernment.extract_claims, brief_path)
+            # 1-2. Discernment -> Inquiry -> Adjudication, streamed claim by claim
+            run_state = RunState(run_id=run_id, status=RunStatus.RUNNING)
+
+            def record_finding(finding):
+                run_state.items_processed += 1
+                self.case_context.jobs.save_job(run_state)
+                self._publish_finding(run_id, finding)
 
-            # 2. Inquiry & Adjudication (Parallel with Semaphore)
-            findings = await self._verify_claims_parallel(claims)
+            findings = await self._verify_claims_pipeline(self._stream_claims(brief_path), on_finding=record_finding)
 
-            # 3. Chronicle (IO/CPU bound)
-            report_path = await asyncio.to_thread(self.chronicle.render_report, findings)
+            # 3. Persist findings, then Chronicle (IO/CPU bound)
+            await io_lane.run(self.case_context.findings.save_run, run_id, findings)
+            report_path = await io_lane.run(self.chronicle.render_report, findings, formats=formats, run_id=run_id)
 
             self.case_context.audit_log.log_event("Dominion", "audit_job_complete", {"run_id": run_id, "findings": len(findings)})
 
@@ -141,38 +427,31 @@ class Dominion:
             self.case_context.jobs.save_job(complete_state)
 
         except Exception as e:
-            self.kpi_monitor("errors")
             self.case_context.audit_log.log_event("Dominion", "audit_job_error", {"run_id": run_id, "error": str(e)})
-            failed_state = RunState(
-                run_id=run_id,
-                status=RunStatus.FAILED,
-                warnings=[str(e)]
-            )
-            self.case_context.jobs.save_job(failed_state)
+            raise
 
-    def kpi_monitor(self, metric: str):
-        if metric in self.kpi_stats:
-            self.kpi_stats[metric] += 1
-        # In production, push to Prometheus/Datadog or write to DB
+    def _stage_progress(self, run_id: str, stage: str, progress: float, **fields):
+        # Persisted for pollers, published for wait/stream subscribers
+        self.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.RUNNING, progress=progress, **fields))
+        self.case_context.jobs.publish(run_id, "progress", {"stage": stage, "progress": progress})
 
-    async def workflow_cite_check(self, text_or_file: str) -> RunState:
-        run_id = str(uuid.uuid4())
-        run_state = RunState(
-            run_id=run_id,
-            status=RunStatus.RUNNING,
-            progress=0.0
-        )
-        self.case_context.jobs.save_job(run_state)
-        asyncio.create_task(self._run_cite_check_job(run_id, text_or_file))
-        return run_state
+    def _publish_finding(self, run_id: str, finding):
+        self.case_context.jobs.publish(run_id, "partial", {"kind": "claim", "finding": finding.model_dump(mode="json")})
+        for warning in finding.warnings:
+            self.case_context.jobs.publish(run_id, "warning", {"claim_id": finding.claim_id, "message": warning})
 
-    async def _run_cite_check_job(self, run_id: str, text: str):
+    async def workflow_cite_check(self, text_or_file: str, formats: Optional[List[str]] = None, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("cite_check", {"text": text_or_file, "formats": formats}, deadline_seconds, profile)
+
+    async def _run_cite_check_job(self, run_id: str, text: str, formats: Optional[List[str]] = None):
         self.case_context.audit_log.log_event("Dominion", "cite_check_job_start", {"run_id": run_id})
         try:
-            citations = await asyncio.to_thread(self.validation.verify_citations, text)
+            with span("Validation.verify_citations"):
+                citations = await self.validation.verify_citations_async(text)
 
             # Use Chronicle to render report (even if just citations)
-            report_path = await asyncio.to_thread(self.chronicle.render_report, [], citation_findings=citations)
+            await io_lane.run(self.case_context.findings.save_run, run_id, citation_findings=citations)
+            report_path = await io_lane.run(self.chronicle.render_report, [], citation_findings=citations, formats=formats, run_id=run_id)
 
             complete_state = RunState(
                 run_id=run_id,
@@ -183,7 +462,7 @@ class Dominion:
             self.case_context.jobs.save_job(complete_state)
         except Exception as e:
             self.case_context.audit_log.log_event("Dominion", "cite_check_error", {"error": str(e)})
-            self.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.FAILED, warnings=[str(e)]))
+            raise
 
     def _validate_brief_path(self, brief_path: str) -> None:
         """
@@ -218,42 +497,43 @@ class Dominion:
         if not os.path.isfile(abs_path):
             raise ValueError(f"Path is not a file: {brief_path}")
 
-    async def workflow_prefile_gate(self, brief_path: str) -> RunState:
-        run_id = str(uuid.uuid4())
-        run_state = RunState(run_id=run_id, status=RunStatus.RUNNING, progress=0.0)
-        self.case_context.jobs.save_job(run_state)
-        asyncio.create_task(self._run_prefile_gate_job(run_id, brief_path))
-        return run_state
+    async def workflow_prefile_gate(self, brief_path: str, formats: Optional[List[str]] = None, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("prefile", {"brief_path": brief_path, "formats": formats}, deadline_seconds, profile)
 
-    async def _run_prefile_gate_job(self, run_id: str, brief_path: str):
+    async def _run_prefile_gate_job(self, run_id: str, brief_path: str, formats: Optional[List[str]] = None):
         self.case_context.audit_log.log_event("Dominion", "prefile_gate_start", {"run_id": run_id, "brief": brief_path})
         try:
             # Validate path first
             self._validate_brief_path(brief_path)
 
-            # 1. Read Text (IO bound)
-            # Helper to get text for validation
-            def read_text():
-                import docx
-                doc = docx.Document(brief_path)
-                return "\n".join([p.text for p in doc.paragraphs])
-
-            full_text = await asyncio.to_thread(read_text)
+            # 1. Read Text (CPU bound)
+            full_text = "\n".join(await run_cpu(docx_paragraphs, brief_path))
+            self._stage_progress(run_id, "read_brief", 0.1)
 
             # 2. Validation (Parallel) & Audit (Parallel)
-            citation_task = asyncio.to_thread(self.validation.verify_citations, full_text)
-
-            async def run_audit_pipeline():
-                claims = await asyncio.to_thread(self.discernment.extract_claims, brief_path)
-                return await self._verify_claims_parallel(claims)
+            async def check_citations():
+                with span("Validation.verify_citations"):
+                    citations = await self.validation.verify_citations_async(full_text)
+                self.case_context.jobs.publish(run_id, "partial", {
+                    "kind": "citations", "findings": [c.model_dump(mode="json") for c in citations]
+                })
+                return citations
+
+            audit_pipeline = self._verify_claims_pipeline(
+                self._stream_claims(brief_path), on_finding=lambda finding: self._publish_finding(run_id, finding)
+            )
 
-            citation_findings, claim_findings = await asyncio.gather(citation_task, run_audit_pipeline())
+            citation_findings, claim_findings = await asyncio.gather(check_citations(), audit_pipeline)
+            self._stage_progress(run_id, "verification", 0.7)
 
             # 3. Sentinel Gate (CPU bound, lightweight)
-            gate_result = await asyncio.to_thread(self.sentinel.gate_evaluator, claim_findings, citation_findings)
+            with span("Sentinel.gate_evaluator"):
+                gate_result = await asyncio.to_thread(self.sentinel.gate_evaluator, claim_findings, citation_findings)
+            self._stage_progress(run_id, "gate", 0.8)
 
-            # 4. Chronicle Report (IO bound)
-            report_path = await asyncio.to_thread(self.chronicle.render_report, claim_findings, citation_findings, gate_result)
+            # 4. Persist findings, then Chronicle Report; PDF waits for the first download unless requested
+            await io_lane.run(self.case_context.findings.save_run, run_id, claim_findings, citation_findings, gate_result)
+            report_path = await io_lane.run(self.chronicle.render_report, claim_findings, citation_findings, gate_result, formats, run_id)
 
             complete_state = RunState(
                 run_id=run_id,
@@ -265,35 +545,160 @@ class Dominion:
 
         except Exception as e:
             self.case_context.audit_log.log_event("Dominion", "prefile_gate_error", {"error": str(e)})
-            self.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.FAILED, warnings=[str(e)]))
+            raise
+
+    async def workflow_render_report(self, source_run_id: str, finding_ids: Optional[List[str]] = None, formats: Optional[List[str]] = None, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("render_report", {"source_run_id": source_run_id, "finding_ids": finding_ids, "formats": formats}, deadline_seconds, profile)
+
+    async def _run_render_report_job(self, run_id: str, source_run_id: str, finding_ids: Optional[List[str]] = None, formats: Optional[List[str]] = None):
+        # Re-renders from stored findings only; nothing is re-verified
+        self.case_context.audit_log.log_event("Dominion", "report_render_start", {"run_id": run_id, "source_run_id": source_run_id})
+        try:
+            stored = await io_lane.run(self.case_context.findings.load_run, source_run_id, finding_ids)
+            if stored is None:
+                raise ValueError(f"No stored findings for run {source_run_id}")
+            findings, citation_findings, gate_result = stored
+
+            report_path = await io_lane.run(self.chronicle.render_report, findings, citation_findings, gate_result, formats, run_id)
+
+            self.case_context.jobs.save_job(RunState(
+                run_id=run_id,
+                status=RunStatus.COMPLETE,
+                progress=1.0,
+                result_payload={
+                    "report_path": report_path,
+                    "source_run_id": source_run_id,
+                    "findings_count": len(findings) + len(citation_findings)
+                }
+            ))
+        except Exception as e:
+            self.case_context.audit_log.log_event("Dominion", "report_render_error", {"run_id": run_id, "error": str(e)})
+            raise
 
-    async def _verify_claims_parallel(self, claims):
-        findings = []
-        sem = asyncio.Semaphore(self.config.MAX_LLM_CONCURRENCY)
+    async def _stream_claims(self, brief_path: str):
+        """
+        Runs Discernment.stream_claims on a worker thread and re-yields each claim
+        on the event loop as soon as it is extracted. If the consumer stops
+        early, extraction stops after the window in progress.
+        """
+        loop = asyncio.get_running_loop()
+        claim_queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                with span("Discernment.stream_claims"):
+                    for claim in self.discernment.stream_claims(brief_path):
+                        if stop.is_set():
+                            # Closing the generator drops the windows not yet sent to the model
+                            break
+                        loop.call_soon_threadsafe(claim_queue.put_nowait, claim)
+            finally:
+                with contextlib.suppress(RuntimeError):
+                    loop.call_soon_threadsafe(claim_queue.put_nowait, done)
+
+        producer = asyncio.create_task(asyncio.to_thread(produce))
+        drained = False
+        try:
+            while True:
+                claim = await claim_queue.get()
+                if claim is done:
+                    break
+                yield claim
+            drained = True
+        finally:
+            if not drained:
+                stop.set()
+                # The consumer's own error is the one to report
+                with contextlib.suppress(Exception):
+                    await producer
+        # Surface extraction errors once the queue is drained
+        await producer
+
+    async def _verify_claims_pipeline(self, claims, on_finding=None):
+        """
+        Verifies claims as they arrive. Retrieval runs on the shared IO lane;
+        only adjudication holds a slot on the process-wide LLM lane, so slow
+        retrieval never starves the model of work. Near-duplicate claims are
+        verified once and the representative's finding is shared.
+        """
 
         async def verify_single(claim):
             if claim.routing != "verify":
                 return None
-            async with sem:
-                # Retry logic loop
-                max_retries = 2
-                attempt = 0
-                while attempt <= max_retries:
-                    try:
-                        bundle = await asyncio.to_thread(self.inquiry.retrieve_evidence, claim)
-                        finding = await asyncio.to_thread(self.adjudication.verify_claim_skeptical, claim, bundle)
-                        return finding
-                    except Exception as e:
-                        attempt += 1
-                        if attempt > max_retries:
-                            self.case_context.audit_log.log_event("Dominion", "claim_retry_exhausted", {"claim_id": claim.claim_id})
-                            return None
-                        await asyncio.sleep(0.5 * attempt)
-
-        tasks = [verify_single(c) for c in claims]
-        results = await asyncio.gather(*tasks)
+            with span("Dominion.verify_claim", claim_id=claim.claim_id):
+                bundle = await self._run_with_retries(claim, io_lane, self.inquiry.retrieve_evidence, claim)
+                if bundle is None:
+                    return None
+                finding = await self._run_with_retries(claim, llm_lane, self.adjudication.verify_claim_skeptical, claim, bundle)
+            if finding is not None and on_finding:
+                on_finding(finding)
+            return finding
+
+        async def share_finding(claim, representative_id, representative_task):
+            # Near-duplicate of an earlier claim: reuse its verdict under this claim's id
+            representative_finding = await representative_task
+            if representative_finding is None:
+                return None
+            finding = representative_finding.model_copy(deep=True, update={"claim_id": claim.claim_id})
+            finding.warnings.append(f"Verified as near-duplicate of claim {representative_id}")
+            if on_finding:
+                on_finding(finding)
+            return finding
+
+        clusterer = self.discernment.claim_clusterer() if self.config.CLAIM_DEDUP_ENABLED else None
+        representative_tasks = {}
+        tasks = []
+        # Claim tasks copy the context when created, so their spans nest under this one
+        with span("Dominion.verify_claims") as pipeline_span:
+            try:
+                async for claim in claims:
+                    representative = None
+                    if clusterer and claim.routing == "verify":
+                        representative = clusterer.assign(claim)
+
+                    if representative is not None:
+                        task = asyncio.create_task(share_finding(claim, representative.claim_id, representative_tasks[representative.claim_id]))
+                    else:
+                        task = asyncio.create_task(verify_single(claim))
+                        representative_tasks[claim.claim_id] = task
+                    tasks.append(task)
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            pipeline_span.set_attribute("claims", len(tasks))
+            pipeline_span.set_attribute("verified", len(representative_tasks))
+
+        if clusterer:
+            self.case_context.audit_log.log_event("Dominion", "claim_dedup", {"claims": len(tasks), "verified": len(representative_tasks)})
         return [r for r in results if r is not None]
 
+    async def _run_with_retries(self, claim, lane: Lane, func, *args):
+        max_retries = 2
+        attempt = 0
+        name = getattr(func, "__qualname__", "call")
+        while attempt <= max_retries:
+            with span(name, attempt=attempt + 1) as attempt_span:
+                try:
+                    def call():
+                        # Time before this event went to waiting for a lane slot
+                        attempt_span.add_event("lane_acquired")
+                        return func(*args)
+
+                    return await lane.run(call)
+                except Exception as e:
+                    attempt_span.record_exception(e)
+            attempt += 1
+            if attempt > max_retries:
+                self.case_context.audit_log.log_event("Dominion", "claim_retry_exhausted", {"claim_id": claim.claim_id})
+                return None
+            retries_total.inc(kind="claim", case=self.case_context.case_id)
+            # Back off outside the lane so the slot serves other claims meanwhile
+            await asyncio.sleep(0.5 * attempt)
+
     async def case_workspace_init(self, case_name: str) -> Dict[str, Any]:
         self.case_context.audit_log.log_event("Dominion", "case_workspace_init_start", {"case_name": case_name})
 
@@ -306,18 +711,14 @@ class Dominion:
         self.case_context.audit_log.log_event("Dominion", "case_workspace_init_complete", {"path": new_context.base_path})
         return {"status": "initialized", "path": new_context.base_path}
 
-    async def workflow_background_maintenance(self) -> RunState:
-        run_id = str(uuid.uuid4())
-        run_state = RunState(run_id=run_id, status=RunStatus.RUNNING, progress=0.0)
-        self.case_context.jobs.save_job(run_state)
-        asyncio.create_task(self._run_maintenance_job(run_id))
-        return run_state
+    async def workflow_background_maintenance(self, deadline_seconds: Optional[float] = None, profile: bool = False) -> RunState:
+        return await self._enqueue("maintenance", {}, deadline_seconds, profile)
 
     async def _run_maintenance_job(self, run_id: str):
         self.case_context.audit_log.log_event("Dominion", "maintenance_job_start", {"run_id": run_id})
         try:
             # 1. Fetch all segments (IO bound)
-            segments = await asyncio.to_thread(self.case_context.ledger.get_all_segments)
+            segments = await io_lane.run(self.case_context.ledger.get_all_segments)
 
             # 2. Filter for draft quality
             draft_segments = [s for s in segments if s.metadata.get("transcription_quality") == "draft"]
@@ -330,12 +731,13 @@ class Dominion:
             # 3. Refine sequentially
             # Since this is "maintenance", we do it sequentially to save resources.
             for seg in draft_segments:
-                await asyncio.to_thread(self.conversion.refine_transcription, seg)
+                with span("Conversion.refine_transcription", segment_id=seg.segment_id):
+                    await io_lane.run(self.conversion.refine_transcription, seg)
 
                 # Check if upgraded
                 if seg.metadata.get("transcription_quality") == "final":
                     # Save update
-                    await asyncio.to_thread(self.case_context.ledger.update_segment, seg)
+                    await io_lane.run(self.case_context.ledger.update_segment, seg)
                     processed_count += 1
 
             self.case_context.audit_log.log_event("Dominion", "maintenance_job_complete", {"processed": processed_count})
@@ -350,4 +752,4 @@ class Dominion:
 
         except Exception as e:
             self.case_context.audit_log.log_event("Dominion", "maintenance_error", {"error": str(e)})
-            self.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.FAILED, warnings=[str(e)]))
+            raise
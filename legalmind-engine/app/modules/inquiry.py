@@ -1,41 +1,84 @@
 import uuid
 import os
 import pickle
-import chromadb
-from chromadb.utils import embedding_functions
+import functools
+import threading
 from typing import List, Any, Dict, Tuple
 from app.core.stores import CaseContext
+from app.core.config import load_config
+from app.core.metrics import track_stage
+from app.core.tracing import span
 from app.models import Claim, EvidenceBundle, RetrievalMode, Chunk
+from app.modules.preservation import open_collection
+
+@functools.lru_cache(maxsize=2)
+def _load_cross_encoder(model_name: str):
+    """The cross-encoder for model_name, or None when it cannot be loaded (failures are not retried)."""
+    try:
+        from sentence_transformers import CrossEncoder
+        return CrossEncoder(model_name)
+    except Exception as e:
+        print(f"Failed to load reranker model {model_name}: {e}")
+        return None
 
 class Inquiry:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
+        self.config = load_config()
+        self._client = None
+        self._collection = None
+        self._collection_lock = threading.Lock()
+
+    @property
+    def collection(self):
+        # Opened on the first dense search, then reused across claims
+        if self._collection is None:
+            with self._collection_lock:
+                if self._collection is None:
+                    self._client, self._collection = open_collection(self.case_context, self.config)
+        return self._collection
+
+    def close(self):
+        with self._collection_lock:
+            client, self._client, self._collection = self._client, None, None
+        if client is not None:
+            client.close()
 
     def retrieve_evidence(self, claim: Claim) -> EvidenceBundle:
+        case_id, modality = self.case_context.case_id, claim.expected_modality
+        mode = self.config.RETRIEVAL_MODE
+        dense_results, sparse_results = [], []
         # 1. Dense Retrieval (Chroma)
-        dense_results = self._dense_search(claim)
+        if mode != "bm25":
+            with track_stage("dense_search", case_id, modality), span("Inquiry.dense_search"):
+                dense_results = self._dense_search(claim)
 
         # 2. Sparse Retrieval (BM25)
-        sparse_results = self._bm25_search(claim)
+        if mode != "dense":
+            with track_stage("bm25_search", case_id, modality), span("Inquiry.bm25_search"):
+                sparse_results = self._bm25_search(claim)
 
-        # 3. RRF Fusion
-        merged_chunks, merged_scores = self.rrf_merger(dense_results, sparse_results)
+        # 3. RRF Fusion (a single retriever keeps its own order)
+        merged_chunks, merged_scores = self.rrf_merger(dense_results, sparse_results, k=self.config.RRF_K)
 
+        # 4. Optional cross-encoder rerank of the fused candidates
+        warnings = []
+        if self.config.RERANKER_ENABLED and merged_chunks:
+            with track_stage("rerank", case_id, modality), span("Inquiry.reranker", candidates=len(merged_chunks)):
+                merged_chunks, merged_scores, warnings = self.reranker(claim, merged_chunks, merged_scores)
+
+        top_k = self.config.RETRIEVAL_TOP_K
         return EvidenceBundle(
             bundle_id=str(uuid.uuid4()),
             claim_id=claim.claim_id,
-            chunks=merged_chunks[:5], # Top 5
-            retrieval_scores=merged_scores[:5],
+            chunks=merged_chunks[:top_k],
+            retrieval_scores=merged_scores[:top_k],
             retrieval_mode=RetrievalMode.SEMANTIC, # Actually hybrid
             modality_filter_applied=claim.expected_modality is not None,
-            retrieval_warnings=[]
+            retrieval_warnings=warnings
         )
 
     def _dense_search(self, claim: Claim) -> List[Tuple[Chunk, float]]:
-        client = chromadb.PersistentClient(path=os.path.join(self.case_context.index.index_path, "chroma"))
-        ef = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-        collection = client.get_or_create_collection(name=f"case_{self.case_context.case_id}", embedding_function=ef)
-
         where_filter = None
         if claim.expected_modality:
             if claim.expected_modality == "video":
@@ -43,9 +86,9 @@ class Inquiry:
             elif claim.expected_modality == "testimony":
                 where_filter = {"modality": "audio_transcript"}
 
-        results = collection.query(
+        results = self.collection.query(
             query_texts=[claim.text],
-            n_results=10,
+            n_results=self._candidates(),
             where=where_filter
         )
 
@@ -79,7 +122,7 @@ class Inquiry:
 
         # Get all chunks to map back index
         all_chunks = self.case_context.index.get_all_chunks()
-        if not all_chunks or len(all_chunks) != len(bm25.corpus_size):
+        if not all_chunks or len(all_chunks) != bm25.corpus_size:
             # Index mismatch fallback
             return []
 
@@ -88,7 +131,7 @@ class Inquiry:
 
         # Get top N indices
         import numpy as np
-        top_n = 10
+        top_n = self._candidates()
         top_indices = np.argsort(scores)[::-1][:top_n]
 
         hits = []
@@ -129,8 +172,22 @@ class Inquiry:
 
         return merged_chunks, merged_scores
 
+    def _candidates(self) -> int:
+        return max(self.config.RETRIEVAL_CANDIDATES, self.config.RETRIEVAL_TOP_K)
+
+    def reranker(self, claim: Claim, chunks: List[Chunk], scores: List[float]) -> Tuple[List[Chunk], List[float], List[str]]:
+        """
+        Reorders chunks by cross-encoder relevance to the claim. When the
+        model is unavailable the fused order is kept and a warning returned.
+        """
+        model = _load_cross_encoder(self.config.RERANKER_MODEL)
+        if model is None:
+            return chunks, scores, [f"Reranker model {self.config.RERANKER_MODEL} unavailable; kept fused order"]
+        relevance = model.predict([(claim.text, chunk.text) for chunk in chunks])
+        order = sorted(range(len(chunks)), key=lambda i: float(relevance[i]), reverse=True)
+        return [chunks[i] for i in order], [float(relevance[i]) for i in order], []
+
     def query_builder(self, claim: Claim): pass
     def modality_filter(self, claim: Claim): pass
-    def reranker(self, results: List[Any]): pass
     def context_expander(self, chunks: List[Any]): pass
     def contradiction_hunter(self, claim: Claim): pass
@@ -3,22 +3,11 @@ import shutil
 import os
 import mimetypes
 import json
-import fcntl
-import contextlib
 from datetime import datetime
-from app.core.stores import CaseContext
+from app.core.stores import CaseContext, file_lock
 from app.core.config import load_config
 from typing import Dict, Any
 
-@contextlib.contextmanager
-def file_lock(lock_path: str):
-    with open(lock_path, "w") as f:
-        fcntl.flock(f, fcntl.LOCK_EX)
-        try:
-            yield
-        finally:
-            fcntl.flock(f, fcntl.LOCK_UN)
-
 class Intake:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
@@ -1,43 +1,61 @@
 import os
 import pickle
+import threading
 from typing import List, Dict, Any
 from app.core.stores import CaseContext
-from app.core.config import load_config
+from app.core.config import Config, load_config
+from app.core.metrics import cache_requests, track_stage
 from app.models import Chunk
-import chromadb
-from chromadb.utils import embedding_functions
-from rank_bm25 import BM25Okapi
+from app.core.lazy import lazy_import
+
+chromadb = lazy_import("chromadb")
+rank_bm25 = lazy_import("rank_bm25")
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+def embedding_function(config: Config):
+    """The embedding function for config.EMBEDDING_PROVIDER; sentence-transformers loads its model here."""
+    from chromadb.utils import embedding_functions
+    if config.EMBEDDING_PROVIDER == "openai":
+        return embedding_functions.OpenAIEmbeddingFunction(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model_name="text-embedding-3-small"
+        )
+    # sentence-transformers, and the fallback for anything else
+    return embedding_functions.SentenceTransformerEmbeddingFunction(model_name=EMBEDDING_MODEL)
+
+def open_collection(case_context: CaseContext, config: Config):
+    """(client, collection) for the case's Chroma collection, opened with the configured embedding function."""
+    client = chromadb.PersistentClient(path=os.path.join(case_context.index.index_path, "chroma"))
+    return client, client.get_or_create_collection(name=f"case_{case_context.case_id}", embedding_function=embedding_function(config))
 
 class Preservation:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
         self.config = load_config()
-        self.chroma_client = chromadb.PersistentClient(path=os.path.join(self.case_context.index.index_path, "chroma"))
-
-        # Select embedding function based on config
-        if self.config.EMBEDDING_PROVIDER == "sentence-transformers":
-            self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-        elif self.config.EMBEDDING_PROVIDER == "openai":
-             self.embedding_fn = embedding_functions.OpenAIEmbeddingFunction(
-                api_key=os.getenv("OPENAI_API_KEY"),
-                model_name="text-embedding-3-small"
-            )
-        else:
-            # Fallback or local custom
-            self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(model_name="all-MiniLM-L6-v2")
-
-        self.collection = self.chroma_client.get_or_create_collection(
-            name=f"case_{self.case_context.case_id}",
-            embedding_function=self.embedding_fn
-        )
+        # Chroma and the embedding model are opened on first use, not per Dominion
+        self._client = None
+        self._collection = None
+        self._collection_lock = threading.Lock()
         self.bm25_path = os.path.join(self.case_context.index.index_path, "bm25.pkl")
         self.bm25_index = None
-        self._load_bm25()
 
-    def _load_bm25(self):
-        if os.path.exists(self.bm25_path):
-            with open(self.bm25_path, "rb") as f:
-                self.bm25_index = pickle.load(f)
+    @property
+    def collection(self):
+        if self._collection is None:
+            with self._collection_lock:
+                if self._collection is None:
+                    self._client, self._collection = open_collection(self.case_context, self.config)
+        return self._collection
+
+    def close(self):
+        """Closes the Chroma client and drops the BM25 index; both are reopened on next use."""
+        with self._collection_lock:
+            client, self._client, self._collection = self._client, None, None
+        self.bm25_index = None
+        if client is not None:
+            # Chroma shares one system per path and stops it when its last client closes
+            client.close()
 
     def dense_indexer(self, chunks: List[Chunk]):
         if not chunks:
@@ -57,13 +75,19 @@ class Preservation:
             if "modality" in metadatas[i]:
                 metadatas[i]["modality"] = str(metadatas[i]["modality"])
 
-        self.collection.upsert(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas
-        )
+        # Chroma embeds the documents as part of the upsert
+        with track_stage("embed_index", self.case_context.case_id):
+            self.collection.upsert(
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas
+            )
 
     def bm25_indexer(self, chunks: List[Chunk]):
+        with track_stage("bm25_index", self.case_context.case_id):
+            self._build_bm25(chunks)
+
+    def _build_bm25(self, chunks: List[Chunk]):
         # Rebuild BM25 for simplicity in Phase 1 (append logic is harder for BM25)
         # Optimization: Use cached tokenized corpus to avoid reading full JSONL
         corpus_path = os.path.join(self.case_context.index.index_path, "corpus.pkl")
@@ -78,6 +102,7 @@ class Preservation:
             except Exception:
                 # Corrupted cache, ignore
                 tokenized_corpus = []
+        cache_requests.inc(cache="bm25_corpus", result="hit" if loaded_from_cache else "miss")
 
         # Check for continuity if we loaded from cache and have new chunks
         # chunks are sorted by chunk_index, so check first chunk
@@ -114,7 +139,7 @@ class Preservation:
         if not tokenized_corpus:
             return
 
-        self.bm25_index = BM25Okapi(tokenized_corpus)
+        self.bm25_index = rank_bm25.BM25Okapi(tokenized_corpus)
 
         with open(self.bm25_path, "wb") as f:
             pickle.dump(self.bm25_index, f)
@@ -128,7 +153,7 @@ class Preservation:
             "status": "healthy" if count > 0 else "empty",
             "stats": {
                 "chunk_count": count,
-                "bm25_active": self.bm25_index is not None,
+                "bm25_active": self.bm25_index is not None or os.path.exists(self.bm25_path),
                 "embedding_provider": self.config.EMBEDDING_PROVIDER
             }
         }
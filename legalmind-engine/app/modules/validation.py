@@ -1,20 +1,141 @@
+import os
+import time
+import asyncio
+import threading
+import httpx
+from bisect import bisect_left, bisect_right
+from urllib.parse import urlparse
 from app.core.stores import CaseContext
-from app.models import CitationFinding, CitationStatus, ConfidenceLevel
-from typing import List, Any, Dict, Optional
-from eyecite import get_citations, clean_text
+from app.core.config import load_config
+from app.core.citation_cache import CitationCache, normalize_citation
+from app.core.metrics import cache_requests, courtlistener_requests, track_stage
+from app.core.tracing import KIND_CLIENT, current_span, span
+from app.models import CitationFinding, CitationOccurrence, CitationStatus, ConfidenceLevel
+from typing import Callable, Iterator, List, Any, Dict, Optional, Tuple
+from app.core.lazy import lazy_import
+
+requests = lazy_import("requests")
+eyecite = lazy_import("eyecite")
+eyecite_annotate = lazy_import("eyecite.annotate")
+eyecite_models = lazy_import("eyecite.models")
+
+# Free API, but polite to identify
+USER_AGENT = "LegalMind-Engine/3.0"
+SEARCH_PATH = "/api/rest/v3/search/"
+LOOKUP_PATH = "/api/rest/v4/citation-lookup/"
+
+class HostRateLimiter:
+    """
+    Token bucket per host, shared by every Validation in the process so
+    concurrent cases together stay within the upstream API's limits.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _take(self, host: str) -> float:
+        # Returns 0 if a token was taken, otherwise seconds until one is available
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            if tokens >= 1.0:
+                self._buckets[host] = (tokens - 1.0, now)
+                return 0.0
+            self._buckets[host] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+
+    async def acquire(self, host: str):
+        while True:
+            wait = self._take(host)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+_rate_limiter: Optional[HostRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+_sync_session = None
+
+def get_sync_session():
+    # Created on the first blocking lookup; most verification goes through httpx
+    global _sync_session
+    with _rate_limiter_lock:
+        if _sync_session is None:
+            _sync_session = requests.Session()
+        return _sync_session
+
+def get_rate_limiter(rate: float, burst: int) -> HostRateLimiter:
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None or _rate_limiter.rate != rate or _rate_limiter.burst != max(1, burst):
+            _rate_limiter = HostRateLimiter(rate, burst)
+        return _rate_limiter
 
 class Validation:
     def __init__(self, case_context: CaseContext):
         self.case_context = case_context
+        self.config = load_config()
+        self.citation_cache = CitationCache.from_config(self.config)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_loop = None
+
+    def close(self):
+        """Closes the pooled CourtListener client on the loop that opened it."""
+        client, loop = self._http_client, self._http_loop
+        self._http_client = self._http_loop = None
+        if client is not None and not client.is_closed and loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
 
     def eyecite_extractor(self, text: str) -> List[Any]:
-        # Clean text
-        cleaned_text = clean_text(text, ['all_whitespace', 'html'])
-        citations = get_citations(cleaned_text)
+        citations = eyecite.get_citations(self._clean_text(text))
         return citations
 
-    def courtlistener_client(self, citation_str: str) -> Dict[str, Any]:
-        import os
+    def _clean_text(self, text: str) -> str:
+        return eyecite.clean_text(text, ['all_whitespace', 'html'])
+
+    def citation_resolver(self, citations: List[Any]) -> Tuple[List[Tuple[Any, List[Any]]], List[Any]]:
+        """
+        Links short forms, supra and Id. references to their full citation and
+        groups every mention by authority. Returns (full citation, mentions)
+        pairs plus the references eyecite could not link to any authority.
+        """
+        groups: Dict[str, Tuple[Any, List[Any]]] = {}
+        resolved = set()
+        for resource, mentions in eyecite.resolve_citations(citations).items():
+            full = getattr(resource, "citation", None) or mentions[0]
+            entry = groups.setdefault(self.normalizer(full.matched_text()), (full, []))
+            entry[1].extend(mentions)
+            resolved.update(id(m) for m in mentions)
+
+        unresolved = [c for c in citations if id(c) not in resolved]
+        return list(groups.values()), unresolved
+
+    def _offset_mapper(self, cleaned_text: str, source_text: str) -> Callable[[int, int], Tuple[int, int]]:
+        # eyecite spans refer to the cleaned text; map them back onto what the caller submitted
+        if cleaned_text == source_text:
+            return lambda start, end: (start, end)
+        updater = eyecite_annotate.SpanUpdater(cleaned_text, source_text)
+        return lambda start, end: (updater.update(start, bisect_right), updater.update(end, bisect_left))
+
+    def _citation_form(self, citation: Any) -> str:
+        if isinstance(citation, eyecite_models.IdCitation):
+            return "id"
+        if isinstance(citation, eyecite_models.SupraCitation):
+            return "supra"
+        if isinstance(citation, eyecite_models.ShortCaseCitation):
+            return "short"
+        return "full"
+
+    def _occurrences(self, mentions: List[Any], text: str, to_source: Callable[[int, int], Tuple[int, int]]) -> List[CitationOccurrence]:
+        occurrences = []
+        for mention in sorted(mentions, key=lambda m: m.span()[0]):
+            start, end = to_source(*mention.span())
+            occurrences.append(CitationOccurrence(citation_text=text[start:end], form=self._citation_form(mention), start=start, end=end))
+        return occurrences
+
+    def _mock_lookup(self, citation_str: str) -> Optional[Dict[str, Any]]:
         # Check for mock trigger first (for tests)
         if os.getenv("LEGALMIND_ENV") == "TEST" and "347 U.S. 483" in citation_str:
              return {
@@ -23,50 +144,265 @@ class Validation:
                  "date_filed": "1954-05-17",
                  "court": "scotus"
              }
+        return None
 
-        # Real API Implementation
-        import requests
-        import os
+    def _request_headers(self) -> Dict[str, str]:
+        headers = {"User-Agent": USER_AGENT}
+        if self.config.COURTLISTENER_API_TOKEN:
+            headers["Authorization"] = f"Token {self.config.COURTLISTENER_API_TOKEN}"
+        return headers
 
-        # Free API, but polite to identify
-        headers = {"User-Agent": "LegalMind-Engine/3.0"}
+    def _bulk_enabled(self) -> bool:
+        # The citation-lookup endpoint rejects anonymous requests, so auto only uses it with a token
+        mode = self.config.CITATION_LOOKUP_MODE
+        return mode == "bulk" or (mode == "auto" and bool(self.config.COURTLISTENER_API_TOKEN))
 
+    def _search_params(self, citation_str: str) -> Dict[str, str]:
         # Use Search API as simple lookup if citation endpoint is complex/restricted
-        # Or better: Document lookup by citation logic.
         # CourtListener has strict rate limits and complex citation endpoints.
         # For this implementation, we use a search fallback which is robust.
+        return {"q": f'"{citation_str}"'}
+
+    def _parse_search_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if data.get("count", 0) > 0:
+            result = data["results"][0]
+            return {
+                "status": "found",
+                "title": result.get("caseName", "Unknown"),
+                "date_filed": result.get("dateFiled", ""),
+                "court": result.get("court", ""),
+                "url": f"{self.config.COURTLISTENER_BASE_URL}{result.get('absolute_url', '')}"
+            }
+        return {"status": "not_found"}
+
+    def _cached_result(self, citation_str: str):
+        # Returns (result to use or None, cache entry for outage fallback)
+        cached = self.citation_cache.get(self.normalizer(citation_str))
+        if cached and cached.fresh:
+            cache_requests.inc(cache="citation", result="hit")
+            return {**cached.result, "cache": "hit"}, cached
+        cache_requests.inc(cache="citation", result="miss")
+        return None, cached
+
+    def _remember(self, citation_str: str, result: Dict[str, Any], cached) -> Dict[str, Any]:
+        if "error" not in result:
+            self.citation_cache.put(self.normalizer(citation_str), result)
+            return result
+        # Transport failure: a previously confirmed authority is still good evidence
+        if cached and cached.found:
+            cache_requests.inc(cache="citation", result="stale")
+            return {**cached.result, "cache": "stale", "error": result["error"]}
+        return result
+
+    def courtlistener_client(self, citation_str: str) -> Dict[str, Any]:
+        with span("Validation.courtlistener_client", KIND_CLIENT, citation=citation_str) as lookup_span:
+            mocked = self._mock_lookup(citation_str)
+            if mocked:
+                return mocked
+
+            hit, cached = self._cached_result(citation_str)
+            lookup_span.set_attribute("cache", "hit" if hit else "miss")
+            if hit:
+                return hit
+            return self._remember(citation_str, self._fetch_sync(citation_str), cached)
 
+    def _fetch_sync(self, citation_str: str) -> Dict[str, Any]:
+        # Blocking single lookup; batch verification goes through courtlistener_client_async
         try:
-            response = requests.get(
-                "https://www.courtlistener.com/api/rest/v3/search/",
-                params={"q": f'"{citation_str}"'},
-                headers=headers,
-                timeout=10
-            )
+            with track_stage("courtlistener", self.case_context.case_id):
+                response = get_sync_session().get(
+                    f"{self.config.COURTLISTENER_BASE_URL}{SEARCH_PATH}",
+                    params=self._search_params(citation_str),
+                    headers=self._request_headers(),
+                    timeout=self.config.CITATION_REQUEST_TIMEOUT
+                )
+            courtlistener_requests.inc(endpoint="search", outcome=str(response.status_code))
+            current_span().set_attribute("http.response.status_code", response.status_code)
 
             if response.status_code == 200:
-                data = response.json()
-                if data.get("count", 0) > 0:
-                    result = data["results"][0]
-                    return {
-                        "status": "found",
-                        "title": result.get("caseName", "Unknown"),
-                        "date_filed": result.get("dateFiled", ""),
-                        "court": result.get("court", ""),
-                        "url": f"https://www.courtlistener.com{result.get('absolute_url', '')}"
-                    }
+                return self._parse_search_response(response.json())
+            return {"status": "not_found", "error": f"CourtListener returned HTTP {response.status_code}"}
         except Exception as e:
+            courtlistener_requests.inc(endpoint="search", outcome="error")
             print(f"CourtListener API error: {e}")
+            return {"status": "not_found", "error": str(e)}
 
-        return {"status": "not_found"}
+    def _new_http_client(self) -> httpx.AsyncClient:
+        limit = self.config.CITATION_MAX_CONCURRENCY
+        return httpx.AsyncClient(
+            headers=self._request_headers(),
+            timeout=self.config.CITATION_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # Clients are bound to the loop that created them; reuse only on the same loop
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_loop is not loop:
+            self._http_client = self._new_http_client()
+            self._http_loop = loop
+        return self._http_client
+
+    async def courtlistener_client_async(self, citation_str: str, client: Optional[httpx.AsyncClient] = None) -> Dict[str, Any]:
+        with span("Validation.courtlistener_client", KIND_CLIENT, citation=citation_str) as lookup_span:
+            mocked = self._mock_lookup(citation_str)
+            if mocked:
+                return mocked
+
+            hit, cached = self._cached_result(citation_str)
+            lookup_span.set_attribute("cache", "hit" if hit else "miss")
+            if hit:
+                return hit
+            return self._remember(citation_str, await self._fetch_async(citation_str, client), cached)
+
+    async def _search_after_miss(self, citation_str: str, cached, client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+        # For authorities whose cache entry was already read (and counted) this run
+        with span("Validation.courtlistener_client", KIND_CLIENT, citation=citation_str, cache="miss"):
+            return self._remember(citation_str, await self._fetch_async(citation_str, client), cached)
+
+    async def _fetch_async(self, citation_str: str, client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+        client = client or self._get_http_client()
+        url = f"{self.config.COURTLISTENER_BASE_URL}{SEARCH_PATH}"
+        limiter = get_rate_limiter(self.config.CITATION_RATE_LIMIT, self.config.CITATION_RATE_BURST)
+        await limiter.acquire(urlparse(url).netloc)
+
+        try:
+            # Deadline starts once the rate limiter lets the request go
+            with track_stage("courtlistener", self.case_context.case_id):
+                response = await asyncio.wait_for(
+                    client.get(url, params=self._search_params(citation_str)),
+                    timeout=self.config.CITATION_REQUEST_TIMEOUT
+                )
+            courtlistener_requests.inc(endpoint="search", outcome=str(response.status_code))
+            current_span().set_attribute("http.response.status_code", response.status_code)
+            if response.status_code == 200:
+                return self._parse_search_response(response.json())
+            # Throttled or failing upstream says nothing about the citation itself
+            return {"status": "not_found", "error": f"CourtListener returned HTTP {response.status_code}"}
+        except asyncio.TimeoutError:
+            courtlistener_requests.inc(endpoint="search", outcome="timeout")
+            return {"status": "not_found", "error": f"Lookup exceeded {self.config.CITATION_REQUEST_TIMEOUT}s deadline"}
+        except Exception as e:
+            courtlistener_requests.inc(endpoint="search", outcome="error")
+            print(f"CourtListener API error: {e}")
+            return {"status": "not_found", "error": str(e)}
+
+    async def bulk_lookup(self, cleaned_text: str, groups: List[Tuple[Any, List[Any]]], client: Optional[httpx.AsyncClient] = None):
+        """
+        Resolves the given authorities through the citation-lookup endpoint,
+        which parses a block of text server-side. Only chunks containing one
+        of the authorities are sent. Returns (results by group index, extra)
+        where extra holds (start, end, citation, result) for citations the server found
+        that local extraction missed. Groups absent from the results need the
+        per-citation client.
+        """
+        client = client or self._get_http_client()
+        spans = sorted((m.span(), i) for i, (_, mentions) in enumerate(groups) for m in mentions if isinstance(m, eyecite_models.FullCitation))
+        by_start = {span[0]: i for span, i in spans}
+        by_key = {self.normalizer(full.matched_text()): i for i, (full, _) in enumerate(groups)}
+
+        results: Dict[int, Dict[str, Any]] = {}
+        extra = []
+        for offset, chunk in self._bulk_chunks(cleaned_text, [span for span, _ in spans]):
+            items = await self._post_bulk(chunk, client)
+            for item in items or []:
+                start = offset + item.get("start_index", 0)
+                end = offset + item.get("end_index", 0)
+                result = self._parse_lookup_item(item)
+                index = by_start.get(start)
+                if index is None:
+                    keys = [self.normalizer(c) for c in [item.get("citation", "")] + item.get("normalized_citations", [])]
+                    index = next((by_key[k] for k in keys if k in by_key), None)
+                if result is None:
+                    continue
+                if index is None:
+                    extra.append((start, end, item.get("citation", cleaned_text[start:end]), result))
+                elif index not in results:
+                    results[index] = result
+        return results, extra
+
+    def _bulk_chunks(self, text: str, spans: List[Tuple[int, int]]) -> Iterator[Tuple[int, str]]:
+        # Yields (offset, chunk) pieces within the endpoint's size and citation limits,
+        # never cutting through a citation and skipping pieces with nothing to look up
+        max_chars = self.config.CITATION_BULK_MAX_CHARS
+        max_cites = max(1, self.config.CITATION_BULK_MAX_CITATIONS)
+        start = 0
+        while start < len(text):
+            end = min(len(text), start + max_chars)
+            inside = [s for s in spans if s[0] >= start and s[1] <= end]
+            if len(inside) > max_cites:
+                end = inside[max_cites][0]
+            if end < len(text):
+                space = text.rfind(" ", start, end)
+                if space > start:
+                    end = space
+                # The space may fall inside a citation; back off until the cut is clear of all of them
+                while True:
+                    cut = next(((s_start, s_end) for s_start, s_end in spans if s_start < end < s_end), None)
+                    if cut is None:
+                        break
+                    if cut[0] <= start:
+                        # A citation longer than the limit goes whole rather than split
+                        end = cut[1]
+                        break
+                    end = cut[0]
+            if any(s[0] >= start and s[1] <= end for s in spans):
+                yield start, text[start:end]
+            start = end
+
+    async def _post_bulk(self, chunk: str, client: httpx.AsyncClient) -> Optional[List[Dict[str, Any]]]:
+        url = f"{self.config.COURTLISTENER_BASE_URL}{LOOKUP_PATH}"
+        limiter = get_rate_limiter(self.config.CITATION_RATE_LIMIT, self.config.CITATION_RATE_BURST)
+        await limiter.acquire(urlparse(url).netloc)
+
+        try:
+            with track_stage("courtlistener", self.case_context.case_id, "bulk"), \
+                    span("Validation.citation_lookup", KIND_CLIENT, chars=len(chunk)) as lookup_span:
+                response = await asyncio.wait_for(
+                    client.post(url, data={"text": chunk}),
+                    timeout=self.config.CITATION_BULK_TIMEOUT
+                )
+                lookup_span.set_attribute("http.response.status_code", response.status_code)
+            courtlistener_requests.inc(endpoint="lookup", outcome=str(response.status_code))
+            if response.status_code == 200:
+                return response.json()
+            print(f"Citation lookup returned HTTP {response.status_code}; falling back to per-citation search")
+        except asyncio.TimeoutError:
+            courtlistener_requests.inc(endpoint="lookup", outcome="timeout")
+            print(f"Citation lookup exceeded {self.config.CITATION_BULK_TIMEOUT}s deadline; falling back to per-citation search")
+        except Exception as e:
+            courtlistener_requests.inc(endpoint="lookup", outcome="error")
+            print(f"Citation lookup error: {e}")
+        return None
+
+    def _parse_lookup_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # 400 (unknown reporter) and 429 (over the per-request limit) leave the citation to the fallback
+        status = item.get("status")
+        clusters = item.get("clusters") or []
+        if status == 200 and clusters:
+            cluster = clusters[0]
+            return {
+                "status": "found",
+                "title": cluster.get("case_name", "Unknown"),
+                "date_filed": cluster.get("date_filed", ""),
+                "court": cluster.get("court", ""),
+                "url": f"{self.config.COURTLISTENER_BASE_URL}{cluster.get('absolute_url', '')}"
+            }
+        if status == 300:
+            return {"status": "ambiguous", "title": "; ".join(c.get("case_name", "Unknown") for c in clusters)}
+        if status == 404:
+            return {"status": "not_found"}
+        return None
 
     def reconciler(self, api_data: Dict[str, Any]) -> CitationStatus:
         if api_data.get("status") == "found":
             return CitationStatus.VERIFIED
+        if api_data.get("status") == "ambiguous":
+            return CitationStatus.AMBIGUOUS
         return CitationStatus.NOT_FOUND
 
     def normalizer(self, citation_text: str) -> str:
-        return citation_text.lower().replace(".", "").replace(" ", "")
+        return normalize_citation(citation_text)
 
     def deduplicator(self, findings: List[CitationFinding]) -> List[CitationFinding]:
         seen = set()
@@ -77,34 +413,138 @@ class Validation:
                 unique.append(f)
         return unique
 
+    def _build_finding(self, cit_str: str, api_res: Dict[str, Any]) -> CitationFinding:
+        status = self.reconciler(api_res)
+
+        # Use explicit confidence level enum if defined in models, else float 1.0/0.0
+        confidence = 1.0 if status == CitationStatus.VERIFIED else 0.0
+
+        return CitationFinding(
+            citation_text=cit_str,
+            normalized_form=self.normalizer(cit_str),
+            status=status,
+            confidence=confidence,
+            case_details={
+                "name": api_res.get("title", "Unknown"),
+                "date": api_res.get("date_filed", ""),
+                "court": api_res.get("court", ""),
+                "url": ""
+            },
+            reconciliation_notes=self._reconciliation_notes(api_res),
+            source_pass="both"
+        )
+
+    def _reconciliation_notes(self, api_res: Dict[str, Any]) -> str:
+        if api_res.get("status") == "ambiguous":
+            return f"Citation matches several cases: {api_res.get('title', '')}"
+        if api_res.get("cache") == "stale":
+            return f"Served from stale citation cache: {api_res.get('error', '')}"
+        if "error" in api_res:
+            return api_res["error"]
+        if api_res.get("cache") == "hit":
+            return "Served from citation cache"
+        return "Mock verification"
+
     def verify_citations(self, text: str) -> List[CitationFinding]:
-        citations = self.eyecite_extractor(text)
+        """
+        Blocking entry point; runs the concurrent engine on a private event loop.
+        Must not be called from a thread that is already running a loop.
+        """
+        async def run():
+            async with self._new_http_client() as client:
+                return await self.verify_citations_async(text, client)
 
-        findings = []
-        for citation in citations:
-            cit_str = citation.matched_text()
-
-            # API check (Mocked)
-            api_res = self.courtlistener_client(cit_str)
-            status = self.reconciler(api_res)
-
-            # Use explicit confidence level enum if defined in models, else float 1.0/0.0
-            confidence = 1.0 if status == CitationStatus.VERIFIED else 0.0
-
-            finding = CitationFinding(
-                citation_text=cit_str,
-                normalized_form=self.normalizer(cit_str),
-                status=status,
-                confidence=confidence,
-                case_details={
-                    "name": api_res.get("title", "Unknown"),
-                    "date": api_res.get("date_filed", ""),
-                    "court": api_res.get("court", ""),
-                    "url": ""
-                },
-                reconciliation_notes="Mock verification",
-                source_pass="both"
-            )
-            findings.append(finding)
+        return asyncio.run(run())
+
+    async def verify_citations_async(self, text: str, client: Optional[httpx.AsyncClient] = None) -> List[CitationFinding]:
+        """
+        Resolves every mention to its authority first, looks each distinct
+        authority up once, then attaches all of its mentions to the finding.
+        In bulk mode uncached authorities go through the citation-lookup
+        endpoint; anything it cannot settle falls back to per-citation search.
+        """
+        def extract():
+            cleaned = self._clean_text(text)
+            groups, unresolved = self.citation_resolver(eyecite.get_citations(cleaned))
+            return cleaned, groups, unresolved, self._offset_mapper(cleaned, text)
+
+        cleaned, groups, unresolved, to_source = await asyncio.to_thread(extract)
+        results: Dict[int, Dict[str, Any]] = {}
+        extra = []
+
+        # Cache entries already read for authorities that missed, so the fallback does not count them again
+        checked: Dict[int, Any] = {}
 
+        if self._bulk_enabled():
+            pending = []
+            for i, (full, _) in enumerate(groups):
+                cit_str = full.matched_text()
+                known = self._mock_lookup(cit_str)
+                if not known:
+                    known, checked[i] = self._cached_result(cit_str)
+                if known:
+                    results[i] = known
+                    checked.pop(i, None)
+                else:
+                    pending.append(i)
+            if pending:
+                bulk_results, extra = await self.bulk_lookup(cleaned, [groups[i] for i in pending], client)
+                for local_index, result in bulk_results.items():
+                    index = pending[local_index]
+                    results[index] = self._remember(groups[index][0].matched_text(), result, None)
+                for _, _, cit_str, result in extra:
+                    self._remember(cit_str, result, None)
+
+        sem = asyncio.Semaphore(self.config.CITATION_MAX_CONCURRENCY)
+
+        async def lookup(i, full, mentions):
+            cit_str = full.matched_text()
+            api_res = results.get(i)
+            if api_res is None:
+                async with sem:
+                    if i in checked:
+                        api_res = await self._search_after_miss(cit_str, checked[i], client)
+                    else:
+                        api_res = await self.courtlistener_client_async(cit_str, client)
+            finding = self._build_finding(cit_str, api_res)
+            finding.occurrences = self._occurrences(mentions, text, to_source)
+            return finding
+
+        findings = list(await asyncio.gather(*[lookup(i, full, mentions) for i, (full, mentions) in enumerate(groups)]))
+        findings.extend(self._unresolved_findings(unresolved, text, to_source))
+        for start, end, cit_str, result in extra:
+            # Cited in the brief but missed by eyecite; the server's offsets are into the cleaned text
+            finding = self._build_finding(cit_str, result)
+            finding.source_pass = "api"
+            source_start, source_end = to_source(start, end)
+            finding.occurrences = [CitationOccurrence(citation_text=text[source_start:source_end], form="full", start=source_start, end=source_end)]
+            findings.append(finding)
+        findings.sort(key=lambda f: f.occurrences[0].start if f.occurrences else 0)
         return self.deduplicator(findings)
+
+    def _unresolved_findings(self, unresolved: List[Any], text: str, to_source: Callable[[int, int], Tuple[int, int]]) -> List[CitationFinding]:
+        # Short forms with no antecedent in the brief cannot be checked against an authority
+        by_form: Dict[str, List[Any]] = {}
+        for citation in unresolved:
+            if isinstance(citation, eyecite_models.FullCitation):
+                continue
+            if isinstance(citation, eyecite_models.ShortCaseCitation):
+                # Pin cites differ between mentions; the volume and reporter identify the authority
+                key = self.normalizer(f"{citation.groups.get('volume', '')} {citation.groups.get('reporter', '')}")
+            else:
+                key = self.normalizer(citation.matched_text())
+            by_form.setdefault(key, []).append(citation)
+
+        findings = []
+        for normalized, mentions in by_form.items():
+            findings.append(CitationFinding(
+                citation_text=mentions[0].matched_text(),
+                normalized_form=normalized,
+                status=CitationStatus.UNVERIFIED,
+                confidence=0.0,
+                case_details={"name": "Unknown", "date": "", "court": "", "url": ""},
+                reconciliation_notes="Reference could not be linked to a full citation in the text",
+                source_pass="local",
+                occurrences=self._occurrences(mentions, text, to_source)
+            ))
+        return findings
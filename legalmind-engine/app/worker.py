@@ -0,0 +1,87 @@
+"""
+Runs queued Dominion workflows outside the API process.
+
+    python -m app.worker [--concurrency N] [--metrics-port PORT] [--warmup]
+
+Start the API with LEGALMIND_JOB_EXECUTION_MODE=worker so it only enqueues.
+Any number of workers can share one storage root; the queue's leases keep
+each job on a single worker and hand it to another if that worker dies.
+"""
+import signal
+import threading
+import asyncio
+import argparse
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from app.api.routes import case_cache, get_cached_dominion
+from app.modules.dominion import warmup
+from app.core.config import load_config
+from app.core.executors import shutdown_executors
+from app.core.job_queue import JobQueue, JobRunner
+from app.core.stores import AuditLog, job_events
+from app.core import metrics
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", metrics.CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_metrics(port: int) -> ThreadingHTTPServer:
+    """Serves GET /metrics for this worker on a background thread; the API's /metrics only covers the API process."""
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+async def run_worker(concurrency: Optional[int] = None, owner: Optional[str] = None, stop: Optional[asyncio.Event] = None, metrics_port: Optional[int] = None, preload: bool = False):
+    config = load_config()
+    if concurrency:
+        config.JOB_WORKER_CONCURRENCY = concurrency
+    queue = JobQueue.for_storage(config.STORAGE_PATH, config)
+    queue.report_metrics()
+    server = serve_metrics(metrics_port) if metrics_port else None
+    # Progress and status reach API subscribers through the queue database
+    job_events.attach_log(queue)
+    runner = JobRunner(queue, get_cached_dominion, owner=owner, config=config)
+    if preload:
+        # Load models before claiming jobs rather than in the first job that needs them
+        for component, result in (await asyncio.to_thread(warmup)).items():
+            print(f"Warmup {component}: {result['status']} ({result['seconds']}s)")
+
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError, ValueError):
+            loop.add_signal_handler(sig, stop.set)
+
+    print(f"Worker {runner.owner} running up to {runner.concurrency} jobs from {queue.db_path}")
+    await runner.run_forever(stop)
+    if server is not None:
+        server.shutdown()
+    await asyncio.to_thread(case_cache.clear)
+    shutdown_executors()
+    await asyncio.to_thread(AuditLog.close)
+    print(f"Worker {runner.owner} stopped")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description="Execute queued LegalMind jobs.")
+    parser.add_argument("--concurrency", type=int, help="Jobs run at once (defaults to LEGALMIND_JOB_WORKER_CONCURRENCY)")
+    parser.add_argument("--name", help="Worker name recorded on leased jobs (defaults to host:pid)")
+    parser.add_argument("--metrics-port", type=int, help="Serve this worker's Prometheus metrics at http://0.0.0.0:PORT/metrics")
+    parser.add_argument("--warmup", action="store_true", help="Load dependencies and models before taking jobs")
+    args = parser.parse_args(argv)
+    asyncio.run(run_worker(args.concurrency, args.name, metrics_port=args.metrics_port, preload=args.warmup))
+
+if __name__ == "__main__":
+    main()
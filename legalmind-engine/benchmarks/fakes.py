@@ -0,0 +1,329 @@
+"""
+Stand-ins for the LLM and CourtListener so benchmarks measure the engine
+rather than a provider's queue or the network.
+
+FakeLLM answers claim extraction and verification prompts deterministically
+from the prompt text alone. Install it with patch_litellm() to replace
+litellm.completion in-process, or serve it over HTTP with FakeLLMServer
+for an engine in another process. CourtListenerStub serves the search and
+citation-lookup endpoints for a fixed set of authorities on a local port;
+point LEGALMIND_COURTLISTENER_BASE_URL at stub.url. HashEmbeddingFunction
+stands in for the sentence-transformers model where it cannot be
+downloaded; patch_embeddings() installs it.
+"""
+import re
+import json
+import zlib
+import time
+import random
+import threading
+import contextlib
+from types import SimpleNamespace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from unittest.mock import patch
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from app.modules.validation import LOOKUP_PATH, SEARCH_PATH
+
+CITATION_PATTERN = re.compile(r"\b(\d{1,4})\s+(U\.S\.|F\.3d|F\.2d|F\. Supp\. 2d)\s+(\d{1,5})\b")
+_WORDS = re.compile(r"\w+")
+
+class FakeLLMError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+def _normalize(citation: str) -> str:
+    return " ".join(citation.split())
+
+# Sentence ends, except after "v.", "Dr." and reporter abbreviations
+_SENTENCE_END = re.compile(r"(?<=[.!?])(?<!\bv\.)(?<!\bDr\.)(?<!\bNo\.)(?<!\bF\.)(?<!U\.S\.)\s+(?=[A-Z])")
+
+def _sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+
+def _overlap(a: str, b: str) -> float:
+    left, right = set(_WORDS.findall(a.lower())), set(_WORDS.findall(b.lower()))
+    return len(left & right) / len(left) if left else 0.0
+
+class FakeLLM:
+    """
+    OpenAI-style chat completions with fixed answers: extraction returns one
+    claim per factual sentence, verification compares the claim with the
+    evidence in the prompt. latency (seconds, with +/- jitter) is slept per
+    call; error_rate and rate_limit_rate make calls fail with 500 or 429.
+    """
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self) -> Tuple[float, float]:
+        with self._lock:
+            self.calls += 1
+            return self._rng.random(), self._rng.uniform(-self.jitter, self.jitter)
+
+    def content_for(self, messages: List[Dict[str, Any]]) -> str:
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        if system.startswith("Extract factual claims"):
+            return json.dumps(self._extract(user))
+        return json.dumps(self._verify(user))
+
+    def _extract(self, window_text: str) -> List[Dict[str, Any]]:
+        claims = []
+        for line in window_text.splitlines():
+            match = re.match(r"\[(\d+)\]\s*(.*)", line)
+            if not match:
+                continue
+            paragraph, text = int(match.group(1)), match.group(2)
+            for sentence in _sentences(text):
+                # Citation sentences and headings are not factual claims
+                if sentence.startswith(("See ", "See also")) or sentence.isupper() or not re.search(r"\d", sentence):
+                    continue
+                claims.append({"text": sentence, "type": "factual", "priority": 3, "paragraph": paragraph})
+        return claims
+
+    def _verify(self, prompt: str) -> Dict[str, Any]:
+        claim_match = re.search(r'Claim: "(.*?)"\s*\n', prompt, re.DOTALL)
+        claim = claim_match.group(1) if claim_match else ""
+        evidence = prompt.split("Evidence from Record:", 1)[-1].split("Instructions:", 1)[0]
+        best, best_score = "", 0.0
+        for sentence in _sentences(evidence):
+            score = _overlap(claim, sentence)
+            if score > best_score:
+                best, best_score = sentence, score
+        if best_score >= 0.95:
+            return {"status": "Supported", "reasoning": "The record states this directly.", "quote": best}
+        if best_score >= 0.75:
+            return {"status": "Contradicted", "reasoning": "The record describes the same event differently.", "quote": best}
+        return {"status": "Not Supported", "reasoning": "Nothing in the record addresses this.", "quote": ""}
+
+    def respond(self, messages: List[Dict[str, Any]]) -> Tuple[str, Dict[str, int]]:
+        """(content, usage) after the configured delay; raises FakeLLMError for injected failures."""
+        roll, jitter = self._draw()
+        if self.latency or jitter:
+            time.sleep(max(0.0, self.latency + jitter))
+        if roll < self.rate_limit_rate:
+            raise FakeLLMError("Rate limit reached for requests", 429)
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeLLMError("The server had an error while processing your request", 500)
+        content = self.content_for(messages)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+        return content, {"prompt_tokens": prompt_tokens, "completion_tokens": len(content.split()), "total_tokens": prompt_tokens + len(content.split())}
+
+    def completion(self, model: str = "fake", messages: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Any:
+        """Drop-in for litellm.completion."""
+        content, usage = self.respond(messages or [])
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason="stop", message=SimpleNamespace(role="assistant", content=content))],
+            usage=SimpleNamespace(**usage),
+        )
+
+@contextlib.contextmanager
+def patch_litellm(llm: FakeLLM) -> Iterator[FakeLLM]:
+    """Routes every litellm.completion call in this process to llm."""
+    import litellm
+
+    original = litellm.completion
+    litellm.completion = llm.completion
+    try:
+        yield llm
+    finally:
+        litellm.completion = original
+
+class HashEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Hashed bag-of-words vectors. Needs no model download, so dense retrieval
+    runs offline; its quality says nothing about the real embedding model.
+    """
+    def __init__(self, model_name: str = "hash", dimensions: int = 64, **kwargs):
+        self.dimensions = dimensions
+
+    def __call__(self, input: Documents) -> Embeddings:
+        vectors = []
+        for text in input:
+            vector = [0.0] * self.dimensions
+            for word in _WORDS.findall(text.lower()):
+                vector[zlib.crc32(word.encode("utf-8")) % self.dimensions] += 1.0
+            vectors.append(vector)
+        return vectors
+
+    @staticmethod
+    def name() -> str:
+        return "hash"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"dimensions": self.dimensions}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "HashEmbeddingFunction":
+        return HashEmbeddingFunction(**config)
+
+def patch_embeddings() -> Any:
+    """Replaces the sentence-transformers embedding function used by Preservation and Inquiry."""
+    return patch("chromadb.utils.embedding_functions.SentenceTransformerEmbeddingFunction", HashEmbeddingFunction)
+
+class _LocalServer:
+    """A ThreadingHTTPServer on a background thread; subclasses build the handler."""
+    def _serve(self, handler: type, host: str, port: int):
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+class FakeLLMServer(_LocalServer):
+    """
+    OpenAI-compatible /v1/chat/completions backed by a FakeLLM, for engines
+    in another process (set LEGALMIND_LLM_API_BASE to server.url + "/v1").
+    Injected failures are answered as the OpenAI API does: 429 with
+    Retry-After, or 500. stats counts requests, responses by status and
+    the most requests in flight at once.
+    """
+    def __init__(self, llm: FakeLLM, host: str = "127.0.0.1", port: int = 0, retry_after: float = 1.0):
+        self.llm = llm
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(_JSONHandler):
+            def do_GET(self):
+                if urlparse(self.path).path.rstrip("/") != "/v1/models":
+                    return self._send(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                self._send(200, {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "legalmind"}]})
+
+            def do_POST(self):
+                if urlparse(self.path).path.rstrip("/") != "/v1/chat/completions":
+                    return self._send(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                request = json.loads(self._body() or b"{}")
+                server._track(+1)
+                try:
+                    content, usage = server.llm.respond(request.get("messages", []))
+                except FakeLLMError as e:
+                    rate_limited = e.status_code == 429
+                    server._count("rate_limited" if rate_limited else "errors")
+                    kind = "rate_limit_error" if rate_limited else "server_error"
+                    headers = {"Retry-After": str(server.retry_after)} if rate_limited else None
+                    return self._send(e.status_code, {"error": {"message": str(e), "type": kind, "code": kind}}, headers)
+                finally:
+                    server._track(-1)
+                server._count("ok")
+                self._send(200, {
+                    "id": f"chatcmpl-{server.stats['requests']}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{"index": 0, "finish_reason": "stop", "logprobs": None,
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                })
+
+        self._serve(Handler, host, port)
+
+    def _track(self, delta: int):
+        with self._lock:
+            if delta > 0:
+                self.stats["requests"] += 1
+            self.stats["in_flight"] += delta
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+class CourtListenerStub(_LocalServer):
+    """
+    Local CourtListener serving SEARCH_PATH and LOOKUP_PATH for the given
+    authorities (dicts with citation, case_name, date_filed, court, exists).
+    """
+    def __init__(self, authorities: List[Dict[str, Any]], latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.records = {_normalize(a["citation"]): a for a in authorities if a.get("exists", True)}
+        self.requests = {"search": 0, "lookup": 0}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(_JSONHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != SEARCH_PATH:
+                    return self._send(404, {"detail": "Not found."})
+                stub._count("search")
+                query = parse_qs(url.query).get("q", [""])[0].strip('"')
+                record = stub.records.get(_normalize(query))
+                results = [stub._search_result(record)] if record else []
+                self._send(200, {"count": len(results), "results": results})
+
+            def do_POST(self):
+                if urlparse(self.path).path != LOOKUP_PATH:
+                    return self._send(404, {"detail": "Not found."})
+                stub._count("lookup")
+                text = parse_qs(self._body().decode("utf-8")).get("text", [""])[0]
+                self._send(200, [stub._lookup_item(m) for m in CITATION_PATTERN.finditer(text)])
+
+        self._serve(Handler, host, port)
+
+    def _count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _slug(self, record: Dict[str, Any]) -> str:
+        return f"/opinion/{zlib.crc32(record['citation'].encode('utf-8')) % 10 ** 7}/{record['case_name'].lower().replace(' ', '-').replace('.', '')}/"
+
+    def _search_result(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return {"caseName": record["case_name"], "dateFiled": record["date_filed"], "court": record["court"], "absolute_url": self._slug(record)}
+
+    def _lookup_item(self, match: re.Match) -> Dict[str, Any]:
+        citation = _normalize(match.group(0))
+        record = self.records.get(citation)
+        item = {"citation": match.group(0), "normalized_citations": [citation], "start_index": match.start(), "end_index": match.end()}
+        if record is None:
+            return {**item, "status": 404, "error_message": "Citation not found", "clusters": []}
+        cluster = {"case_name": record["case_name"], "date_filed": record["date_filed"], "court": record["court"], "absolute_url": self._slug(record)}
+        return {**item, "status": 200, "error_message": "", "clusters": [cluster]}
@@ -0,0 +1,318 @@
+"""
+Load generator for the LegalMind API.
+
+Drives the HTTP endpoints the way clients do. Each of --cases cases
+initialises its workspace, ingests the synthetic evidence PDF and, once it
+is indexed, submits --audits audit jobs, polling every job until it
+finishes. --concurrency cases run at once. The report gives throughput,
+latency percentiles and error rates per endpoint and per workflow.
+Run from legalmind-engine/:
+
+    python -m benchmarks.loadgen --cases 8 --concurrency 4 --audits 2 --llm-latency 0.5 --llm-429-rate 0.05
+    python -m benchmarks.loadgen --engine-env LEGALMIND_JOB_WORKER_CONCURRENCY=8 --out load.json
+    python -m benchmarks.loadgen --base-url http://localhost:8000 --case-dir /tmp/legalmind-case
+
+By default the engine is started as a subprocess on scratch storage, with
+its LLM and CourtListener traffic sent to local fakes
+(benchmarks.servers). No request leaves the machine. With --base-url an
+engine that is already running is used instead; point it at
+"python -m benchmarks.servers fakes" yourself. The case files must be
+readable by that engine at the same paths.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+import shutil
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.run import latency_summary
+from benchmarks.servers import engine_environment, start_fakes
+from benchmarks.synthetic import generate_case, load_manifest
+
+ENGINE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TERMINAL = {"complete", "failed", "cancelled"}
+WORKFLOW_ROUTES = {"ingest": "/api/evidence/ingest", "audit": "/api/audit/run", "prefile": "/api/prefile/run"}
+
+class Recorder:
+    """Latency and outcome of every request and job in a run."""
+    def __init__(self):
+        self.requests: Dict[str, List[float]] = defaultdict(list)
+        self.request_outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.jobs: Dict[str, List[float]] = defaultdict(list)
+        self.job_outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: List[str] = []
+
+    def request(self, name: str, seconds: float, outcome: Any):
+        self.requests[name].append(seconds)
+        self.request_outcomes[name][str(outcome)] += 1
+
+    def job(self, workflow: str, seconds: float, outcome: str):
+        self.jobs[workflow].append(seconds)
+        self.job_outcomes[workflow][outcome] += 1
+
+    def error(self, message: str):
+        # The first few are enough to diagnose a run
+        if len(self.errors) < 20:
+            self.errors.append(message)
+
+    def summary(self, wall_seconds: float) -> Dict[str, Any]:
+        def failed(outcomes: Counter, ok) -> int:
+            return sum(count for outcome, count in outcomes.items() if not ok(outcome))
+
+        requests = {}
+        for name, samples in sorted(self.requests.items()):
+            outcomes = self.request_outcomes[name]
+            errors = failed(outcomes, lambda o: o.isdigit() and int(o) < 400)
+            requests[name] = {**latency_summary(samples), "per_second": len(samples) / wall_seconds,
+                              "error_rate": errors / len(samples), "outcomes": dict(outcomes)}
+        jobs = {}
+        for workflow, samples in sorted(self.jobs.items()):
+            outcomes = self.job_outcomes[workflow]
+            jobs[workflow] = {**latency_summary(samples), "per_second": outcomes["complete"] / wall_seconds,
+                              "failure_rate": failed(outcomes, lambda o: o == "complete") / len(samples), "outcomes": dict(outcomes)}
+        total_requests = sum(len(s) for s in self.requests.values())
+        completed = sum(o["complete"] for o in self.job_outcomes.values())
+        return {
+            "wall_seconds": wall_seconds,
+            "requests": total_requests,
+            "requests_per_second": total_requests / wall_seconds,
+            "jobs_completed": completed,
+            "jobs_per_second": completed / wall_seconds,
+            "by_endpoint": requests,
+            "by_workflow": jobs,
+            "errors": self.errors,
+        }
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, case_dir: str, manifest: Dict[str, Any],
+                 audits: int, workflows: List[str], poll: str, poll_interval: float, job_timeout: float, formats: List[str]):
+        self.client = client
+        self.recorder = recorder
+        self.case_dir = case_dir
+        self.manifest = manifest
+        self.audits = audits
+        self.workflows = workflows
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self.formats = formats
+
+    async def call(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.request(name, time.perf_counter() - start, type(e).__name__)
+            self.recorder.error(f"{name}: {type(e).__name__}: {e}")
+            return None
+        self.recorder.request(name, time.perf_counter() - start, response.status_code)
+        if response.status_code >= 400:
+            self.recorder.error(f"{name}: HTTP {response.status_code}: {response.text[:200]}")
+        return response
+
+    async def run_job(self, case_id: str, workflow: str, body: Dict[str, Any]) -> str:
+        """Submits a job and polls it to the end; returns its final status (or submit_failed / timeout)."""
+        params = {"case_id": case_id}
+        start = time.perf_counter()
+        response = await self.call(f"submit {workflow}", "POST", WORKFLOW_ROUTES[workflow], params=params, json=body)
+        if response is None or response.status_code != 200:
+            self.recorder.job(workflow, time.perf_counter() - start, "submit_failed")
+            return "submit_failed"
+        state = response.json()
+        run_id, since = state["run_id"], None
+        while state["status"] not in TERMINAL:
+            if time.perf_counter() - start > self.job_timeout:
+                self.recorder.job(workflow, time.perf_counter() - start, "timeout")
+                self.recorder.error(f"{workflow} {run_id} in {case_id} did not finish in {self.job_timeout:.0f}s")
+                return "timeout"
+            if self.poll == "long":
+                query = {**params, "timeout": self.poll_interval, **({"since": since} if since is not None else {})}
+            else:
+                await asyncio.sleep(self.poll_interval)
+                query = {**params, "timeout": 0}
+            response = await self.call(f"poll {self.poll}", "GET", f"/api/jobs/{run_id}/wait", params=query)
+            if response is not None and response.status_code == 200:
+                data = response.json()
+                state, since = data["run_state"], data["last_seq"]
+            elif self.poll == "long":
+                # Do not spin on a failing endpoint
+                await asyncio.sleep(self.poll_interval)
+        status = state["status"]
+        if status != "complete":
+            self.recorder.error(f"{workflow} {run_id} in {case_id} ended {status}: {state.get('warnings')}")
+        self.recorder.job(workflow, time.perf_counter() - start, status)
+        return status
+
+    async def run_case(self, case_id: str):
+        await self.call("case init", "POST", "/api/case/init", params={"case_id": case_id}, json={"case_name": case_id})
+        evidence = os.path.join(self.case_dir, self.manifest["files"]["evidence_pdf"])
+        if await self.run_job(case_id, "ingest", {"file_path": evidence}) != "complete":
+            return
+        brief = os.path.join(self.case_dir, self.manifest["files"]["brief_docx"])
+        await asyncio.gather(*(
+            self.run_job(case_id, self.workflows[i % len(self.workflows)], {"brief_path": brief, "formats": self.formats})
+            for i in range(self.audits)
+        ))
+
+    async def run(self, cases: List[str], concurrency: int):
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(case_id: str):
+            async with gate:
+                await self.run_case(case_id)
+
+        await asyncio.gather(*(one(case_id) for case_id in cases))
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_engine(work_dir: str, env: Dict[str, str], hash_embeddings: bool, startup_timeout: float = 120.0):
+    """Starts the API on a free port; returns (process, base_url, log_path)."""
+    port = _free_port()
+    log_path = os.path.join(work_dir, "engine.log")
+    command = [sys.executable, "-m", "benchmarks.servers", "engine", "--port", str(port)]
+    if hash_embeddings:
+        command.append("--hash-embeddings")
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(command, cwd=ENGINE_ROOT, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Engine exited with {process.returncode}; see {log_path}")
+        try:
+            if httpx.get(base_url + "/", timeout=1.0).status_code == 200:
+                return process, base_url, log_path
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Engine did not start within {startup_timeout:.0f}s; see {log_path}")
+
+def stop_engine(process: subprocess.Popen, timeout: float = 30.0):
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def parse_env(assignments: List[str]) -> Dict[str, str]:
+    env = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition("=")
+        if not sep:
+            raise SystemExit(f"--engine-env expects KEY=VALUE, got {assignment!r}")
+        env[key] = value
+    return env
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--base-url", help="Engine already running; default starts one on scratch storage")
+    parser.add_argument("--cases", type=int, default=4, help="Cases to create and load")
+    parser.add_argument("--concurrency", type=int, default=4, help="Cases in progress at once")
+    parser.add_argument("--audits", type=int, default=2, help="Audit jobs per case once its evidence is ingested")
+    parser.add_argument("--workflows", default="audit", help="Comma-separated mix of audit and prefile, used in turn")
+    parser.add_argument("--formats", default="html", help="Report formats rendered by each audit")
+    parser.add_argument("--poll", choices=("short", "long"), default="short",
+                        help="short: check job status every --poll-interval; long: block on /jobs/{id}/wait for up to --poll-interval")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--job-timeout", type=float, default=600.0)
+    parser.add_argument("--case-prefix", default="load", help="Case ids are <prefix>_<n>")
+    parser.add_argument("--case-dir", help="Synthetic case to load (generated if missing)")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--claims", type=int, default=20)
+    parser.add_argument("--citations", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.05)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of fake LLM calls answered with 500")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="Share of fake LLM calls answered with 429")
+    parser.add_argument("--courtlistener-latency", type=float, default=0.05)
+    parser.add_argument("--engine-env", action="append", default=[], help="KEY=VALUE set for the started engine; repeatable")
+    parser.add_argument("--hash-embeddings", action="store_true", help="Started engine uses hashed embeddings (no model download)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch directory")
+    parser.add_argument("--out", default="loadgen-results.json")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="legalmind-load-")
+    case_dir = args.case_dir or os.path.join(work_dir, "case")
+    manifest = load_manifest(case_dir) or generate_case(
+        case_dir, pages=args.pages, scanned_pages=0, claims=args.claims, citations=args.citations, audio_seconds=0, seed=args.seed)
+
+    llm_server = stub = process = None
+    log_path = None
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            llm_server, stub = start_fakes(manifest["authorities"], llm_latency=args.llm_latency, llm_jitter=args.llm_jitter,
+                                           llm_error_rate=args.llm_error_rate, llm_429_rate=args.llm_429_rate,
+                                           courtlistener_latency=args.courtlistener_latency, seed=args.seed)
+            env = {
+                **engine_environment(llm_server, stub),
+                "LEGALMIND_STORAGE_PATH": os.path.join(work_dir, "storage"),
+                "LEGALMIND_CITATION_CACHE_PATH": os.path.join(work_dir, "citation_cache.db"),
+                "LEGALMIND_ALLOWED_INPUT_PATHS": f"{case_dir},{tempfile.gettempdir()}",
+                **parse_env(args.engine_env),
+            }
+            process, base_url, log_path = start_engine(work_dir, env, args.hash_embeddings)
+
+        recorder = Recorder()
+        cases = [f"{args.case_prefix}_{n}" for n in range(args.cases)]
+        workflows = [w.strip() for w in args.workflows.split(",") if w.strip()]
+
+        async def drive():
+            limits = httpx.Limits(max_connections=max(10, args.concurrency * (args.audits + 1) * 2))
+            async with httpx.AsyncClient(base_url=base_url, timeout=args.poll_interval + 60.0, limits=limits) as client:
+                test = LoadTest(client, recorder, case_dir, manifest, args.audits, workflows, args.poll,
+                                args.poll_interval, args.job_timeout, [f for f in args.formats.split(",") if f])
+                await test.run(cases, args.concurrency)
+
+        start = time.perf_counter()
+        asyncio.run(drive())
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count()},
+            "parameters": {k: v for k, v in vars(args).items() if k not in ("out", "keep")},
+            "summary": recorder.summary(time.perf_counter() - start),
+        }
+        if llm_server is not None:
+            report["fakes"] = {"llm": dict(llm_server.stats), "courtlistener": dict(stub.requests)}
+    finally:
+        if process is not None:
+            stop_engine(process)
+        if llm_server is not None:
+            llm_server.stop()
+            stub.stop()
+        if args.keep:
+            print(f"Scratch directory kept at {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = report["summary"]
+    print(f"{summary['requests']} requests ({summary['requests_per_second']:.1f}/s), "
+          f"{summary['jobs_completed']} jobs completed ({summary['jobs_per_second']:.2f}/s) in {summary['wall_seconds']:.1f}s")
+    for workflow, row in summary["by_workflow"].items():
+        print(f"  {workflow:<10} p50={row['p50_ms'] / 1000:.2f}s p99={row['p99_ms'] / 1000:.2f}s failures={row['failure_rate']:.1%} {row['outcomes']}")
+    for name, row in summary["by_endpoint"].items():
+        print(f"  {name:<16} p50={row['p50_ms']:.1f}ms p99={row['p99_ms']:.1f}ms errors={row['error_rate']:.1%}")
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Retrieval quality and latency evaluation.
+
+Runs Inquiry.retrieve_evidence over a labelled claim set under several
+retrieval configurations and reports recall@k, MRR and nDCG@k next to
+latency percentiles and memory, so a retrieval change can be judged on
+both. Run from legalmind-engine/:
+
+    python -m benchmarks.retrieval_eval --case-id my_case --golden golden.json --out eval.json
+    python -m benchmarks.retrieval_eval --synthetic --pages 40 --claims 60 --out eval.json
+    python -m benchmarks.retrieval_eval --synthetic --config "wide:RETRIEVAL_CANDIDATES=30,RRF_K=20"
+
+A golden file lists claims with the chunk or segment ids that answer them:
+
+    {"claims": [{"claim_id": "c1", "text": "...", "relevant": ["<chunk or segment id>"],
+                 "expected_modality": null}]}
+
+A retrieved chunk counts as relevant when its chunk id, or any segment it
+was cut from, is listed. --synthetic builds and indexes a generated case
+(benchmarks.synthetic) and labels each claim with the segments that state
+its fact.
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import contextlib
+import resource
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from benchmarks.fakes import patch_embeddings
+from benchmarks.run import environment, index_pdf, latency_summary
+from benchmarks.synthetic import generate_case
+
+DEFAULT_KS = (1, 3, 5, 10)
+# Each configuration is a name plus Config overrides applied to the base config
+DEFAULT_CONFIGS: List[Dict[str, Any]] = [
+    {"name": "dense", "overrides": {"RETRIEVAL_MODE": "dense"}},
+    {"name": "bm25", "overrides": {"RETRIEVAL_MODE": "bm25"}},
+    {"name": "hybrid_rrf10", "overrides": {"RETRIEVAL_MODE": "hybrid", "RRF_K": 10}},
+    {"name": "hybrid_rrf60", "overrides": {"RETRIEVAL_MODE": "hybrid", "RRF_K": 60}},
+    {"name": "hybrid_rrf100", "overrides": {"RETRIEVAL_MODE": "hybrid", "RRF_K": 100}},
+    {"name": "hybrid_top10", "overrides": {"RETRIEVAL_MODE": "hybrid", "RETRIEVAL_TOP_K": 10}},
+    {"name": "hybrid_rerank", "overrides": {"RETRIEVAL_MODE": "hybrid", "RERANKER_ENABLED": True}},
+]
+
+def parse_config(spec: str) -> Dict[str, Any]:
+    """
+    "name:KEY=VALUE,KEY=VALUE" to a configuration. Values are converted by
+    the Config field types, so unknown keys and bad values fail here.
+    """
+    from app.core.config import Config
+
+    name, _, assignments = spec.partition(":")
+    overrides: Dict[str, Any] = {}
+    for assignment in filter(None, (a.strip() for a in assignments.split(","))):
+        key, sep, value = assignment.partition("=")
+        if not sep or key not in Config.model_fields:
+            raise ValueError(f"Bad override {assignment!r} in {spec!r}; expected KEY=VALUE with a Config field")
+        overrides[key] = value
+    validated = Config(**overrides)
+    return {"name": name, "overrides": {key: getattr(validated, key) for key in overrides}}
+
+def load_golden(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        data = json.load(f)
+    claims = data["claims"] if isinstance(data, dict) else data
+    for i, claim in enumerate(claims):
+        claim.setdefault("claim_id", f"claim_{i}")
+        claim["relevant"] = list(claim.get("relevant", []))
+    return claims
+
+def _squash(text: str) -> str:
+    return " ".join(text.split())
+
+def golden_from_manifest(case_context, manifest: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Labels the manifest's claims with the ledger segments containing their
+    source fact. Invented claims have no answer in the record and are left
+    out; contradicted ones are labelled with the fact they contradict.
+    """
+    facts = {f["fact_id"]: _squash(f["text"]) for f in manifest["facts"] + manifest.get("scanned_facts", [])}
+    segments = [(s.segment_id, _squash(s.text)) for s in case_context.ledger.get_all_segments()]
+    claims = []
+    for row in manifest["claims"]:
+        fact = facts.get(row.get("fact_id"))
+        if fact is None:
+            continue
+        relevant = [segment_id for segment_id, text in segments if fact in text]
+        if relevant:
+            claims.append({"claim_id": f"c{row['claim_index']}", "text": row["text"], "kind": row["kind"], "relevant": relevant})
+    return claims
+
+def relevance_keys(case_context) -> Dict[str, Set[str]]:
+    """chunk_id -> the ids a label may use for it: the chunk id and its segment ids."""
+    return {c.chunk_id: {c.chunk_id, *c.segment_ids} for c in case_context.index.get_all_chunks()}
+
+def score_ranking(ranked: Sequence[Set[str]], relevant: Set[str], ks: Sequence[int] = DEFAULT_KS) -> Dict[str, float]:
+    """
+    Quality of one ranking. ranked holds, per retrieved chunk in order, the
+    ids it answers to. recall@k is the share of relevant ids covered by the
+    first k chunks; nDCG@k uses binary gains, with an ideal ranking that
+    places one relevant chunk per relevant id first.
+    """
+    scores: Dict[str, float] = {}
+    first_hit = next((rank for rank, ids in enumerate(ranked, start=1) if ids & relevant), None)
+    scores["mrr"] = 1.0 / first_hit if first_hit else 0.0
+    for k in ks:
+        top = ranked[:k]
+        covered = set().union(*top) & relevant if top else set()
+        scores[f"recall@{k}"] = len(covered) / len(relevant) if relevant else 0.0
+        dcg = sum(1.0 / math.log2(rank + 1) for rank, ids in enumerate(top, start=1) if ids & relevant)
+        ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+        scores[f"ndcg@{k}"] = dcg / ideal if ideal else 0.0
+    return scores
+
+def _claim(row: Dict[str, Any]):
+    from app.models import Claim, ClaimType, RoutingDecision
+    return Claim(claim_id=row["claim_id"], text=row["text"], type=ClaimType.FACTUAL, source_location=row["claim_id"],
+                 priority=3, expected_modality=row.get("expected_modality"), routing=RoutingDecision.VERIFY)
+
+def evaluate_config(case_context, claims: List[Dict[str, Any]], config: Dict[str, Any], ks: Sequence[int] = DEFAULT_KS,
+                    repeat: int = 1, trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Scores one configuration. The first query is a warm-up (model loads,
+    cold caches) reported separately; latencies come from repeat passes
+    over every claim, and memory from one further pass under tracemalloc
+    so tracing does not inflate the latencies.
+    """
+    from app.modules.inquiry import Inquiry
+
+    inquiry = Inquiry(case_context)
+    inquiry.config = inquiry.config.model_copy(update=config["overrides"])
+    keys = relevance_keys(case_context)
+    queries = [(_claim(row), set(row["relevant"])) for row in claims if row["relevant"]]
+    if not queries:
+        raise ValueError("No labelled claims to evaluate")
+
+    start = time.perf_counter()
+    inquiry.retrieve_evidence(queries[0][0])
+    warmup = time.perf_counter() - start
+
+    latencies, per_claim, warnings = [], {}, 0
+    for _ in range(max(1, repeat)):
+        for claim, relevant in queries:
+            start = time.perf_counter()
+            bundle = inquiry.retrieve_evidence(claim)
+            latencies.append(time.perf_counter() - start)
+            warnings += len(bundle.retrieval_warnings)
+            # Rankings are deterministic for a fixed index, so the last pass is scored
+            per_claim[claim.claim_id] = score_ranking([keys.get(c.chunk_id, {c.chunk_id}) for c in bundle.chunks], relevant, ks)
+
+    memory: Dict[str, Any] = {"max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0}
+    if trace_memory:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for claim, _ in queries:
+            inquiry.retrieve_evidence(claim)
+        memory["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+        if not already_tracing:
+            tracemalloc.stop()
+
+    metric_names = next(iter(per_claim.values())).keys()
+    quality = {name: sum(scores[name] for scores in per_claim.values()) / len(per_claim) for name in metric_names}
+    return {
+        "name": config["name"],
+        "overrides": config["overrides"],
+        "claims": len(queries),
+        "quality": quality,
+        "latency": {**latency_summary(latencies), "warmup_ms": warmup * 1000.0},
+        "memory": memory,
+        "warnings": warnings,
+        "per_claim": per_claim,
+    }
+
+def evaluate(case_context, claims: List[Dict[str, Any]], configs: List[Dict[str, Any]], ks: Sequence[int] = DEFAULT_KS,
+             repeat: int = 1, trace_memory: bool = True, log=print) -> Dict[str, Any]:
+    """Scores every configuration; one that fails is reported with its error and the rest still run."""
+    results = []
+    for config in configs:
+        try:
+            result = evaluate_config(case_context, claims, config, ks, repeat, trace_memory)
+            log(f"{config['name']:<16} " + " ".join(f"{k}={v:.3f}" for k, v in result["quality"].items() if not k.startswith("ndcg"))
+                + f" p50={result['latency']['p50_ms']:.1f}ms p99={result['latency']['p99_ms']:.1f}ms")
+        except Exception as e:
+            result = {"name": config["name"], "overrides": config["overrides"], "error": f"{type(e).__name__}: {e}"}
+            log(f"{config['name']:<16} error {result['error'].splitlines()[0]}")
+        results.append(result)
+    return {
+        "case_id": case_context.case_id,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "ks": list(ks),
+        "repeat": repeat,
+        "configs": results,
+    }
+
+def build_synthetic_case(storage_root: str, case_id: str, parameters: Dict[str, Any]):
+    """Generates a case, ingests its text PDF into a new case and returns (case_context, golden claims)."""
+    from app.core.stores import CaseContext
+
+    case_dir = os.path.join(storage_root, "_synthetic")
+    manifest = generate_case(case_dir, scanned_pages=0, audio_seconds=0, **parameters)
+    case_context = CaseContext(case_id, base_storage_path=storage_root)
+    index_pdf(case_context, os.path.join(case_dir, manifest["files"]["evidence_pdf"]), "evidence")
+    return case_context, golden_from_manifest(case_context, manifest)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.retrieval_eval", description=__doc__.split("\n\n")[0].strip())
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--case-id", help="Existing case to evaluate (under --storage)")
+    source.add_argument("--synthetic", action="store_true", help="Generate, index and label a synthetic case")
+    parser.add_argument("--golden", help="Labelled claims (JSON); required with --case-id")
+    parser.add_argument("--storage", help="Storage root holding --case-id (default LEGALMIND_STORAGE_PATH)")
+    parser.add_argument("--config", action="append", default=[], help='Configuration "name:KEY=VALUE,..."; repeatable. Defaults to the built-in grid')
+    parser.add_argument("--ks", default=",".join(str(k) for k in DEFAULT_KS), help="Cut-offs for recall@k and nDCG@k")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the claims per configuration")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--hash-embeddings", action="store_true", help="Use hashed bag-of-words embeddings instead of the model (offline smoke runs)")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--claims", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-golden", help="Write the synthetic case's labelled claims here")
+    parser.add_argument("--out", default="retrieval-eval.json")
+    args = parser.parse_args(argv)
+
+    configs = [parse_config(spec) for spec in args.config] or DEFAULT_CONFIGS
+    ks = tuple(int(k) for k in args.ks.split(",") if k.strip())
+    with patch_embeddings() if args.hash_embeddings else contextlib.nullcontext():
+        report = _run(parser, args, configs, ks)
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return 1 if any("error" in r for r in report["configs"]) else 0
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace, configs: List[Dict[str, Any]], ks: Sequence[int]) -> Dict[str, Any]:
+    if args.synthetic:
+        work_dir = tempfile.mkdtemp(prefix="legalmind-eval-")
+        try:
+            with environment(LEGALMIND_STORAGE_PATH=work_dir):
+                case_context, claims = build_synthetic_case(work_dir, "retrieval_eval", {
+                    "pages": args.pages, "claims": args.claims, "citations": 0, "seed": args.seed})
+                if args.save_golden:
+                    with open(args.save_golden, "w") as f:
+                        json.dump({"case_id": case_context.case_id, "claims": claims}, f, indent=2)
+                report = evaluate(case_context, claims, configs, ks, args.repeat, not args.no_memory)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        report["synthetic"] = {"pages": args.pages, "claims": args.claims, "seed": args.seed}
+    else:
+        if not args.golden:
+            parser.error("--golden is required with --case-id")
+        from app.core.config import load_config
+        from app.core.stores import CaseContext
+        case_context = CaseContext(args.case_id, base_storage_path=args.storage or load_config().STORAGE_PATH)
+        report = evaluate(case_context, load_golden(args.golden), configs, ks, args.repeat, not args.no_memory)
+    report["hash_embeddings"] = args.hash_embeddings
+    return report
+
+if __name__ == "__main__":
+    sys.exit(main())
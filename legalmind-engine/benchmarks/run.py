@@ -0,0 +1,500 @@
+"""
+Benchmark suite for the engine's pipeline stages.
+
+Run from legalmind-engine/:
+
+    python -m benchmarks.run --out results.json
+    python -m benchmarks.run --only conversion,inquiry --pages 100 --baseline last.json
+
+Every benchmark works on a synthetic case (benchmarks.synthetic) generated
+from --seed, so two runs with the same parameters measure the same input.
+A benchmark whose dependencies are missing (tesseract, whisper, the
+embedding model) is recorded as skipped or error and the rest still run.
+Results are written as JSON; with --baseline, timings are compared with an
+earlier results file and the exit status is 1 when any regresses by more
+than --max-regression.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import argparse
+import platform
+import resource
+import statistics
+import subprocess
+import contextlib
+import tempfile
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from benchmarks.fakes import CourtListenerStub, FakeLLM, patch_embeddings, patch_litellm
+from benchmarks.synthetic import generate_case, load_manifest
+
+SCHEMA_VERSION = 1
+BENCHMARKS: Dict[str, Callable[["BenchContext"], Dict[str, Any]]] = {}
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark whose dependencies are not available here."""
+
+def benchmark(name: str):
+    def register(func: Callable[["BenchContext"], Dict[str, Any]]):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile; q in [0, 100]."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(q / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def timing_summary(samples: List[float]) -> Dict[str, Any]:
+    return {
+        "runs": len(samples),
+        "median_seconds": statistics.median(samples),
+        "min_seconds": min(samples),
+        "max_seconds": max(samples),
+    }
+
+def latency_summary(samples: List[float]) -> Dict[str, Any]:
+    """Millisecond percentiles for per-operation latencies given in seconds."""
+    ms = [s * 1000.0 for s in samples]
+    return {
+        "count": len(ms),
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "mean_ms": statistics.fmean(ms) if ms else 0.0,
+        "max_ms": max(ms) if ms else 0.0,
+    }
+
+@contextlib.contextmanager
+def environment(**values: str) -> Iterator[None]:
+    """Sets environment variables for the block; load_config() reads them on every call."""
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def index_pdf(case_context, path: str, source_asset_id: str):
+    """Converts, chunks and indexes a PDF into case_context the way an ingest job does; returns the segments."""
+    from app.modules.conversion import Conversion
+    from app.modules.structuring import Structuring
+    from app.modules.preservation import Preservation
+
+    segments = Conversion(case_context).ingest_pdf_layout(path, source_asset_id)
+    # BM25 is rebuilt from the case's own chunk store, so chunks must be written to this case
+    chunks = Structuring(case_context).structural_chunker(segments)
+    preservation = Preservation(case_context)
+    preservation.dense_indexer(chunks)
+    preservation.bm25_indexer(chunks)
+    return segments
+
+class BenchContext:
+    """The generated case plus scratch storage shared by the benchmarks of one run."""
+    def __init__(self, case_dir: str, work_dir: str, manifest: Dict[str, Any], repeat: int, llm_latency: float):
+        self.case_dir = case_dir
+        self.work_dir = work_dir
+        self.manifest = manifest
+        self.repeat = max(1, repeat)
+        self.llm_latency = llm_latency
+        self.storage_root = os.path.join(work_dir, "storage")
+        os.makedirs(self.storage_root, exist_ok=True)
+        self._shared: Dict[str, Any] = {}
+
+    def file(self, key: str) -> str:
+        name = self.manifest["files"].get(key)
+        if name is None:
+            raise BenchmarkSkipped(f"the synthetic case has no {key} (generated with it disabled)")
+        return os.path.join(self.case_dir, name)
+
+    def case_context(self, label: str):
+        """A fresh, empty case so repeated runs never see each other's ledger or index."""
+        from app.core.stores import CaseContext
+        return CaseContext(f"bench_{label}_{uuid.uuid4().hex[:8]}", base_storage_path=self.storage_root)
+
+    def shared(self, key: str, build: Callable[[], Any]) -> Any:
+        """Builds an input several benchmarks need (segments, chunks, an index) once per run."""
+        if key not in self._shared:
+            self._shared[key] = build()
+        return self._shared[key]
+
+    def text_segments(self):
+        def build():
+            from app.modules.conversion import Conversion
+            segments = Conversion(self.case_context("segments")).ingest_pdf_layout(self.file("evidence_pdf"), "evidence")
+            if not segments:
+                raise RuntimeError("conversion of evidence.pdf produced no segments")
+            return segments
+        return self.shared("text_segments", build)
+
+    def text_chunks(self):
+        def build():
+            from app.modules.structuring import Structuring
+            return Structuring(self.case_context("chunks")).structural_chunker(self.text_segments())
+        return self.shared("text_chunks", build)
+
+    def indexed_case(self):
+        """A case with the evidence PDF dense- and BM25-indexed, for retrieval."""
+        def build():
+            case = self.case_context("indexed")
+            index_pdf(case, self.file("evidence_pdf"), "evidence")
+            return case
+        return self.shared("indexed_case", build)
+
+def _timed(run: Callable[[], Any], repeat: int) -> tuple:
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+@benchmark("conversion.text_pdf")
+def bench_conversion_text_pdf(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.conversion import Conversion
+    path = ctx.file("evidence_pdf")
+    samples, segments = _timed(lambda: Conversion(ctx.case_context("pdf")).ingest_pdf_layout(path, "evidence"), ctx.repeat)
+    pages = ctx.manifest["parameters"]["pages"]
+    return {**timing_summary(samples), "pages": pages, "segments": len(segments),
+            "pages_per_second": pages / statistics.median(samples)}
+
+@benchmark("conversion.scanned_pdf")
+def bench_conversion_scanned_pdf(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.conversion import Conversion
+    path = ctx.file("scanned_pdf")
+    for tool in ("tesseract", "pdftoppm"):
+        if shutil.which(tool) is None:
+            raise BenchmarkSkipped(f"{tool} is not installed")
+    samples, segments = _timed(lambda: Conversion(ctx.case_context("ocr")).ingest_pdf_layout(path, "scanned"), ctx.repeat)
+    pages = ctx.manifest["parameters"]["scanned_pages"]
+    return {**timing_summary(samples), "pages": pages, "segments": len(segments),
+            "pages_per_second": pages / statistics.median(samples)}
+
+@benchmark("conversion.docx")
+def bench_conversion_docx(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.conversion import Conversion
+    path = ctx.file("brief_docx")
+    samples, segments = _timed(lambda: Conversion(ctx.case_context("docx")).ingest_docx(path, "brief"), ctx.repeat)
+    return {**timing_summary(samples), "segments": len(segments)}
+
+@benchmark("conversion.audio")
+def bench_conversion_audio(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.conversion import Conversion
+    path = ctx.file("audio_wav")
+    if shutil.which("ffmpeg") is None:
+        raise BenchmarkSkipped("ffmpeg is not installed")
+    try:
+        import whisper  # noqa: F401
+    except ImportError:
+        raise BenchmarkSkipped("openai-whisper is not installed")
+    samples, segments = _timed(lambda: Conversion(ctx.case_context("audio")).ingest_audio(path, "interview"), ctx.repeat)
+    seconds = ctx.manifest["parameters"]["audio_seconds"]
+    return {**timing_summary(samples), "audio_seconds": seconds, "segments": len(segments),
+            "realtime_factor": statistics.median(samples) / seconds}
+
+@benchmark("structuring")
+def bench_structuring(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.structuring import Structuring
+    segments = ctx.text_segments()
+    samples, chunks = _timed(lambda: Structuring(ctx.case_context("structuring")).structural_chunker(segments), ctx.repeat)
+    return {**timing_summary(samples), "segments": len(segments), "chunks": len(chunks),
+            "chunks_per_second": len(chunks) / statistics.median(samples)}
+
+@benchmark("preservation.dense")
+def bench_preservation_dense(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.preservation import Preservation
+    chunks = ctx.text_chunks()
+    load, index = [], []
+    for _ in range(ctx.repeat):
+        start = time.perf_counter()
+        preservation = Preservation(ctx.case_context("dense"))
+        loaded = time.perf_counter()
+        preservation.dense_indexer(chunks)
+        load.append(loaded - start)
+        index.append(time.perf_counter() - loaded)
+    return {**timing_summary(index), "setup_median_seconds": statistics.median(load), "chunks": len(chunks),
+            "chunks_per_second": len(chunks) / statistics.median(index)}
+
+@benchmark("preservation.bm25")
+def bench_preservation_bm25(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.preservation import Preservation
+    chunks = ctx.text_chunks()
+    samples = []
+    for _ in range(ctx.repeat):
+        preservation = Preservation(ctx.case_context("bm25"))
+        start = time.perf_counter()
+        preservation.bm25_indexer(chunks)
+        samples.append(time.perf_counter() - start)
+    return {**timing_summary(samples), "chunks": len(chunks),
+            "chunks_per_second": len(chunks) / statistics.median(samples)}
+
+@benchmark("inquiry.retrieve")
+def bench_inquiry_retrieve(ctx: BenchContext) -> Dict[str, Any]:
+    from app.modules.inquiry import Inquiry
+    from app.models import Claim, ClaimType, RoutingDecision
+    inquiry = Inquiry(ctx.indexed_case())
+    claims = [
+        Claim(claim_id=f"c{row['claim_index']}", text=row["text"], type=ClaimType.FACTUAL,
+              source_location=f"claim_{row['claim_index']}", priority=3, routing=RoutingDecision.VERIFY)
+        for row in ctx.manifest["claims"]
+    ]
+    if not claims:
+        raise BenchmarkSkipped("the synthetic case has no claims")
+    latencies, empty = [], 0
+    for _ in range(ctx.repeat):
+        for claim in claims:
+            start = time.perf_counter()
+            bundle = inquiry.retrieve_evidence(claim)
+            latencies.append(time.perf_counter() - start)
+            empty += not bundle.chunks
+    total = sum(latencies)
+    return {**latency_summary(latencies), "queries_per_second": len(latencies) / total if total else 0.0,
+            "empty_bundles": empty}
+
+def _trace_totals(trace_path: str) -> Dict[str, Any]:
+    """Total and call count per span name from a job's trace file."""
+    if not os.path.exists(trace_path):
+        return {}
+    with open(trace_path) as f:
+        trace = json.load(f)
+    totals: Dict[str, Dict[str, Any]] = {}
+    for resource_spans in trace.get("resourceSpans", []):
+        for scope in resource_spans.get("scopeSpans", []):
+            for item in scope.get("spans", []):
+                row = totals.setdefault(item["name"], {"count": 0, "total_ms": 0.0})
+                row["count"] += 1
+                row["total_ms"] += (int(item["endTimeUnixNano"]) - int(item["startTimeUnixNano"])) / 1e6
+    return dict(sorted(totals.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+async def _wait(dominion, run_id: str, timeout: float):
+    from app.models import CitationStatus, RunStatus
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        state = dominion.get_job_status(run_id)
+        if state is not None and state.status != RunStatus.RUNNING:
+            return state
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"job {run_id} did not finish within {timeout:.0f}s")
+
+@benchmark("audit.e2e")
+def bench_audit_e2e(ctx: BenchContext) -> Dict[str, Any]:
+    from app.models import CitationStatus, RunStatus
+
+    storage = os.path.join(ctx.work_dir, f"e2e_{uuid.uuid4().hex[:8]}")
+    llm = FakeLLM(latency=ctx.llm_latency, seed=ctx.manifest["seed"])
+    with CourtListenerStub(ctx.manifest["authorities"]) as stub, patch_litellm(llm), environment(
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "benchmark",
+        LEGALMIND_CLOUD_MODEL_ALLOWED="true",
+        LEGALMIND_COURTLISTENER_BASE_URL=stub.url,
+        LEGALMIND_COURTLISTENER_API_TOKEN="benchmark",
+        LEGALMIND_CITATION_CACHE_PATH=os.path.join(storage, "citation_cache.db"),
+        LEGALMIND_STORAGE_PATH=storage,
+    ):
+        from app.core.stores import CaseContext
+        from app.modules.dominion import Dominion
+
+        async def run():
+            dominion = Dominion(CaseContext("bench_e2e", base_storage_path=storage))
+            start = time.perf_counter()
+            ingest = await dominion.workflow_ingest_case(ctx.file("evidence_pdf"))
+            ingest_state = await _wait(dominion, ingest.run_id, 600)
+            ingest_seconds = time.perf_counter() - start
+            if ingest_state.status != RunStatus.COMPLETE:
+                raise RuntimeError(f"ingest ended {ingest_state.status.value}: {ingest_state.warnings}")
+
+            # Briefs must live under the case directory
+            brief = os.path.join(dominion.case_context.base_path, "brief.docx")
+            shutil.copyfile(ctx.file("brief_docx"), brief)
+            start = time.perf_counter()
+            audit = await dominion.workflow_prefile_gate(brief, formats=["html"])
+            audit_state = await _wait(dominion, audit.run_id, 600)
+            audit_seconds = time.perf_counter() - start
+            if audit_state.status != RunStatus.COMPLETE:
+                raise RuntimeError(f"audit ended {audit_state.status.value}: {audit_state.warnings}")
+            findings, citations, gate = dominion.case_context.findings.load_run(audit.run_id)
+            return ingest_seconds, audit_seconds, findings, citations, gate, dominion.case_context.jobs.trace_path(audit.run_id)
+
+        ingest_seconds, audit_seconds, findings, citations, gate, trace_path = asyncio.run(run())
+
+    statuses: Dict[str, int] = {}
+    for finding in findings:
+        status = getattr(finding.status, "value", str(finding.status))
+        statuses[status] = statuses.get(status, 0) + 1
+    return {
+        "ingest_seconds": ingest_seconds,
+        "audit_seconds": audit_seconds,
+        "claims_in_brief": len(ctx.manifest["claims"]),
+        "findings": len(findings),
+        "finding_statuses": statuses,
+        "citations_checked": len(citations),
+        "citations_verified": sum(1 for c in citations if c.status == CitationStatus.VERIFIED),
+        "gate": gate.model_dump(mode="json") if gate else None,
+        "llm_calls": llm.calls,
+        "llm_latency_seconds": ctx.llm_latency,
+        "courtlistener_requests": dict(stub.requests),
+        "spans": _trace_totals(trace_path),
+    }
+
+def run_benchmark(name: str, ctx: BenchContext) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        result = {"name": name, "status": "ok", "metrics": BENCHMARKS[name](ctx)}
+    except BenchmarkSkipped as e:
+        result = {"name": name, "status": "skipped", "reason": str(e)}
+    except Exception as e:
+        result = {"name": name, "status": "error", "reason": f"{type(e).__name__}: {e}",
+                  "traceback": traceback.format_exc(limit=5)}
+    result["wall_seconds"] = time.perf_counter() - start
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def select(only: Optional[str]) -> List[str]:
+    """Benchmark names matching a comma-separated list of names or prefixes ("conversion")."""
+    if not only:
+        return list(BENCHMARKS)
+    wanted = [w.strip() for w in only.split(",") if w.strip()]
+    names = [n for n in BENCHMARKS if any(n == w or n.startswith(w + ".") for w in wanted)]
+    unknown = [w for w in wanted if not any(n == w or n.startswith(w + ".") for n in BENCHMARKS)]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+    return names
+
+def run_suite(names: List[str], case_dir: str, work_dir: str, parameters: Dict[str, Any], repeat: int = 3,
+              llm_latency: float = 0.0, log: Callable[[str], None] = print) -> Dict[str, Any]:
+    manifest = load_manifest(case_dir)
+    if manifest is None or manifest["seed"] != parameters["seed"] or manifest["parameters"] != {
+            k: parameters[k] for k in manifest["parameters"]}:
+        manifest = generate_case(case_dir, seed=parameters["seed"], **{k: parameters[k] for k in (
+            "pages", "scanned_pages", "claims", "citations", "audio_seconds", "facts_per_page")})
+    ctx = BenchContext(case_dir, work_dir, manifest, repeat, llm_latency)
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    results = []
+    for name in names:
+        result = run_benchmark(name, ctx)
+        results.append(result)
+        reason = (result.get("reason") or "").splitlines()[:1]
+        log(f"{name:<24} {result['status']:<8} {result['wall_seconds']:.2f}s {' '.join(reason)}")
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "started_at": started_at,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "git_commit": _git_commit(),
+            # ru_maxrss is KiB on Linux
+            "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        },
+        "parameters": {**parameters, "repeat": repeat, "llm_latency": llm_latency},
+        "results": results,
+    }
+
+def _timings(result: Dict[str, Any]) -> Dict[str, float]:
+    """Lower-is-better metrics of a result: *_seconds and *_ms."""
+    metrics = result.get("metrics") or {}
+    return {k: v for k, v in metrics.items()
+            if isinstance(v, (int, float)) and (k.endswith("_seconds") or k.endswith("_ms")) and k != "llm_latency_seconds"}
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[Dict[str, Any]]:
+    """
+    Per-metric change of current against baseline for benchmarks that
+    succeeded in both. Rows whose ratio exceeds 1 + max_regression are
+    marked regressed.
+    """
+    previous = {r["name"]: r for r in baseline.get("results", []) if r.get("status") == "ok"}
+    rows = []
+    for result in current["results"]:
+        if result.get("status") != "ok" or result["name"] not in previous:
+            continue
+        before = _timings(previous[result["name"]])
+        for metric, value in _timings(result).items():
+            if metric not in before or before[metric] <= 0:
+                continue
+            ratio = value / before[metric]
+            rows.append({"name": result["name"], "metric": metric, "baseline": before[metric], "current": value,
+                         "ratio": ratio, "regressed": ratio > 1 + max_regression})
+    return rows
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--out", default="benchmark-results.json", help="Where to write the JSON results")
+    parser.add_argument("--only", help="Comma-separated benchmark names or prefixes, e.g. conversion,inquiry")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    parser.add_argument("--pages", type=int, default=20, help="Pages in the text evidence PDF")
+    parser.add_argument("--scanned-pages", type=int, default=3, help="Pages in the scanned PDF (0 to skip)")
+    parser.add_argument("--claims", type=int, default=30, help="Claims in the brief")
+    parser.add_argument("--citations", type=int, default=10, help="Citations in the brief")
+    parser.add_argument("--audio-seconds", type=float, default=5.0, help="Length of the WAV (0 to skip)")
+    parser.add_argument("--facts-per-page", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; medians are reported")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the fake LLM waits per call in audit.e2e")
+    parser.add_argument("--hash-embeddings", action="store_true", help="Use hashed bag-of-words embeddings instead of the model (offline smoke runs)")
+    parser.add_argument("--case-dir", help="Where to generate (or reuse) the synthetic case; default is inside --workdir")
+    parser.add_argument("--workdir", help="Scratch directory for case storage; default is a temporary directory")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch directory")
+    parser.add_argument("--baseline", help="Earlier results file to compare timings with")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed slowdown against --baseline (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+    names = select(args.only)
+
+    work_dir = args.workdir or tempfile.mkdtemp(prefix="legalmind-bench-")
+    os.makedirs(work_dir, exist_ok=True)
+    case_dir = args.case_dir or os.path.join(work_dir, "case")
+    parameters = {"seed": args.seed, "pages": args.pages, "scanned_pages": args.scanned_pages, "claims": args.claims,
+                  "citations": args.citations, "audio_seconds": args.audio_seconds, "facts_per_page": args.facts_per_page}
+    try:
+        # Benchmarks write only to scratch storage
+        with environment(LEGALMIND_STORAGE_PATH=os.path.join(work_dir, "storage"),
+                         LEGALMIND_CITATION_CACHE_PATH=os.path.join(work_dir, "citation_cache.db")), \
+                patch_embeddings() if args.hash_embeddings else contextlib.nullcontext():
+            report = run_suite(names, case_dir, work_dir, parameters, args.repeat, args.llm_latency)
+        report["parameters"]["hash_embeddings"] = args.hash_embeddings
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(report, json.load(f), args.max_regression)
+        report["comparison"] = {"baseline": os.path.abspath(args.baseline), "max_regression": args.max_regression, "rows": rows}
+        for row in rows:
+            marker = "REGRESSED" if row["regressed"] else ""
+            print(f"{row['name']:<24} {row['metric']:<22} {row['baseline']:.4f} -> {row['current']:.4f} ({row['ratio']:.2f}x) {marker}")
+        if any(row["regressed"] for row in rows):
+            status = 1
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
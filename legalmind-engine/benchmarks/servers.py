@@ -0,0 +1,102 @@
+"""
+Runs the benchmark stand-ins as standalone servers, for load tests against
+an engine in another process.
+
+    python -m benchmarks.servers fakes --llm-port 8100 --courtlistener-port 8101 \\
+        --llm-latency 0.5 --llm-error-rate 0.01 --llm-429-rate 0.05
+    python -m benchmarks.servers engine --port 8000 [--hash-embeddings]
+
+"fakes" serves an OpenAI-compatible LLM (FakeLLMServer) and CourtListener
+(CourtListenerStub) and prints the settings that point an engine at them.
+"engine" runs the API like the Dockerfile does, optionally with hashed
+embeddings so it needs no model download; benchmarks.loadgen starts it
+this way.
+"""
+import sys
+import argparse
+import contextlib
+import threading
+from typing import List, Optional
+
+from benchmarks.fakes import CourtListenerStub, FakeLLM, FakeLLMServer, patch_embeddings
+from benchmarks.synthetic import generate_case, load_manifest
+
+def start_fakes(authorities: List[dict], host: str = "127.0.0.1", llm_port: int = 0, courtlistener_port: int = 0,
+                llm_latency: float = 0.0, llm_jitter: float = 0.0, llm_error_rate: float = 0.0, llm_429_rate: float = 0.0,
+                courtlistener_latency: float = 0.0, seed: int = 0):
+    """Starts both servers on background threads and returns (llm_server, courtlistener_stub)."""
+    llm = FakeLLM(latency=llm_latency, jitter=llm_jitter, error_rate=llm_error_rate, rate_limit_rate=llm_429_rate, seed=seed)
+    llm_server = FakeLLMServer(llm, host=host, port=llm_port).start()
+    stub = CourtListenerStub(authorities, latency=courtlistener_latency, host=host, port=courtlistener_port).start()
+    return llm_server, stub
+
+def engine_environment(llm_server: FakeLLMServer, stub: CourtListenerStub) -> dict:
+    """Settings that send an engine's LLM and citation traffic to the fakes."""
+    return {
+        "OPENAI_API_KEY": "fake",
+        "LEGALMIND_CLOUD_MODEL_ALLOWED": "true",
+        "LEGALMIND_LLM_API_BASE": llm_server.url + "/v1",
+        "LEGALMIND_COURTLISTENER_BASE_URL": stub.url,
+        # Any token will do; with one set, citation checks use the bulk endpoint as in production
+        "LEGALMIND_COURTLISTENER_API_TOKEN": "fake",
+    }
+
+def authorities_for(case_dir: Optional[str], seed: int) -> List[dict]:
+    """The authorities of a generated case, generating a small one if case_dir has none."""
+    manifest = load_manifest(case_dir) if case_dir else None
+    if manifest is None:
+        import tempfile
+        manifest = generate_case(case_dir or tempfile.mkdtemp(prefix="legalmind-case-"), pages=1, scanned_pages=0,
+                                 claims=10, citations=10, audio_seconds=0, seed=seed)
+    return manifest["authorities"]
+
+def run_engine(host: str, port: int, hash_embeddings: bool):
+    import uvicorn
+    with patch_embeddings() if hash_embeddings else contextlib.nullcontext():
+        from app.main import app
+        uvicorn.run(app, host=host, port=port, log_level="warning")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.servers", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fakes = commands.add_parser("fakes", help="Fake LLM and CourtListener servers")
+    fakes.add_argument("--host", default="127.0.0.1")
+    fakes.add_argument("--llm-port", type=int, default=8100)
+    fakes.add_argument("--courtlistener-port", type=int, default=8101)
+    fakes.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per LLM call")
+    fakes.add_argument("--llm-jitter", type=float, default=0.0, help="Uniform +/- seconds added to each LLM call")
+    fakes.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of LLM calls answered with 500")
+    fakes.add_argument("--llm-429-rate", type=float, default=0.0, help="Share of LLM calls answered with 429")
+    fakes.add_argument("--courtlistener-latency", type=float, default=0.0, help="Seconds per CourtListener request")
+    fakes.add_argument("--case-dir", help="Synthetic case whose authorities CourtListener knows (generated if missing)")
+    fakes.add_argument("--seed", type=int, default=0)
+
+    engine = commands.add_parser("engine", help="The LegalMind API")
+    engine.add_argument("--host", default="127.0.0.1")
+    engine.add_argument("--port", type=int, default=8000)
+    engine.add_argument("--hash-embeddings", action="store_true", help="Hashed bag-of-words embeddings instead of the model")
+    args = parser.parse_args(argv)
+
+    if args.command == "engine":
+        run_engine(args.host, args.port, args.hash_embeddings)
+        return 0
+
+    llm_server, stub = start_fakes(
+        authorities_for(args.case_dir, args.seed), args.host, args.llm_port, args.courtlistener_port,
+        args.llm_latency, args.llm_jitter, args.llm_error_rate, args.llm_429_rate, args.courtlistener_latency, args.seed)
+    print("Fake servers running; start the engine with:")
+    for key, value in engine_environment(llm_server, stub).items():
+        print(f"  {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        llm_server.stop()
+        stub.stop()
+        print(f"LLM: {llm_server.stats}  CourtListener: {stub.requests}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""
+Deterministic synthetic cases for benchmarks and retrieval evaluation.
+
+generate_case() writes a text PDF of N pages, a scanned (image-only) PDF, a
+DOCX brief with M claims and K citations, and a short WAV, plus
+manifest.json with the ground truth: which page states each fact, which
+claims restate, contradict or invent a fact, and which cited authorities
+exist. The same seed always yields the same content, so runs on different
+commits measure the same work.
+"""
+import io
+import os
+import json
+import math
+import wave
+import random
+import struct
+import zipfile
+import datetime
+from typing import Any, Dict, List, Optional
+
+PEOPLE = [
+    "Officer Daniel Reyes", "Sergeant Amy Whitfield", "Maria Lopez", "James Carter", "Dr. Helen Okafor",
+    "Thomas Brennan", "Priya Natarajan", "Kevin Marsh", "Angela Ruiz", "Detective Paul Ng",
+    "Samuel Ortiz", "Linda Hwang", "Marcus Bell", "Rachel Stein", "Victor Alvarez",
+]
+ACTIONS = [
+    "arrived at", "left", "called the dispatcher from", "met the plaintiff at", "photographed the scene at",
+    "collected a statement at", "inspected the vehicle at", "signed the report at", "returned to", "was seen leaving",
+]
+PLACES = [
+    "the corner of Fifth Street and Main", "the Riverside Apartments", "Mercy General Hospital", "the county impound lot",
+    "the Lakeview shopping center", "the defendant's warehouse", "the north parking garage", "the Elm Street precinct",
+    "the Harbor Road gas station", "the plaintiff's residence", "the courthouse annex", "the Oakmont diner",
+]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+FILLER = [
+    "The witness was advised of the purpose of the interview and agreed to proceed.",
+    "Weather conditions at the time were reported as clear with dry pavement.",
+    "No additional persons were identified in the immediate area.",
+    "The recording equipment was checked and found to be functioning normally.",
+    "This summary was prepared from contemporaneous notes and reviewed for accuracy.",
+    "All times are given in local time as recorded by the department's system.",
+    "The parties were reminded that the statement may be used in later proceedings.",
+    "Photographs referenced in this report are maintained in the evidence locker.",
+]
+SURNAMES = ["Smith", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Anderson", "Taylor", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Harris", "Clark"]
+FIXED_DATE = datetime.datetime(2024, 1, 1)
+REPORTERS = [("U.S.", "scotus"), ("F.3d", "ca9"), ("F.2d", "ca2"), ("F. Supp. 2d", "nysd")]
+
+def _fact(rng: random.Random, fact_id: str) -> Dict[str, Any]:
+    month, day, year = rng.choice(MONTHS), rng.randint(1, 28), rng.choice([2019, 2020, 2021, 2022])
+    hour, minute = rng.randint(6, 22), rng.choice([0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55])
+    person, action, place = rng.choice(PEOPLE), rng.choice(ACTIONS), rng.choice(PLACES)
+    return {
+        "fact_id": fact_id,
+        "text": f"On {month} {day}, {year}, {person} {action} {place} at {hour}:{minute:02d}.",
+        "parts": {"month": month, "day": day, "year": year, "hour": hour, "minute": minute, "person": person, "action": action, "place": place},
+    }
+
+def _contradiction(rng: random.Random, fact: Dict[str, Any]) -> str:
+    parts = dict(fact["parts"])
+    parts["hour"] = (parts["hour"] + rng.randint(2, 6)) % 24
+    return f"On {parts['month']} {parts['day']}, {parts['year']}, {parts['person']} {parts['action']} {parts['place']} at {parts['hour']}:{parts['minute']:02d}."
+
+def _authorities(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    authorities = []
+    used = set()
+    while len(authorities) < count:
+        reporter, court = rng.choice(REPORTERS)
+        volume, page = rng.randint(100, 599), rng.randint(1, 1400)
+        citation = f"{volume} {reporter} {page}"
+        if citation in used:
+            continue
+        used.add(citation)
+        plaintiff, defendant = rng.sample(SURNAMES, 2)
+        year = rng.randint(1950, 2020)
+        authorities.append({
+            "citation": citation,
+            "case_name": f"{plaintiff} v. {defendant}",
+            "date_filed": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "court": court,
+            # About one in eight cited authorities does not exist
+            "exists": rng.random() >= 0.125,
+        })
+    return authorities
+
+def _evidence_pages(rng: random.Random, pages: int, facts_per_page: int, prefix: str) -> List[List[Dict[str, Any]]]:
+    layout = []
+    for page in range(1, pages + 1):
+        layout.append([{**_fact(rng, f"{prefix}{page}_{i}"), "page": page} for i in range(facts_per_page)])
+    return layout
+
+def _page_paragraphs(rng: random.Random, facts: List[Dict[str, Any]]) -> List[str]:
+    paragraphs = []
+    for fact in facts:
+        filler = " ".join(rng.sample(FILLER, 2))
+        paragraphs.append(f"{fact['text']} {filler}")
+    return paragraphs
+
+def write_text_pdf(path: str, pages: List[List[str]], title: str):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    # invariant=1 drops the creation date and random document id
+    c = canvas.Canvas(path, pagesize=letter, invariant=1)
+    width, height = letter
+    for number, paragraphs in enumerate(pages, start=1):
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(72, height - 60, f"{title} - Page {number}")
+        c.setFont("Helvetica", 10)
+        y = height - 90
+        for paragraph in paragraphs:
+            for line in _wrap(paragraph, 95):
+                c.drawString(72, y, line)
+                y -= 14
+            y -= 10
+        c.showPage()
+    c.save()
+
+def write_scanned_pdf(path: str, pages: List[List[str]], title: str, dpi: int = 150):
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=22)
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        font = ImageFont.load_default()
+    images = []
+    for number, paragraphs in enumerate(pages, start=1):
+        image = Image.new("L", (int(8.5 * dpi), int(11 * dpi)), color=255)
+        draw = ImageDraw.Draw(image)
+        y = dpi // 2
+        draw.text((dpi // 2, y), f"{title} - Page {number}", fill=0, font=font)
+        y += 50
+        for paragraph in paragraphs:
+            for line in _wrap(paragraph, 80):
+                draw.text((dpi // 2, y), line, fill=0, font=font)
+                y += 30
+            y += 20
+        images.append(image.convert("RGB"))
+    images[0].save(path, "PDF", resolution=float(dpi), save_all=True, append_images=images[1:],
+                   creationDate=FIXED_DATE.timetuple(), modDate=FIXED_DATE.timetuple())
+
+def write_brief_docx(path: str, claims: List[Dict[str, Any]], authorities: List[Dict[str, Any]], rng: random.Random):
+    import docx
+
+    document = docx.Document()
+    # Fixed metadata so the only variation between seeds is the content
+    document.core_properties.created = FIXED_DATE
+    document.core_properties.modified = FIXED_DATE
+    document.core_properties.author = "LegalMind Benchmarks"
+    document.add_paragraph("STATEMENT OF FACTS")
+
+    pending = list(authorities)
+    for i, claim in enumerate(claims):
+        text = claim["text"]
+        # Spread the citations over the claims, one or two at a time
+        take = min(len(pending), 2 if len(pending) > len(claims) - i else rng.randint(0, 1))
+        cited, pending = pending[:take], pending[take:]
+        for authority in cited:
+            year = authority["date_filed"][:4]
+            text += f" See {authority['case_name']}, {authority['citation']} ({year})."
+        document.add_paragraph(text)
+        if i and i % 5 == 0:
+            document.add_paragraph(rng.choice(FILLER))
+    if pending:
+        document.add_paragraph("See also " + "; ".join(f"{a['case_name']}, {a['citation']} ({a['date_filed'][:4]})" for a in pending) + ".")
+    document.add_paragraph("CONCLUSION")
+    document.add_paragraph("For the foregoing reasons, the motion should be granted.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    # Zip entries carry the time of writing; pin them so equal seeds give equal bytes
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for item in source.infolist():
+            entry = zipfile.ZipInfo(item.filename, date_time=FIXED_DATE.timetuple()[:6])
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            target.writestr(entry, source.read(item.filename))
+
+def write_wav(path: str, seconds: float, rng: random.Random, sample_rate: int = 16000):
+    """Tone bursts over low noise; a fixed-size input for the transcription stage."""
+    frames = bytearray()
+    tone = 0.0
+    for i in range(int(seconds * sample_rate)):
+        if i % (sample_rate // 4) == 0:
+            tone = rng.choice([0.0, 220.0, 330.0, 440.0])
+        value = 0.3 * math.sin(2 * math.pi * tone * i / sample_rate) + rng.uniform(-0.02, 0.02)
+        frames += struct.pack("<h", int(max(-1.0, min(1.0, value)) * 32767))
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(bytes(frames))
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+def generate_case(out_dir: str, pages: int = 20, scanned_pages: int = 3, claims: int = 30, citations: int = 10,
+                  audio_seconds: float = 5.0, facts_per_page: int = 4, seed: int = 0) -> Dict[str, Any]:
+    """
+    Writes the case files into out_dir and returns the manifest (also saved
+    as manifest.json). Claims are 60% restatements of evidence facts, 20%
+    contradictions of one and 20% invented.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    layout = _evidence_pages(rng, pages, facts_per_page, "f")
+    text_pages = [_page_paragraphs(rng, facts) for facts in layout]
+    facts = [fact for page in layout for fact in page]
+
+    scanned_layout = _evidence_pages(rng, scanned_pages, facts_per_page, "s") if scanned_pages else []
+    scanned_text = [_page_paragraphs(rng, page) for page in scanned_layout]
+
+    claim_rows = []
+    for i in range(claims):
+        roll = rng.random()
+        fact = rng.choice(facts)
+        if roll < 0.6:
+            kind, text = "supported", fact["text"]
+        elif roll < 0.8:
+            kind, text = "contradicted", _contradiction(rng, fact)
+        else:
+            kind, text, fact = "fabricated", _fact(rng, f"x{i}")["text"], None
+        claim_rows.append({
+            "claim_index": i,
+            "text": text,
+            "kind": kind,
+            "fact_id": fact["fact_id"] if fact else None,
+            "source": "evidence.pdf" if fact else None,
+            "page": fact["page"] if fact else None,
+        })
+    authorities = _authorities(rng, citations)
+
+    files = {"evidence_pdf": "evidence.pdf", "brief_docx": "brief.docx"}
+    write_text_pdf(os.path.join(out_dir, files["evidence_pdf"]), text_pages, "Incident Report")
+    write_brief_docx(os.path.join(out_dir, files["brief_docx"]), claim_rows, authorities, rng)
+    if scanned_pages:
+        files["scanned_pdf"] = "scanned.pdf"
+        write_scanned_pdf(os.path.join(out_dir, files["scanned_pdf"]), scanned_text, "Witness Statement")
+    if audio_seconds:
+        files["audio_wav"] = "interview.wav"
+        write_wav(os.path.join(out_dir, files["audio_wav"]), audio_seconds, rng)
+
+    manifest = {
+        "seed": seed,
+        "parameters": {"pages": pages, "scanned_pages": scanned_pages, "claims": claims, "citations": citations,
+                       "audio_seconds": audio_seconds, "facts_per_page": facts_per_page},
+        "files": files,
+        "facts": [{"fact_id": f["fact_id"], "text": f["text"], "source": "evidence.pdf", "page": f["page"]} for f in facts],
+        "scanned_facts": [{"fact_id": f["fact_id"], "text": f["text"], "source": "scanned.pdf", "page": f["page"]}
+                          for page in scanned_layout for f in page],
+        "claims": claim_rows,
+        "authorities": authorities,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest(case_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(case_dir, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
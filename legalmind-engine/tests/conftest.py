@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import patch
+from app.core.stores import CaseContext
+from app.modules import dominion as dominion_module
+from app.modules.dominion import Dominion
+from app.models import (
+    Claim, ClaimType, RoutingDecision, EvidenceBundle, RetrievalMode,
+    VerificationFinding, VerificationStatus, ConfidenceLevel, Justification
+)
+
+@pytest.fixture
+def dominion(tmp_path):
+    case_context = CaseContext("test_case", base_storage_path=str(tmp_path))
+    # Preservation loads the embedding model; none of these tests need it. Patched through the
+    # module object, since test_config_storage reloads app.modules.dominion
+    with patch.object(dominion_module, "Preservation"):
+        return Dominion(case_context)
+
+@pytest.fixture
+def api_dominion(dominion):
+    """The dominion fixture, served to every API request for the test."""
+    from app.main import app
+    from app.api.routes import get_dominion
+    app.dependency_overrides[get_dominion] = lambda: dominion
+    yield dominion
+    app.dependency_overrides.clear()
+
+def make_claim(claim_id, routing=RoutingDecision.VERIFY, text=None):
+    return Claim(
+        claim_id=claim_id,
+        text=text or f"Claim {claim_id} is true.",
+        type=ClaimType.FACTUAL,
+        source_location="para_1",
+        priority=1,
+        routing=routing
+    )
+
+def make_bundle(claim):
+    return EvidenceBundle(
+        bundle_id=f"b_{claim.claim_id}",
+        claim_id=claim.claim_id,
+        chunks=[],
+        retrieval_scores=[],
+        retrieval_mode=RetrievalMode.SEMANTIC,
+        modality_filter_applied=False
+    )
+
+def make_finding(claim, bundle=None):
+    return VerificationFinding(
+        claim_id=claim.claim_id,
+        status=VerificationStatus.SUPPORTED,
+        justification=Justification(elements_supported=[], elements_missing=[], contradictions=[]),
+        quotes_with_provenance=[],
+        evidence_refs=[],
+        confidence=ConfidenceLevel.HIGH
+    )
@@ -1,4 +1,6 @@
 import pytest
+# Adjudication imports litellm lazily; load it before the tests patch os.getenv
+import litellm
 from unittest.mock import MagicMock, patch
 from app.modules.adjudication import Adjudication
 from app.core.stores import CaseContext
@@ -4,11 +4,17 @@ import time
 import json
 import pytest
 import sys
+import httpx
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 # Ensure app is in path
 sys.path.append(os.path.join(os.getcwd(), "legalmind-engine"))
 
-from app.core.stores import AuditLog
+from app.core.stores import AuditLog, CaseContext
+from app.core.cancellation import CancelToken, cancel_scope
+from app.main import app
+from app.api.routes import get_dominion
 
 @pytest.fixture
 def clean_audit_log():
@@ -62,3 +68,140 @@ def test_audit_log_multiple_writes(clean_audit_log):
     with open(log_file, "r") as f:
         lines = f.readlines()
         assert len(lines) == count
+
+def read_lines(audit_log):
+    with open(audit_log.log_file, "r") as f:
+        return [json.loads(line) for line in f]
+
+def test_audit_log_batches_and_flushes(tmp_path):
+    audit_log = AuditLog("test_case_batch", str(tmp_path))
+    before = AuditLog.stats()
+
+    for i in range(1000):
+        audit_log.log_event("TestModule", "TestAction", {"i": i})
+    assert AuditLog.flush()
+
+    stats = AuditLog.stats()
+    assert [e["details"]["i"] for e in read_lines(audit_log)] == list(range(1000))
+    assert stats["events_written"] - before["events_written"] == 1000
+    # Entries queued together are appended together
+    assert stats["batches"] - before["batches"] < 1000
+    assert stats["queue_depth"] == 0
+
+def test_audit_log_reopens_rotated_file(tmp_path):
+    audit_log = AuditLog("test_case_rotate", str(tmp_path))
+    audit_log.log_event("TestModule", "Before", {})
+    AuditLog.flush()
+
+    os.rename(audit_log.log_file, audit_log.log_file + ".1")
+    audit_log.log_event("TestModule", "After", {})
+    AuditLog.flush()
+
+    assert [e["action"] for e in read_lines(audit_log)] == ["After"]
+
+def test_audit_log_bounds_open_files(tmp_path):
+    logs = [AuditLog(f"test_case_lru_{i}", str(tmp_path / str(i))) for i in range(3)]
+    limit = AuditLog.max_open_files
+    AuditLog.max_open_files = 2
+    try:
+        for _ in range(2):
+            for audit_log in logs:
+                audit_log.log_event("TestModule", "TestAction", {})
+            AuditLog.flush()
+        assert AuditLog.stats()["open_files"] <= 2
+        assert AuditLog.stats()["open_indexes"] <= 2
+    finally:
+        AuditLog.max_open_files = limit
+
+    assert all(len(read_lines(audit_log)) == 2 for audit_log in logs)
+    assert AuditLog.close()
+    assert AuditLog.stats()["open_files"] == 0
+    assert AuditLog.stats()["open_indexes"] == 0
+
+def test_audit_log_keeps_its_index_connection_open(tmp_path):
+    audit_log = AuditLog("test_case_index_conn", str(tmp_path))
+    audit_log.log_event("TestModule", "First", {})
+    AuditLog.flush()
+    index = AuditLog._indexes[audit_log.log_path]
+
+    audit_log.log_event("TestModule", "Second", {})
+    AuditLog.flush()
+    assert [e["action"] for e in audit_log.query(module="TestModule")] == ["First", "Second"]
+    assert AuditLog._indexes[audit_log.log_path] is index
+
+    # A case directory replaced underneath the log gets a fresh connection
+    shutil.rmtree(audit_log.log_path)
+    os.makedirs(audit_log.log_path)
+    audit_log.log_event("TestModule", "Third", {})
+    AuditLog.flush()
+    assert [e["action"] for e in audit_log.query(module="TestModule")] == ["Third"]
+    assert AuditLog._indexes[audit_log.log_path] is not index
+
+def test_audit_log_query_by_run_module_and_time(tmp_path):
+    audit_log = AuditLog("test_case_query", str(tmp_path))
+    audit_log.log_event("Dominion", "job_start", {"run_id": "run1"})
+    audit_log.log_event("Dominion", "job_start", {"run_id": "run2"})
+    with cancel_scope(CancelToken(run_id="run1")):
+        # Logged during the job without naming the run
+        audit_log.log_event("Adjudication", "heuristic_error", {"claim_id": "c1"})
+    audit_log.log_event("Dominion", "job_complete", {"run_id": "run1"})
+    AuditLog.flush()
+
+    run1 = audit_log.query(run_id="run1")
+    assert [e["action"] for e in run1] == ["job_start", "heuristic_error", "job_complete"]
+    assert all(e["run_id"] == "run1" for e in run1)
+    assert [e["action"] for e in audit_log.query(module="Adjudication")] == ["heuristic_error"]
+    assert [e["action"] for e in audit_log.query(run_id="run1", module="Dominion", limit=1)] == ["job_start"]
+    assert audit_log.query(since=datetime.now() + timedelta(hours=1)) == []
+    assert len(audit_log.query(until=datetime.now())) == 4
+
+def test_audit_log_rotates_into_compressed_segments(tmp_path):
+    audit_log = AuditLog("test_case_segments", str(tmp_path))
+    rotate_bytes, bucket_bytes = AuditLog.rotate_bytes, AuditLog.bucket_bytes
+    AuditLog.rotate_bytes, AuditLog.bucket_bytes = 8000, 1000
+    rotations = AuditLog.stats()["rotations"]
+    try:
+        for i in range(200):
+            audit_log.log_event("Dominion", "step", {"run_id": f"run{i % 3}", "i": i})
+            if i % 20 == 0:
+                AuditLog.flush()
+        AuditLog.flush()
+    finally:
+        AuditLog.rotate_bytes, AuditLog.bucket_bytes = rotate_bytes, bucket_bytes
+
+    assert AuditLog.stats()["rotations"] > rotations
+    assert any(name.endswith(".jsonl.gz") for name in os.listdir(os.path.join(audit_log.log_path, "segments")))
+    # Runs spanning compressed segments and the live file come back whole and in order
+    assert [e["details"]["i"] for e in audit_log.query(run_id="run1")] == list(range(1, 200, 3))
+    assert len(audit_log.query(module="Dominion")) == 200
+
+    audit_log.rotate()
+    assert not os.path.exists(audit_log.log_file)
+    assert len(audit_log.query(run_id="run2")) == len(range(2, 200, 3))
+
+def test_audit_log_indexes_existing_log(tmp_path):
+    audit_log = AuditLog("test_case_legacy", str(tmp_path))
+    # Written before the index existed, ending in a torn line
+    with open(audit_log.log_file, "w") as f:
+        for i in range(5):
+            f.write(json.dumps({"timestamp": datetime.now().isoformat(), "case_id": "test_case_legacy", "module": "Dominion",
+                                "action": "old", "details": {"run_id": "legacy", "i": i}}) + "\n")
+        f.write('{"timestamp": "2026')
+
+    assert [e["details"]["i"] for e in audit_log.query(run_id="legacy")] == list(range(5))
+
+@pytest.mark.asyncio
+async def test_audit_log_events_endpoint(tmp_path):
+    case_context = CaseContext("test_case_api", base_storage_path=str(tmp_path))
+    case_context.audit_log.log_event("Dominion", "job_start", {"run_id": "run1"})
+    case_context.audit_log.log_event("Dominion", "job_start", {"run_id": "run2"})
+    app.dependency_overrides[get_dominion] = lambda: SimpleNamespace(case_context=case_context)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/audit-log/events", params={"run_id": "run2"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["events"][0]["details"] == {"run_id": "run2"}
@@ -0,0 +1,120 @@
+import time
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from conftest import make_bundle, make_claim, make_finding
+from app.core.executors import Lane
+from app.modules import dominion as dominion_module
+from app.models import RoutingDecision
+
+@pytest.mark.asyncio
+async def test_findings_flow_before_extraction_finishes(dominion):
+    dominion.inquiry.retrieve_evidence = MagicMock(side_effect=make_bundle)
+    dominion.adjudication.verify_claim_skeptical = MagicMock(side_effect=make_finding)
+
+    first_finding = asyncio.Event()
+    events = []
+
+    async def claims():
+        yield make_claim("c1")
+        # The first claim is verified while extraction is still running
+        await asyncio.wait_for(first_finding.wait(), timeout=5)
+        events.append("extraction_resumed")
+        yield make_claim("c2")
+        yield make_claim("c3", routing=RoutingDecision.SKIP)
+
+    def on_finding(finding):
+        events.append(finding.claim_id)
+        first_finding.set()
+
+    findings = await dominion._verify_claims_pipeline(claims(), on_finding=on_finding)
+
+    assert [f.claim_id for f in findings] == ["c1", "c2"]
+    assert events == ["c1", "extraction_resumed", "c2"]
+
+@pytest.mark.asyncio
+async def test_extraction_stops_when_the_consumer_does(dominion):
+    produced = []
+    closed = threading.Event()
+
+    def stream_claims(brief_path):
+        try:
+            for i in range(100):
+                produced.append(i)
+                time.sleep(0.01)
+                yield make_claim(f"c{i}")
+        finally:
+            closed.set()
+
+    dominion.discernment.stream_claims = stream_claims
+    stream = dominion._stream_claims("brief.docx")
+    assert (await stream.__anext__()).claim_id == "c0"
+    await stream.aclose()
+
+    # The extraction thread has wound down by the time the stream is closed
+    assert closed.is_set()
+    assert len(produced) < 100
+
+@pytest.mark.asyncio
+async def test_retrieval_does_not_hold_llm_slot(dominion, monkeypatch):
+    # A single-slot LLM lane in place of the process-wide one
+    monkeypatch.setattr(dominion_module, "llm_lane", Lane("llm", 1))
+    release_retrieval = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def slow_retrieval(claim):
+        if claim.claim_id == "slow":
+            asyncio.run_coroutine_threadsafe(asyncio.wait_for(release_retrieval.wait(), 5), loop).result()
+        return make_bundle(claim)
+
+    def adjudicate(claim, bundle):
+        # Fast claim reaches the single LLM slot while the slow one is still retrieving
+        if claim.claim_id == "fast":
+            loop.call_soon_threadsafe(release_retrieval.set)
+        return make_finding(claim, bundle)
+
+    dominion.inquiry.retrieve_evidence = MagicMock(side_effect=slow_retrieval)
+    dominion.adjudication.verify_claim_skeptical = MagicMock(side_effect=adjudicate)
+
+    async def claims():
+        yield make_claim("slow")
+        yield make_claim("fast")
+
+    findings = await asyncio.wait_for(dominion._verify_claims_pipeline(claims()), timeout=10)
+
+    assert sorted(f.claim_id for f in findings) == ["fast", "slow"]
+
+@pytest.mark.asyncio
+async def test_retry_exhaustion_drops_claim(dominion):
+    dominion.inquiry.retrieve_evidence = MagicMock(side_effect=RuntimeError("index unavailable"))
+    dominion.adjudication.verify_claim_skeptical = MagicMock(side_effect=make_finding)
+
+    async def claims():
+        yield make_claim("c1")
+
+    with patch("asyncio.sleep", new=AsyncMock()):
+        findings = await dominion._verify_claims_pipeline(claims())
+
+    assert findings == []
+    assert dominion.inquiry.retrieve_evidence.call_count == 3
+    dominion.adjudication.verify_claim_skeptical.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_near_duplicate_claims_verified_once(dominion):
+    dominion.inquiry.retrieve_evidence = MagicMock(side_effect=make_bundle)
+    dominion.adjudication.verify_claim_skeptical = MagicMock(side_effect=make_finding)
+
+    async def claims():
+        yield make_claim("facts", text="The defendant ran the red light at Main Street on June 3, 2021.")
+        yield make_claim("other", text="Plaintiff was treated at County Hospital for a fractured wrist.")
+        yield make_claim("argument", text="The defendant ran the red light at Main Street on June 3, 2021, as shown.")
+
+    findings = await dominion._verify_claims_pipeline(claims())
+
+    assert [f.claim_id for f in findings] == ["facts", "other", "argument"]
+    assert dominion.adjudication.verify_claim_skeptical.call_count == 2
+    shared = findings[2]
+    assert shared.status == findings[0].status
+    assert any("facts" in w for w in shared.warnings)
+    assert findings[0].warnings == []
@@ -0,0 +1,118 @@
+import json
+import httpx
+import pytest
+from benchmarks.synthetic import generate_case
+from benchmarks.fakes import CourtListenerStub, FakeLLM, FakeLLMError, patch_embeddings
+from benchmarks.run import BenchmarkSkipped, benchmark, BENCHMARKS, compare, run_suite
+from app.modules.validation import LOOKUP_PATH, SEARCH_PATH
+
+PARAMETERS = {"seed": 7, "pages": 3, "scanned_pages": 1, "claims": 6, "citations": 3, "audio_seconds": 0.5, "facts_per_page": 4}
+
+def test_generator_is_deterministic(tmp_path):
+    first = generate_case(str(tmp_path / "a"), pages=2, scanned_pages=1, claims=5, citations=3, audio_seconds=0.5, seed=3)
+    second = generate_case(str(tmp_path / "b"), pages=2, scanned_pages=1, claims=5, citations=3, audio_seconds=0.5, seed=3)
+    other = generate_case(str(tmp_path / "c"), pages=2, scanned_pages=1, claims=5, citations=3, audio_seconds=0.5, seed=4)
+
+    assert first == second and first != other
+    for name in first["files"].values():
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+    assert len(first["claims"]) == 5 and len(first["authorities"]) == 3
+    assert {f["page"] for f in first["facts"]} == {1, 2}
+    # Every supported claim restates a fact at the page the manifest names
+    facts = {f["fact_id"]: f for f in first["facts"]}
+    for claim in first["claims"]:
+        if claim["kind"] == "supported":
+            assert facts[claim["fact_id"]]["text"] == claim["text"]
+            assert facts[claim["fact_id"]]["page"] == claim["page"]
+
+def test_fake_llm_extracts_and_verifies():
+    llm = FakeLLM()
+    extraction = [
+        {"role": "system", "content": "Extract factual claims from the brief."},
+        {"role": "user", "content": "[1] STATEMENT OF FACTS\n[2] Maria Lopez arrived at the Oakmont diner at 9:15 PM. See Smith v. Jones, 123 U.S. 456 (1990)."},
+    ]
+    claims = json.loads(llm.completion(messages=extraction).choices[0].message.content)
+    assert claims == [{"text": "Maria Lopez arrived at the Oakmont diner at 9:15 PM.", "type": "factual", "priority": 3, "paragraph": 2}]
+
+    def verify(claim):
+        prompt = f'Claim: "{claim}"\n\nEvidence from Record:\nMaria Lopez arrived at the Oakmont diner at 9:15 PM. The lot was empty.\n\nInstructions: respond in JSON.'
+        return json.loads(llm.content_for([{"role": "user", "content": prompt}]))["status"]
+
+    assert verify("Maria Lopez arrived at the Oakmont diner at 9:15 PM.") == "Supported"
+    assert verify("Maria Lopez arrived at the Oakmont diner at 11:40 PM.") == "Contradicted"
+    assert verify("Kevin Marsh inspected the vehicle at the impound lot.") == "Not Supported"
+
+    with pytest.raises(FakeLLMError) as error:
+        FakeLLM(rate_limit_rate=1.0).completion(messages=extraction)
+    assert error.value.status_code == 429
+
+def test_courtlistener_stub_serves_known_authorities():
+    authorities = [
+        {"citation": "123 U.S. 456", "case_name": "Smith v. Jones", "date_filed": "1990-05-01", "court": "scotus", "exists": True},
+        {"citation": "45 F.3d 678", "case_name": "Doe v. Roe", "date_filed": "1995-02-02", "court": "ca9", "exists": False},
+    ]
+    with CourtListenerStub(authorities) as stub:
+        found = httpx.get(stub.url + SEARCH_PATH, params={"q": '"123 U.S. 456"'}).json()
+        missing = httpx.get(stub.url + SEARCH_PATH, params={"q": '"45 F.3d 678"'}).json()
+        lookup = httpx.post(stub.url + LOOKUP_PATH, data={"text": "See 123 U.S. 456 and 45 F.3d 678."}).json()
+
+    assert found["results"][0]["caseName"] == "Smith v. Jones"
+    assert missing["results"] == []
+    assert [item["status"] for item in lookup] == [200, 404]
+    assert lookup[0]["clusters"][0]["case_name"] == "Smith v. Jones"
+    assert stub.requests == {"search": 2, "lookup": 1}
+
+def test_suite_records_skips_and_errors(tmp_path):
+    @benchmark("test.skipped")
+    def skipped(ctx):
+        raise BenchmarkSkipped("not here")
+
+    @benchmark("test.broken")
+    def broken(ctx):
+        raise RuntimeError("boom")
+
+    try:
+        report = run_suite(["test.skipped", "test.broken", "conversion.text_pdf", "structuring"],
+                           str(tmp_path / "case"), str(tmp_path / "work"), PARAMETERS, repeat=1, log=lambda line: None)
+    finally:
+        BENCHMARKS.pop("test.skipped")
+        BENCHMARKS.pop("test.broken")
+
+    results = {r["name"]: r for r in report["results"]}
+    assert results["test.skipped"]["status"] == "skipped"
+    assert results["test.broken"]["status"] == "error" and "boom" in results["test.broken"]["reason"]
+    assert results["conversion.text_pdf"]["status"] == "ok"
+    assert results["conversion.text_pdf"]["metrics"]["pages"] == 3
+    assert results["structuring"]["metrics"]["chunks"] > 0
+    assert report["parameters"]["seed"] == 7 and report["environment"]["cpu_count"]
+
+    # A slower run against this one as baseline is flagged
+    slower = json.loads(json.dumps(report))
+    slower_pdf = next(r for r in slower["results"] if r["name"] == "conversion.text_pdf")
+    slower_pdf["metrics"]["median_seconds"] *= 2
+    rows = compare(slower, report, max_regression=0.2)
+    assert any(r["regressed"] and r["metric"] == "median_seconds" and r["name"] == "conversion.text_pdf" for r in rows)
+    assert not any(r["regressed"] for r in compare(report, report, max_regression=0.2))
+
+def test_audit_e2e_with_fake_llm_and_stub(tmp_path, monkeypatch):
+    monkeypatch.delenv("LEGALMIND_ENV", raising=False)
+    with patch_embeddings():
+        report = run_suite(["inquiry.retrieve", "audit.e2e"], str(tmp_path / "case"), str(tmp_path / "work"),
+                           PARAMETERS, repeat=1, log=lambda line: None)
+
+    results = {r["name"]: r for r in report["results"]}
+    assert results["inquiry.retrieve"]["status"] == "ok", results["inquiry.retrieve"].get("reason")
+    assert results["inquiry.retrieve"]["metrics"]["count"] == PARAMETERS["claims"]
+    assert results["inquiry.retrieve"]["metrics"]["p99_ms"] >= results["inquiry.retrieve"]["metrics"]["p50_ms"]
+
+    e2e = results["audit.e2e"]
+    assert e2e["status"] == "ok", e2e.get("reason")
+    metrics = e2e["metrics"]
+    assert metrics["findings"] > 0 and metrics["llm_calls"] > 0
+    assert metrics["citations_checked"] == PARAMETERS["citations"]
+    assert metrics["courtlistener_requests"]["lookup"] >= 1
+    assert "Dominion.verify_claim" in metrics["spans"]
+    # The fake LLM is only installed for the benchmark
+    import litellm
+    assert not hasattr(litellm.completion, "__self__") or not isinstance(litellm.completion.__self__, FakeLLM)
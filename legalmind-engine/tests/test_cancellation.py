@@ -0,0 +1,109 @@
+import time
+import uuid
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+from app.main import app
+from app.core.cancellation import CancelToken, JobCancelled, cancel_scope, check_cancelled
+from app.models import EvidenceSegment, Modality, RunStatus
+
+pytestmark = pytest.mark.usefixtures("api_dominion")
+
+@pytest.fixture
+def dominion(dominion):
+    dominion.config.JOB_CANCEL_POLL_INTERVAL = 0.05
+    return dominion
+
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+async def wait_for_status(dominion, run_id, statuses, attempts=100):
+    for _ in range(attempts):
+        state = dominion.get_job_status(run_id)
+        if state.status in statuses:
+            return state
+        await asyncio.sleep(0.05)
+    return dominion.get_job_status(run_id)
+
+def slow_conversion(case_context, progress):
+    # Stands in for a long document: one ledger segment per "page", checking between pages
+    def ingest_docx(file_path, file_hash):
+        segments = []
+        for page in range(200):
+            check_cancelled()
+            segment = EvidenceSegment(
+                segment_id=str(uuid.uuid4()), source_asset_id=file_hash, modality=Modality.PDF_TEXT, location=f"page_{page + 1}",
+                text=f"Page {page + 1} of the deposition.", confidence=1.0, extraction_method="test", derived=False, warnings=[]
+            )
+            case_context.ledger.append_segment(segment)
+            segments.append(segment)
+            progress.append(page)
+            time.sleep(0.02)
+        return segments
+    return ingest_docx
+
+def test_check_cancelled_outside_jobs_is_a_no_op():
+    check_cancelled()
+
+    token = CancelToken(deadline=time.time() - 1)
+    with cancel_scope(token):
+        with pytest.raises(JobCancelled):
+            check_cancelled()
+    assert token.reason == "Deadline exceeded"
+
+@pytest.mark.asyncio
+async def test_cancel_running_ingest_stops_work_and_cleans_ledger(dominion):
+    progress = []
+    with patch.object(dominion.intake, "vault_writer", return_value="hash123"), \
+         patch.object(dominion.intake, "file_classifier", return_value="application/docx"), \
+         patch.object(dominion.conversion, "ingest_docx", side_effect=slow_conversion(dominion.case_context, progress)):
+        state = await dominion.workflow_ingest_case("long.docx")
+        while len(progress) < 5:
+            await asyncio.sleep(0.02)
+
+        async with client() as ac:
+            response = await ac.delete(f"/api/jobs/{state.run_id}")
+        assert response.status_code == 200
+
+        final_state = await wait_for_status(dominion, state.run_id, [RunStatus.CANCELLED, RunStatus.COMPLETE, RunStatus.FAILED])
+        pages_at_cancel = len(progress)
+        await asyncio.sleep(0.2)
+
+    assert final_state.status == RunStatus.CANCELLED
+    assert final_state.warnings == ["Cancelled by request"]
+    # The conversion thread stopped at its next page, well short of the document
+    assert len(progress) == pages_at_cancel < 200
+    # Nothing half-ingested is left behind
+    assert dominion.case_context.ledger.get_segments("hash123") == []
+    assert dominion.case_context.index.get_chunk_count() == 0
+    dominion.preservation.dense_indexer.assert_not_called()
+    assert dominion.job_queue.stats()["cancelled"] == 1
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_job(dominion):
+    progress = []
+    with patch.object(dominion.intake, "vault_writer", return_value="hash123"), \
+         patch.object(dominion.intake, "file_classifier", return_value="application/docx"), \
+         patch.object(dominion.conversion, "ingest_docx", side_effect=slow_conversion(dominion.case_context, progress)):
+        state = await dominion.workflow_ingest_case("long.docx", deadline_seconds=0.3)
+        final_state = await wait_for_status(dominion, state.run_id, [RunStatus.CANCELLED, RunStatus.COMPLETE, RunStatus.FAILED])
+
+    assert final_state.status == RunStatus.CANCELLED
+    assert final_state.warnings == ["Deadline exceeded"]
+    assert 0 < len(progress) < 200
+
+@pytest.mark.asyncio
+async def test_cancel_queued_job_never_runs(dominion):
+    dominion.config.JOB_EXECUTION_MODE = "worker"
+    state = await dominion.workflow_render_report(source_run_id="run1")
+
+    async with client() as ac:
+        response = await ac.delete(f"/api/jobs/{state.run_id}")
+        missing = await ac.delete("/api/jobs/no-such-run")
+
+    assert response.json()["status"] == RunStatus.CANCELLED
+    assert missing.status_code == 404
+    assert dominion.job_queue.lease("worker-1", 60) is None
+    # Cancelling a finished job changes nothing
+    assert dominion.cancel_job(state.run_id).status == RunStatus.CANCELLED
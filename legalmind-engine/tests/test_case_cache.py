@@ -0,0 +1,137 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core.case_cache import CaseCache
+from app.core.job_queue import QueuedJob
+from app.core.stores import CaseContext
+from app.modules.dominion import Dominion
+
+class FakeCase:
+    def __init__(self, case_id):
+        self.case_id = case_id
+        self.running = False
+        self.closed = 0
+
+    def busy(self):
+        return self.running
+
+    def close(self):
+        self.closed += 1
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_least_recently_used_case_is_evicted_and_released():
+    cache = CaseCache(FakeCase, max_cases=2, idle_seconds=0)
+    a, b = cache.get("a"), cache.get("b")
+    assert cache.get("a") is a
+    c = cache.get("c")
+    assert cache.resident() == ["a", "c"]
+    assert b.closed == 1 and a.closed == 0 and c.closed == 0
+    # A new object is built after eviction
+    assert cache.get("b") is not b
+    assert cache.stats()["evictions_size"] == 2 and cache.stats()["misses"] == 4
+
+def test_busy_cases_are_never_evicted():
+    cache = CaseCache(FakeCase, max_cases=1, idle_seconds=0)
+    a = cache.get("a")
+    a.running = True
+    b = cache.get("b")
+    assert cache.resident() == ["a", "b"] and a.closed == 0
+    assert not cache.evict("a")
+    a.running = False
+    cache.get("c")
+    assert cache.resident() == ["c"] and a.closed == 1 and b.closed == 1
+
+def test_idle_cases_expire():
+    clock = Clock()
+    cache = CaseCache(FakeCase, max_cases=10, idle_seconds=60, clock=clock)
+    a = cache.get("a")
+    clock.now = 30
+    b = cache.get("b")
+    clock.now = 75
+    cache.get("b")
+    assert cache.resident() == ["b"] and a.closed == 1 and b.closed == 0
+    assert cache.stats()["evictions_idle"] == 1
+
+def test_memory_budget_evicts_until_under_budget():
+    usage = {"mb": 0.0}
+
+    class HeavyCase(FakeCase):
+        def __init__(self, case_id):
+            super().__init__(case_id)
+            usage["mb"] += 100.0
+
+        def close(self):
+            super().close()
+            usage["mb"] -= 100.0
+
+    cache = CaseCache(HeavyCase, max_cases=10, idle_seconds=0, memory_budget_mb=250, memory=lambda: usage["mb"],
+                      memory_check_seconds=0)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a").running = True
+    cache.get("c")
+    # 300 MB resident: the least recently used idle case goes, the busy one stays
+    assert cache.resident() == ["a", "c"] and usage["mb"] == 200.0
+    cache.get("d")
+    assert cache.resident() == ["a", "d"] and usage["mb"] == 200.0
+    assert cache.stats()["evictions_memory"] == 2
+
+def test_slow_work_runs_outside_the_cache_lock():
+    clock = Clock()
+    checks = []
+    cache = CaseCache(lambda case_id: FakeCase(case_id), max_cases=10, idle_seconds=0, memory_budget_mb=100,
+                      memory=lambda: checks.append(clock.now) or 500.0, clock=clock, memory_check_seconds=5)
+    other = cache.get("other")
+    other.running = True
+
+    def build(case_id):
+        # Another case's lookup goes ahead while this one is being built
+        assert cache.get("other") is other
+        return FakeCase(case_id)
+
+    cache.factory = build
+    cache.get("a")
+    cache.get("b")
+    # Over budget with nothing idle to drop, but measured once per interval, not on every miss
+    assert checks == [0.0]
+    clock.now = 6
+    cache.get("c")
+    assert checks == [0.0, 6, 6, 6]
+    assert cache.resident() == ["other", "c"]
+
+@pytest.mark.asyncio
+async def test_dominion_is_busy_while_running_and_releases_modules(tmp_path):
+    case_context = CaseContext("test_case_cache", base_storage_path=str(tmp_path))
+    with patch("app.modules.dominion.Preservation") as preservation_class:
+        dominion = Dominion(case_context)
+    dominion.preservation.dense_indexer
+    dominion.validation
+    assert dominion.loaded_modules() == ["preservation", "validation"]
+
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def slow_cite_check(run_id, text, formats=None):
+        started.set()
+        await release.wait()
+
+    job = QueuedJob(run_id="r1", case_id="test_case_cache", workflow="cite_check", payload={"text": "x"}, attempts=1,
+                    max_attempts=1, deadline=None, profile=False)
+    with patch.object(dominion, "_run_cite_check_job", slow_cite_check):
+        task = asyncio.create_task(dominion.execute_job(job))
+        await started.wait()
+        assert dominion.busy()
+        release.set()
+        await task
+    assert not dominion.busy()
+
+    dominion.close()
+    assert dominion.loaded_modules() == []
+    preservation_class.return_value.close.assert_called_once()
+    # Closed modules are rebuilt on next use
+    assert dominion.validation is not None and dominion.loaded_modules() == ["validation"]
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import pytest
+import httpx
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.main import app
+from app.core.stores import CaseContext
+from app.modules import chronicle as chronicle_module
+from app.modules.chronicle import Chronicle
+from app.models import CitationFinding, CitationStatus, RunState, RunStatus
+
+@pytest.fixture
+def chronicle(tmp_path):
+    return Chronicle(CaseContext("test_case_chronicle", base_storage_path=str(tmp_path)))
+
+@pytest.fixture
+def citations():
+    return [CitationFinding(
+        citation_text="347 U.S. 483", normalized_form="347us483", status=CitationStatus.VERIFIED, confidence=1.0,
+        case_details={"name": "Brown v. Board <of> Education", "date": "1954-05-17", "court": "scotus", "url": ""},
+        reconciliation_notes="", source_pass="both"
+    )]
+
+def test_render_report_default_formats(chronicle, citations):
+    html_path = chronicle.render_report([], citation_findings=citations)
+
+    assert os.path.exists(html_path)
+    assert os.path.exists(chronicle.report_path("docx"))
+    assert not os.path.exists(chronicle.report_path("pdf"))
+    with open(html_path) as f:
+        # Template output is escaped
+        assert "Brown v. Board &lt;of&gt; Education" in f.read()
+
+def test_render_report_selected_formats(chronicle, citations):
+    chronicle.render_report([], citation_findings=citations, formats=["html"])
+
+    assert os.path.exists(chronicle.report_path("html"))
+    assert not os.path.exists(chronicle.report_path("docx"))
+
+    with pytest.raises(ValueError):
+        chronicle.render_report([], citation_findings=citations, formats=["rtf"])
+
+def test_ensure_pdf_renders_once(chronicle, citations, monkeypatch):
+    renders = []
+
+    def fake_render_pdf(html_path, path):
+        renders.append(html_path)
+        with open(path, "wb") as f:
+            f.write(b"%PDF-1.7")
+        return path
+
+    def submit_inline(func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+    # weasyprint needs system libraries, so exercise the lazy path with a stand-in renderer
+    monkeypatch.setattr("app.modules.chronicle.render_pdf", fake_render_pdf)
+    monkeypatch.setattr(chronicle, "_submit", submit_inline)
+    html_path = chronicle.render_report([], citation_findings=citations, formats=["html"])
+
+    pdf_path = chronicle.ensure_pdf(html_path)
+    assert os.path.getsize(pdf_path) > 0
+
+    assert chronicle.ensure_pdf(html_path) == pdf_path
+    assert len(renders) == 1
+
+    # A newer HTML render invalidates the old PDF
+    time.sleep(0.05)
+    chronicle.render_report([], citation_findings=citations, formats=["html"])
+    chronicle.ensure_pdf(html_path)
+    assert len(renders) == 2
+    # Per-report locks are dropped once nobody is rendering
+    assert pdf_path not in chronicle_module._pdf_locks
+
+@pytest.mark.asyncio
+async def test_pdf_download_without_renderer_is_unavailable(api_dominion, tmp_path):
+    html_path = str(tmp_path / "report.html")
+    api_dominion.case_context.jobs.save_job(RunState(run_id="r1", status=RunStatus.COMPLETE, result_payload={"report_path": html_path}))
+    api_dominion.chronicle.ensure_pdf = MagicMock(side_effect=OSError("cannot load library 'libpango-1.0-0'"))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/report/download", params={"run_id": "r1", "format": "pdf"})
+
+    assert response.status_code == 503
+    assert "libpango" in response.json()["detail"]
+
+def test_render_pdf_writes_through_a_unique_temp_file(tmp_path, monkeypatch):
+    written = []
+
+    class FakeHTML:
+        def __init__(self, filename):
+            pass
+
+        def write_pdf(self, target):
+            written.append(target)
+            if len(written) == 2:
+                raise RuntimeError("render failed")
+            with open(target, "wb") as f:
+                f.write(b"%PDF-1.7")
+
+    monkeypatch.setitem(sys.modules, "weasyprint", SimpleNamespace(HTML=FakeHTML))
+    pdf_path = str(tmp_path / "report.pdf")
+
+    assert chronicle_module.render_pdf("report.html", pdf_path) == pdf_path
+    with pytest.raises(RuntimeError):
+        chronicle_module.render_pdf("report.html", pdf_path)
+
+    assert written[0] != written[1] and all(os.path.dirname(t) == str(tmp_path) for t in written)
+    # The finished PDF survives the failed render, and no temp file is left behind
+    assert os.listdir(tmp_path) == ["report.pdf"]
@@ -1,10 +1,21 @@
+import json
+import time
+import asyncio
+import threading
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 from app.core.stores import CaseContext
-from app.modules.validation import Validation
+from app.modules.validation import Validation, HostRateLimiter
+from app.core.citation_cache import CitationCache, import_file
 from app.models import CitationStatus
+from app.core.metrics import cache_requests
+from eyecite import get_citations
+from eyecite.models import FullCaseCitation
 
 @pytest.fixture
-def validation(tmp_path):
+def validation(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEGALMIND_CITATION_CACHE_PATH", str(tmp_path / "citation_cache.db"))
     case_context = CaseContext("test_case_citation", base_storage_path=str(tmp_path))
     return Validation(case_context)
 
@@ -33,3 +44,283 @@ def test_verify_citations_not_found(validation):
     assert len(findings) == 1
     f = findings[0]
     assert f.status == CitationStatus.NOT_FOUND
+
+class StubCourtListener:
+    """Local stand-in for the CourtListener search and citation-lookup APIs."""
+    def __init__(self, cases, delays=None, bulk=False):
+        self.cases = cases
+        self.delays = delays or {}
+        self.bulk = bulk
+        self.requests = []
+        self.bulk_requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)["q"][0].strip('"')
+                with stub.lock:
+                    stub.requests.append(query)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delays.get(query, 0.2))
+                    results = [{"caseName": stub.cases[query], "dateFiled": "2000-01-01", "court": "scotus"}] if query in stub.cases else []
+                    body = json.dumps({"count": len(results), "results": results}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                text = parse_qs(self.rfile.read(length).decode())["text"][0]
+                if not stub.bulk:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                with stub.lock:
+                    stub.bulk_requests.append(text)
+                items = []
+                for citation in get_citations(text):
+                    if not isinstance(citation, FullCaseCitation):
+                        continue
+                    cite = citation.matched_text()
+                    start, end = citation.span()
+                    found = cite in stub.cases
+                    items.append({
+                        "citation": cite, "normalized_citations": [cite], "start_index": start, "end_index": end,
+                        "status": 200 if found else 404,
+                        "clusters": [{"case_name": stub.cases[cite], "date_filed": "2000-01-01", "absolute_url": "/opinion/1/"}] if found else []
+                    })
+                body = json.dumps(items).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub_validation(validation):
+    stubs = []
+
+    def configure(cases, delays=None, bulk=False, **config):
+        stub = StubCourtListener(cases, delays, bulk)
+        stubs.append(stub)
+        validation.config.COURTLISTENER_BASE_URL = stub.url
+        for key, value in config.items():
+            setattr(validation.config, key, value)
+        return stub
+
+    yield configure
+    for stub in stubs:
+        stub.close()
+
+def test_verify_citations_concurrent(stub_validation, validation):
+    cases = {f"{100 + i} U.S. {200 + i}": f"Case {i}" for i in range(8)}
+    stub = stub_validation(cases, CITATION_MAX_CONCURRENCY=8, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+    text = " ".join(f"See {c}." for c in cases) + " Also 999 U.S. 999."
+
+    start = time.monotonic()
+    findings = validation.verify_citations(text)
+    elapsed = time.monotonic() - start
+
+    assert len(findings) == 9
+    assert sum(f.status == CitationStatus.VERIFIED for f in findings) == 8
+    assert next(f for f in findings if f.citation_text == "999 U.S. 999").status == CitationStatus.NOT_FOUND
+    # 9 lookups of 0.2s each overlap instead of running back to back
+    assert stub.max_in_flight > 1
+    assert elapsed < 9 * 0.2
+
+def test_verify_citations_bounded_concurrency(stub_validation, validation):
+    cases = {f"{100 + i} U.S. {200 + i}": f"Case {i}" for i in range(6)}
+    stub = stub_validation(cases, CITATION_MAX_CONCURRENCY=2, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+
+    findings = validation.verify_citations(" ".join(f"See {c}." for c in cases))
+
+    assert len(findings) == 6
+    assert stub.max_in_flight <= 2
+
+def test_verify_citations_deadline(stub_validation, validation):
+    cases = {"101 U.S. 201": "Fast Case", "102 U.S. 202": "Slow Case"}
+    stub_validation(cases, delays={"102 U.S. 202": 3.0}, CITATION_REQUEST_TIMEOUT=0.5, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+
+    start = time.monotonic()
+    findings = validation.verify_citations("See 101 U.S. 201. See 102 U.S. 202.")
+
+    assert time.monotonic() - start < 2.0
+    by_text = {f.citation_text: f for f in findings}
+    assert by_text["101 U.S. 201"].status == CitationStatus.VERIFIED
+    assert by_text["102 U.S. 202"].status == CitationStatus.NOT_FOUND
+    assert "deadline" in by_text["102 U.S. 202"].reconciliation_notes
+
+def test_host_rate_limiter():
+    limiter = HostRateLimiter(rate=10.0, burst=2)
+
+    async def take(n, host):
+        for _ in range(n):
+            await limiter.acquire(host)
+
+    start = time.monotonic()
+    asyncio.run(take(5, "api.example"))
+    # Two tokens up front, the remaining three refill at 10/s
+    assert time.monotonic() - start >= 0.25
+
+    start = time.monotonic()
+    asyncio.run(take(2, "other.example"))
+    assert time.monotonic() - start < 0.1
+
+def test_citation_cache_serves_repeat_lookups(stub_validation, validation):
+    stub = stub_validation({"101 U.S. 201": "Cached Case"}, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+
+    first = validation.verify_citations("See 101 U.S. 201. Also 999 U.S. 999.")
+    second = validation.verify_citations("Again 101 U.S. 201. And 999 U.S. 999.")
+
+    # Found and not-found results are both remembered
+    assert sorted(stub.requests) == ["101 U.S. 201", "999 U.S. 999"]
+    assert [f.status for f in first] == [f.status for f in second]
+    assert all(f.reconciliation_notes == "Served from citation cache" for f in second)
+
+def test_citation_cache_negative_ttl_expires(stub_validation, validation):
+    stub = stub_validation({}, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+    validation.citation_cache.negative_ttl = 0
+
+    validation.verify_citations("See 999 U.S. 999.")
+    validation.verify_citations("See 999 U.S. 999.")
+
+    assert stub.requests == ["999 U.S. 999", "999 U.S. 999"]
+
+def test_citation_cache_stale_positive_during_outage(validation):
+    validation.citation_cache.put(validation.normalizer("101 U.S. 201"), {"status": "found", "title": "Old Case"}, ttl=-1)
+    # Nothing listens here, so the lookup fails at the transport level
+    validation.config.COURTLISTENER_BASE_URL = "http://127.0.0.1:9"
+
+    findings = validation.verify_citations("See 101 U.S. 201.")
+
+    assert findings[0].status == CitationStatus.VERIFIED
+    assert findings[0].case_details["name"] == "Old Case"
+    assert findings[0].reconciliation_notes.startswith("Served from stale citation cache")
+
+def test_citation_cache_import(tmp_path):
+    cache = CitationCache(str(tmp_path / "cache.db"), positive_ttl=3600, negative_ttl=60)
+    path = tmp_path / "authorities.jsonl"
+    path.write_text(
+        json.dumps({"citation": "410 U.S. 113", "title": "Roe v. Wade", "date_filed": "1973-01-22"}) + "\n"
+        + json.dumps({"citation": "999 U.S. 999", "status": "not_found"}) + "\n"
+    )
+
+    assert import_file(cache, str(path)) == 2
+
+    entry = cache.get("410us113")
+    assert entry.fresh and entry.found
+    assert entry.result["title"] == "Roe v. Wade"
+    assert entry.expires_at - entry.fetched_at == 3600
+    assert cache.get("999us999").expires_at - cache.get("999us999").fetched_at == 60
+    assert cache.stats() == {"entries": 2, "found": 1, "not_found": 1, "fresh": 2}
+
+def test_short_forms_resolve_to_one_lookup(stub_validation, validation):
+    stub = stub_validation({"101 U.S. 201": "Alpha v. Beta"}, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+    text = (
+        "Alpha v. Beta, 101 U.S. 201, 205 (1990), controls.\n"
+        "The  rule is settled. Id. at 206. See also Alpha, 101 U.S. at 207.\n"
+        "As the Court held in Alpha, 101 U.S. 201, the duty is strict."
+    )
+
+    findings = validation.verify_citations(text)
+
+    assert stub.requests == ["101 U.S. 201"]
+    assert len(findings) == 1
+    finding = findings[0]
+    assert finding.status == CitationStatus.VERIFIED
+    assert [o.form for o in finding.occurrences] == ["full", "id", "short", "full"]
+    # Offsets point into the submitted text, not eyecite's whitespace-collapsed copy
+    for occurrence in finding.occurrences:
+        assert text[occurrence.start:occurrence.end] == occurrence.citation_text
+
+def test_unresolved_short_form_is_unverified(stub_validation, validation):
+    stub = stub_validation({}, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+
+    findings = validation.verify_citations("As noted, Gamma, 555 F.3d at 12, and again 555 F.3d at 14.")
+
+    assert stub.requests == []
+    assert len(findings) == 1
+    assert findings[0].status == CitationStatus.UNVERIFIED
+    assert len(findings[0].occurrences) == 2
+
+def test_bulk_lookup_chunks_brief_text(stub_validation, validation):
+    cases = {f"{100 + i} U.S. {200 + i}": f"Case {i}" for i in range(12)}
+    stub = stub_validation(cases, bulk=True, CITATION_BULK_MAX_CHARS=120, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100,
+                           COURTLISTENER_API_TOKEN="token")
+    text = " ".join(f"The holding in Case {i} v. State, {c}, applies." for i, c in enumerate(cases)) + " Compare 999 U.S. 999."
+
+    findings = validation.verify_citations(text)
+
+    # Every authority is settled by a handful of citation-lookup calls, no per-citation searches
+    assert stub.requests == []
+    assert 1 < len(stub.bulk_requests) < 13
+    assert all(len(chunk) <= 120 for chunk in stub.bulk_requests)
+    assert sum(f.status == CitationStatus.VERIFIED for f in findings) == 12
+    assert next(f for f in findings if f.citation_text == "999 U.S. 999").status == CitationStatus.NOT_FOUND
+
+    # Results land in the shared cache, so a repeat run sends nothing
+    sent = len(stub.bulk_requests)
+    validation.verify_citations(text)
+    assert len(stub.bulk_requests) == sent and stub.requests == []
+
+def test_bulk_lookup_falls_back_to_search(stub_validation, validation):
+    stub = stub_validation({"101 U.S. 201": "Fallback Case"}, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100,
+                           COURTLISTENER_API_TOKEN="token")
+    misses = cache_requests.value(cache="citation", result="miss")
+
+    findings = validation.verify_citations("See 101 U.S. 201.")
+
+    assert stub.requests == ["101 U.S. 201"]
+    assert findings[0].status == CitationStatus.VERIFIED
+    # The cache is checked once per authority, not again by the fallback
+    assert cache_requests.value(cache="citation", result="miss") == misses + 1
+
+def test_bulk_lookup_needs_a_token(stub_validation, validation):
+    stub = stub_validation({"101 U.S. 201": "Case"}, bulk=True, CITATION_RATE_LIMIT=100.0, CITATION_RATE_BURST=100)
+
+    findings = validation.verify_citations("See 101 U.S. 201.")
+
+    # Anonymous requests to the citation-lookup endpoint would only be refused
+    assert stub.bulk_requests == [] and stub.requests == ["101 U.S. 201"]
+    assert findings[0].status == CitationStatus.VERIFIED
+
+def test_bulk_chunks_never_split_a_citation(validation):
+    text = "The court in Brown, 347 U.S. 483, held otherwise and later cases agree."
+    cite = "347 U.S. 483"
+    start = text.index(cite)
+    end = start + len(cite)
+    # The citation ends exactly at the size limit, so the last space before the cut is inside it
+    validation.config.CITATION_BULK_MAX_CHARS = end
+
+    chunks = list(validation._bulk_chunks(text, [(start, end)]))
+
+    assert len(chunks) == 1
+    offset, chunk = chunks[0]
+    assert chunk[start - offset:end - offset] == cite
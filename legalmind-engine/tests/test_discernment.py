@@ -1,7 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 import os
+import re
 import sys
+import json
+import importlib
 
 # Add the project root to sys.path so we can import app modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -9,7 +12,12 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # --- Mocking Infrastructure ---
 
 def mock_module(module_name, **kwargs):
-    """Mocks a module in sys.modules to allow importing code that depends on it."""
+    """Mocks a module in sys.modules to allow importing code that depends on it, if it is not installed."""
+    try:
+        # The app imports these lazily, so "not imported yet" no longer means "missing"
+        importlib.import_module(module_name)
+    except ImportError:
+        pass
     if module_name not in sys.modules:
         mock = MagicMock()
         for key, value in kwargs.items():
@@ -48,7 +56,7 @@ except ImportError:
 # But app.core.stores imports app.models.
 
 try:
-    from app.modules.discernment import Discernment
+    from app.modules.discernment import Discernment, ClaimClusterer
     from app.models import Claim, ClaimType, RoutingDecision
     from app.core.stores import CaseContext
 except ImportError as e:
@@ -143,7 +151,8 @@ class TestDiscernment(unittest.TestCase):
 
         self.assertEqual(len(claims), 1)
         self.assertEqual(claims[0].text, "This is a claim that should be extracted heuristically")
-        self.assertEqual(claims[0].source_location, "heuristic_body")
+        self.assertEqual(claims[0].source_location, "para_1")
+        self.assertEqual([c.source_location for c in self.discernment.stream_claims("dummy.docx")], ["para_1"])
 
     @patch('app.modules.discernment.docx.Document')
     def test_extract_claims_file_error(self, mock_docx):
@@ -183,7 +192,7 @@ class TestDiscernment(unittest.TestCase):
 
         self.assertEqual(len(claims), 1)
         self.assertEqual(claims[0].text, "LLM extracted claim")
-        self.assertEqual(claims[0].source_location, "llm_extracted")
+        self.assertEqual(claims[0].source_location, "para_1")
 
     @patch('app.modules.discernment.litellm.completion')
     @patch('app.modules.discernment.docx.Document')
@@ -194,7 +203,9 @@ class TestDiscernment(unittest.TestCase):
         mock_doc = MagicMock()
         mock_para = MagicMock()
         mock_para.text = "This is a backup claim."
-        mock_doc.paragraphs = [mock_para]
+        second_para = MagicMock()
+        second_para.text = "The second paragraph holds another claim."
+        mock_doc.paragraphs = [mock_para, second_para]
         mock_docx.return_value = mock_doc
 
         # Enable LLM but make it fail
@@ -207,10 +218,86 @@ class TestDiscernment(unittest.TestCase):
 
         claims = self.discernment.extract_claims("dummy.docx")
 
-        # Should fall back to heuristic
-        self.assertEqual(len(claims), 1)
-        self.assertEqual(claims[0].text, "This is a backup claim")
-        self.assertEqual(claims[0].source_location, "heuristic_body")
+        # Should fall back to heuristic, keeping each claim's paragraph
+        self.assertEqual([c.text for c in claims], ["This is a backup claim", "The second paragraph holds another claim"])
+        self.assertEqual([c.source_location for c in claims], ["para_1", "para_2"])
+
+    def test_section_splitter_windows(self):
+        paragraphs = [(i + 1, "x" * 40) for i in range(10)]
+
+        windows = self.discernment.section_splitter(paragraphs, max_chars=100, overlap_chars=40)
+
+        # Every paragraph is covered and consecutive windows share one paragraph
+        covered = {index for window in windows for index, _ in window}
+        self.assertEqual(covered, set(range(1, 11)))
+        for prev, nxt in zip(windows, windows[1:]):
+            self.assertEqual(prev[-1][0], nxt[0][0])
+        self.assertTrue(all(sum(len(t) for _, t in w) <= 100 for w in windows))
+
+    def test_section_splitter_breaks_on_heading(self):
+        paragraphs = [
+            (1, "STATEMENT OF FACTS"),
+            (2, "a" * 60),
+            (3, "ARGUMENT"),
+            (4, "b" * 60),
+        ]
+
+        windows = self.discernment.section_splitter(paragraphs, max_chars=100, overlap_chars=40)
+
+        # The heading starts a fresh window without overlap from the previous section
+        self.assertEqual([[i for i, _ in w] for w in windows], [[1, 2], [3, 4]])
+
+    @patch('app.modules.discernment.litellm.completion')
+    def test_llm_decomposer_sharded(self, mock_completion):
+        self.discernment.config.CLAIM_WINDOW_CHARS = 100
+        self.discernment.config.CLAIM_WINDOW_OVERLAP_CHARS = 60
+        paragraphs = [(i * 2, f"Paragraph {i} states that fact number {i} is true.") for i in range(1, 7)]
+
+        def respond(model, messages, max_tokens):
+            # Claim every paragraph visible in the window, reporting its index
+            indices = re.findall(r"^\[(\d+)\]", messages[1]["content"], re.MULTILINE)
+            data = [{"text": f"Fact number {int(i) // 2} is true", "priority": 1, "paragraph": int(i)} for i in indices]
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(data)))])
+
+        mock_completion.side_effect = respond
+
+        claims = self.discernment.llm_decomposer("", paragraphs)
+
+        self.assertGreater(mock_completion.call_count, 1)
+        # Overlapping windows report the same claims; each survives exactly once
+        self.assertEqual([c.text for c in claims], [f"Fact number {i} is true" for i in range(1, 7)])
+        self.assertEqual([c.source_location for c in claims], [f"para_{i * 2}" for i in range(1, 7)])
+
+    def _claim(self, claim_id, text, expected_modality=None):
+        return Claim(
+            claim_id=claim_id,
+            text=text,
+            type=ClaimType.FACTUAL,
+            source_location="para_1",
+            priority=1,
+            expected_modality=expected_modality,
+            routing=RoutingDecision.VERIFY
+        )
+
+    def test_claim_clusterer_groups_near_duplicates(self):
+        clusterer = ClaimClusterer(threshold=0.8)
+        text = "The defendant ran the red light at the intersection of Main Street and Elm Avenue"
+
+        self.assertIsNone(clusterer.assign(self._claim("a", text)))
+        self.assertIsNone(clusterer.assign(self._claim("b", "Plaintiff suffered a fractured wrist in the collision")))
+
+        representative = clusterer.assign(self._claim("c", text + "."))
+        self.assertEqual(representative.claim_id, "a")
+        representative = clusterer.assign(self._claim("d", "As noted, " + text.lower()))
+        self.assertEqual(representative.claim_id, "a")
+
+    def test_claim_clusterer_keeps_distinct_claims_apart(self):
+        clusterer = ClaimClusterer(threshold=0.8)
+
+        self.assertIsNone(clusterer.assign(self._claim("a", "The defendant ran the red light at Main Street")))
+        self.assertIsNone(clusterer.assign(self._claim("b", "The defendant stopped at the red light at Main Street")))
+        # Same text but a different expected modality retrieves different evidence
+        self.assertIsNone(clusterer.assign(self._claim("c", "The defendant ran the red light at Main Street", expected_modality="video")))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,115 @@
+import os
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from conftest import make_bundle, make_claim, make_finding
+from app.core.cancellation import CancelToken, cancel_scope, current_token
+from app.core.executors import CpuDispatcher, Lane, cpu_pool, executor_stats, reset_cpu_pool, run_cpu, submit_cpu
+from app.core.stores import CaseContext
+from app.modules import dominion as dominion_module
+from app.modules.dominion import Dominion
+
+@pytest.mark.asyncio
+async def test_lane_bounds_work_and_carries_context():
+    lane = Lane("io", 2)
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+    release = threading.Event()
+
+    def work():
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        release.wait(5)
+        with lock:
+            running["now"] -= 1
+        return current_token()
+
+    token = CancelToken()
+    try:
+        with cancel_scope(token):
+            tasks = [asyncio.create_task(lane.run(work)) for _ in range(5)]
+        await asyncio.sleep(0.1)
+        assert lane.stats() == {"size": 2, "queued": 3, "running": 2, "completed": 0}
+
+        # Cancelling a task whose call is still queued drops the call
+        tasks[-1].cancel()
+        await asyncio.sleep(0.05)
+        assert lane.stats()["queued"] == 2
+        release.set()
+        results = await asyncio.gather(*tasks[:-1])
+        await asyncio.sleep(0)
+    finally:
+        release.set()
+        lane.shutdown()
+
+    assert running["peak"] == 2
+    assert results == [token] * 4
+    assert lane.stats() == {"size": 2, "queued": 0, "running": 0, "completed": 4}
+
+@pytest.mark.asyncio
+async def test_llm_lane_is_shared_across_cases(tmp_path, monkeypatch):
+    monkeypatch.setattr(dominion_module, "llm_lane", Lane("llm", 1))
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def adjudicate(claim, bundle):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        threading.Event().wait(0.02)
+        with lock:
+            running["now"] -= 1
+        return make_finding(claim, bundle)
+
+    dominions = []
+    for case_id in ("case_a", "case_b"):
+        with patch("app.modules.dominion.Preservation"):
+            dominion = Dominion(CaseContext(case_id, base_storage_path=str(tmp_path)))
+        dominion.inquiry.retrieve_evidence = MagicMock(side_effect=make_bundle)
+        dominion.adjudication.verify_claim_skeptical = MagicMock(side_effect=adjudicate)
+        dominions.append(dominion)
+
+    async def claims(prefix):
+        for i in range(3):
+            yield make_claim(f"{prefix}{i}")
+
+    results = await asyncio.gather(*(d._verify_claims_pipeline(claims(d.case_context.case_id)) for d in dominions))
+
+    assert [len(findings) for findings in results] == [3, 3]
+    # Each job alone would have been allowed 1; together they still never overlap
+    assert running["peak"] == 1
+
+@pytest.mark.asyncio
+async def test_cpu_work_runs_in_worker_processes(monkeypatch):
+    monkeypatch.setenv("LEGALMIND_MAX_CPU_CONCURRENCY", "1")
+    reset_cpu_pool()
+    try:
+        assert await run_cpu(os.getpid) != os.getpid()
+        assert executor_stats()["cpu"]["size"] == 1
+
+        # A pool that was shut down underneath us is replaced; this call runs here meanwhile
+        cpu_pool().shutdown()
+        assert submit_cpu(os.getpid).result() == os.getpid()
+        assert submit_cpu(os.getpid).result() != os.getpid()
+    finally:
+        reset_cpu_pool()
+
+    monkeypatch.setenv("LEGALMIND_MAX_CPU_CONCURRENCY", "0")
+    try:
+        assert cpu_pool() is None
+        assert await run_cpu(os.getpid) == os.getpid()
+    finally:
+        reset_cpu_pool()
+
+def test_cpu_fallback_leaves_the_dispatcher_free(monkeypatch):
+    monkeypatch.setenv("LEGALMIND_MAX_CPU_CONCURRENCY", "1")
+    dispatcher = CpuDispatcher()
+    try:
+        dispatcher.pool().shutdown()
+        # With the pool gone the call runs in-process, but not on the thread feeding the pool
+        assert dispatcher.submit(lambda: threading.current_thread().name).result(5) == "legalmind-cpu-fallback"
+        assert dispatcher.stats()["in_process"] == 1
+    finally:
+        dispatcher.reset()
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from conftest import make_claim, make_finding
+from app.core.stores import FindingsStore
+from app.models import CitationFinding, CitationStatus, GateResult, FilingRecommendation, RunStatus
+
+def make_citation(text):
+    return CitationFinding(
+        citation_text=text, normalized_form=text.lower().replace(".", "").replace(" ", ""),
+        status=CitationStatus.VERIFIED, confidence=1.0,
+        case_details={"name": "Case", "date": "", "court": "", "url": ""},
+        reconciliation_notes="", source_pass="both"
+    )
+
+def make_gate():
+    return GateResult(
+        document_id="brief.docx", filing_recommendation=FilingRecommendation.CLEAR, risk_score=0.0,
+        citation_summary={"verified": 2}, claim_summary={"supported": 2}, config_snapshot={}, timestamp=datetime.now()
+    )
+
+@pytest.fixture
+def store(tmp_path):
+    return FindingsStore("test_case_findings", str(tmp_path))
+
+def test_findings_round_trip(store):
+    store.save_run("run1", [make_finding(make_claim("c1")), make_finding(make_claim("c2"))], [make_citation("101 U.S. 201")], make_gate())
+
+    findings, citations, gate = store.load_run("run1")
+
+    assert [f.claim_id for f in findings] == ["c1", "c2"]
+    assert citations[0].citation_text == "101 U.S. 201"
+    assert gate.filing_recommendation == FilingRecommendation.CLEAR
+    assert store.load_run("missing") is None
+
+def test_findings_filter_and_replace(store):
+    store.save_run("run1", [make_finding(make_claim("c1")), make_finding(make_claim("c2"))], [make_citation("101 U.S. 201"), make_citation("102 U.S. 202")], make_gate())
+
+    findings, citations, gate = store.load_run("run1", ["c2", "102us202"])
+    assert [f.claim_id for f in findings] == ["c2"]
+    assert [c.citation_text for c in citations] == ["102 U.S. 202"]
+    assert gate is not None
+
+    # Saving the same run again replaces its findings
+    store.save_run("run1", [make_finding(make_claim("c3"))])
+    findings, citations, gate = store.load_run("run1")
+    assert [f.claim_id for f in findings] == ["c3"]
+    assert citations == [] and gate is None
+
+@pytest.mark.asyncio
+async def test_render_report_from_stored_findings(dominion):
+    dominion.case_context.findings.save_run("audit_run", [make_finding(make_claim("c1"))], [make_citation("101 U.S. 201")], make_gate())
+
+    with patch.object(dominion.validation, "verify_citations_async") as verify, \
+         patch.object(dominion.adjudication, "verify_claim_skeptical") as adjudicate:
+        state = await dominion.workflow_render_report("audit_run", formats=["html"])
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            final_state = dominion.get_job_status(state.run_id)
+            if final_state.status in [RunStatus.COMPLETE, RunStatus.FAILED]:
+                break
+
+    assert final_state.status == RunStatus.COMPLETE, final_state.warnings
+    verify.assert_not_called()
+    adjudicate.assert_not_called()
+    report_path = final_state.result_payload["report_path"]
+    # Each run renders into its own directory
+    assert report_path == dominion.chronicle.report_path("html", state.run_id)
+    with open(report_path) as f:
+        assert "101 U.S. 201" in f.read()
+
+@pytest.mark.asyncio
+async def test_render_report_unknown_run_fails(dominion):
+    state = await dominion.workflow_render_report("nope")
+    for _ in range(50):
+        await asyncio.sleep(0.05)
+        final_state = dominion.get_job_status(state.run_id)
+        if final_state.status != RunStatus.RUNNING:
+            break
+
+    assert final_state.status == RunStatus.FAILED
+    assert "No stored findings" in final_state.warnings[0]
@@ -166,8 +166,10 @@ async def test_audit_workflow_formats(dominion, test_data):
 
     assert final_state.status == RunStatus.COMPLETE
 
-    # Check for all report formats
-    base_dir = dominion.case_context.base_path
+    # Check for all report formats in the run's own report directory
+    base_dir = dominion.chronicle.report_dir(audit_state.run_id)
     assert os.path.exists(os.path.join(base_dir, "report.html"))
     assert os.path.exists(os.path.join(base_dir, "report.docx"))
-    assert os.path.exists(os.path.join(base_dir, "report.pdf"))
+    # PDF is only rendered on first download
+    assert not os.path.exists(os.path.join(base_dir, "report.pdf"))
+    assert os.path.exists(dominion.chronicle.ensure_pdf(final_state.result_payload["report_path"]))
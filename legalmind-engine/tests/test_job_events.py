@@ -0,0 +1,64 @@
+import json
+import asyncio
+import threading
+import pytest
+import httpx
+from app.main import app
+from app.core.stores import JobEvents
+from app.models import RunState, RunStatus
+
+pytestmark = pytest.mark.usefixtures("api_dominion")
+
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+async def finish_later(dominion, run_id, delay=0.2):
+    await asyncio.sleep(delay)
+    dominion.case_context.jobs.publish(run_id, "progress", {"stage": "intake", "progress": 0.5})
+    await asyncio.sleep(delay)
+    dominion.case_context.jobs.save_job(RunState(run_id=run_id, status=RunStatus.COMPLETE, progress=1.0))
+
+@pytest.mark.asyncio
+async def test_job_events_wait_wakes_from_other_thread():
+    events = JobEvents()
+    threading.Timer(0.1, events.publish, args=("run1", "progress", {"progress": 0.5})).start()
+
+    batch = await events.wait("run1", 0, timeout=5)
+
+    assert [e["type"] for e in batch] == ["progress"]
+    assert await events.wait("run1", batch[-1]["seq"], timeout=0.05) == []
+
+@pytest.mark.asyncio
+async def test_wait_endpoint_returns_on_change(dominion):
+    dominion.case_context.jobs.save_job(RunState(run_id="job1", status=RunStatus.RUNNING))
+    task = asyncio.create_task(finish_later(dominion, "job1"))
+
+    async with client() as c:
+        first = (await c.get("/api/jobs/job1/wait", params={"timeout": 5})).json()
+        assert [e["type"] for e in first["events"]] == ["progress"]
+        assert first["run_state"]["status"] == "running"
+
+        second = (await c.get("/api/jobs/job1/wait", params={"since": first["last_seq"], "timeout": 5})).json()
+        assert second["run_state"]["status"] == "complete"
+
+        # Finished jobs answer immediately
+        third = (await c.get("/api/jobs/job1/wait", params={"timeout": 30})).json()
+        assert third["events"] == [] and third["run_state"]["status"] == "complete"
+
+        assert (await c.get("/api/jobs/missing/wait")).status_code == 404
+    await task
+
+@pytest.mark.asyncio
+async def test_event_stream_ends_with_job(dominion):
+    dominion.case_context.jobs.save_job(RunState(run_id="job2", status=RunStatus.RUNNING))
+    task = asyncio.create_task(finish_later(dominion, "job2"))
+
+    async with client() as c:
+        response = await c.get("/api/jobs/job2/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    # History is replayed from the start, then the stream closes on the terminal status
+    assert [e["type"] for e in events] == ["status", "progress", "status"]
+    assert events[-1]["data"]["status"] == "complete"
+    await task
@@ -0,0 +1,237 @@
+import time
+import uuid
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from app.core.job_queue import JobQueue, JobRunner
+from app.core.stores import CaseContext, JobEvents
+from app.modules.conversion import Conversion
+from app.modules.dominion import Dominion
+from app.models import EvidenceSegment, Modality, RunStatus
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "job_queue.db"), max_attempts=2, retry_backoff=0)
+
+def test_lease_expires_to_another_worker(queue):
+    queue.enqueue("run1", "case", "ingest", {"file_path": "a.pdf"})
+
+    job = queue.lease("worker-a", lease_seconds=0.1)
+    assert job.payload == {"file_path": "a.pdf"} and job.attempts == 1
+    assert queue.lease("worker-b", lease_seconds=10) is None
+    assert queue.heartbeat("run1", "worker-a", 0.1)
+
+    time.sleep(0.15)
+    taken = queue.lease("worker-b", lease_seconds=10)
+    assert taken.run_id == "run1" and taken.attempts == 2
+    # The original worker learns on its next heartbeat that it lost the job
+    assert not queue.heartbeat("run1", "worker-a", 10)
+
+def test_fail_retries_then_gives_up(queue):
+    queue.enqueue("run1", "case", "audit", {})
+
+    queue.lease("w", 10)
+    assert queue.fail("run1", "w", "boom") == 0
+    queue.lease("w", 10)
+    assert queue.fail("run1", "w", "boom again") is None
+    assert queue.stats()["failed"] == 1
+
+    queue.enqueue("run2", "case", "audit", {})
+    queue.lease("w", 10)
+    # Input errors are not worth retrying
+    assert queue.fail("run2", "w", "bad path", retryable=False) is None
+
+def test_abandoned_final_attempt_is_failed(queue):
+    queue.enqueue("run1", "case", "ingest", {}, max_attempts=1)
+    queue.lease("w", lease_seconds=0.05)
+    time.sleep(0.1)
+
+    job = queue.lease("w2", 10)
+    assert job.exhausted
+    assert queue.stats()["failed"] == 1
+    assert queue.lease("w2", 10) is None
+
+def test_release_returns_job_without_spending_an_attempt(queue):
+    queue.enqueue("run1", "case", "ingest", {})
+    queue.lease("worker-a", 60)
+    queue.release("run1", "worker-a")
+
+    job = queue.lease("worker-b", 60)
+    assert job.run_id == "run1" and job.attempts == 1
+
+@pytest.mark.asyncio
+async def test_events_cross_processes_through_log(queue):
+    worker_events, api_events = JobEvents(), JobEvents()
+    worker_events.attach_log(queue)
+    api_events.attach_log(queue)
+    stop = asyncio.Event()
+    relay = asyncio.create_task(api_events.relay(queue, stop, interval=0.01))
+    await asyncio.sleep(0.05)
+
+    waiter = asyncio.create_task(api_events.wait("run1", 0, timeout=5))
+    await asyncio.sleep(0)
+    worker_events.publish("run1", "progress", {"stage": "conversion", "progress": 0.4})
+    worker_events.publish("run1", "status", {"status": "COMPLETE"})
+
+    first = await waiter
+    assert first[0]["seq"] == 1 and first[0]["data"]["stage"] == "conversion"
+    await asyncio.sleep(0.05)
+    assert [e["type"] for e in api_events.since("run1", 0)] == ["progress", "status"]
+    assert api_events.last_seq("run1") == 2
+
+    stop.set()
+    await relay
+
+@pytest.mark.asyncio
+async def test_runner_retries_until_success(queue):
+    target = MagicMock()
+    calls = []
+
+    async def execute_job(job):
+        calls.append(job.attempts)
+        if job.attempts == 1:
+            raise RuntimeError("transient")
+
+    target.execute_job = execute_job
+    runner = JobRunner(queue, lambda case_id: target, owner="w")
+    queue.enqueue("run1", "case", "ingest", {})
+
+    await runner.run_now("run1")
+
+    assert calls == [1, 2]
+    target.record_job_failure.assert_called_once()
+    assert target.record_job_failure.call_args[0][2] is True
+    assert queue.stats()["done"] == 1
+
+@pytest.mark.asyncio
+async def test_runner_releases_its_job_when_cancelled(queue):
+    started = asyncio.Event()
+
+    async def execute_job(job):
+        started.set()
+        await asyncio.Event().wait()
+
+    target = MagicMock()
+    target.execute_job = execute_job
+    runner = JobRunner(queue, lambda case_id: target, owner="w")
+    queue.enqueue("run1", "case", "ingest", {})
+
+    task = asyncio.create_task(runner.run_now("run1"))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Back in the queue for the next worker, without spending an attempt
+    job = queue.lease("w2", 60)
+    assert job.run_id == "run1" and job.attempts == 1
+
+@pytest.mark.asyncio
+async def test_ingest_resumes_after_failed_stage(tmp_path):
+    case_context = CaseContext("test_case_resume", base_storage_path=str(tmp_path))
+    with patch("app.modules.dominion.Preservation"):
+        dominion = Dominion(case_context)
+    dominion.job_queue.retry_backoff = 0
+
+    def ingest_docx(file_path, file_hash):
+        segment = EvidenceSegment(
+            segment_id=str(uuid.uuid4()), source_asset_id=file_hash, modality=Modality.PDF_TEXT, location="para_1",
+            text="The contract was signed on March 3.", confidence=1.0, extraction_method="test", derived=False, warnings=[]
+        )
+        case_context.ledger.append_segment(segment)
+        return [segment]
+
+    with patch.object(dominion.intake, "vault_writer", return_value="hash123") as vault_writer, \
+         patch.object(dominion.intake, "file_classifier", return_value="application/docx"), \
+         patch.object(dominion.conversion, "ingest_docx", side_effect=ingest_docx) as convert:
+        # The dense index fails once, as if the worker died mid-stage
+        dominion.preservation.dense_indexer.side_effect = [RuntimeError("index unavailable"), None]
+
+        state = await dominion.workflow_ingest_case("brief.docx")
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            final_state = dominion.get_job_status(state.run_id)
+            if final_state.status in [RunStatus.COMPLETE, RunStatus.FAILED]:
+                break
+
+    assert final_state.status == RunStatus.COMPLETE, final_state.warnings
+    # Intake, conversion and structuring ran once; only the failed stage repeated
+    vault_writer.assert_called_once()
+    convert.assert_called_once()
+    assert dominion.preservation.dense_indexer.call_count == 2
+    assert dominion.preservation.bm25_indexer.call_count == 1
+    assert case_context.index.get_chunk_count() == 1
+
+@pytest.mark.asyncio
+async def test_worker_mode_leaves_jobs_to_workers(tmp_path):
+    case_context = CaseContext("test_case_worker", base_storage_path=str(tmp_path))
+    with patch("app.modules.dominion.Preservation"):
+        dominion = Dominion(case_context)
+    dominion.config.JOB_EXECUTION_MODE = "worker"
+
+    state = await dominion.workflow_render_report(source_run_id="missing")
+    await asyncio.sleep(0.05)
+    assert dominion.job_queue.stats()["queued"] == 1
+    assert dominion.get_job_status(state.run_id).status == RunStatus.RUNNING
+
+    # A worker leases it; a missing source run is bad input, so it fails without retrying
+    worker = JobRunner(dominion.job_queue, lambda case_id: dominion, owner="worker-1", config=dominion.config)
+    stop = asyncio.Event()
+    task = asyncio.create_task(worker.run_forever(stop))
+    for _ in range(50):
+        await asyncio.sleep(0.05)
+        if dominion.get_job_status(state.run_id).status == RunStatus.FAILED:
+            break
+    stop.set()
+    await task
+
+    assert dominion.get_job_status(state.run_id).status == RunStatus.FAILED
+    assert dominion.job_queue.stats()["failed"] == 1
+
+def test_pdf_conversion_resumes_from_page(tmp_path):
+    from reportlab.pdfgen import canvas
+    pdf_path = str(tmp_path / "three_pages.pdf")
+    c = canvas.Canvas(pdf_path)
+    for page in range(3):
+        c.drawString(72, 720, f"Page {page + 1} of the deposition transcript, with enough text to extract.")
+        c.showPage()
+    c.save()
+
+    conversion = Conversion(CaseContext("test_case_pages", base_storage_path=str(tmp_path)))
+    pages_done = []
+    segments = conversion.ingest_pdf_layout(pdf_path, "asset1", start_page=1, on_page=pages_done.append)
+
+    assert [s.location for s in segments] == ["page_2", "page_3"]
+    assert pages_done == [2, 3]
+
+@pytest.mark.asyncio
+async def test_failed_conversion_is_discarded_before_the_retry(dominion):
+    dominion.job_queue.retry_backoff = 0
+    ledger = dominion.case_context.ledger
+    attempts = []
+
+    def ingest_docx(file_path, file_hash):
+        attempts.append(file_path)
+        segment = EvidenceSegment(
+            segment_id=str(uuid.uuid4()), source_asset_id=file_hash, modality=Modality.PDF_TEXT, location="para_1",
+            text="The contract was signed on March 3.", confidence=1.0, extraction_method="test", derived=False, warnings=[]
+        )
+        ledger.append_segment(segment)
+        if len(attempts) == 1:
+            raise RuntimeError("converter crashed")
+        return [segment]
+
+    with patch.object(dominion.intake, "vault_writer", return_value="hash123"), \
+         patch.object(dominion.intake, "file_classifier", return_value="application/docx"), \
+         patch.object(dominion.conversion, "ingest_docx", side_effect=ingest_docx):
+        state = await dominion.workflow_ingest_case("brief.docx")
+        for _ in range(50):
+            await asyncio.sleep(0.05)
+            final_state = dominion.get_job_status(state.run_id)
+            if final_state.status in [RunStatus.COMPLETE, RunStatus.FAILED]:
+                break
+
+    assert final_state.status == RunStatus.COMPLETE, final_state.warnings
+    assert len(attempts) == 2
+    # The first attempt's segment went with its failure, so the ledger holds one copy
+    assert len(ledger.get_segments("hash123")) == 1
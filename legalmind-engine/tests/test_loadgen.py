@@ -0,0 +1,71 @@
+import httpx
+import pytest
+from benchmarks.fakes import FakeLLM, FakeLLMServer, patch_embeddings
+from benchmarks.loadgen import LoadTest, Recorder
+from benchmarks.servers import engine_environment, start_fakes
+from benchmarks.synthetic import generate_case
+from app.main import app
+from app.api.routes import case_cache
+
+def test_fake_llm_server_speaks_openai():
+    extraction = [
+        {"role": "system", "content": "Extract factual claims from the legal text."},
+        {"role": "user", "content": "[1] Maria Lopez arrived at the Oakmont diner at 9:15 PM."},
+    ]
+    with FakeLLMServer(FakeLLM()) as server:
+        response = httpx.post(server.url + "/v1/chat/completions", json={"model": "gpt-4o", "messages": extraction})
+    body = response.json()
+    assert response.status_code == 200 and body["object"] == "chat.completion" and body["model"] == "gpt-4o"
+    assert "Oakmont diner" in body["choices"][0]["message"]["content"]
+    assert body["usage"]["total_tokens"] > 0
+
+    with FakeLLMServer(FakeLLM(rate_limit_rate=1.0), retry_after=2) as server:
+        limited = httpx.post(server.url + "/v1/chat/completions", json={"model": "gpt-4o", "messages": extraction})
+    assert limited.status_code == 429 and limited.headers["Retry-After"] == "2"
+    assert limited.json()["error"]["type"] == "rate_limit_error"
+    assert server.stats["rate_limited"] == 1 and server.stats["in_flight"] == 0
+
+def test_recorder_summary():
+    recorder = Recorder()
+    for seconds, outcome in [(0.01, 200), (0.02, 200), (0.5, 503), (1.0, "ConnectTimeout")]:
+        recorder.request("submit audit", seconds, outcome)
+    recorder.job("audit", 3.0, "complete")
+    recorder.job("audit", 9.0, "failed")
+    summary = recorder.summary(wall_seconds=2.0)
+
+    submit = summary["by_endpoint"]["submit audit"]
+    assert submit["error_rate"] == 0.5 and submit["per_second"] == 2.0
+    assert submit["outcomes"] == {"200": 2, "503": 1, "ConnectTimeout": 1}
+    assert summary["by_workflow"]["audit"]["failure_rate"] == 0.5
+    assert summary["jobs_completed"] == 1 and summary["requests_per_second"] == 2.0
+
+@pytest.mark.asyncio
+async def test_load_test_drives_the_api(tmp_path, monkeypatch):
+    case_dir = str(tmp_path / "case")
+    manifest = generate_case(case_dir, pages=2, scanned_pages=0, claims=4, citations=2, audio_seconds=0, seed=2)
+    llm_server, stub = start_fakes(manifest["authorities"])
+    for key, value in engine_environment(llm_server, stub).items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setenv("LEGALMIND_STORAGE_PATH", str(tmp_path / "storage"))
+    monkeypatch.setenv("LEGALMIND_CITATION_CACHE_PATH", str(tmp_path / "citation_cache.db"))
+    monkeypatch.delenv("LEGALMIND_ENV", raising=False)
+
+    recorder = Recorder()
+    try:
+        with patch_embeddings():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                test = LoadTest(client, recorder, case_dir, manifest, audits=2, workflows=["audit", "prefile"],
+                                poll="short", poll_interval=0.05, job_timeout=120, formats=["html"])
+                await test.run(["load_a", "load_b"], concurrency=2)
+    finally:
+        llm_server.stop()
+        stub.stop()
+        case_cache.clear()
+
+    summary = recorder.summary(wall_seconds=1.0)
+    assert summary["errors"] == []
+    assert {workflow: row["outcomes"] for workflow, row in summary["by_workflow"].items()} == {
+        "ingest": {"complete": 2}, "audit": {"complete": 2}, "prefile": {"complete": 2}}
+    assert summary["by_endpoint"]["poll short"]["error_rate"] == 0.0
+    # Claim extraction and verification went to the fake over HTTP
+    assert llm_server.stats["ok"] > 0 and stub.requests["lookup"] >= 1
@@ -0,0 +1,112 @@
+import pytest
+import httpx
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.main import app
+from app.core import metrics
+from app.core.job_queue import JobQueue, JobRunner
+from app.core.metrics import MetricsRegistry, track_stage, observe_llm_call
+from app.models import Modality
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests", ("case",))
+    depth = registry.gauge("test_depth", "Depth")
+    latency = registry.histogram("test_latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+
+    requests.inc(case='a"b')
+    requests.inc(2, case='a"b')
+    depth.set(4)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, stage="ocr")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{case="a\\"b"} 3' in lines
+    assert "test_depth 4" in lines
+    # Buckets are cumulative and end at +Inf
+    assert 'test_latency_seconds_bucket{stage="ocr",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{stage="ocr",le="1"} 2' in lines
+    assert 'test_latency_seconds_bucket{stage="ocr",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{stage="ocr"} 3' in lines
+    assert 'test_latency_seconds_sum{stage="ocr"} 5.55' in lines
+
+    with pytest.raises(ValueError):
+        requests.inc(tenant="x")
+    with pytest.raises(ValueError):
+        registry.gauge("test_requests_total", "Clash")
+
+def test_track_stage_and_llm_usage():
+    labels = {"stage": "ocr", "case": "metrics_case", "modality": "ocr_printed"}
+    errors = metrics.stage_errors.value(**labels)
+    observed = metrics.stage_seconds.count(**labels)
+
+    with track_stage("ocr", "metrics_case", Modality.OCR_PRINTED):
+        pass
+    with pytest.raises(RuntimeError):
+        with track_stage("ocr", "metrics_case", Modality.OCR_PRINTED):
+            raise RuntimeError("tesseract crashed")
+
+    assert metrics.stage_seconds.count(**labels) == observed + 2
+    assert metrics.stage_errors.value(**labels) == errors + 1
+
+    response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+    tokens = metrics.llm_tokens.value(purpose="verify", case="metrics_case", kind="prompt")
+    assert observe_llm_call("verify", "metrics_case", lambda **kwargs: response, model="m") is response
+    assert metrics.llm_tokens.value(purpose="verify", case="metrics_case", kind="prompt") == tokens + 120
+
+    failing = MagicMock(side_effect=TimeoutError("slow"))
+    failures = metrics.llm_requests.value(purpose="verify", case="metrics_case", outcome="error")
+    with pytest.raises(TimeoutError):
+        observe_llm_call("verify", "metrics_case", failing)
+    assert metrics.llm_requests.value(purpose="verify", case="metrics_case", outcome="error") == failures + 1
+
+class FakeTarget:
+    def __init__(self, fail: bool):
+        self.fail = fail
+
+    async def execute_job(self, job):
+        if self.fail:
+            raise RuntimeError("boom")
+
+    def record_job_failure(self, job, error, retrying):
+        pass
+
+    def record_job_cancelled(self, job, reason):
+        pass
+
+@pytest.mark.asyncio
+async def test_job_outcomes_and_queue_depth_are_exported(tmp_path):
+    queue = JobQueue(str(tmp_path / "job_queue.db"), max_attempts=2, retry_backoff=0)
+    queue.enqueue("run_ok", "metrics_case", "audit", {})
+    queue.enqueue("run_bad", "metrics_case", "audit", {})
+    queue.enqueue("run_waiting", "metrics_case", "audit", {})
+    runner = JobRunner(queue, lambda case_id: FakeTarget(fail=False), owner="w")
+    failing = JobRunner(queue, lambda case_id: FakeTarget(fail=True), owner="w")
+
+    labels = {"workflow": "audit", "case": "metrics_case"}
+    complete = metrics.jobs_total.value(outcome="complete", **labels)
+    retried = metrics.jobs_total.value(outcome="retry", **labels)
+    await runner.run_now("run_ok")
+    await failing.run_now("run_bad")
+
+    assert metrics.jobs_total.value(outcome="complete", **labels) == complete + 1
+    assert metrics.jobs_total.value(outcome="retry", **labels) == retried + 1
+    assert metrics.jobs_running.value(workflow="audit") == 0
+
+    queue.report_metrics()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/metrics")
+    finally:
+        metrics.registry.remove_collector(queue._collect_metrics)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert 'legalmind_job_queue_jobs{status="queued"} 1' in lines
+    assert 'legalmind_job_queue_jobs{status="failed"} 1' in lines
+    assert any(line.startswith('legalmind_job_duration_seconds_count{workflow="audit",case="metrics_case"}') for line in lines)
+    assert any(line.startswith('legalmind_audit_log{field="queue_depth"}') for line in lines)
+    # The API's case cache reports itself
+    assert any(line.startswith('legalmind_case_cache{field="resident"}') for line in lines)
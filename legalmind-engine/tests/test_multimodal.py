@@ -5,6 +5,7 @@ import uuid
 import asyncio
 from unittest.mock import MagicMock, patch
 from app.core.stores import CaseContext
+from app.core.executors import reset_cpu_pool
 from app.modules.conversion import Conversion
 from app.modules.dominion import Dominion
 from app.models import Modality, RunStatus, EvidenceSegment
@@ -39,8 +40,10 @@ def test_ingest_audio_mock(conversion, tmp_path):
             assert segments[0].text == "Hello world"
             assert segments[0].modality == Modality.AUDIO_TRANSCRIPT
 
-def test_ingest_image_mock(conversion, tmp_path):
-    # Mocking pytesseract
+def test_ingest_image_mock(conversion, tmp_path, monkeypatch):
+    # Mocking pytesseract, so OCR has to run in this process rather than a CPU worker
+    monkeypatch.setenv("LEGALMIND_MAX_CPU_CONCURRENCY", "0")
+    reset_cpu_pool()
     image_path = tmp_path / "test_image.png"
     image_path.touch()
 
@@ -86,7 +89,7 @@ async def test_multimodal_retrieval_filtering(tmp_path):
 
     # 2. Run Audit on a claim that targets video
     # We'll mock Discernment to return a video claim
-    with patch.object(dominion.discernment, "extract_claims") as mock_extract:
+    with patch.object(dominion.discernment, "stream_claims") as mock_extract:
         from app.models import Claim, ClaimType, RoutingDecision
         mock_extract.return_value = [
             Claim(claim_id="cl1", text="The video shows a red car.", type=ClaimType.FACTUAL,
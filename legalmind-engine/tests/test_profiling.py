@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+import httpx
+from conftest import make_bundle, make_claim, make_finding
+from app.main import app
+from app.core.profiling import profile_job
+from app.models import RunStatus
+
+def busy_work(stop: threading.Event, keep: list):
+    while not stop.is_set():
+        keep.append(bytearray(64 * 1024))
+        sum(i * i for i in range(2000))
+
+def test_sampler_sees_worker_threads_and_memory():
+    exported = []
+    stop = threading.Event()
+    keep = []
+    with profile_job(lambda summary, collapsed: exported.append((summary, collapsed)), interval=0.005, run_id="r1") as profiler:
+        worker = threading.Thread(target=busy_work, args=(stop, keep), name="job-worker")
+        worker.start()
+        deadline = time.monotonic() + 10
+        while profiler.thread_samples["job-worker"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        worker.join()
+
+    summary, collapsed = exported[0]
+    assert summary["run_id"] == "r1"
+    assert summary["sampler"]["samples"] > 0
+    assert summary["threads"]["job-worker"] > 0
+    # Collapsed lines are "thread;outer;...;inner count", outermost first
+    worker_lines = [line for line in collapsed.splitlines() if line.startswith("job-worker;")]
+    assert worker_lines and all(line.rsplit(" ", 1)[1].isdigit() for line in worker_lines)
+    assert any("busy_work (" in line for line in worker_lines)
+    assert any(row["function"].startswith("busy_work") for row in summary["cumulative"])
+    assert keep and summary["memory"]["peak_traced_bytes"] >= 64 * 1024
+
+async def finished(dominion, run_id):
+    for _ in range(100):
+        state = dominion.get_job_status(run_id)
+        if state.status != RunStatus.RUNNING:
+            return state
+        await asyncio.sleep(0.05)
+    return state
+
+@pytest.mark.asyncio
+async def test_profile_query_flag_profiles_the_job(api_dominion):
+    dominion = api_dominion
+    claim = make_claim("c1")
+    dominion.case_context.findings.save_run("source_run", [make_finding(claim, make_bundle(claim))])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        profiled = (await ac.post("/api/report/render?profile=true", json={"source_run_id": "source_run", "formats": ["html"]})).json()["run_id"]
+        plain = (await ac.post("/api/report/render", json={"source_run_id": "source_run", "formats": ["html"]})).json()["run_id"]
+        assert (await finished(dominion, profiled)).status == RunStatus.COMPLETE
+        assert (await finished(dominion, plain)).status == RunStatus.COMPLETE
+
+        summary = await ac.get(f"/api/jobs/{profiled}/profile")
+        collapsed = await ac.get(f"/api/jobs/{profiled}/profile?format=collapsed")
+        missing = await ac.get(f"/api/jobs/{plain}/profile")
+
+    assert summary.status_code == 200
+    report = summary.json()
+    assert report["run_id"] == profiled and report["workflow"] == "render_report" and report["attempt"] == 1
+    assert report["duration_seconds"] > 0
+    assert "peak_traced_bytes" in report["memory"]
+    assert collapsed.status_code == 200
+    assert missing.status_code == 404
+
+    # Stored next to the job's state file
+    summary_path, collapsed_path = dominion.case_context.jobs.profile_paths(profiled)
+    with open(summary_path) as f:
+        assert json.load(f)["run_id"] == profiled
+    assert collapsed.text == open(collapsed_path).read()
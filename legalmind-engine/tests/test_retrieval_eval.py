@@ -0,0 +1,78 @@
+import math
+import pytest
+from unittest.mock import MagicMock, patch
+from conftest import make_claim
+from benchmarks.fakes import patch_embeddings
+from benchmarks.retrieval_eval import build_synthetic_case, evaluate, parse_config, score_ranking
+from app.core.stores import CaseContext
+from app.modules.inquiry import Inquiry
+from app.models import Chunk
+
+def make_chunk(chunk_id):
+    return Chunk(chunk_id=chunk_id, segment_ids=[f"seg_{chunk_id}"], source="s", page_or_timecode="page_1",
+                 chunk_method="paragraph_split", text=f"text {chunk_id}", context_header="", metadata={}, chunk_index=0)
+
+def test_score_ranking():
+    ranked = [{"a"}, {"b", "seg_b"}, {"c"}, {"d"}]
+    scores = score_ranking(ranked, {"seg_b", "d"}, ks=(1, 2, 4))
+    assert scores["mrr"] == 0.5
+    assert scores["recall@1"] == 0.0 and scores["recall@2"] == 0.5 and scores["recall@4"] == 1.0
+    ideal = 1 + 1 / math.log2(3)
+    assert scores["ndcg@4"] == pytest.approx((1 / math.log2(3) + 1 / math.log2(5)) / ideal)
+    assert score_ranking([], {"x"}, ks=(5,)) == {"mrr": 0.0, "recall@5": 0.0, "ndcg@5": 0.0}
+
+def test_parse_config_converts_by_field_type():
+    assert parse_config("wide:RETRIEVAL_TOP_K=10,RERANKER_ENABLED=true") == {
+        "name": "wide", "overrides": {"RETRIEVAL_TOP_K": 10, "RERANKER_ENABLED": True}}
+    with pytest.raises(ValueError):
+        parse_config("bad:NOT_A_SETTING=1")
+
+def test_inquiry_honours_retrieval_config(tmp_path):
+    inquiry = Inquiry(CaseContext("test_retrieval_config", base_storage_path=str(tmp_path)))
+    dense = [(make_chunk(f"d{i}"), 1.0) for i in range(8)]
+    sparse = [(make_chunk(f"b{i}"), 1.0) for i in range(8)]
+    inquiry._dense_search = MagicMock(return_value=dense)
+    inquiry._bm25_search = MagicMock(return_value=sparse)
+
+    inquiry.config = inquiry.config.model_copy(update={"RETRIEVAL_MODE": "bm25", "RETRIEVAL_TOP_K": 3})
+    bundle = inquiry.retrieve_evidence(make_claim("c1", text="Maria Lopez arrived at 9:15 PM."))
+    assert [c.chunk_id for c in bundle.chunks] == ["b0", "b1", "b2"]
+    inquiry._dense_search.assert_not_called()
+
+    inquiry.config = inquiry.config.model_copy(update={"RETRIEVAL_MODE": "hybrid", "RETRIEVAL_TOP_K": 10, "RRF_K": 1})
+    bundle = inquiry.retrieve_evidence(make_claim("c1", text="Maria Lopez arrived at 9:15 PM."))
+    assert len(bundle.chunks) == 10
+    assert bundle.retrieval_scores[0] == pytest.approx(1 / 2)
+
+    # The cross-encoder reorders the fused candidates; a missing model keeps the fused order with a warning
+    inquiry.config = inquiry.config.model_copy(update={"RERANKER_ENABLED": True, "RETRIEVAL_TOP_K": 2})
+    encoder = MagicMock()
+    encoder.predict.side_effect = lambda pairs: [1.0 if text == "text b7" else 0.0 for _, text in pairs]
+    with patch("app.modules.inquiry._load_cross_encoder", return_value=encoder):
+        bundle = inquiry.retrieve_evidence(make_claim("c1", text="Maria Lopez arrived at 9:15 PM."))
+    assert bundle.chunks[0].chunk_id == "b7" and bundle.retrieval_warnings == []
+    with patch("app.modules.inquiry._load_cross_encoder", return_value=None):
+        bundle = inquiry.retrieve_evidence(make_claim("c1", text="Maria Lopez arrived at 9:15 PM."))
+    assert [c.chunk_id for c in bundle.chunks] == ["d0", "b0"] and bundle.retrieval_warnings
+
+def test_evaluate_synthetic_case(tmp_path):
+    with patch_embeddings():
+        case_context, claims = build_synthetic_case(str(tmp_path), "eval_case", {"pages": 4, "claims": 12, "citations": 0, "seed": 5})
+        report = evaluate(case_context, claims, [
+            parse_config("bm25:RETRIEVAL_MODE=bm25"),
+            parse_config("hybrid_top10:RETRIEVAL_TOP_K=10"),
+        ], ks=(1, 5), repeat=2, log=lambda line: None)
+        unlabelled = evaluate(case_context, [{"claim_id": "x", "text": "Nothing", "relevant": []}],
+                              [parse_config("bm25:RETRIEVAL_MODE=bm25")], log=lambda line: None)
+
+    assert claims and all(claim["relevant"] for claim in claims)
+    results = {r["name"]: r for r in report["configs"]}
+    bm25 = results["bm25"]
+    # Claims restate (or contradict) a sentence on one page, so BM25 finds it first
+    assert bm25["quality"]["recall@5"] == 1.0 and bm25["quality"]["mrr"] > 0.9
+    assert bm25["claims"] == len(claims) and bm25["latency"]["count"] == 2 * len(claims)
+    assert bm25["latency"]["p99_ms"] >= bm25["latency"]["p50_ms"] > 0
+    assert bm25["memory"]["peak_traced_bytes"] > 0
+    assert set(bm25["quality"]) == {"mrr", "recall@1", "recall@5", "ndcg@1", "ndcg@5"}
+    assert results["hybrid_top10"]["quality"]["recall@5"] > 0
+    assert "No labelled claims" in unlabelled["configs"][0]["error"]
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+from app.core.executors import Lane
+from app.core.job_queue import JobQueue, JobRunner
+from app.core.scheduling import (BULK, INTERACTIVE, FairQueue, JobScheduler, TokenBudget, Weights,
+                                 parse_case_weights, work_scope)
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_interactive_work_overtakes_a_bulk_backlog():
+    queue = FairQueue()
+    for i in range(20):
+        queue.push(f"ingest{i}", "case_a", BULK)
+    for i in range(3):
+        queue.push(f"cite{i}", "case_b", INTERACTIVE)
+
+    served = [queue.pop() for _ in range(6)]
+    # The bulk flow was first in line and gets its one pick, then the cite checks go ahead of the rest
+    assert served == ["ingest0", "cite0", "cite1", "cite2", "ingest1", "ingest2"]
+    assert queue.depth() == {BULK: 17} and len(queue) == 17
+
+def test_cases_in_a_class_share_by_weight():
+    queue = FairQueue(Weights(cases=parse_case_weights(["case_b=2"])))
+    for i in range(100):
+        queue.push(("case_a", i), "case_a", BULK)
+    for i in range(4):
+        queue.push(("case_b", i), "case_b", BULK)
+
+    served = [queue.pop()[0] for _ in range(6)]
+    assert served == ["case_a", "case_b", "case_b", "case_a", "case_b", "case_b"]
+    # Flows whose head is not eligible sit the pick out
+    assert queue.pop(lambda item: item[0] == "case_b") is None
+    assert queue.pop(lambda item: item[0] == "case_a") == ("case_a", 2)
+
+    with pytest.raises(ValueError):
+        parse_case_weights(["case_a=0"])
+
+@pytest.mark.asyncio
+async def test_job_slots_are_shared_fairly_and_capped_per_case():
+    scheduler = JobScheduler(max_running=2, case_cpu_jobs=1)
+    order = []
+    release = asyncio.Event()
+
+    async def job(case_id, workflow, name):
+        async with scheduler.slot(case_id, workflow):
+            order.append(name)
+            await release.wait()
+
+    tasks = [asyncio.create_task(job("case_a", "ingest", f"ingest{i}")) for i in range(3)]
+    await asyncio.sleep(0.01)
+    # One ingest for case_a at a time; the second slot stays free for others
+    assert order == ["ingest0"]
+    tasks.append(asyncio.create_task(job("case_b", "cite_check", "cite")))
+    await asyncio.sleep(0.01)
+    assert order == ["ingest0", "cite"]
+    assert scheduler.stats()["running"] == 2 and scheduler.stats()["waiting_bulk"] == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert order == ["ingest0", "cite", "ingest1", "ingest2"]
+    assert scheduler.stats()["running"] == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    scheduler = JobScheduler(max_running=1)
+    release = asyncio.Event()
+
+    async def job(case_id):
+        async with scheduler.slot(case_id, "audit"):
+            await release.wait()
+
+    first = asyncio.create_task(job("case_a"))
+    waiting = asyncio.create_task(job("case_b"))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    await asyncio.sleep(0.01)
+    assert scheduler.stats()["waiting_standard"] == 0
+    release.set()
+    await first
+    assert scheduler.stats()["running"] == 0
+
+def test_reserve_skips_cases_at_their_cpu_quota():
+    scheduler = JobScheduler(max_running=3, case_cpu_jobs=1)
+    candidates = [("r1", "case_a", "ingest"), ("r2", "case_b", "audit")]
+
+    assert scheduler.reserve(candidates) == ("r1", "case_a", "ingest")
+    # The next ingest for case_a would break its quota, so the audit goes
+    assert scheduler.reserve([("r3", "case_a", "ingest")] + candidates[1:]) == ("r2", "case_b", "audit")
+    assert scheduler.reserve([("r3", "case_a", "ingest")]) is None
+
+    scheduler.finish("case_a", "ingest")
+    assert scheduler.reserve([("r3", "case_a", "ingest")]) == ("r3", "case_a", "ingest")
+
+def test_token_budget_refills_per_minute():
+    clock = Clock()
+    budget = TokenBudget(tokens_per_minute=600, clock=clock)
+    budget.charge("case_a", 700)
+
+    assert not budget.allows("case_a") and budget.allows("case_b")
+    assert budget.retry_in() == pytest.approx(10.1)
+    assert budget.stats() == {"llm_cases_throttled": 1}
+    clock.now = 11
+    assert budget.allows("case_a") and budget.retry_in() is None
+
+    response = MagicMock()
+    response.usage.total_tokens = 1200
+    budget.charge_response("case_b", response)
+    assert not budget.allows("case_b")
+    # No quota configured
+    assert TokenBudget(0).allows("case_b")
+
+@pytest.mark.asyncio
+async def test_lane_holds_back_a_case_over_its_token_budget():
+    clock = Clock()
+    budget = TokenBudget(tokens_per_minute=600, clock=clock)
+    lane = Lane("llm", 1, budget=budget)
+    budget.charge("case_a", 1000)
+    ran = []
+
+    def call(name):
+        ran.append(name)
+        return threading.current_thread().name
+
+    try:
+        with work_scope("case_a", "audit"):
+            held = asyncio.ensure_future(lane.run(call, "a"))
+        with work_scope("case_b", "audit"):
+            assert (await lane.run(call, "b")).startswith("legalmind-llm")
+        await asyncio.sleep(0.05)
+        assert ran == ["b"] and not held.done()
+
+        clock.now = 60
+        lane.wake()
+        await asyncio.wait_for(held, 5)
+        assert ran == ["b", "a"]
+    finally:
+        lane.shutdown()
+
+@pytest.mark.asyncio
+async def test_runner_leases_interactive_jobs_ahead_of_a_backlog(tmp_path):
+    queue = JobQueue(str(tmp_path / "job_queue.db"), retry_backoff=0)
+    for i in range(5):
+        queue.enqueue(f"ingest{i}", "case_a", "ingest", {})
+    queue.enqueue("cite", "case_b", "cite_check", {})
+    order = []
+
+    async def execute_job(job):
+        order.append(job.run_id)
+
+    target = MagicMock()
+    target.execute_job = execute_job
+    scheduler = JobScheduler(max_running=1)
+    runner = JobRunner(queue, lambda case_id: target, owner="w", scheduler=scheduler)
+    runner.poll_interval = 0.01
+    stop = asyncio.Event()
+    worker = asyncio.create_task(runner.run_forever(stop))
+    for _ in range(200):
+        if len(order) == 6:
+            break
+        await asyncio.sleep(0.01)
+    stop.set()
+    await worker
+
+    assert order == ["ingest0", "cite", "ingest1", "ingest2", "ingest3", "ingest4"]
+    assert scheduler.stats()["running"] == 0
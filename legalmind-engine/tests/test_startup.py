@@ -0,0 +1,70 @@
+import sys
+import json
+import subprocess
+import httpx
+import pytest
+from benchmarks.fakes import patch_embeddings
+from app.main import app
+from app.api.routes import case_cache, get_cached_dominion
+from app.core.lazy import LazyModule, lazy_import
+
+# Generous next to the ~1s a lazy import takes, far below the ~6s of importing litellm and chromadb eagerly
+IMPORT_BUDGET_SECONDS = 3.0
+DOMINION_BUDGET_SECONDS = 0.25
+
+STARTUP_PROBE = """
+import sys, json, time, tempfile
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter() - started
+from app.core.lazy import HEAVY_MODULES
+from app.core.stores import CaseContext
+from app.modules.dominion import Dominion
+started = time.perf_counter()
+Dominion(CaseContext("startup_case", base_storage_path=tempfile.mkdtemp()))
+built = time.perf_counter() - started
+print(json.dumps({"import": imported, "dominion": built,
+                  "loaded": [m for m in HEAVY_MODULES + ("torch", "sentence_transformers") if m in sys.modules]}))
+"""
+
+def test_startup_stays_within_budget():
+    # A fresh interpreter, since this one has already imported everything the other tests used
+    probe = subprocess.run([sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True, timeout=120)
+    assert probe.returncode == 0, probe.stderr
+    timings = json.loads(probe.stdout.strip().splitlines()[-1])
+    assert timings["loaded"] == []
+    assert timings["import"] < IMPORT_BUDGET_SECONDS
+    assert timings["dominion"] < DOMINION_BUDGET_SECONDS
+
+def test_lazy_module_defers_import_and_honours_patches():
+    module = LazyModule("json")
+    assert module.dumps({"a": 1}) == '{"a": 1}'
+    module.dumps = lambda value: "patched"
+    assert module.dumps({}) == "patched"
+    del module.dumps
+    assert module.dumps([]) == "[]"
+    # Already imported modules are returned as is
+    assert lazy_import("json") is json
+
+@pytest.mark.asyncio
+async def test_warmup_endpoint(tmp_path, monkeypatch):
+    monkeypatch.setenv("LEGALMIND_STORAGE_PATH", str(tmp_path))
+    case_cache.clear()
+    try:
+        with patch_embeddings():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.post("/api/warmup", params={"case_id": "warm_case"},
+                                             json={"components": ["imports", "embeddings", "citations"]})
+                rejected = await client.post("/api/warmup", json={"components": ["gpu"]})
+        resident = get_cached_dominion("warm_case").loaded_modules()
+    finally:
+        case_cache.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert {name: row["status"] for name, row in body["components"].items()} == {
+        "imports": "ready", "embeddings": "ready", "citations": "ready"}
+    assert body["components"]["citations"]["citations"] == 1
+    assert body["case"]["index"] == {"status": "ready", "chunks": 0}
+    assert len(body["case"]["modules"]) == 10 and resident == body["case"]["modules"]
+    assert rejected.status_code == 400
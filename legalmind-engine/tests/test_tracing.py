@@ -0,0 +1,111 @@
+import asyncio
+import uuid
+import pytest
+import httpx
+from unittest.mock import MagicMock
+from conftest import make_bundle, make_claim, make_finding
+from app.main import app
+from app.core.job_queue import QueuedJob
+from app.core.tracing import STATUS_ERROR, span, start_trace
+
+def spans_of(document):
+    return [s for scope in document["scopeSpans"] for s in scope["spans"]]
+
+def attributes_of(otlp_span):
+    return {a["key"]: next(iter(a["value"].values())) for a in otlp_span["attributes"]}
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_threads():
+    exported = []
+    run_id = str(uuid.uuid4())
+
+    def in_thread():
+        with span("thread.work"):
+            pass
+
+    async def in_task():
+        with span("task.work", claim_id="c1"):
+            await asyncio.to_thread(in_thread)
+
+    # Outside a trace spans cost nothing and record nothing
+    with span("orphan") as orphan:
+        orphan.set_attribute("ignored", True)
+
+    with pytest.raises(RuntimeError):
+        with start_trace(run_id, "Dominion.audit", exported.append, resource={"case_id": "c"}, attempt=1):
+            await asyncio.create_task(in_task())
+            with span("failing"):
+                raise RuntimeError("upstream down")
+
+    assert len(exported) == 1
+    spans = {s["name"]: s for s in spans_of(exported[0])}
+    assert set(spans) == {"Dominion.audit", "task.work", "thread.work", "failing"}
+    root = spans["Dominion.audit"]
+    assert root["traceId"] == uuid.UUID(run_id).hex
+    assert root["parentSpanId"] == ""
+    assert spans["task.work"]["parentSpanId"] == root["spanId"]
+    assert spans["thread.work"]["parentSpanId"] == spans["task.work"]["spanId"]
+    # run_id and claim_id flow down to children
+    assert attributes_of(spans["thread.work"]) == {"run_id": run_id, "claim_id": "c1"}
+    assert attributes_of(root)["attempt"] == "1"
+    assert spans["failing"]["status"]["code"] == STATUS_ERROR
+    assert spans["failing"]["events"][0]["name"] == "exception"
+    assert root["status"]["code"] == STATUS_ERROR
+    assert int(root["endTimeUnixNano"]) >= int(spans["thread.work"]["endTimeUnixNano"])
+
+@pytest.mark.asyncio
+async def test_claim_retries_are_traced(dominion, monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda seconds: sleep(0))
+    claim = make_claim("c1", text="The light was red.")
+    bundle = make_bundle(claim)
+    finding = make_finding(claim, bundle)
+    dominion.inquiry.retrieve_evidence = MagicMock(side_effect=[TimeoutError("chroma busy"), bundle])
+    dominion.adjudication.verify_claim_skeptical = MagicMock(return_value=finding)
+
+    async def claims():
+        yield claim
+
+    exported = []
+    with start_trace("run_retry", "Dominion.audit", exported.append):
+        await dominion._verify_claims_pipeline(claims())
+
+    spans = spans_of(exported[0])
+    by_id = {s["spanId"]: s for s in spans}
+    claim_span = next(s for s in spans if s["name"] == "Dominion.verify_claim")
+    assert by_id[claim_span["parentSpanId"]]["name"] == "Dominion.verify_claims"
+
+    attempts = [s for s in spans if s["parentSpanId"] == claim_span["spanId"]]
+    assert len(attempts) == 3
+    assert all(attributes_of(s)["claim_id"] == "c1" for s in attempts)
+    assert all(attributes_of(s)["run_id"] == "run_retry" for s in attempts)
+    assert [attributes_of(s)["attempt"] for s in attempts] == ["1", "2", "1"]
+    assert [s["status"]["code"] for s in attempts] == [STATUS_ERROR, 0, 0]
+    assert [e["name"] for e in attempts[0]["events"]] == ["lane_acquired", "exception"]
+
+@pytest.mark.asyncio
+async def test_job_trace_is_written_per_attempt_and_served(api_dominion):
+    dominion = api_dominion
+    run_id = str(uuid.uuid4())
+    job = QueuedJob(run_id, dominion.case_context.case_id, "maintenance", {}, attempts=1, max_attempts=3)
+    await dominion.execute_job(job)
+    job.attempts = 2
+    await dominion.execute_job(job)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        response = await ac.get(f"/api/jobs/{run_id}/trace")
+        missing = await ac.get("/api/jobs/no_such_run/trace")
+
+    assert response.status_code == 200
+    attempts = response.json()["resourceSpans"]
+    assert len(attempts) == 2
+    assert {"key": "case_id", "value": {"stringValue": dominion.case_context.case_id}} in attempts[0]["resource"]["attributes"]
+    roots = [spans_of(a)[0] for a in attempts]
+    assert [attributes_of(r)["attempt"] for r in roots] == ["1", "2"]
+    assert all(r["name"] == "Dominion.maintenance" and r["traceId"] == uuid.UUID(run_id).hex for r in roots)
+    assert missing.status_code == 404
+
+    dominion.config.TRACING_ENABLED = False
+    other = str(uuid.uuid4())
+    await dominion.execute_job(QueuedJob(other, dominion.case_context.case_id, "maintenance", {}, attempts=1, max_attempts=3))
+    assert dominion.case_context.jobs.get_trace(other) is None
@@ -84,7 +84,8 @@ export function activate() {
             type: "object",
             properties: {
                 file_path: { type: "string" },
-                run_id: { type: "string" }
+                run_id: { type: "string" },
+                deadline_seconds: { type: "number" }
             }
         },
         execute: async (args: any) => callEngine("/evidence/ingest", "POST", args)
@@ -139,7 +140,8 @@ export function activate() {
             type: "object",
             properties: {
                 brief_path: { type: "string" },
-                run_id: { type: "string" }
+                run_id: { type: "string" },
+                deadline_seconds: { type: "number" }
             }
         },
         execute: async (args: any) => callEngine("/audit/run", "POST", args)
@@ -193,12 +195,95 @@ export function activate() {
         execute: async (args: any) => callEngine("/prefile/run", "POST", args)
     });
 
+    api.registerTool("legalmind.job.wait", {
+        description: "Block until a job reports progress, a warning, a partial result or a status change (or timeout). Pass the returned last_seq as since on the next call.",
+        parameters: {
+            type: "object",
+            properties: {
+                run_id: { type: "string" },
+                since: { type: "number" },
+                timeout: { type: "number" }
+            },
+            required: ["run_id"]
+        },
+        execute: async (args: any) => {
+            const params = new URLSearchParams({ timeout: String(args.timeout ?? 30) });
+            if (args.since !== undefined) params.set("since", String(args.since));
+            return callEngine(`/jobs/${args.run_id}/wait?${params}`, "GET");
+        }
+    });
+
+    api.registerTool("legalmind.job.cancel", {
+        description: "Cancel a queued or running job. Running jobs report status cancelled once their work has stopped.",
+        parameters: {
+            type: "object",
+            properties: {
+                run_id: { type: "string" }
+            },
+            required: ["run_id"]
+        },
+        execute: async (args: any) => callEngine(`/jobs/${args.run_id}`, "DELETE")
+    });
+
+    api.registerTool("legalmind.job.trace", {
+        description: "Fetch a job's trace (OpenTelemetry JSON spans per attempt) to see where its time went.",
+        parameters: {
+            type: "object",
+            properties: {
+                run_id: { type: "string" },
+                case_id: { type: "string" }
+            },
+            required: ["run_id"]
+        },
+        execute: async (args: any) => {
+            const query = args.case_id ? `?case_id=${encodeURIComponent(args.case_id)}` : "";
+            return callEngine(`/jobs/${args.run_id}/trace${query}`, "GET");
+        }
+    });
+
+    api.registerTool("legalmind.job.profile", {
+        description: "Fetch the profile summary (hot functions, per-thread samples, peak memory) of a job started with ?profile=true.",
+        parameters: {
+            type: "object",
+            properties: {
+                run_id: { type: "string" },
+                case_id: { type: "string" }
+            },
+            required: ["run_id"]
+        },
+        execute: async (args: any) => {
+            const query = args.case_id ? `?case_id=${encodeURIComponent(args.case_id)}` : "";
+            return callEngine(`/jobs/${args.run_id}/profile${query}`, "GET");
+        }
+    });
+
+    api.registerTool("legalmind.audit_log.query", {
+        description: "Read a case's audit trail, oldest first, filtered by run, module and ISO time range. Use run_id for a run's chain of custody.",
+        parameters: {
+            type: "object",
+            properties: {
+                case_id: { type: "string" },
+                run_id: { type: "string" },
+                module: { type: "string" },
+                since: { type: "string" },
+                until: { type: "string" },
+                limit: { type: "number" }
+            }
+        },
+        execute: async (args: any) => {
+            const query = new URLSearchParams(Object.entries(args).map(([key, value]) => [key, String(value)]));
+            return callEngine(`/audit-log/events?${query}`, "GET");
+        }
+    });
+
     api.registerTool("legalmind.report.render", {
-        description: "Render report from findings. Start/poll: returns run_id or status + file path.",
+        description: "Re-render a finished run's report from its stored findings. Start/poll: returns run_id or status + file path.",
         parameters: {
             type: "object",
             properties: {
+                source_run_id: { type: "string" },
                 findings_ids: { type: "array", items: { type: "string" } },
+                formats: { type: "array", items: { type: "string", enum: ["html", "docx", "pdf"] } },
                 run_id: { type: "string" }
             }
         },